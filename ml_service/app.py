@@ -57,6 +57,7 @@ import base64
 from io import BytesIO
 import json
 import threading
+import time
 
 # Import untuk visualisasi
 import matplotlib
@@ -68,6 +69,12 @@ import seaborn as sns
 # IMPORT MODUL INTERNAL (Journal-Grade)
 # ========================================
 from temporal_features import TemporalSlidingWindow, get_sliding_window
+from window_persistence import WindowPersistence
+from window_janitor import WindowJanitor
+from history_store import RoundRobinHistory
+from window_snapshot import SnapshotPublisher
+from verdict_cache import VerdictCache
+from flat_isolation_forest import FlatIsolationForest
 from shap_explainer import SHAPExplainer, create_shap_explainer
 from ensemble_voting import (
     EnsembleVotingClassifier, 
@@ -86,11 +93,17 @@ CORS(app)  # Mengizinkan Cross-Origin Request dari Laravel
 
 # Variabel global untuk menyimpan model dan encoder
 model = None                    # Legacy: Single Isolation Forest
+model_scorer = None             # Scorer legacy IF (FlatIsolationForest atau model)
 ensemble_model = None           # NEW: Ensemble Voting Classifier
 shap_explainer = None           # NEW: SHAP Explainer untuk XAI
 label_encoders = {}
 pca_model = None                # PCA untuk reduksi dimensi
 sliding_window = None           # NEW: Temporal Sliding Window
+window_persistence = None       # Snapshot + WAL sliding window (opsional)
+window_janitor = None           # Eviction latar belakang sliding window
+history_store = None            # Riwayat multi-resolusi untuk grafik dashboard
+window_snapshots = None         # Snapshot read-only untuk endpoint dashboard
+verdict_cache = None            # Cache verdict untuk IP penyerang berulang
 log_history = []                # Menyimpan history log untuk visualisasi
 
 # NEW: Feedback storage untuk Active Learning
@@ -171,7 +184,8 @@ def initialize_model():
     4. PCA untuk visualisasi
     5. Temporal Sliding Window
     """
-    global model, ensemble_model, shap_explainer, label_encoders, pca_model, sliding_window
+    global model, ensemble_model, shap_explainer, label_encoders, pca_model, sliding_window, window_persistence
+    global window_janitor, history_store, window_snapshots, verdict_cache, model_scorer
     
     print("\n" + "="*60)
     print("  LOG SENTINEL - INITIALIZING ML MODELS v2.0")
@@ -211,14 +225,31 @@ def initialize_model():
         n_jobs=-1
     )
     model.fit(fitur_training)
+    compile_forest = os.environ.get('FAST_ISOLATION_FOREST', '1') != '0'
+    model_scorer = FlatIsolationForest(model) if compile_forest else model
     print("  ✓ Isolation Forest trained successfully")
     
     # ========================================
     # NEW: Ensemble Voting Classifier
     # ========================================
     print("[STEP 3/6] Training Ensemble Voting Classifier...")
-    ensemble_model = create_ensemble_classifier(contamination=0.1, random_state=42)
+    previous_ensemble = ensemble_model
+    ensemble_model = create_ensemble_classifier(
+        contamination=0.1,
+        random_state=42,
+        parallel=os.environ.get('ENSEMBLE_PARALLEL', '0') == '1',
+        cascade=os.environ.get('ENSEMBLE_CASCADE', '0') == '1',
+        cascade_band=tuple(
+            float(bound) for bound in os.environ.get('ENSEMBLE_CASCADE_BAND', '-0.05,0.05').split(',')
+        ),
+        compile_forest=compile_forest
+    )
     ensemble_model.fit(fitur_training)
+    if previous_ensemble is not None:
+        # Thread pool ensemble lama dilepas; request yang masih memakainya dibiarkan selesai
+        previous_ensemble.close(wait=False)
+    if verdict_cache is not None:
+        verdict_cache.clear()
     print("  ✓ Ensemble (IF + OCSVM + LOF) trained successfully")
     
     # ========================================
@@ -243,6 +274,69 @@ def initialize_model():
     sliding_window = get_sliding_window()
     print("  ✓ Sliding Window initialized (10 min buffer)")
     
+    # Restore state dari snapshot + WAL agar fitur rate tidak kosong setelah restart
+    state_dir = os.environ.get('SLIDING_WINDOW_STATE_DIR')
+    if state_dir and window_persistence is None:
+        if not WindowPersistence.supports(sliding_window):
+            raise RuntimeError(
+                f"SLIDING_WINDOW_STATE_DIR is not supported with storage '{sliding_window.storage}' "
+                "(decayed/shared windows keep no log records); unset SLIDING_WINDOW_STATE_DIR "
+                "or use the object/compact/columnar storage"
+            )
+        window_persistence = WindowPersistence(
+            state_dir,
+            snapshot_interval_seconds=float(os.environ.get('SLIDING_WINDOW_SNAPSHOT_INTERVAL', 60)),
+            flush_interval_seconds=float(os.environ.get('SLIDING_WINDOW_WAL_FLUSH_INTERVAL', 0))
+        )
+        restored = window_persistence.restore(sliding_window)
+        window_persistence.attach(sliding_window)
+        window_persistence.start()
+        print(f"  ✓ Sliding Window state restored ({restored} logs) from {state_dir}")
+    
+    # Eviction log kedaluwarsa & state IP idle di thread latar belakang.
+    # Window shared tidak butuh janitor (bucket kedaluwarsa secara lazy)
+    janitor_setting = os.environ.get('SLIDING_WINDOW_JANITOR')
+    if window_janitor is None and janitor_setting != '0':
+        if WindowJanitor.supports(sliding_window):
+            window_janitor = WindowJanitor(
+                interval_seconds=float(os.environ.get('SLIDING_WINDOW_JANITOR_INTERVAL', 1))
+            )
+            window_janitor.attach(sliding_window)
+            window_janitor.start()
+            print("  ✓ Sliding Window janitor started")
+        elif janitor_setting == '1':
+            raise RuntimeError(
+                f"SLIDING_WINDOW_JANITOR=1 is not supported with storage '{sliding_window.storage}'; "
+                "unset SLIDING_WINDOW_JANITOR"
+            )
+        else:
+            print(f"  ✓ Sliding Window janitor skipped (storage '{sliding_window.storage}')")
+    
+    # Riwayat 1s/1min/1h/1d agar grafik dashboard tidak perlu query database
+    if history_store is None and os.environ.get('SLIDING_WINDOW_HISTORY', '1') != '0':
+        history_store = RoundRobinHistory()
+        history_store.attach(sliding_window)
+        print("  ✓ Round-robin history store attached")
+    
+    # Endpoint dashboard membaca snapshot terbitan thread ini, bukan window langsung
+    if window_snapshots is None:
+        window_snapshots = SnapshotPublisher(
+            sliding_window,
+            interval_seconds=float(os.environ.get('SLIDING_WINDOW_PUBLISH_INTERVAL', 1))
+        )
+        window_snapshots.start()
+        print("  ✓ Sliding Window snapshot publisher started")
+    
+    # Verdict HIGH/CRITICAL berulang dari IP yang sama disajikan dari cache
+    if verdict_cache is None and os.environ.get('VERDICT_CACHE', '1') != '0':
+        verdict_cache = VerdictCache(
+            ttl_seconds=float(os.environ.get('VERDICT_CACHE_TTL', 30)),
+            threshold=int(os.environ.get('VERDICT_CACHE_THRESHOLD', 5)),
+            url_normalizer=getattr(sliding_window, 'url_normalizer', None)
+            if os.environ.get('VERDICT_CACHE_BY_ROUTE', '0') == '1' else None
+        )
+        print("  ✓ Verdict cache enabled")
+    
     print("\n" + "="*60)
     print("  ALL MODELS INITIALIZED SUCCESSFULLY!")
     print(f"  Training samples: {len(fitur_training)}")
@@ -411,6 +505,7 @@ def health_check():
     ensemble_status = 'ready' if ensemble_model is not None and ensemble_model.is_fitted else 'not_initialized'
     shap_status = 'ready' if shap_explainer is not None else 'not_initialized'
     sliding_window_status = 'ready' if sliding_window is not None else 'not_initialized'
+    snapshot = window_snapshots.read() if window_snapshots is not None else None
     
     all_ready = all([
         legacy_status == 'ready',
@@ -428,7 +523,8 @@ def health_check():
             'shap_explainer': shap_status,
             'sliding_window': sliding_window_status
         },
-        'sliding_window_stats': sliding_window.get_stats() if sliding_window else None,
+        'sliding_window_stats': dict(snapshot.stats) if snapshot else None,
+        'snapshot_age': round(snapshot.age, 3) if snapshot else None,
         'timestamp': datetime.now().isoformat()
     })
 
@@ -476,10 +572,10 @@ def predict():
         fitur = preprocess_log_data(log_data)
         
         # Prediksi menggunakan model
-        prediction = model.predict(fitur)[0]
+        prediction = model_scorer.predict(fitur)[0]
         
         # Dapatkan skor anomali (semakin negatif = semakin anomali)
-        anomaly_score = model.decision_function(fitur)[0]
+        anomaly_score = model_scorer.decision_function(fitur)[0]
         
         # Hitung confidence (0-1)
         # Skor decision function berkisar dari -0.5 hingga 0.5
@@ -561,8 +657,8 @@ def predict_batch():
         for log_data in logs:
             try:
                 fitur = preprocess_log_data(log_data)
-                prediction = model.predict(fitur)[0]
-                anomaly_score = model.decision_function(fitur)[0]
+                prediction = model_scorer.predict(fitur)[0]
+                anomaly_score = model_scorer.decision_function(fitur)[0]
                 severity_score = calculate_severity_score(log_data, prediction, anomaly_score)
                 
                 prediction_label = 'normal' if prediction == 1 else 'anomaly'
@@ -710,7 +806,7 @@ def visualize_pca():
                 if 'prediction' in log_data:
                     pred = -1 if log_data['prediction'] == 'anomaly' else 1
                 else:
-                    pred = model.predict(fitur)[0]
+                    pred = model_scorer.predict(fitur)[0]
                 predictions.append(pred)
             except Exception as e:
                 print(f"[WARN] Gagal memproses log: {str(e)}")
@@ -870,6 +966,31 @@ def predict_ensemble():
                 'timestamp': datetime.now().isoformat()
             })
         
+        # IP yang sudah berulang kali HIGH/CRITICAL: lewati model, counter tetap jalan.
+        # Cache hanya berisi verdict; konteks temporal dan latency dihitung ulang
+        started = time.perf_counter()
+        cached = verdict_cache.lookup(log_data['ip_address'], log_data['url']) if verdict_cache else None
+        if cached is not None:
+            temporal_features = sliding_window.extract_temporal_features(log_data)
+            if history_store is not None:
+                history_store.record_threat(cached['threat_level'])
+            return jsonify({
+                'status': 'success',
+                'data': {
+                    **cached,
+                    'cached': True,
+                    'ensemble_latency_ms': round((time.perf_counter() - started) * 1000, 3),
+                    'temporal_context': temporal_features
+                },
+                'input_data': {
+                    'ip_address': log_data.get('ip_address'),
+                    'method': log_data.get('method'),
+                    'url': log_data.get('url'),
+                    'status_code': log_data.get('status_code')
+                },
+                'timestamp': datetime.now().isoformat()
+            })
+        
         # Preprocessing
         fitur = preprocess_log_data(log_data)
         
@@ -880,6 +1001,9 @@ def predict_ensemble():
         with model_lock:
             result = ensemble_model.predict(fitur)
         
+        if history_store is not None:
+            history_store.record_threat(result.threat_level.value)
+        
         # Map threat level ke severity score
         severity_map = {
             ThreatLevel.NORMAL: 0,
@@ -888,27 +1012,35 @@ def predict_ensemble():
             ThreatLevel.CRITICAL: 95
         }
         
+        # Verdict (yang boleh di-cache) terpisah dari data per request
+        verdict = {
+            'threat_level': result.threat_level.value,
+            'consensus_score': result.consensus_score,
+            'severity_score': severity_map.get(result.threat_level, 50),
+            'voting_breakdown': {
+                name: 'anomaly' if voted else 'normal'
+                for name, voted in result.voting_breakdown.items()
+            },
+            'individual_predictions': [
+                {
+                    'model': pred.model_name,
+                    'prediction': 'anomaly' if pred.prediction == -1 else 'normal',
+                    'confidence': pred.confidence,
+                    'score': round(pred.score, 4),
+                    'latency_ms': pred.latency_ms
+                }
+                for pred in result.individual_predictions
+            ],
+            'evaluation_path': result.path,
+            'explanation': result.explanation
+        }
+        
         # Format response
         response = {
             'status': 'success',
             'data': {
-                'threat_level': result.threat_level.value,
-                'consensus_score': result.consensus_score,
-                'severity_score': severity_map.get(result.threat_level, 50),
-                'voting_breakdown': {
-                    name: 'anomaly' if voted else 'normal'
-                    for name, voted in result.voting_breakdown.items()
-                },
-                'individual_predictions': [
-                    {
-                        'model': pred.model_name,
-                        'prediction': 'anomaly' if pred.prediction == -1 else 'normal',
-                        'confidence': pred.confidence,
-                        'score': round(pred.score, 4)
-                    }
-                    for pred in result.individual_predictions
-                ],
-                'explanation': result.explanation,
+                **verdict,
+                'ensemble_latency_ms': result.latency_ms,
                 'temporal_context': temporal_features
             },
             'input_data': {
@@ -920,6 +1052,9 @@ def predict_ensemble():
             'timestamp': datetime.now().isoformat()
         }
         
+        if verdict_cache is not None:
+            verdict_cache.record(log_data['ip_address'], log_data['url'], result.threat_level.value, verdict)
+        
         # Log dengan warna
         threat_icons = {
             'normal': '✅',
@@ -968,14 +1103,14 @@ def predict_explain():
         fitur = preprocess_log_data(log_data)
         
         # Prediksi dengan legacy model (untuk SHAP)
-        prediction = model.predict(fitur)[0]
+        prediction = model_scorer.predict(fitur)[0]
         
         # Generate SHAP explanation
         with model_lock:
             explanation = shap_explainer.generate_explanation(fitur, prediction, log_data)
         
         # Calculate severity
-        anomaly_score = model.decision_function(fitur)[0]
+        anomaly_score = model_scorer.decision_function(fitur)[0]
         severity_score = calculate_severity_score(log_data, prediction, anomaly_score)
         
         response = {
@@ -1064,6 +1199,8 @@ def submit_feedback():
         if data.get('add_to_whitelist') and data.get('ip_address'):
             feedback_storage['whitelist_ips'].add(data['ip_address'])
             print(f"✅ IP {data['ip_address']} ditambahkan ke whitelist")
+            if verdict_cache is not None:
+                verdict_cache.invalidate(data['ip_address'])
         
         print(f"📝 Feedback #{feedback_entry['id']}: {data['feedback_type']} | Log #{data['log_id']}")
         
@@ -1122,6 +1259,8 @@ def manage_whitelist():
             if data.get('ip_address'):
                 feedback_storage['whitelist_ips'].add(data['ip_address'])
                 print(f"✅ Whitelist ADD IP: {data['ip_address']}")
+                if verdict_cache is not None:
+                    verdict_cache.invalidate(data['ip_address'])
             if data.get('pattern'):
                 feedback_storage['whitelist_patterns'].append(data['pattern'])
                 print(f"✅ Whitelist ADD Pattern: {data['pattern']}")
@@ -1153,64 +1292,23 @@ def temporal_stats():
     Endpoint untuk mendapatkan statistik sliding window.
     Menyediakan data real-time untuk dashboard Temporal Behavioral Analysis.
     """
-    if sliding_window is None:
+    if sliding_window is None or window_snapshots is None:
         return jsonify({'status': 'error', 'error': 'Sliding window not initialized'}), 500
     
-    # Get basic stats dari sliding window
-    basic_stats = sliding_window.get_stats()
-    
-    # Hitung metrik lanjutan
-    logs_1min = sliding_window.get_logs_in_window('1min')
-    logs_5min = sliding_window.get_logs_in_window('5min')
-    
-    # Request per minute
-    req_per_min = len(logs_1min)
-    
-    # Error rate (4xx dan 5xx)
-    if logs_1min:
-        error_count = sum(1 for log in logs_1min if log.get('status_code', 200) >= 400)
-        error_rate = (error_count / len(logs_1min)) * 100
-    else:
-        error_rate = 0.0
-    
-    # Unique URLs
-    unique_urls = len(set(log.get('url', '/') for log in logs_1min))
-    
-    # Method Entropy
-    if logs_1min:
-        methods = [log.get('method', 'GET') for log in logs_1min]
-        method_counts = {}
-        for m in methods:
-            method_counts[m] = method_counts.get(m, 0) + 1
-        total = len(methods)
-        entropy = 0.0
-        for count in method_counts.values():
-            p = count / total
-            if p > 0:
-                entropy -= p * np.log2(p)
-        method_entropy = round(entropy, 2)
-    else:
-        method_entropy = 0.0
-    
-    # Average Response Time
-    if logs_1min:
-        response_times = [float(log.get('response_time', 0)) for log in logs_1min]
-        avg_response = round(np.mean(response_times), 1) if response_times else 0.0
-    else:
-        avg_response = 0.0
+    # Statistik & metrik dari snapshot terbitan terakhir (tanpa lock window)
+    snapshot = window_snapshots.read()
+    basic_stats = snapshot.stats
+    metrics_1min = snapshot.metrics['1min']
+    metrics_5min = snapshot.metrics['5min']
+    
+    req_per_min = metrics_1min['requests']
+    error_rate = metrics_1min['error_rate'] * 100
+    unique_urls = metrics_1min['unique_urls']
+    method_entropy = round(metrics_1min['method_entropy'], 2)
+    avg_response = round(metrics_1min['avg_response_time'], 1)
     
     # Burst Score (request per second tertinggi dalam 1 menit terakhir)
-    if logs_1min:
-        # Group by second
-        second_counts = {}
-        for log in logs_1min:
-            ts = log.get('timestamp')
-            if ts:
-                sec_key = ts.strftime('%Y-%m-%d %H:%M:%S') if hasattr(ts, 'strftime') else str(ts)[:19]
-                second_counts[sec_key] = second_counts.get(sec_key, 0) + 1
-        burst_score = max(second_counts.values()) if second_counts else 0.0
-    else:
-        burst_score = 0.0
+    burst_score = metrics_1min['max_rps']
     
     return jsonify({
         'status': 'success',
@@ -1220,14 +1318,83 @@ def temporal_stats():
             'logs_1min': basic_stats['logs_1min'],
             'logs_5min': basic_stats['logs_5min'],
             'logs_10min': basic_stats['logs_10min'],
+            'logs_by_window': {key: basic_stats.get(f'logs_{key}', 0) for key in sliding_window.windows},
             # Metrik untuk Dashboard
             'req_per_min': req_per_min,
             'error_rate': round(error_rate, 1),
             'unique_urls': unique_urls,
             'method_entropy': method_entropy,
             'avg_response': avg_response,
-            'burst_score': burst_score
+            'p50_response': round(metrics_1min['p50_response_time'], 1),
+            'p95_response': round(metrics_1min['p95_response_time'], 1),
+            'p99_response': round(metrics_1min['p99_response_time'], 1),
+            'burst_score': burst_score,
+            'error_rate_slope': round(metrics_5min['error_rate_slope'], 4)
         },
+        'snapshot_age': round(snapshot.age, 3),
+        'persistence': window_persistence.get_stats() if window_persistence is not None else None,
+        'timestamp': datetime.now().isoformat()
+    })
+
+
+@app.route('/temporal/top', methods=['GET'])
+def temporal_top():
+    """
+    Endpoint untuk mendapatkan top-K IP (heavy hitter) per window.
+    Query params: window (1min/5min/10min, default 1min), k (default 10, max 100).
+    """
+    if sliding_window is None:
+        return jsonify({'status': 'error', 'error': 'Sliding window not initialized'}), 500
+    
+    window_key = request.args.get('window', '1min')
+    if window_key not in sliding_window.windows:
+        return jsonify({'status': 'error', 'error': f'Window {window_key} tidak dikenal'}), 400
+    
+    try:
+        k = int(request.args.get('k', 10))
+    except ValueError:
+        return jsonify({'status': 'error', 'error': 'Parameter k harus berupa integer'}), 400
+    k = max(1, min(k, 100))
+    
+    get_top_ips = getattr(sliding_window, 'get_top_ips', None)
+    if get_top_ips is None:
+        return jsonify({
+            'status': 'error',
+            'error': f"Top-K tidak didukung storage '{sliding_window.storage}'"
+        }), 400
+    
+    return jsonify({
+        'status': 'success',
+        'window': window_key,
+        'k': k,
+        'top': get_top_ips(window_key, k),
+        'timestamp': datetime.now().isoformat()
+    })
+
+
+@app.route('/temporal/history', methods=['GET'])
+def temporal_history():
+    """
+    Endpoint untuk series riwayat (request, error rate, threat level, top IP)
+    siap pakai untuk grafik dashboard, tanpa query database.
+    Query params: resolution (1s/1min/1h/1d, default 1h), points (default 24).
+    """
+    if history_store is None:
+        return jsonify({'status': 'error', 'error': 'History store not initialized'}), 500
+    
+    resolution = request.args.get('resolution', '1h')
+    if resolution not in history_store.resolutions:
+        return jsonify({'status': 'error', 'error': f'Resolution {resolution} tidak dikenal'}), 400
+    
+    try:
+        points = int(request.args.get('points', 24))
+    except ValueError:
+        return jsonify({'status': 'error', 'error': 'Parameter points harus berupa integer'}), 400
+    points = max(1, min(points, history_store.max_points(resolution)))
+    
+    return jsonify({
+        'status': 'success',
+        'history': history_store.series(resolution, points),
         'timestamp': datetime.now().isoformat()
     })
 
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                LOG SENTINEL - TEMPORAL WINDOW BENCHMARK                       ║
+║          Mengukur throughput & lock contention Sliding Window                 ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Script ini menjalankan extract_temporal_features dari beberapa thread
+sekaligus untuk membandingkan TemporalSlidingWindow (satu lock) dengan
+ShardedSlidingWindow (lock per shard).
+
+Kolom µs melaporkan dua hal terpisah per request: total waktu
+extract_temporal_features, dan waktu menunggu lock window/shard saja
+(diukur dengan membungkus lock setiap shard).
+
+Catatan: pada CPython dengan GIL, kode Python murni tidak berjalan paralel.
+Peningkatan throughput mendekati linear hanya terjadi jika thread juga
+menghabiskan waktu di luar GIL (I/O, kode native), seperti pada worker
+Flask sungguhan.
+
+================================================================================
+Usage: python benchmark_temporal.py [--threads 1 2 4 8] [--requests 20000] [--shards 8]
+================================================================================
+"""
+
+import argparse
+import random
+import threading
+import time
+from typing import Dict, List
+
+from temporal_features import TemporalSlidingWindow, ShardedSlidingWindow
+
+
+def generate_logs(n: int, n_ips: int = 2000, seed: int = 42) -> List[Dict]:
+    """Membuat log sintetis dengan distribusi IP acak."""
+    rng = random.Random(seed)
+    methods = ['GET', 'GET', 'GET', 'POST', 'PUT', 'DELETE']
+    return [
+        {
+            'ip_address': f'10.{rng.randint(0, 7)}.{rng.randint(0, 255)}.{rng.randint(1, n_ips % 254 + 1)}',
+            'method': rng.choice(methods),
+            'url': f'/api/resource/{rng.randint(0, 500)}',
+            'status_code': rng.choice([200, 200, 200, 404, 500]),
+            'response_time': rng.uniform(10, 500),
+            'user_agent': 'Mozilla/5.0'
+        }
+        for _ in range(n)
+    ]
+
+
+class TimedLock:
+    """Pembungkus lock yang menjumlahkan waktu menunggu acquire."""
+    
+    def __init__(self, lock):
+        self._lock = lock
+        self.wait_seconds = 0.0
+    
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        start = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        # Ditambahkan setelah lock didapat; float += di bawah GIL cukup untuk benchmark
+        self.wait_seconds += time.perf_counter() - start
+        return acquired
+    
+    def release(self) -> None:
+        self._lock.release()
+    
+    def __enter__(self) -> 'TimedLock':
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+def instrument_locks(window) -> List[TimedLock]:
+    """Mengganti lock window (atau setiap shard) dengan TimedLock."""
+    locks = []
+    for shard in getattr(window, 'shards', [window]):
+        shard.lock = TimedLock(shard.lock)
+        locks.append(shard.lock)
+    return locks
+
+
+def run(window, logs: List[Dict], n_threads: int, io_wait: float) -> Dict:
+    """
+    Menjalankan ekstraksi fitur dari n_threads thread.
+    
+    Args:
+        window: Instance sliding window
+        logs: Log yang akan diproses (dibagi rata antar thread)
+        n_threads: Jumlah thread
+        io_wait: Simulasi waktu I/O per request (detik, di luar GIL)
+    
+    Returns:
+        Dictionary berisi throughput, rata-rata waktu ekstraksi dan
+        rata-rata waktu tunggu lock per request
+    """
+    chunks = [logs[i::n_threads] for i in range(n_threads)]
+    extract_time = [0.0] * n_threads
+    locks = instrument_locks(window)
+    
+    def worker(index: int) -> None:
+        for log in chunks[index]:
+            if io_wait:
+                time.sleep(io_wait)
+            start = time.perf_counter()
+            window.extract_temporal_features(dict(log))
+            extract_time[index] += time.perf_counter() - start
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    return {
+        'throughput': len(logs) / elapsed,
+        'avg_extract_us': sum(extract_time) / len(logs) * 1e6,
+        'avg_lock_wait_us': sum(lock.wait_seconds for lock in locks) / len(logs) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark lock contention Temporal Sliding Window')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--shards', type=int, default=8)
+    parser.add_argument('--io-wait-ms', type=float, default=0.0,
+                        help='Simulasi I/O per request (ms) di luar GIL')
+    args = parser.parse_args()
+    
+    logs = generate_logs(args.requests)
+    io_wait = args.io_wait_ms / 1000
+    
+    print(f"{'threads':>8} | {'single req/s':>12} | {'sharded req/s':>13} | "
+          f"{'extract µs (single/sharded)':>27} | {'lock wait µs (single/sharded)':>29}")
+    print('-' * 100)
+    for n_threads in args.threads:
+        single = run(TemporalSlidingWindow(window_size_minutes=10), logs, n_threads, io_wait)
+        sharded = run(ShardedSlidingWindow(window_size_minutes=10, shards=args.shards), logs, n_threads, io_wait)
+        print(f"{n_threads:>8} | {single['throughput']:>12.0f} | {sharded['throughput']:>13.0f} | "
+              f"{single['avg_extract_us']:>13.1f} / {sharded['avg_extract_us']:<11.1f} | "
+              f"{single['avg_lock_wait_us']:>14.1f} / {sharded['avg_lock_wait_us']:<12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -38,10 +38,15 @@ from sklearn.ensemble import IsolationForest
 from sklearn.svm import OneClassSVM
 from sklearn.neighbors import LocalOutlierFactor
 from typing import Dict, List, Tuple, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 import joblib
 import os
+import threading
+import time
+
+from flat_isolation_forest import FlatIsolationForest
 
 
 class ThreatLevel(Enum):
@@ -59,6 +64,7 @@ class ModelPrediction:
     prediction: int  # 1 = normal, -1 = anomaly
     score: float
     confidence: float
+    latency_ms: float = 0.0  # Waktu scoring model ini
 
 
 @dataclass
@@ -69,6 +75,41 @@ class EnsembleResult:
     individual_predictions: List[ModelPrediction]
     voting_breakdown: Dict[str, bool]
     explanation: str
+    latency_ms: float = 0.0  # Waktu evaluasi semua model (wall clock)
+    path: str = 'full'       # 'full' atau 'cascade' (OCSVM/LOF dilewati)
+
+
+# Kode threat level pada hasil batch: indeks = posisi level pada ThreatLevel
+THREAT_LEVEL_CODES: Tuple[ThreatLevel, ...] = tuple(ThreatLevel)
+
+
+@dataclass
+class EnsembleBatchResult:
+    """
+    Data class kolumnar untuk hasil ensemble voting N baris.
+    Kolom per model mengikuti urutan model_names.
+    """
+    model_names: List[str]
+    predictions: np.ndarray       # (N, n_models), 1 = normal, -1 = anomaly
+    scores: np.ndarray            # (N, n_models)
+    confidences: np.ndarray       # (N, n_models)
+    threat_codes: np.ndarray      # (N,), indeks ke THREAT_LEVEL_CODES
+    consensus_scores: np.ndarray  # (N,)
+    # (N,) True jika baris diputus mode cascade; kolom model yang dilewati
+    # berisi prediksi Isolation Forest dengan score/confidence NaN
+    cascaded: Optional[np.ndarray] = None
+    
+    def __len__(self) -> int:
+        return len(self.threat_codes)
+    
+    @property
+    def anomaly_votes(self) -> np.ndarray:
+        """Jumlah model yang vote anomaly per baris."""
+        return (self.predictions == -1).sum(axis=1)
+    
+    def threat_levels(self) -> List[ThreatLevel]:
+        """Threat level per baris sebagai enum."""
+        return [THREAT_LEVEL_CODES[code] for code in self.threat_codes]
 
 
 class EnsembleVotingClassifier:
@@ -84,13 +125,24 @@ class EnsembleVotingClassifier:
     - Mengurangi bias algoritma tunggal
     - Meningkatkan robustness terhadap noise
     - Memberikan confidence level melalui voting
+    
+    Mode cascade: Isolation Forest dievaluasi lebih dulu; OCSVM dan LOF
+    hanya dijalankan jika score IF berada di band ketidakpastian. Di luar
+    band, verdict dipetakan seolah ketiga model sepakat dengan IF.
     """
     
+    CASCADE_MODEL = 'isolation_forest'
+    DEFAULT_CASCADE_BAND = (-0.05, 0.05)
+    
     def __init__(
         self,
         contamination: float = 0.1,
         random_state: int = 42,
-        n_jobs: int = -1
+        n_jobs: int = -1,
+        parallel: bool = False,
+        cascade: bool = False,
+        cascade_band: Tuple[float, float] = DEFAULT_CASCADE_BAND,
+        compile_forest: bool = True
     ):
         """
         Inisialisasi Ensemble Voting Classifier.
@@ -99,10 +151,34 @@ class EnsembleVotingClassifier:
             contamination: Proporsi outlier yang diharapkan (0.0 - 0.5)
             random_state: Random seed untuk reproducibility
             n_jobs: Jumlah CPU cores (-1 = semua)
+            parallel: Evaluasi ketiga model secara bersamaan di thread pool
+                persisten pada predict(); scoring sklearn sebagian besar
+                berjalan di kode native tanpa GIL, sehingga latency
+                mendekati model paling lambat, bukan jumlah ketiganya
+            cascade: Jalankan OCSVM dan LOF hanya untuk baris yang score
+                Isolation Forest-nya berada di dalam cascade_band
+            cascade_band: (batas bawah, batas atas) decision score IF yang
+                dianggap belum pasti; harus mengapit 0 (threshold IF)
+            compile_forest: Score Isolation Forest lewat FlatIsolationForest
+                (hasil identik, tanpa overhead scikit-learn per pemanggilan)
         """
+        low, high = cascade_band
+        if not low <= 0 <= high:
+            raise ValueError("cascade_band must satisfy low <= 0 <= high")
+        
         self.contamination = contamination
         self.random_state = random_state
         self.n_jobs = n_jobs
+        self.parallel = parallel
+        self.cascade = cascade
+        self.cascade_band = (float(low), float(high))
+        self.compile_forest = compile_forest
+        # Scorer ter-compile per model (dibangun ulang setelah fit/load)
+        self._compiled: Dict[str, Any] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # True setelah close(): evaluasi kembali sekuensial, pool tidak dibuat ulang
+        self._closed = False
         
         # Inisialisasi models
         self.models: Dict[str, Any] = {}
@@ -172,6 +248,7 @@ class EnsembleVotingClassifier:
         print("[INFO] Training Local Outlier Factor...")
         self.models['lof'].fit(X)
         
+        self._compile_models()
         self.is_fitted = True
         print("[INFO] All models trained successfully!")
         
@@ -192,20 +269,14 @@ class EnsembleVotingClassifier:
         Returns:
             ModelPrediction object
         """
-        model = self.models.get(model_name)
+        model = self._compiled.get(model_name, self.models.get(model_name))
         if model is None:
             raise ValueError(f"Unknown model: {model_name}")
         
-        # Prediksi
-        prediction = model.predict(X)[0]
-        
-        # Score (decision function atau negative outlier factor)
-        if hasattr(model, 'decision_function'):
-            score = model.decision_function(X)[0]
-        elif hasattr(model, 'score_samples'):
-            score = model.score_samples(X)[0]
-        else:
-            score = 0.0
+        started = time.perf_counter()
+        predictions, scores = self._score_model(model, X)
+        latency_ms = (time.perf_counter() - started) * 1000
+        prediction, score = predictions[0], scores[0]
         
         # Hitung confidence dari score
         # Score semakin negatif = semakin yakin anomaly
@@ -216,9 +287,46 @@ class EnsembleVotingClassifier:
             model_name=model_name,
             prediction=int(prediction),
             score=float(score),
-            confidence=float(confidence)
+            confidence=float(confidence),
+            latency_ms=round(latency_ms, 3)
         )
     
+    def _compile_models(self) -> None:
+        """Compile Isolation Forest yang sudah dilatih menjadi FlatIsolationForest."""
+        self._compiled = {}
+        if not self.compile_forest:
+            return
+        for name, model in self.models.items():
+            if isinstance(model, IsolationForest):
+                self._compiled[name] = FlatIsolationForest(model)
+    
+    def _scorer(self, model_name: str) -> Any:
+        """Objek yang dipakai untuk scoring model (versi compile jika ada)."""
+        return self._compiled.get(model_name, self.models[model_name])
+    
+    @staticmethod
+    def _score_model(model: Any, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Prediksi dan score satu model untuk semua baris X.
+        
+        Jika model punya decision_function, prediksi diturunkan dari score
+        dengan aturan yang sama seperti model.predict (IF/LOF: score < 0,
+        OCSVM/libsvm: score <= 0 berarti anomaly), sehingga cukup satu
+        pemanggilan scoring.
+        
+        Returns:
+            Tuple (prediksi 1/-1, score)
+        """
+        if hasattr(model, 'decision_function'):
+            scores = np.asarray(model.decision_function(X), dtype=np.float64)
+            anomaly = scores <= 0 if isinstance(model, OneClassSVM) else scores < 0
+            return np.where(anomaly, -1, 1), scores
+        
+        predictions = np.asarray(model.predict(X))
+        if hasattr(model, 'score_samples'):
+            return predictions, np.asarray(model.score_samples(X), dtype=np.float64)
+        return predictions, np.zeros(len(predictions))
+    
     def _score_to_confidence(self, score: float) -> float:
         """
         Mengkonversi score ke confidence level (0-1).
@@ -251,14 +359,22 @@ class EnsembleVotingClassifier:
         if X.ndim == 1:
             X = X.reshape(1, -1)
         
-        # Dapatkan prediksi dari setiap model
-        predictions: List[ModelPrediction] = []
-        voting_breakdown: Dict[str, bool] = {}
+        # Dapatkan prediksi dari setiap model (urutan hasil tetap urutan models)
+        started = time.perf_counter()
+        if self.cascade:
+            first = self.predict_single_model(self.CASCADE_MODEL, X)
+            if self._is_clear_cut(first.score):
+                return self._cascade_result(first, (time.perf_counter() - started) * 1000)
+            remaining = [name for name in self.models.keys() if name != self.CASCADE_MODEL]
+            predictions: List[ModelPrediction] = [first] + self._predict_models(remaining, X)
+        else:
+            predictions = self._predict_models(list(self.models.keys()), X)
+        latency_ms = (time.perf_counter() - started) * 1000
         
-        for model_name in self.models.keys():
-            pred = self.predict_single_model(model_name, X)
-            predictions.append(pred)
-            voting_breakdown[model_name] = (pred.prediction == -1)  # True if anomaly
+        voting_breakdown: Dict[str, bool] = {
+            pred.model_name: (pred.prediction == -1)  # True if anomaly
+            for pred in predictions
+        }
         
         # Hitung consensus
         anomaly_votes = sum(1 for v in voting_breakdown.values() if v)
@@ -283,9 +399,178 @@ class EnsembleVotingClassifier:
             consensus_score=round(consensus_score, 4),
             individual_predictions=predictions,
             voting_breakdown=voting_breakdown,
-            explanation=explanation
+            explanation=explanation,
+            latency_ms=round(latency_ms, 3)
+        )
+    
+    def _predict_models(self, model_names: List[str], X: np.ndarray) -> List[ModelPrediction]:
+        """Prediksi beberapa model, bersamaan di thread pool jika parallel."""
+        if self.parallel and len(model_names) > 1 and not self._closed:
+            executor = self._get_executor()
+            try:
+                futures = [executor.submit(self.predict_single_model, name, X) for name in model_names]
+            except RuntimeError:
+                # Pool ditutup saat request ini berjalan (ensemble diganti)
+                return [self.predict_single_model(name, X) for name in model_names]
+            return [future.result() for future in futures]
+        return [self.predict_single_model(name, X) for name in model_names]
+    
+    def _is_clear_cut(self, score):
+        """True (per elemen) jika score IF di luar band ketidakpastian."""
+        low, high = self.cascade_band
+        return (score < low) | (score > high)
+    
+    def _cascade_result(self, first: ModelPrediction, latency_ms: float) -> EnsembleResult:
+        """
+        Hasil untuk baris yang diputus oleh Isolation Forest saja.
+        
+        Threat level dan consensus dihitung seolah semua model sepakat
+        dengan IF (NORMAL atau CRITICAL), sama seperti predict_batch.
+        """
+        is_anomaly = first.prediction == -1
+        threat_level = self._determine_threat_level(len(self.models) if is_anomaly else 0, len(self.models))
+        consensus_score = self._calculate_consensus_score([first], 1 if is_anomaly else 0)
+        
+        if is_anomaly:
+            explanation = (
+                "KRITIS: Isolation Forest menilai request ini jelas ANOMALY (score di bawah "
+                "band ketidakpastian), sehingga OCSVM dan LOF dilewati (mode cascade). "
+                "Diperlukan tindakan segera."
+            )
+        else:
+            explanation = (
+                "Isolation Forest menilai request ini jelas NORMAL (score di atas band "
+                "ketidakpastian), sehingga OCSVM dan LOF dilewati (mode cascade)."
+            )
+        
+        return EnsembleResult(
+            threat_level=threat_level,
+            consensus_score=round(consensus_score, 4),
+            individual_predictions=[first],
+            voting_breakdown={first.model_name: is_anomaly},
+            explanation=explanation,
+            latency_ms=round(latency_ms, 3),
+            path='cascade'
         )
     
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Thread pool persisten untuk evaluasi paralel (dibuat sekali)."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=len(self.models),
+                        thread_name_prefix='ensemble-model'
+                    )
+        return self._executor
+    
+    def close(self, wait: bool = True) -> None:
+        """
+        Menghentikan thread pool evaluasi paralel (jika ada).
+        
+        Args:
+            wait: False = tidak menunggu prediksi yang sedang berjalan di pool
+        """
+        with self._executor_lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+    
+    def predict_batch(self, X: np.ndarray, deduplicate: bool = True) -> EnsembleBatchResult:
+        """
+        Prediksi ensemble untuk N baris sekaligus dengan satu pemanggilan
+        scoring per model. Nilai per baris sama dengan predict().
+        
+        Args:
+            X: Data untuk diprediksi (shape: N x n_features)
+            deduplicate: Baris identik (misal banjir request yang sama)
+                di-score sekali lewat np.unique
+        
+        Returns:
+            EnsembleBatchResult kolumnar
+        """
+        if not self.is_fitted:
+            raise RuntimeError("Ensemble must be fitted before prediction")
+        
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        
+        model_names = list(self.models.keys())
+        if not len(X):
+            empty = np.zeros((0, len(model_names)))
+            return EnsembleBatchResult(model_names, empty.astype(np.int64), empty, empty.copy(),
+                                       np.zeros(0, dtype=np.int8), np.zeros(0),
+                                       np.zeros(0, dtype=bool) if self.cascade else None)
+        
+        if deduplicate:
+            unique_rows, inverse = np.unique(X, axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+        else:
+            unique_rows, inverse = X, None
+        
+        predictions = np.empty((len(unique_rows), len(model_names)), dtype=np.int64)
+        scores = np.empty((len(unique_rows), len(model_names)), dtype=np.float64)
+        cascaded = None
+        if self.cascade:
+            first = model_names.index(self.CASCADE_MODEL)
+            predictions[:, first], scores[:, first] = self._score_model(self._scorer(self.CASCADE_MODEL), unique_rows)
+            cascaded = self._is_clear_cut(scores[:, first])
+            uncertain = ~cascaded
+            for column, model_name in enumerate(model_names):
+                if column == first:
+                    continue
+                predictions[:, column], scores[:, column] = predictions[:, first], np.nan
+                if uncertain.any():
+                    predictions[uncertain, column], scores[uncertain, column] = self._score_model(
+                        self._scorer(model_name), unique_rows[uncertain]
+                    )
+        else:
+            for column, model_name in enumerate(model_names):
+                predictions[:, column], scores[:, column] = self._score_model(self._scorer(model_name), unique_rows)
+        
+        # Sama dengan _score_to_confidence, per elemen
+        with np.errstate(over='ignore'):
+            confidences = np.round(np.clip(1 / (1 + np.exp(-scores * 5)), 0.0, 1.0), 4)
+        
+        # Sama dengan _determine_threat_level dan _calculate_consensus_score;
+        # model yang dilewati cascade ikut vote tetapi tanpa confidence
+        anomaly = predictions == -1
+        anomaly_votes = anomaly.sum(axis=1)
+        threat_codes = self._threat_code_table(len(model_names))[anomaly_votes]
+        scored_anomaly = anomaly & ~np.isnan(confidences)
+        anomaly_confidence = (
+            np.where(scored_anomaly, confidences, 0.0).sum(axis=1) / np.maximum(scored_anomaly.sum(axis=1), 1)
+        )
+        consensus_scores = np.round(anomaly_votes / len(model_names) * 0.6 + anomaly_confidence * 0.4, 4)
+        
+        if inverse is not None:
+            predictions, scores, confidences = predictions[inverse], scores[inverse], confidences[inverse]
+            threat_codes, consensus_scores = threat_codes[inverse], consensus_scores[inverse]
+            if cascaded is not None:
+                cascaded = cascaded[inverse]
+        
+        return EnsembleBatchResult(
+            model_names=model_names,
+            predictions=predictions,
+            scores=scores,
+            confidences=confidences,
+            threat_codes=threat_codes,
+            consensus_scores=consensus_scores,
+            cascaded=cascaded
+        )
+    
+    def _threat_code_table(self, n_models: int) -> np.ndarray:
+        """
+        Tabel jumlah vote anomaly -> kode threat level (indeks THREAT_LEVEL_CODES),
+        dibangun dari _determine_threat_level untuk 0..n_models vote.
+        """
+        return np.array([
+            THREAT_LEVEL_CODES.index(self._determine_threat_level(votes, n_models))
+            for votes in range(n_models + 1)
+        ], dtype=np.int8)
+    
     def _determine_threat_level(
         self, 
         anomaly_votes: int, 
@@ -428,6 +713,10 @@ class EnsembleVotingClassifier:
             'models': list(self.models.keys()),
             'contamination': self.contamination,
             'is_fitted': self.is_fitted,
+            'parallel': self.parallel,
+            'cascade': self.cascade,
+            'cascade_band': list(self.cascade_band),
+            'compiled_models': list(self._compiled.keys()),
             'voting_strategy': 'majority_vote',
             'threat_levels': [level.value for level in ThreatLevel]
         }
@@ -462,6 +751,7 @@ class EnsembleVotingClassifier:
             if os.path.exists(path):
                 self.models[name] = joblib.load(path)
         
+        self._compile_models()
         self.is_fitted = True
         print(f"[INFO] Ensemble loaded from {directory}")
         
@@ -470,7 +760,11 @@ class EnsembleVotingClassifier:
 
 def create_ensemble_classifier(
     contamination: float = 0.1,
-    random_state: int = 42
+    random_state: int = 42,
+    parallel: bool = False,
+    cascade: bool = False,
+    cascade_band: Tuple[float, float] = EnsembleVotingClassifier.DEFAULT_CASCADE_BAND,
+    compile_forest: bool = True
 ) -> EnsembleVotingClassifier:
     """
     Factory function untuk membuat EnsembleVotingClassifier.
@@ -478,13 +772,21 @@ def create_ensemble_classifier(
     Args:
         contamination: Proporsi outlier yang diharapkan
         random_state: Random seed
+        parallel: Evaluasi model secara bersamaan pada predict()
+        cascade: Jalankan OCSVM/LOF hanya untuk score IF di cascade_band
+        cascade_band: Band ketidakpastian decision score Isolation Forest
+        compile_forest: Score Isolation Forest lewat FlatIsolationForest
     
     Returns:
         EnsembleVotingClassifier instance
     """
     return EnsembleVotingClassifier(
         contamination=contamination,
-        random_state=random_state
+        random_state=random_state,
+        parallel=parallel,
+        cascade=cascade,
+        cascade_band=cascade_band,
+        compile_forest=compile_forest
     )
 
 
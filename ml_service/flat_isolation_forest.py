@@ -0,0 +1,193 @@
+"""
+========================================
+FLAT ISOLATION FOREST MODULE
+Inferensi Isolation Forest dari Array NumPy Datar
+========================================
+
+Scoring IsolationForest milik scikit-learn untuk satu request membayar
+validasi input, dispatch joblib dan iterasi Python per pohon (100 pohon),
+sehingga overhead jauh lebih besar daripada traversal pohonnya sendiri.
+Modul ini meng-compile forest yang sudah dilatih menjadi array datar:
+
+  - feature, threshold, anak kiri/kanan untuk seluruh node semua pohon
+    (indeks feature sudah dipetakan ke kolom X asli)
+  - nilai leaf = kedalaman leaf + koreksi average path length, dihitung
+    persis seperti scikit-learn
+
+Traversal berjalan serentak untuk semua (baris x pohon) selama max_depth
+langkah, lalu kedalaman dijumlahkan berurutan per pohon seperti
+scikit-learn, sehingga hasil score_samples/decision_function/predict
+identik bit-per-bit dengan model aslinya.
+
+Untuk batch besar, loop Cython tree.apply milik scikit-learn lebih cepat
+daripada gather NumPy, sehingga batch di atas max_flat_rows di-score oleh
+model aslinya; hasilnya tetap identik.
+
+========================================
+Lead Researcher & Developer (Journal-Grade Overhaul):
+  MUHAMMAD AKBAR HADI PRATAMA
+  GitHub: @el-pablos
+  Email: yeteprem.end23juni@gmail.com
+
+Original Contributors / Legacy Team:
+  - Jeremy Christo Emmanuelle Panjaitan (237006516084)
+  - Farrel Alfaridzi (237006516028)
+  - Chosmas Laurens Rumngewur (217006516074)
+========================================
+"""
+
+import numpy as np
+from sklearn.ensemble import IsolationForest
+
+
+def _average_path_length(n_samples_leaf: np.ndarray) -> np.ndarray:
+    """
+    Average path length pohon isolasi dengan n sampel (rumus yang sama
+    dengan scikit-learn, agar hasilnya identik).
+    """
+    n_samples_leaf = np.asarray(n_samples_leaf, dtype=np.float64)
+    average_path_length = np.zeros(n_samples_leaf.shape)
+    
+    mask_1 = n_samples_leaf <= 1
+    mask_2 = n_samples_leaf == 2
+    not_mask = ~np.logical_or(mask_1, mask_2)
+    
+    average_path_length[mask_2] = 1.0
+    average_path_length[not_mask] = (
+        2.0 * (np.log(n_samples_leaf[not_mask] - 1.0) + np.euler_gamma)
+        - 2.0 * (n_samples_leaf[not_mask] - 1.0) / n_samples_leaf[not_mask]
+    )
+    return average_path_length
+
+
+def _node_depths(children_left: np.ndarray, children_right: np.ndarray) -> np.ndarray:
+    """Kedalaman setiap node (root = 1), seperti tree_.compute_node_depths()."""
+    depths = np.zeros(len(children_left), dtype=np.float64)
+    depths[0] = 1.0
+    # Di tree scikit-learn indeks anak selalu lebih besar dari induknya
+    for node in range(len(children_left)):
+        if children_left[node] != -1:
+            depths[children_left[node]] = depths[node] + 1.0
+            depths[children_right[node]] = depths[node] + 1.0
+    return depths
+
+
+class FlatIsolationForest:
+    """
+    Isolation Forest ter-compile untuk scoring cepat.
+    
+    Antarmuka scoring sama dengan IsolationForest, jadi bisa dipakai di
+    mana pun model aslinya di-score:
+        scorer = FlatIsolationForest(model)
+        scorer.predict(X), scorer.decision_function(X), scorer.score_samples(X)
+    """
+    
+    def __init__(self, model: IsolationForest, max_flat_rows: int = 512):
+        """
+        Compile IsolationForest yang sudah dilatih.
+        
+        Args:
+            model: IsolationForest scikit-learn yang sudah di-fit
+            max_flat_rows: Batch lebih besar dari ini di-score oleh model
+                scikit-learn (titik impas sekitar 700 baris untuk 100 pohon)
+        """
+        if not hasattr(model, 'estimators_'):
+            raise RuntimeError("IsolationForest must be fitted before compiling")
+        if max_flat_rows < 1:
+            raise ValueError("max_flat_rows must be >= 1")
+        
+        self.model = model
+        self.max_flat_rows = max_flat_rows
+        self.offset_ = model.offset_
+        self.n_features_in_ = model.n_features_in_
+        self.n_estimators = len(model.estimators_)
+        subsample_features = model._max_features != model.n_features_in_
+        
+        features, thresholds, children, leaf_values, roots = [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator, estimator_features in zip(model.estimators_, model.estimators_features_):
+            tree = estimator.tree_
+            left = tree.children_left.astype(np.int64)
+            right = tree.children_right.astype(np.int64)
+            is_leaf = left == -1
+            node_ids = np.arange(tree.node_count, dtype=np.int64)
+            
+            # Leaf menunjuk dirinya sendiri sehingga traversal cukup diulang
+            # max_depth kali tanpa percabangan
+            feature = np.where(is_leaf, 0, tree.feature).astype(np.int64)
+            if subsample_features:
+                feature = np.asarray(estimator_features, dtype=np.int64)[feature]
+            
+            depths = _node_depths(left, right)
+            leaf_value = depths + _average_path_length(tree.n_node_samples) - 1.0
+            
+            features.append(feature)
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            # children[2 * node] = kiri, children[2 * node + 1] = kanan
+            children.append(np.column_stack([
+                np.where(is_leaf, node_ids, left) + offset,
+                np.where(is_leaf, node_ids, right) + offset
+            ]).ravel())
+            leaf_values.append(np.where(is_leaf, leaf_value, 0.0))
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, int(depths.max()) - 1)
+        
+        self.feature = np.concatenate(features).astype(np.int32)
+        self.threshold = np.concatenate(thresholds)
+        self.children = np.concatenate(children).astype(np.int32)
+        self.leaf_value = np.concatenate(leaf_values)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.max_depth = max_depth
+        self.denominator = self.n_estimators * _average_path_length(np.array([model._max_samples]))[0]
+    
+    def _check_input(self, X) -> np.ndarray:
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X has {X.shape[-1]} features, but FlatIsolationForest expects {self.n_features_in_}"
+            )
+        # Pohon scikit-learn membandingkan input sebagai float32
+        return X.astype(np.float32)
+    
+    def _depths(self, X: np.ndarray) -> np.ndarray:
+        """Jumlah path length semua pohon per baris."""
+        flat_X = X.ravel()
+        row_offsets = (np.arange(len(X), dtype=np.int32) * X.shape[1])[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), self.n_estimators))
+        for _ in range(self.max_depth):
+            values = flat_X[row_offsets + self.feature[nodes]]
+            nodes = self.children[2 * nodes + (values > self.threshold[nodes])]
+        # cumsum menjumlah berurutan per pohon, sama seperti scikit-learn
+        return np.cumsum(self.leaf_value[nodes], axis=1)[:, -1]
+    
+    def score_samples(self, X) -> np.ndarray:
+        """
+        Kebalikan anomaly score (semakin kecil = semakin anomali),
+        identik dengan IsolationForest.score_samples.
+        """
+        X = self._check_input(X)
+        if len(X) > self.max_flat_rows or np.isnan(X).any():
+            # Batch besar lebih cepat di Cython; routing nilai hilang
+            # mengikuti aturan tree scikit-learn
+            return self.model.score_samples(X)
+        
+        depths = self._depths(X)
+        if self.denominator == 0:
+            # Satu sampel training: scikit-learn menetapkan score 1
+            return -np.full(len(X), 0.5)
+        return -(2 ** -(depths / self.denominator))
+    
+    def decision_function(self, X) -> np.ndarray:
+        """Score dengan threshold 0 (negatif = anomaly)."""
+        return self.score_samples(X) - self.offset_
+    
+    def predict(self, X) -> np.ndarray:
+        """Prediksi 1 (normal) atau -1 (anomaly)."""
+        decision = self.decision_function(X)
+        is_inlier = np.ones_like(decision, dtype=int)
+        is_inlier[decision < 0] = -1
+        return is_inlier
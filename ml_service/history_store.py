@@ -0,0 +1,361 @@
+"""
+========================================
+HISTORY STORE MODULE
+Round-Robin History Multi-Resolusi untuk Grafik Dashboard
+========================================
+
+Sliding window hanya mengingat 10 menit terakhir, sedangkan grafik
+dashboard (misalnya jumlah request per jam selama 24 jam) selama ini
+diambil dari database pada setiap page load. Modul ini menyimpan riwayat
+ringkas ala RRD (round-robin database): setiap resolusi punya ring
+berukuran tetap, sehingga memori konstan berapa pun lamanya service
+berjalan.
+
+    1s    x 3600  ->  1 jam terakhir
+    1min  x 1440  ->  24 jam terakhir
+    1h    x 720   ->  30 hari terakhir
+    1d    x 365   ->  1 tahun terakhir
+
+Setiap slot menyimpan jumlah request, error, total response time, jumlah
+verdict per threat level, dan (kecuali resolusi 1s) counter top-IP
+Misra-Gries berukuran tetap. Slot lama di-reset secara lazy saat ditimpa
+bucket baru, dan series untuk grafik dibaca dalam O(points).
+
+Setiap shard window menulis ke ring miliknya sendiri (lane) dengan lock
+sendiri, sehingga pencatatan history tidak menyerialkan shard; series
+menjumlahkan semua lane saat dibaca.
+
+========================================
+Lead Researcher & Developer (Journal-Grade Overhaul):
+  MUHAMMAD AKBAR HADI PRATAMA
+  GitHub: @el-pablos
+  Email: yeteprem.end23juni@gmail.com
+
+Original Contributors / Legacy Team:
+  - Jeremy Christo Emmanuelle Panjaitan (237006516084)
+  - Farrel Alfaridzi (237006516028)
+  - Chosmas Laurens Rumngewur (217006516074)
+========================================
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Nama resolusi -> (lebar bucket dalam detik, jumlah slot ring)
+HISTORY_RESOLUTIONS: Dict[str, Tuple[int, int]] = {
+    '1s': (1, 3600),
+    '1min': (60, 1440),
+    '1h': (3600, 720),
+    '1d': (86400, 365),
+}
+
+# Sama dengan nilai ensemble_voting.ThreatLevel
+THREAT_LEVELS = ('normal', 'suspicious', 'high', 'critical')
+
+# Resolusi 1s terlalu rapat untuk counter IP per slot
+TOP_IP_RESOLUTIONS = ('1min', '1h', '1d')
+
+
+class _HistoryRing:
+    """
+    Satu ring RRD: `points` slot selebar `step` detik.
+    
+    Slot untuk bucket b adalah b % points; label slot menyimpan bucket yang
+    sedang menempatinya sehingga slot kedaluwarsa dikenali tanpa sweep.
+    Counter disimpan di list Python karena penulisan per log bersifat skalar
+    (indexing NumPy per elemen jauh lebih lambat); NumPy dipakai saat series
+    dibaca.
+    """
+    
+    def __init__(self, step: int, points: int, top_k: int = 0):
+        self.step = step
+        self.points = points
+        self.top_k = top_k
+        self._labels = [-1] * points
+        self._requests = [0] * points
+        self._errors = [0] * points
+        self._response_time_sums = [0.0] * points
+        self._threats = [[0] * len(THREAT_LEVELS) for _ in range(points)]
+        # Counter Misra-Gries per slot (kapasitas 2 * top_k)
+        self._ip_counts: Optional[List[Optional[Dict[str, int]]]] = [None] * points if top_k else None
+    
+    def _slot(self, timestamp: float) -> Optional[int]:
+        """Slot untuk timestamp, di-reset jika masih berisi bucket lama."""
+        bucket = int(timestamp // self.step)
+        slot = bucket % self.points
+        label = self._labels[slot]
+        if label != bucket:
+            if label > bucket:
+                # Event lebih tua dari isi ring: sudah di luar horizon
+                return None
+            self._labels[slot] = bucket
+            self._requests[slot] = 0
+            self._errors[slot] = 0
+            self._response_time_sums[slot] = 0.0
+            self._threats[slot] = [0] * len(THREAT_LEVELS)
+            if self._ip_counts is not None:
+                self._ip_counts[slot] = None
+        return slot
+    
+    def add(self, timestamp: float, ip: Optional[str], is_error: bool, response_time: float) -> None:
+        slot = self._slot(timestamp)
+        if slot is None:
+            return
+        self._requests[slot] += 1
+        self._errors[slot] += is_error
+        self._response_time_sums[slot] += response_time
+        if self._ip_counts is not None and ip is not None:
+            counts = self._ip_counts[slot]
+            if counts is None:
+                counts = self._ip_counts[slot] = {}
+            if ip in counts:
+                counts[ip] += 1
+            elif len(counts) < 2 * self.top_k:
+                counts[ip] = 1
+            else:
+                # Misra-Gries: kurangi semua counter, buang yang habis
+                for key in list(counts):
+                    counts[key] -= 1
+                    if not counts[key]:
+                        del counts[key]
+    
+    def add_threat(self, timestamp: float, level_index: int) -> None:
+        slot = self._slot(timestamp)
+        if slot is not None:
+            self._threats[slot][level_index] += 1
+    
+    def accumulate(self, first: int, totals: Dict[str, np.ndarray],
+                   ip_totals: Optional[Dict[str, int]]) -> None:
+        """
+        Menjumlahkan bucket [first, first + len(totals['requests'])) ke totals
+        (dan counter IP ke ip_totals jika tidak None).
+        """
+        points = len(totals['requests'])
+        slots = [
+            bucket % self.points for bucket in range(first, first + points)
+            if self._labels[bucket % self.points] == bucket
+        ]
+        if not slots:
+            return
+        positions = np.array([self._labels[slot] for slot in slots], dtype=np.int64) - first
+        totals['requests'][positions] += [self._requests[slot] for slot in slots]
+        totals['errors'][positions] += [self._errors[slot] for slot in slots]
+        totals['response_time_sums'][positions] += [self._response_time_sums[slot] for slot in slots]
+        totals['threats'][positions] += [self._threats[slot] for slot in slots]
+        if ip_totals is not None and self._ip_counts is not None:
+            # Gabungan ringkasan Misra-Gries tetap ringkasan yang valid
+            for slot in slots:
+                counts = self._ip_counts[slot]
+                if counts:
+                    for ip, count in counts.items():
+                        ip_totals[ip] = ip_totals.get(ip, 0) + count
+    
+    def filled(self) -> int:
+        return sum(1 for label in self._labels if label >= 0)
+    
+    def clear(self) -> None:
+        self._labels = [-1] * self.points
+        if self._ip_counts is not None:
+            self._ip_counts = [None] * self.points
+
+
+class _HistoryLane:
+    """Ring semua resolusi milik satu writer (satu shard), dengan lock sendiri."""
+    
+    def __init__(self, resolutions: Dict[str, Tuple[int, int]], top_k: int):
+        self.rings: Dict[str, _HistoryRing] = {
+            name: _HistoryRing(step, points, top_k if name in TOP_IP_RESOLUTIONS else 0)
+            for name, (step, points) in resolutions.items()
+        }
+        self.lock = threading.Lock()
+        self.recorded_logs = 0
+    
+    def record(self, timestamp: float, ip: Optional[str], is_error: bool, response_time: float) -> None:
+        """Mencatat satu log (lihat RoundRobinHistory.record)."""
+        with self.lock:
+            for ring in self.rings.values():
+                ring.add(timestamp, ip, is_error, response_time)
+            self.recorded_logs += 1
+
+
+class RoundRobinHistory:
+    """
+    Riwayat request & verdict multi-resolusi dengan memori tetap.
+    
+    Pemakaian:
+        history = RoundRobinHistory()
+        history.attach(sliding_window)      # setiap add_log ikut tercatat
+        history.record_threat('high')       # verdict dari ensemble
+        history.series('1h', 24)            # data grafik 24 jam terakhir
+    """
+    
+    def __init__(self, top_k: int = 10, resolutions: Optional[Dict[str, Tuple[int, int]]] = None):
+        """
+        Inisialisasi history store.
+        
+        Args:
+            top_k: Jumlah IP teratas per series (0 = tanpa counter IP)
+            resolutions: Nama resolusi -> (detik per bucket, jumlah slot)
+                (default: HISTORY_RESOLUTIONS)
+        """
+        resolutions = resolutions or HISTORY_RESOLUTIONS
+        if top_k < 0:
+            raise ValueError("top_k must be >= 0")
+        for name, (step, points) in resolutions.items():
+            if step < 1 or points < 1:
+                raise ValueError(f"Resolution {name} must have step >= 1 and points >= 1")
+        
+        self.top_k = top_k
+        self._resolutions = dict(resolutions)
+        # Lane 0 untuk record() langsung dan verdict; shard lain mendapat lane sendiri
+        self._lanes: List[_HistoryLane] = [_HistoryLane(self._resolutions, top_k)]
+        self._level_index = {level: index for index, level in enumerate(THREAT_LEVELS)}
+        self._lock = threading.Lock()
+        self.recorded_verdicts = 0
+    
+    @property
+    def resolutions(self) -> List[str]:
+        return list(self._resolutions)
+    
+    @property
+    def recorded_logs(self) -> int:
+        return sum(lane.recorded_logs for lane in list(self._lanes))
+    
+    def attach(self, window) -> None:
+        """
+        Menghubungkan history ke window. Setiap shard mendapat lane sendiri
+        sehingga add_log di shard berbeda tidak berebut satu lock.
+        """
+        shards = getattr(window, 'shards', [window])
+        with self._lock:
+            while len(self._lanes) < len(shards):
+                self._lanes.append(_HistoryLane(self._resolutions, self.top_k))
+        for shard, lane in zip(shards, self._lanes):
+            shard.history = lane
+    
+    def record(self, timestamp: float, ip: Optional[str], is_error: bool, response_time: float) -> None:
+        """
+        Mencatat satu log (dipanggil window pada setiap add_log).
+        
+        Args:
+            timestamp: Waktu log (epoch detik)
+            ip: IP address sumber
+            is_error: True jika status code >= 400
+            response_time: Response time (ms)
+        """
+        self._lanes[0].record(timestamp, ip, is_error, response_time)
+    
+    def record_threat(self, threat_level: str, timestamp: Optional[float] = None) -> None:
+        """
+        Mencatat satu verdict ensemble.
+        
+        Args:
+            threat_level: Salah satu THREAT_LEVELS
+            timestamp: Waktu verdict (default: sekarang)
+        """
+        level_index = self._level_index.get(threat_level)
+        if level_index is None:
+            raise ValueError(f"Unknown threat level: {threat_level}")
+        if timestamp is None:
+            timestamp = time.time()
+        
+        lane = self._lanes[0]
+        with lane.lock:
+            for ring in lane.rings.values():
+                ring.add_threat(timestamp, level_index)
+            self.recorded_verdicts += 1
+    
+    def max_points(self, resolution: str) -> int:
+        """Jumlah slot ring untuk resolusi tertentu."""
+        return self._resolution(resolution)[1]
+    
+    def _resolution(self, resolution: str) -> Tuple[int, int]:
+        if resolution not in self._resolutions:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        return self._resolutions[resolution]
+    
+    def series(self, resolution: str = '1min', points: int = 60, now: Optional[float] = None) -> Dict:
+        """
+        Series siap pakai untuk grafik, dari bucket tertua ke terbaru.
+        
+        Args:
+            resolution: Nama resolusi (lihat HISTORY_RESOLUTIONS)
+            points: Jumlah bucket (dibatasi ukuran ring)
+            now: Akhir series (default: sekarang)
+        
+        Returns:
+            Dictionary berisi timestamps (awal bucket, epoch detik), requests,
+            errors, error_rate, avg_response_time, threat_levels dan
+            top_ips (kecuali resolusi 1s)
+        """
+        step, capacity = self._resolution(resolution)
+        if points < 1:
+            raise ValueError("points must be >= 1")
+        points = min(points, capacity)
+        if now is None:
+            now = time.time()
+        
+        first = int(now // step) - points + 1
+        totals = {
+            'requests': np.zeros(points, dtype=np.int64),
+            'errors': np.zeros(points, dtype=np.int64),
+            'response_time_sums': np.zeros(points, dtype=np.float64),
+            'threats': np.zeros((points, len(THREAT_LEVELS)), dtype=np.int64),
+        }
+        with_ips = self.top_k > 0 and resolution in TOP_IP_RESOLUTIONS
+        ip_totals: Optional[Dict[str, int]] = {} if with_ips else None
+        for lane in list(self._lanes):
+            with lane.lock:
+                lane.rings[resolution].accumulate(first, totals, ip_totals)
+        
+        requests = totals['requests']
+        error_rate = totals['errors'] / np.maximum(requests, 1)
+        avg_response_time = totals['response_time_sums'] / np.maximum(requests, 1)
+        result = {
+            'resolution': resolution,
+            'step_seconds': step,
+            'points': points,
+            'timestamps': (np.arange(first, first + points, dtype=np.int64) * step).tolist(),
+            'requests': requests.tolist(),
+            'errors': totals['errors'].tolist(),
+            'error_rate': np.round(error_rate, 4).tolist(),
+            'avg_response_time': np.round(avg_response_time, 1).tolist(),
+            'threat_levels': {
+                level: totals['threats'][:, index].tolist() for index, level in enumerate(THREAT_LEVELS)
+            },
+        }
+        if with_ips:
+            top = sorted(ip_totals.items(), key=lambda item: (-item[1], item[0]))[:self.top_k]
+            result['top_ips'] = [{'ip': ip, 'requests': count} for ip, count in top]
+        return result
+    
+    def clear(self) -> None:
+        """Menghapus seluruh riwayat."""
+        for lane in list(self._lanes):
+            with lane.lock:
+                for ring in lane.rings.values():
+                    ring.clear()
+                lane.recorded_logs = 0
+        self.recorded_verdicts = 0
+    
+    def get_stats(self) -> Dict:
+        """Statistik history store untuk monitoring."""
+        lanes = list(self._lanes)
+        filled = {name: 0 for name in self._resolutions}
+        for lane in lanes:
+            with lane.lock:
+                for name, ring in lane.rings.items():
+                    filled[name] = max(filled[name], ring.filled())
+        return {
+            'recorded_logs': self.recorded_logs,
+            'recorded_verdicts': self.recorded_verdicts,
+            'lanes': len(lanes),
+            'resolutions': {
+                name: {'step_seconds': step, 'points': points, 'filled': filled[name]}
+                for name, (step, points) in self._resolutions.items()
+            },
+        }
@@ -0,0 +1,226 @@
+"""
+========================================
+OFFLINE FEATURES MODULE
+Fitur Temporal Rolling Window secara Vektor (NumPy)
+========================================
+
+Untuk membangun data training atau menilai ulang arsip log, log tidak
+perlu lagi dimasukkan satu per satu lewat extract_temporal_features.
+Modul ini menghitung fitur FEATURE_ORDER untuk setiap baris tabel log
+kolumnar yang sudah terurut berdasarkan timestamp:
+
+  - baris dikelompokkan per IP (argsort stabil), batas awal window setiap
+    baris dicari sekaligus dengan searchsorted pada kunci (IP, indeks)
+  - jumlah request, error, response time dan bytes dibaca dari selisih
+    prefix sum (cumsum), histogram method dari cumsum per method
+  - URL unik dihitung dengan kemunculan sebelumnya dari pasangan
+    (IP, URL) ditambah difference array
+
+Semantik sama dengan TemporalSlidingWindow ber-clock 'event' yang diisi
+berurutan: fitur baris ke-i memakai log ke-0..i dengan timestamp
+>= timestamp_i - panjang window. Perbedaan yang disengaja: tidak ada batas
+max_tracked_ips (semua IP dilacak exact) dan URL unik selalu exact,
+sedangkan window online beralih ke HyperLogLog setelah
+unique_url_exact_limit URL.
+
+========================================
+Lead Researcher & Developer (Journal-Grade Overhaul):
+  MUHAMMAD AKBAR HADI PRATAMA
+  GitHub: @el-pablos
+  Email: yeteprem.end23juni@gmail.com
+
+Original Contributors / Legacy Team:
+  - Jeremy Christo Emmanuelle Panjaitan (237006516084)
+  - Farrel Alfaridzi (237006516028)
+  - Chosmas Laurens Rumngewur (217006516074)
+========================================
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from temporal_features import TemporalSlidingWindow, _LogEvent, _parse_timestamp, parse_window_key
+
+
+# Kolom tabel log (penamaan sama dengan _ColumnarLogStore)
+OFFLINE_COLUMNS = ('timestamp', 'ip', 'method', 'url', 'status_code', 'response_time', 'nbytes')
+
+
+def logs_to_columns(logs: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Mengkonversi list dictionary log menjadi tabel kolumnar untuk
+    rolling_temporal_features (id IP/method/URL hasil interning, bytes
+    diestimasi sama seperti window online).
+    
+    Args:
+        logs: List dictionary log server (urutan dipertahankan)
+    
+    Returns:
+        Dictionary kolom (lihat OFFLINE_COLUMNS)
+    """
+    vocabularies: Dict[str, Dict] = {'ip': {}, 'method': {}, 'url': {}}
+    columns: Dict[str, List] = {name: [] for name in OFFLINE_COLUMNS}
+    
+    for log in logs:
+        event = _LogEvent.from_log(log, _parse_timestamp(log.get('timestamp')).timestamp())
+        if not event.ip:
+            raise ValueError("Every log needs an ip_address for offline features")
+        columns['timestamp'].append(event.timestamp)
+        for name, value in (('ip', event.ip), ('method', event.method), ('url', event.url)):
+            vocabulary = vocabularies[name]
+            columns[name].append(vocabulary.setdefault(value, len(vocabulary)))
+        columns['status_code'].append(event.status_code)
+        columns['response_time'].append(event.response_time)
+        columns['nbytes'].append(event.nbytes)
+    
+    return {
+        name: np.asarray(values, dtype=np.float64 if name in ('timestamp', 'response_time') else np.int64)
+        for name, values in columns.items()
+    }
+
+
+def _prefix_sum(values: np.ndarray) -> np.ndarray:
+    """Prefix sum dengan 0 di depan: jumlah [a, b) = out[b] - out[a]."""
+    out = np.zeros(len(values) + 1, dtype=np.result_type(values.dtype, np.int64))
+    np.cumsum(values, out=out[1:])
+    return out
+
+
+def _round(values: np.ndarray, digits: int) -> np.ndarray:
+    """
+    Pembulatan yang sama dengan round() Python pada float (dipakai fitur
+    online). np.round mengalikan dengan 10^digits lebih dulu sehingga bisa
+    berbeda tepat di sekitar nilai tengah; hanya nilai tersebut yang
+    dibulatkan ulang satu per satu.
+    """
+    rounded = np.round(values, digits)
+    scaled = values * 10.0 ** digits
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if ties.any():
+        rounded[ties] = [round(float(value), digits) for value in values[ties]]
+    return rounded
+
+
+def _window_starts(grouped_ips: np.ndarray, grouped_keys: np.ndarray, first_in_window: np.ndarray) -> np.ndarray:
+    """
+    Untuk setiap baris (urutan grouped), posisi log pertama IP yang sama
+    di dalam window.
+    
+    Karena tabel terurut berdasarkan waktu, batas waktu bisa diganti indeks
+    baris global (first_in_window, urutan grouped): kunci grouped =
+    ip * N + indeks, sehingga satu searchsorted integer (exact) cukup untuk
+    semua grup sekaligus. Query juga sudah terurut sehingga pencarian
+    biner bisa melanjutkan dari hasil sebelumnya.
+    """
+    return np.searchsorted(grouped_keys, grouped_ips * len(grouped_keys) + first_in_window, side='left')
+
+
+def _distinct_in_windows(groups: np.ndarray, values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    Jumlah nilai unik di window [starts[i], i] untuk setiap baris i
+    (baris terurut per grup, starts tidak pernah turun).
+    """
+    n = len(values)
+    positions = np.arange(n)
+    pair_keys = groups * (int(values.max()) + 1) + values
+    order = np.argsort(pair_keys, kind='stable')
+    same = pair_keys[order[1:]] == pair_keys[order[:-1]]
+    previous = np.full(n, -1, dtype=np.int64)
+    previous[order[1:][same]] = order[:-1][same]
+    
+    # Baris j dihitung di baris i jika j kemunculan pertama nilainya di
+    # window i: previous[j] < starts[i] <= j <= i. Karena starts naik,
+    # baris i tersebut membentuk rentang [first, last].
+    first = np.maximum(positions, np.searchsorted(starts, previous, side='right'))
+    last = np.searchsorted(starts, positions, side='right') - 1
+    valid = first <= last
+    diff = np.bincount(first[valid], minlength=n + 1) - np.bincount(last[valid] + 1, minlength=n + 1)
+    return np.cumsum(diff[:n])
+
+
+def rolling_temporal_features(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Menghitung fitur temporal setiap baris tabel log secara vektor.
+    
+    Hasilnya sama dengan TemporalSlidingWindow(clock='event',
+    max_tracked_ips=None).extract_temporal_features_batch untuk log yang
+    sama (lihat catatan modul untuk URL unik).
+    
+    Args:
+        columns: Tabel kolumnar (lihat OFFLINE_COLUMNS), terurut berdasarkan
+            timestamp; 'ip', 'method' dan 'url' berupa id integer >= 0
+    
+    Returns:
+        Matrix (N, len(FEATURE_ORDER)); baris ke-i milik log ke-i
+    """
+    missing = [name for name in OFFLINE_COLUMNS if name not in columns]
+    if missing:
+        raise ValueError(f"Missing columns: {missing}")
+    
+    timestamps = np.asarray(columns['timestamp'], dtype=np.float64)
+    ips = np.asarray(columns['ip'], dtype=np.int64)
+    n = len(timestamps)
+    feature_order = TemporalSlidingWindow.FEATURE_ORDER
+    matrix = np.zeros((n, len(feature_order)), dtype=np.float64)
+    if not n:
+        return matrix
+    if np.any(np.diff(timestamps) < 0):
+        raise ValueError("Log table must be sorted by timestamp")
+    if ips.min() < 0:
+        raise ValueError("ip ids must be >= 0")
+    if (int(ips.max()) + 1) * n >= np.iinfo(np.int64).max:
+        raise ValueError("ip ids too large for the grouped int64 key")
+    
+    is_error = np.asarray(columns['status_code']) >= 400
+    response_times = np.asarray(columns['response_time'], dtype=np.float64)
+    span_1min = parse_window_key('1min').total_seconds()
+    span_5min = parse_window_key('5min').total_seconds()
+    
+    # Per-IP: baris dikelompokkan per IP dengan urutan waktu dipertahankan
+    order = np.argsort(ips, kind='stable')
+    grouped_ips = ips[order]
+    grouped_keys = grouped_ips * n + order
+    positions = np.arange(n)
+    end = positions + 1
+    # Indeks global log pertama dengan timestamp >= timestamp - span
+    global_start = np.searchsorted(timestamps, timestamps - span_1min, side='left')
+    start_1min = _window_starts(grouped_ips, grouped_keys, global_start[order])
+    start_5min = _window_starts(
+        grouped_ips, grouped_keys, np.searchsorted(timestamps, timestamps - span_5min, side='left')[order]
+    )
+    count_1min = end - start_1min
+    count_5min = end - start_5min
+    
+    errors = _prefix_sum(is_error[order].astype(np.int64))
+    error_rate_1min = (errors[end] - errors[start_1min]) / count_1min
+    error_rate_5min = (errors[end] - errors[start_5min]) / count_5min
+    response_time_sums = _prefix_sum(response_times[order])
+    bytes_sums = _prefix_sum(np.asarray(columns['nbytes'], dtype=np.int64)[order])
+    
+    entropy = np.zeros(n, dtype=np.float64)
+    methods = np.asarray(columns['method'])[order]
+    for method in np.unique(methods):
+        method_counts = _prefix_sum((methods == method).astype(np.int64))
+        p = (method_counts[end] - method_counts[start_1min]) / count_1min
+        entropy -= np.where(p > 0, p * np.log2(np.where(p > 0, p, 1.0)), 0.0)
+    
+    per_ip = np.column_stack([
+        count_1min,
+        count_5min,
+        _round((response_time_sums[end] - response_time_sums[start_1min]) / count_1min, 2),
+        _round((bytes_sums[end] - bytes_sums[start_5min]) / count_5min, 2),
+        _round(error_rate_1min, 4),
+        _round(error_rate_1min - error_rate_5min, 4),
+        _distinct_in_windows(grouped_ips, np.asarray(columns['url'], dtype=np.int64)[order], start_1min),
+        # Entropi online berupa np.float64 sehingga dibulatkan oleh NumPy juga
+        np.round(entropy, 4),
+    ])
+    matrix[order, :per_ip.shape[1]] = per_ip
+    
+    # Global: window di atas urutan waktu asli
+    global_count = end - global_start
+    global_errors = _prefix_sum(is_error.astype(np.int64))
+    matrix[:, per_ip.shape[1]] = global_count
+    matrix[:, per_ip.shape[1] + 1] = _round((global_errors[end] - global_errors[global_start]) / global_count, 4)
+    return matrix
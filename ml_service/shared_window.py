@@ -0,0 +1,662 @@
+"""
+========================================
+SHARED SLIDING WINDOW MODULE
+Sliding Window Lintas Proses via Shared Memory
+========================================
+
+Jika ML service dijalankan dengan beberapa worker (misal gunicorn -w 2),
+setiap proses punya TemporalSlidingWindow sendiri sehingga hitungan per-IP
+terbagi N dan deteksi burst melemah. Modul ini menyimpan agregat window
+di satu segmen `multiprocessing.shared_memory` yang dipakai bersama oleh
+semua worker lokal:
+
+- Bucket global per detik (time wheel) untuk metrik global dan IP unik
+- Tabel hash per-IP (open addressing) berisi bucket waktu untuk jumlah
+  request, error, response time, bytes, histogram method dan HyperLogLog
+  URL unik
+
+Update dilindungi lock byte-range fcntl (bergaris/striped per IP) sehingga
+aman antar proses; pembacaan fitur tidak mengambil lock. Segmen tetap ada
+walaupun worker di-restart, sampai unlink() dipanggil.
+
+Batas window per-IP mengikuti granularitas bucket (`bucket_seconds`).
+Log mentah tidak disimpan, sehingga window ini tidak punya
+get_logs_in_window().
+
+========================================
+Lead Researcher & Developer (Journal-Grade Overhaul):
+  MUHAMMAD AKBAR HADI PRATAMA
+  GitHub: @el-pablos
+  Email: yeteprem.end23juni@gmail.com
+
+Original Contributors / Legacy Team:
+  - Jeremy Christo Emmanuelle Panjaitan (237006516084)
+  - Farrel Alfaridzi (237006516028)
+  - Chosmas Laurens Rumngewur (217006516074)
+========================================
+"""
+
+import fcntl
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from sketches import LATENCY_MAPPING, hll_estimate, hll_estimate_many, hll_position, precision_for_error, stable_hash64
+from temporal_features import TemporalSlidingWindow, _LogEvent, _TimeWheel, _parse_timestamp
+
+
+# Vocabulary method tetap (kolom histogram harus sama di semua proses)
+SHARED_METHODS = ('GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS', 'OTHER')
+
+# Panjang maksimal IP yang disimpan (IPv6 terpanjang 45 karakter)
+_IP_NAME_BYTES = 48
+
+
+class _SharedSegment:
+    """
+    Segmen shared memory berisi beberapa array NumPy dengan layout tetap.
+    Proses pertama membuat segmen, proses lain menempel (attach) dan
+    memverifikasi konfigurasi di header.
+    """
+    
+    MAGIC = 0x4C53_5357
+    HEADER_SLOTS = 16
+    
+    def __init__(self, name: str, layout: List[Tuple[str, type, Tuple[int, ...]]], config: Tuple[int, ...]):
+        offsets = {}
+        offset = self.HEADER_SLOTS * 8
+        for array_name, dtype, shape in layout:
+            offsets[array_name] = offset
+            nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            offset += (nbytes + 7) // 8 * 8
+        size = offset
+        
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            created = True
+        except FileExistsError:
+            self.shm = shared_memory.SharedMemory(name=name)
+            created = False
+        # Segmen harus bertahan walaupun worker yang membuatnya berhenti
+        resource_tracker.unregister(self.shm._name, 'shared_memory')
+        
+        if self.shm.size < size:
+            self.shm.close()
+            raise ValueError(f"Shared memory segment {name} is smaller than the configured layout")
+        
+        self.name = name
+        self.header = np.ndarray(self.HEADER_SLOTS, dtype=np.int64, buffer=self.shm.buf)
+        self.arrays: Dict[str, np.ndarray] = {
+            array_name: np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offsets[array_name])
+            for array_name, dtype, shape in layout
+        }
+        
+        if created:
+            self.header[1:1 + len(config)] = config
+            self.header[0] = self.MAGIC
+        else:
+            deadline = time.time() + 1.0
+            while self.header[0] != self.MAGIC and time.time() < deadline:
+                time.sleep(0.01)
+            if tuple(self.header[1:1 + len(config)]) != tuple(config):
+                self.close()
+                raise ValueError(f"Shared memory segment {name} has a different window configuration")
+    
+    def close(self) -> None:
+        """Melepas view array lalu menutup mapping (segmen tetap ada)."""
+        self.arrays = {}
+        self.header = None
+        self.shm.close()
+    
+    def unlink(self) -> None:
+        """Menghapus segmen dari sistem."""
+        self.shm.unlink()
+
+
+class _StripedProcessLock:
+    """
+    Lock bergaris yang berlaku antar proses (fcntl byte-range lock pada satu
+    file) dan antar thread dalam proses yang sama (threading.Lock).
+    """
+    
+    def __init__(self, path: str, stripes: int):
+        self.stripes = stripes
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._thread_locks = [threading.Lock() for _ in range(stripes)]
+    
+    @contextmanager
+    def hold(self, stripe: int):
+        with self._thread_locks[stripe]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, stripe)
+    
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _SharedTimeWheel(_TimeWheel):
+    """Time wheel global yang array-nya berada di shared memory."""
+    
+    def __init__(self, arrays: Dict[str, np.ndarray], precision: int):
+        self.size = len(arrays['wheel_seconds'])
+        self.precision = precision
+        self._method_ids = {method: slot for slot, method in enumerate(SHARED_METHODS)}
+        self._method_names = list(SHARED_METHODS)
+        self._merged_registers = {}
+        self._seconds = arrays['wheel_seconds']
+        self._counts = arrays['wheel_counts']
+        self._errors = arrays['wheel_errors']
+        self._response_time_sums = arrays['wheel_response_time_sums']
+        self._latency_counts = arrays['wheel_latency_counts']
+        self._method_counts = arrays['wheel_method_counts']
+        self._url_registers = arrays['wheel_url_registers']
+        self._ip_registers = arrays['wheel_ip_registers']
+    
+    def _method_slot(self, method: str) -> int:
+        return self._method_ids.get(method, len(SHARED_METHODS) - 1)
+    
+    def window_registers(self, now: float, seconds: float, field: str = 'ip') -> np.ndarray:
+        # Tanpa cache: worker lain bisa menulis ke detik yang sudah lewat
+        registers = self._ip_registers if field == 'ip' else self._url_registers
+        mask = self._window_mask(now, seconds)
+        if not mask.any():
+            return np.zeros(registers.shape[1], dtype=np.uint8)
+        return registers[mask].max(axis=0)
+    
+    def latency_histogram(self, now: float, seconds: float) -> np.ndarray:
+        return self._latency_counts[self._window_mask(now, seconds)].sum(axis=0, dtype=np.int64)
+    
+    def clear(self) -> None:
+        self._merged_registers.clear()
+        for array in (self._seconds, self._counts, self._errors, self._response_time_sums,
+                      self._latency_counts, self._method_counts, self._url_registers, self._ip_registers):
+            array[...] = 0
+
+
+class _SharedIpTable:
+    """
+    Tabel hash per-IP (linear probing) di shared memory.
+    
+    Setiap slot menyimpan ring bucket waktu selebar `bucket_seconds` untuk
+    seluruh window, plus ring bucket HyperLogLog URL untuk window 1 menit.
+    Slot yang tidak aktif selama satu window dipakai ulang oleh IP lain.
+    Slot yang masih aktif tidak pernah dikeluarkan: jika semua slot pada
+    jalur probe masih aktif, IP baru tidak dilacak per-IP (tabel penuh) dan
+    dihitung di `overflow`.
+    
+    find/claim/acquire untuk penulisan harus dipanggil dengan lock tabel
+    agar slot tidak dipakai ulang selagi worker lain masih menulis ke sana.
+    """
+    
+    PROBES = 16
+    
+    def __init__(self, arrays: Dict[str, np.ndarray], bucket_seconds: int, url_precision: int):
+        self.bucket_seconds = bucket_seconds
+        self.url_precision = url_precision
+        self.keys = arrays['ip_keys']
+        self.names = arrays['ip_names']
+        self.last_seen = arrays['ip_last_seen']
+        self.labels = arrays['ip_labels']
+        self.counts = arrays['ip_counts']
+        self.errors = arrays['ip_errors']
+        self.response_time_sums = arrays['ip_response_time_sums']
+        self.bytes_sums = arrays['ip_bytes_sums']
+        self.method_counts = arrays['ip_method_counts']
+        self.url_labels = arrays['ip_url_labels']
+        self.url_registers = arrays['ip_url_registers']
+        self.overflow = arrays['ip_overflow']
+        self.slots, self.buckets = self.labels.shape
+        self.horizon = self.buckets * bucket_seconds
+    
+    @staticmethod
+    def key_for(ip_address: Optional[str]) -> int:
+        # Key 0 menandai slot kosong
+        return stable_hash64(ip_address) or 1
+    
+    def find(self, key: int) -> Optional[int]:
+        """Slot milik key, atau None jika IP tidak ada di tabel."""
+        keys = self.keys
+        slot = key % self.slots
+        for _ in range(min(self.PROBES, self.slots)):
+            current = keys[slot]
+            if current == key:
+                return slot
+            if current == 0:
+                return None
+            slot = (slot + 1) % self.slots
+        return None
+    
+    def acquire(self, key: int, ip_address: Optional[str], now: float) -> Optional[int]:
+        """
+        Slot untuk menulis event IP (dipanggil dengan lock tabel).
+        
+        last_seen slot diperbarui di sini, sehingga claim() di stripe lain
+        tidak bisa memakai ulang slot ini selama penulisan berlangsung.
+        
+        Returns:
+            Indeks slot, atau None jika tabel penuh
+        """
+        slot = self.find(key)
+        if slot is None:
+            return self.claim(key, ip_address, now)
+        if now > self.last_seen[slot]:
+            self.last_seen[slot] = now
+        return slot
+    
+    def claim(self, key: int, ip_address: Optional[str], now: float) -> Optional[int]:
+        """
+        Mengalokasikan slot untuk IP baru (dipanggil dengan lock tabel).
+        
+        Returns:
+            Indeks slot, atau None jika semua slot pada jalur probe masih
+            aktif (overflow dicatat)
+        """
+        existing = self.find(key)
+        if existing is not None:
+            return existing
+        
+        candidates = [(key % self.slots + i) % self.slots for i in range(min(self.PROBES, self.slots))]
+        slot = next(
+            (s for s in candidates if self.keys[s] == 0 or self.last_seen[s] < now - self.horizon),
+            None
+        )
+        if slot is None:
+            self.overflow[0] += 1
+            return None
+        
+        self.labels[slot] = 0
+        self.counts[slot] = 0
+        self.errors[slot] = 0
+        self.response_time_sums[slot] = 0.0
+        self.bytes_sums[slot] = 0
+        self.method_counts[slot] = 0
+        self.url_labels[slot] = 0
+        self.url_registers[slot] = 0
+        self.last_seen[slot] = now
+        self.names[slot] = str(ip_address).encode('utf-8')[:_IP_NAME_BYTES]
+        self.keys[slot] = key
+        return slot
+    
+    def add(self, slot: int, event: _LogEvent, method_slot: int, now: float) -> None:
+        """Mencatat event ke bucket waktu slot tersebut."""
+        timestamp = min(event.timestamp, now)
+        bucket = int(timestamp // self.bucket_seconds)
+        now_bucket = int(now // self.bucket_seconds)
+        if bucket <= now_bucket - self.buckets:
+            return
+        
+        column = bucket % self.buckets
+        if self.labels[slot, column] != bucket:
+            self.labels[slot, column] = bucket
+            self.counts[slot, column] = 0
+            self.errors[slot, column] = 0
+            self.response_time_sums[slot, column] = 0.0
+            self.bytes_sums[slot, column] = 0
+            self.method_counts[slot, column] = 0
+        
+        self.counts[slot, column] += 1
+        self.errors[slot, column] += event.is_error
+        self.response_time_sums[slot, column] += event.response_time
+        self.bytes_sums[slot, column] += event.nbytes
+        self.method_counts[slot, column, method_slot] += 1
+        if now > self.last_seen[slot]:
+            self.last_seen[slot] = now
+        
+        url_buckets = self.url_labels.shape[1]
+        if bucket > now_bucket - url_buckets:
+            column = bucket % url_buckets
+            if self.url_labels[slot, column] != bucket:
+                self.url_labels[slot, column] = bucket
+                self.url_registers[slot, column] = 0
+            index, rank = hll_position(stable_hash64(event.url), self.url_precision)
+            if rank > self.url_registers[slot, column, index]:
+                self.url_registers[slot, column, index] = rank
+    
+    def _mask(self, labels: np.ndarray, now: float, seconds: float) -> np.ndarray:
+        now_bucket = int(now // self.bucket_seconds)
+        buckets = min(labels.shape[-1], math.ceil(seconds / self.bucket_seconds))
+        return (labels > now_bucket - buckets) & (labels <= now_bucket)
+    
+    def window(self, slot: int, now: float, seconds: float) -> Dict:
+        """Agregat satu IP dalam window yang berakhir di `now`."""
+        mask = self._mask(self.labels[slot], now, seconds)
+        return {
+            'count': int(self.counts[slot][mask].sum()),
+            'errors': int(self.errors[slot][mask].sum()),
+            'response_time_sum': float(self.response_time_sums[slot][mask].sum()),
+            'bytes_sum': int(self.bytes_sums[slot][mask].sum()),
+            'methods': self.method_counts[slot][mask].sum(axis=0),
+        }
+    
+    def unique_urls(self, slot: int, now: float, seconds: float) -> int:
+        mask = self._mask(self.url_labels[slot], now, seconds)
+        if not mask.any():
+            return 0
+        return int(round(hll_estimate(self.url_registers[slot][mask].max(axis=0))))
+    
+    def top(self, now: float, seconds: float, k: int) -> Dict:
+        """Top-K IP aktif (vectorized atas seluruh tabel)."""
+        mask = self._mask(self.labels, now, seconds) & (self.keys != 0)[:, None]
+        counts = np.where(mask, self.counts, 0).sum(axis=1)
+        errors = np.where(mask, self.errors, 0).sum(axis=1)
+        
+        url_mask = self._mask(self.url_labels, now, seconds) & (self.keys != 0)[:, None]
+        registers = np.where(url_mask[:, :, None], self.url_registers, 0).max(axis=1)
+        unique_urls = np.rint(hll_estimate_many(registers)).astype(np.int64)
+        unique_urls[~url_mask.any(axis=1)] = 0
+        
+        def ranking(values: np.ndarray) -> List[Dict]:
+            order = np.argsort(-values, kind='stable')[:k]
+            return [
+                {'ip': self.names[slot].decode('utf-8'), 'count': int(values[slot])}
+                for slot in order if values[slot] > 0
+            ]
+        
+        return {
+            'by_requests': ranking(counts),
+            'by_errors': ranking(errors),
+            'by_unique_urls': ranking(unique_urls),
+            'tracked_ips': int(np.count_nonzero(counts)),
+        }
+    
+    def clear(self) -> None:
+        for array in (self.keys, self.names, self.last_seen, self.labels, self.counts, self.errors,
+                      self.response_time_sums, self.bytes_sums, self.method_counts,
+                      self.url_labels, self.url_registers, self.overflow):
+            array[...] = 0
+
+
+class SharedSlidingWindow:
+    """
+    Sliding window yang state-nya dibagi oleh semua worker lokal melalui
+    shared memory. API fitur sama dengan TemporalSlidingWindow, tetapi log
+    mentah tidak disimpan (hanya agregat per bucket), sehingga tidak ada
+    get_logs_in_window(), export_records()/bulk_load() (WindowPersistence)
+    maupun get_top_routes(). Tidak ada lock per window dan bucket kedaluwarsa
+    secara lazy, sehingga WindowJanitor tidak dipakai; app.py menolak
+    kombinasi tersebut saat startup.
+    """
+    
+    FEATURE_ORDER = TemporalSlidingWindow.FEATURE_ORDER
+    
+    def __init__(
+        self,
+        window_size_minutes: int = 10,
+        name: str = 'log_sentinel_window',
+        bucket_seconds: int = 5,
+        ip_slots: int = 2048,
+        cardinality_error: float = 0.05,
+        url_precision: int = 6,
+        lock_stripes: int = 64
+    ):
+        """
+        Inisialisasi (membuat atau menempel ke) shared sliding window.
+        
+        Args:
+            window_size_minutes: Ukuran maksimal window dalam menit
+            name: Nama segmen shared memory (sama untuk semua worker)
+            bucket_seconds: Lebar bucket waktu per-IP (granularitas window)
+            ip_slots: Jumlah slot tabel IP (memori tetap ~9 KB per slot)
+            cardinality_error: Error bound HyperLogLog IP/URL unik global
+            url_precision: Presisi HyperLogLog URL unik per IP
+            lock_stripes: Jumlah garis lock untuk update per-IP
+        """
+        if bucket_seconds < 1 or ip_slots < 1 or lock_stripes < 1:
+            raise ValueError("bucket_seconds, ip_slots and lock_stripes must be >= 1")
+        
+        self.window_size = timedelta(minutes=window_size_minutes)
+        self.storage = 'shared'
+        self.windows = {
+            '1min': timedelta(minutes=1),
+            '5min': timedelta(minutes=5),
+            '10min': timedelta(minutes=10)
+        }
+        self._window_spans = {
+            key: min(span, self.window_size).total_seconds() for key, span in self.windows.items()
+        }
+        
+        horizon = int(math.ceil(self.window_size.total_seconds()))
+        precision = precision_for_error(cardinality_error)
+        ip_buckets = int(math.ceil(horizon / bucket_seconds))
+        url_buckets = int(math.ceil(60 / bucket_seconds)) + 1
+        methods = len(SHARED_METHODS)
+        layout = [
+            ('wheel_seconds', np.int64, (horizon,)),
+            ('wheel_counts', np.int64, (horizon,)),
+            ('wheel_errors', np.int64, (horizon,)),
+            ('wheel_response_time_sums', np.float64, (horizon,)),
+            ('wheel_latency_counts', np.int32, (horizon, LATENCY_MAPPING.bins)),
+            ('wheel_method_counts', np.int64, (horizon, methods)),
+            ('wheel_url_registers', np.uint8, (horizon, 1 << precision)),
+            ('wheel_ip_registers', np.uint8, (horizon, 1 << precision)),
+            ('ip_keys', np.uint64, (ip_slots,)),
+            ('ip_names', f'S{_IP_NAME_BYTES}', (ip_slots,)),
+            ('ip_last_seen', np.float64, (ip_slots,)),
+            ('ip_labels', np.int64, (ip_slots, ip_buckets)),
+            ('ip_counts', np.int32, (ip_slots, ip_buckets)),
+            ('ip_errors', np.int32, (ip_slots, ip_buckets)),
+            ('ip_response_time_sums', np.float64, (ip_slots, ip_buckets)),
+            ('ip_bytes_sums', np.int64, (ip_slots, ip_buckets)),
+            ('ip_method_counts', np.int32, (ip_slots, ip_buckets, methods)),
+            ('ip_url_labels', np.int64, (ip_slots, url_buckets)),
+            ('ip_url_registers', np.uint8, (ip_slots, url_buckets, 1 << url_precision)),
+            ('ip_overflow', np.int64, (1,)),
+        ]
+        # Elemen pertama = versi layout (naik setiap ada array baru)
+        config = (3, horizon, bucket_seconds, ip_slots, precision, url_precision)
+        
+        self.name = name
+        self._segment = _SharedSegment(name, layout, config)
+        self._locks = _StripedProcessLock(
+            os.path.join(tempfile.gettempdir(), f'{name}.lock'), lock_stripes + 2
+        )
+        self._time_wheel = _SharedTimeWheel(self._segment.arrays, precision)
+        self._table = _SharedIpTable(self._segment.arrays, bucket_seconds, url_precision)
+        # Riwayat dashboard (RoundRobinHistory) milik proses ini, opsional
+        self.history = None
+        
+        print(f"[INFO] SharedSlidingWindow attached (segment: {name}, {ip_slots} IP slots)")
+    
+    # Stripe 0 = time wheel global, 1 = alokasi slot tabel, 2.. = per-IP
+    def _ip_stripe(self, key: int) -> int:
+        return 2 + key % (self._locks.stripes - 2)
+    
+    def add_log(self, log_data: Dict) -> None:
+        """
+        Menambahkan log ke agregat bersama.
+        
+        Args:
+            log_data: Dictionary berisi data log server
+        """
+        timestamp = _parse_timestamp(log_data.get('timestamp'))
+        event = _LogEvent.from_log(log_data, timestamp.timestamp())
+        now = time.time()
+        
+        if self.history is not None:
+            # Riwayat hanya mencatat log yang diterima worker ini
+            self.history.record(event.timestamp, event.ip, event.is_error, event.response_time)
+        
+        with self._locks.hold(0):
+            self._time_wheel.add(event, now)
+        
+        key = self._table.key_for(event.ip)
+        with self._locks.hold(self._ip_stripe(key)):
+            with self._locks.hold(1):
+                slot = self._table.acquire(key, event.ip, now)
+            if slot is not None:
+                self._table.add(slot, event, self._time_wheel._method_slot(event.method), now)
+    
+    def _ip_window(self, ip_address: Optional[str], window_key: str) -> Optional[Dict]:
+        slot = self._table.find(self._table.key_for(ip_address))
+        if slot is None:
+            return None
+        return self._table.window(slot, time.time(), self._window_spans[self._resolve_window(window_key)])
+    
+    def _global_window(self, window_key: str) -> Dict:
+        now = time.time()
+        mask = self._time_wheel._window_mask(now, self._window_spans[self._resolve_window(window_key)])
+        return {
+            'count': int(self._time_wheel._counts[mask].sum()),
+            'errors': int(self._time_wheel._errors[mask].sum()),
+            'response_time_sum': float(self._time_wheel._response_time_sums[mask].sum()),
+            'methods': self._time_wheel._method_counts[mask].sum(axis=0),
+        }
+    
+    def _resolve_window(self, window_key: str) -> str:
+        return window_key if window_key in self._window_spans else '1min'
+    
+    def _aggregate(self, ip_address: Optional[str], window_key: str) -> Optional[Dict]:
+        return self._ip_window(ip_address, window_key) if ip_address else self._global_window(window_key)
+    
+    @staticmethod
+    def _entropy(methods: np.ndarray) -> float:
+        total = methods.sum()
+        if not total:
+            return 0.0
+        p = methods[methods > 0] / total
+        return max(0.0, float(-(p * np.log2(p)).sum()))
+    
+    def calculate_request_count(self, ip_address: str, window_key: str = '1min') -> int:
+        aggregate = self._ip_window(ip_address, window_key)
+        return aggregate['count'] if aggregate else 0
+    
+    def calculate_avg_response_time(self, ip_address: str = None, window_key: str = '1min') -> float:
+        aggregate = self._aggregate(ip_address, window_key)
+        if not aggregate or not aggregate['count']:
+            return 0.0
+        return aggregate['response_time_sum'] / aggregate['count']
+    
+    def calculate_avg_bytes(self, ip_address: str = None, window_key: str = '5min') -> float:
+        # Time wheel global tidak menyimpan bytes
+        aggregate = self._ip_window(ip_address, window_key) if ip_address else None
+        if not aggregate or not aggregate['count']:
+            return 0.0
+        return aggregate['bytes_sum'] / aggregate['count']
+    
+    def calculate_error_rate(self, ip_address: str = None, window_key: str = '1min') -> float:
+        aggregate = self._aggregate(ip_address, window_key)
+        if not aggregate or not aggregate['count']:
+            return 0.0
+        return aggregate['errors'] / aggregate['count']
+    
+    def calculate_error_rate_slope(self, ip_address: str = None) -> float:
+        return self.calculate_error_rate(ip_address, '1min') - self.calculate_error_rate(ip_address, '5min')
+    
+    def calculate_unique_urls(self, ip_address: str, window_key: str = '1min') -> int:
+        slot = self._table.find(self._table.key_for(ip_address))
+        if slot is None:
+            return 0
+        return self._table.unique_urls(slot, time.time(), self._window_spans[self._resolve_window(window_key)])
+    
+    def calculate_unique_ips(self, window_key: str = '1min') -> int:
+        return self._time_wheel.unique_count(time.time(), self._window_spans[self._resolve_window(window_key)], 'ip')
+    
+    def calculate_method_entropy(self, ip_address: str = None, window_key: str = '1min') -> float:
+        aggregate = self._aggregate(ip_address, window_key)
+        return self._entropy(aggregate['methods']) if aggregate else 0.0
+    
+    def extract_temporal_features(self, log_data: Dict) -> Dict:
+        """
+        Mengekstrak semua fitur temporal untuk satu log entry dari state
+        bersama semua worker.
+        """
+        ip_address = log_data.get('ip_address', '')
+        self.add_log(log_data)
+        
+        slot = self._table.find(self._table.key_for(ip_address))
+        now = time.time()
+        empty = {'count': 0, 'errors': 0, 'response_time_sum': 0.0, 'bytes_sum': 0, 'methods': np.zeros(1)}
+        window_1min = self._table.window(slot, now, self._window_spans['1min']) if slot is not None else empty
+        window_5min = self._table.window(slot, now, self._window_spans['5min']) if slot is not None else empty
+        
+        def ratio(numerator, count):
+            return numerator / count if count else 0.0
+        
+        error_rate_1min = ratio(window_1min['errors'], window_1min['count'])
+        error_rate_5min = ratio(window_5min['errors'], window_5min['count'])
+        global_1min = self._global_window('1min')
+        
+        return {
+            'req_count_1min': window_1min['count'],
+            'req_count_5min': window_5min['count'],
+            'avg_response_time_1min': round(ratio(window_1min['response_time_sum'], window_1min['count']), 2),
+            'avg_response_time_5min': round(ratio(window_5min['response_time_sum'], window_5min['count']), 2),
+            'avg_bytes_5min': round(ratio(window_5min['bytes_sum'], window_5min['count']), 2),
+            'error_rate_1min': round(error_rate_1min, 4),
+            'error_rate_5min': round(error_rate_5min, 4),
+            'error_rate_slope': round(error_rate_1min - error_rate_5min, 4),
+            'unique_urls_1min': self._table.unique_urls(slot, now, self._window_spans['1min']) if slot is not None else 0,
+            'method_entropy': round(self._entropy(window_1min['methods']), 4),
+            'global_req_count_1min': global_1min['count'],
+            'global_error_rate_1min': round(ratio(global_1min['errors'], global_1min['count']), 4),
+            'unique_ips_1min': self.calculate_unique_ips('1min'),
+        }
+    
+    def get_feature_vector(self, log_data: Dict) -> np.ndarray:
+        """Mengkonversi fitur temporal menjadi numpy array untuk ML model."""
+        features = self.extract_temporal_features(log_data)
+        return np.array([features[key] for key in self.FEATURE_ORDER])
+    
+    def extract_temporal_features_batch(self, logs: List[Dict]) -> np.ndarray:
+        """
+        Versi batch dari get_feature_vector (urutan timestamp, baris ke-i
+        milik logs[i]). Lock tetap diambil per log karena worker lain
+        menulis ke segmen yang sama.
+        """
+        order = sorted(range(len(logs)), key=lambda i: _parse_timestamp(logs[i].get('timestamp')).timestamp())
+        matrix = np.zeros((len(logs), len(self.FEATURE_ORDER)), dtype=np.float64)
+        for i in order:
+            matrix[i] = self.get_feature_vector(logs[i])
+        return matrix
+    
+    def get_global_metrics(self, window_key: str = '1min') -> Dict:
+        """Metrik global dari time wheel bersama."""
+        return self._time_wheel.fold(time.time(), self._window_spans[self._resolve_window(window_key)])
+    
+    def get_top_ips(self, window_key: str = '1min', k: int = 10) -> Dict:
+        """Top-K IP dari seluruh worker."""
+        return self._table.top(time.time(), self._window_spans[self._resolve_window(window_key)], k)
+    
+    def get_stats(self) -> Dict:
+        """Statistik window bersama."""
+        logs = {key: self._global_window(key)['count'] for key in self.windows}
+        return {
+            'buffer_size': logs['10min'],
+            'storage': self.storage,
+            'window_size_minutes': self.window_size.total_seconds() / 60,
+            'logs_1min': logs['1min'],
+            'logs_5min': logs['5min'],
+            'logs_10min': logs['10min'],
+            'tracked_ips': int(np.count_nonzero(self._table.keys)),
+            'ip_table_overflow': int(self._table.overflow[0]),
+            'shared_memory': self.name,
+        }
+    
+    def clear(self) -> None:
+        """Mengosongkan state bersama (berlaku untuk semua worker)."""
+        with self._locks.hold(0), self._locks.hold(1):
+            self._time_wheel.clear()
+            self._table.clear()
+        print("[INFO] Shared sliding window cleared")
+    
+    def close(self) -> None:
+        """Melepas segmen dari proses ini (state tetap ada untuk worker lain)."""
+        self._time_wheel = None
+        self._table = None
+        self._segment.close()
+        self._locks.close()
+    
+    def unlink(self) -> None:
+        """Menghapus segmen shared memory dari sistem."""
+        self._segment.unlink()
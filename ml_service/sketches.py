@@ -0,0 +1,478 @@
+"""
+========================================
+PROBABILISTIC SKETCHES MODULE
+Struktur Data Ringkas untuk Streaming Analytics
+========================================
+
+Modul ini berisi sketch dengan memori tetap yang dipakai oleh
+Temporal Sliding Window untuk menghitung statistik traffic tanpa
+menyimpan seluruh data mentah:
+
+- HyperLogLog: estimasi kardinalitas (jumlah nilai unik) yang mergeable
+- SlidingHyperLogLog: HyperLogLog yang dipartisi per irisan waktu
+- SlidingCountMinSketch: estimasi frekuensi per key dalam sliding window
+- DDSketch: kuantil (p50/p95/p99) dengan error relatif terbatas, mergeable
+
+Hash yang dipakai stabil antar proses (blake2b), sehingga sketch dari
+worker berbeda dapat digabung.
+
+========================================
+Lead Researcher & Developer (Journal-Grade Overhaul):
+  MUHAMMAD AKBAR HADI PRATAMA
+  GitHub: @el-pablos
+  Email: yeteprem.end23juni@gmail.com
+
+Original Contributors / Legacy Team:
+  - Jeremy Christo Emmanuelle Panjaitan (237006516084)
+  - Farrel Alfaridzi (237006516028)
+  - Chosmas Laurens Rumngewur (217006516074)
+========================================
+"""
+
+import math
+from hashlib import blake2b
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# Tabel 2^-k untuk estimasi HyperLogLog (register maksimal 64)
+_INV_POW2 = np.power(2.0, -np.arange(66, dtype=np.float64))
+
+
+def stable_hash64(value) -> int:
+    """
+    Hash 64-bit yang stabil antar proses (tidak dipengaruhi PYTHONHASHSEED).
+    
+    Args:
+        value: Nilai yang akan di-hash (dikonversi ke string)
+    
+    Returns:
+        Integer 64-bit
+    """
+    return int.from_bytes(blake2b(str(value).encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'little')
+
+
+def precision_for_error(relative_error: float) -> int:
+    """
+    Menghitung presisi HyperLogLog (jumlah bit index) dari error bound.
+    Standard error HLL ~ 1.04 / sqrt(2^p).
+    
+    Args:
+        relative_error: Error relatif yang diinginkan (misal 0.05 = 5%)
+    
+    Returns:
+        Presisi p (4 - 16)
+    """
+    if not 0 < relative_error < 1:
+        raise ValueError("relative_error must be between 0 and 1")
+    registers = (1.04 / relative_error) ** 2
+    return int(min(16, max(4, math.ceil(math.log2(registers)))))
+
+
+def hll_position(hash_value: int, precision: int):
+    """
+    Memetakan hash ke (index register, rank) HyperLogLog.
+    
+    Returns:
+        Tuple (index, rank) dengan rank = posisi bit 1 pertama
+    """
+    width = 64 - precision
+    index = hash_value >> width
+    remainder = hash_value & ((1 << width) - 1)
+    return index, width - remainder.bit_length() + 1
+
+
+def hll_estimate(registers: np.ndarray) -> float:
+    """
+    Estimasi kardinalitas dari array register HyperLogLog.
+    Menggunakan linear counting untuk kardinalitas kecil.
+    
+    Args:
+        registers: Array register uint8 (panjang 2^p)
+    
+    Returns:
+        Estimasi jumlah nilai unik
+    """
+    m = len(registers)
+    if m >= 128:
+        alpha = 0.7213 / (1 + 1.079 / m)
+    elif m == 64:
+        alpha = 0.709
+    elif m == 32:
+        alpha = 0.697
+    else:
+        alpha = 0.673
+    
+    estimate = alpha * m * m / _INV_POW2[registers].sum()
+    if estimate <= 2.5 * m:
+        zeros = int(np.count_nonzero(registers == 0))
+        if zeros:
+            return m * math.log(m / zeros)
+    return estimate
+
+
+def hll_estimate_many(registers: np.ndarray) -> np.ndarray:
+    """
+    Estimasi kardinalitas untuk banyak sketch sekaligus (satu sketch per baris).
+    Hasilnya sama dengan hll_estimate per baris.
+    
+    Args:
+        registers: Array register uint8 berbentuk (n, 2^p)
+    
+    Returns:
+        Array float estimasi jumlah nilai unik per baris
+    """
+    m = registers.shape[1]
+    if m >= 128:
+        alpha = 0.7213 / (1 + 1.079 / m)
+    elif m == 64:
+        alpha = 0.709
+    elif m == 32:
+        alpha = 0.697
+    else:
+        alpha = 0.673
+    
+    estimates = alpha * m * m / _INV_POW2[registers].sum(axis=1)
+    zeros = np.count_nonzero(registers == 0, axis=1)
+    small = (estimates <= 2.5 * m) & (zeros > 0)
+    estimates[small] = m * np.log(m / zeros[small])
+    return estimates
+
+
+class HyperLogLog:
+    """
+    Sketch HyperLogLog untuk estimasi jumlah nilai unik dengan memori tetap.
+    
+    Memori = 2^p byte, tidak bergantung pada jumlah nilai yang dimasukkan.
+    Dua sketch dengan presisi sama dapat digabung (merge) dengan max register.
+    """
+    
+    def __init__(self, precision: Optional[int] = None, relative_error: float = 0.05):
+        """
+        Inisialisasi HyperLogLog.
+        
+        Args:
+            precision: Jumlah bit index (4 - 16); jika None dihitung dari error
+            relative_error: Error bound relatif yang diinginkan
+        """
+        self.precision = precision if precision is not None else precision_for_error(relative_error)
+        if not 4 <= self.precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.registers = np.zeros(1 << self.precision, dtype=np.uint8)
+    
+    @property
+    def relative_error(self) -> float:
+        """Standard error teoritis dari sketch ini."""
+        return 1.04 / math.sqrt(len(self.registers))
+    
+    def add(self, value) -> None:
+        """Menambahkan satu nilai."""
+        self.add_hash(stable_hash64(value))
+    
+    def add_hash(self, hash_value: int) -> None:
+        """Menambahkan nilai yang sudah di-hash (64-bit)."""
+        index, rank = hll_position(hash_value, self.precision)
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+    
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Menggabungkan sketch lain ke sketch ini (in-place)."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+    
+    def count(self) -> int:
+        """Estimasi jumlah nilai unik."""
+        return int(round(hll_estimate(self.registers)))
+    
+    def clear(self) -> None:
+        """Mereset semua register."""
+        self.registers[:] = 0
+    
+    def __len__(self) -> int:
+        return self.count()
+
+
+class SlidingHyperLogLog:
+    """
+    HyperLogLog yang dipartisi per irisan waktu (time slice).
+    
+    Window dibagi menjadi beberapa irisan; setiap irisan punya register
+    sendiri. Estimasi untuk window = merge irisan yang masih overlap dengan
+    window, sehingga nilai lama kedaluwarsa tanpa perlu operasi hapus.
+    Memori tetap: (slices + 1) * 2^p byte.
+    """
+    
+    def __init__(self, span_seconds: float, slices: int = 6, precision: int = 9):
+        """
+        Inisialisasi SlidingHyperLogLog.
+        
+        Args:
+            span_seconds: Panjang window dalam detik
+            slices: Jumlah irisan waktu per window
+            precision: Presisi HyperLogLog
+        """
+        self.span = float(span_seconds)
+        self.precision = precision
+        self.width = self.span / slices
+        # Satu irisan tambahan untuk irisan yang overlap sebagian
+        self._registers = np.zeros((slices + 1, 1 << precision), dtype=np.uint8)
+        self._labels = np.full(slices + 1, -1, dtype=np.int64)
+    
+    def add_hash(self, hash_value: int, timestamp: float) -> None:
+        """Menambahkan nilai (sudah di-hash) pada waktu tertentu."""
+        label = int(timestamp // self.width)
+        slot = label % len(self._labels)
+        current = self._labels[slot]
+        if current != label:
+            if current > label:
+                # Lebih tua dari ring, sudah di luar window
+                return
+            self._labels[slot] = label
+            self._registers[slot] = 0
+        
+        index, rank = hll_position(hash_value, self.precision)
+        if rank > self._registers[slot, index]:
+            self._registers[slot, index] = rank
+    
+    def count(self, now: float, span_seconds: Optional[float] = None) -> int:
+        """
+        Estimasi jumlah nilai unik dalam window yang berakhir di `now`.
+        
+        Args:
+            now: Waktu sekarang (epoch detik)
+            span_seconds: Panjang window (default: span sketch)
+        """
+        span = self.span if span_seconds is None else min(span_seconds, self.span)
+        first_label = int((now - span) // self.width)
+        mask = (self._labels >= first_label) & (self._labels <= int(now // self.width))
+        if not mask.any():
+            return 0
+        return int(round(hll_estimate(self._registers[mask].max(axis=0))))
+
+
+class SlidingCountMinSketch:
+    """
+    Count-Min Sketch yang dipartisi per irisan waktu.
+    
+    Mengestimasi frekuensi (atau total bobot) sebuah key dalam window
+    dengan memori tetap: (slices + 1) * depth * width counter.
+    Estimasi tidak pernah lebih kecil dari nilai sebenarnya; kelebihannya
+    dibatasi ~ e / width dari total bobot dalam window.
+    """
+    
+    def __init__(self, span_seconds: float, slices: int = 6, width: int = 2048, depth: int = 4):
+        """
+        Inisialisasi SlidingCountMinSketch.
+        
+        Args:
+            span_seconds: Panjang window dalam detik
+            slices: Jumlah irisan waktu per window
+            width: Jumlah counter per baris hash
+            depth: Jumlah baris hash
+        """
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be >= 1")
+        self.span = float(span_seconds)
+        self.width = width
+        self.depth = depth
+        self.slice_width = self.span / slices
+        self._rows = np.arange(depth)
+        self._counts = np.zeros((slices + 1, depth, width), dtype=np.int64)
+        self._labels = np.full(slices + 1, -1, dtype=np.int64)
+    
+    def _columns(self, hash_value: int) -> np.ndarray:
+        # Double hashing: kolom baris ke-i = h1 + i * h2 (mod width)
+        h1 = hash_value & 0xFFFFFFFF
+        h2 = (hash_value >> 32) | 1
+        return (h1 + self._rows * h2) % self.width
+    
+    def add_hash(self, hash_value: int, timestamp: float, weight: int = 1) -> None:
+        """Menambahkan bobot untuk key (sudah di-hash) pada waktu tertentu."""
+        label = int(timestamp // self.slice_width)
+        slot = label % len(self._labels)
+        current = self._labels[slot]
+        if current != label:
+            if current > label:
+                # Lebih tua dari ring, sudah di luar window
+                return
+            self._labels[slot] = label
+            self._counts[slot] = 0
+        self._counts[slot, self._rows, self._columns(hash_value)] += weight
+    
+    def estimate(self, hash_value: int, now: float) -> int:
+        """Estimasi total bobot key dalam window yang berakhir di `now`."""
+        first_label = int((now - self.span) // self.slice_width)
+        mask = (self._labels >= first_label) & (self._labels <= int(now // self.slice_width))
+        if not mask.any():
+            return 0
+        counts = self._counts[mask][:, self._rows, self._columns(hash_value)]
+        return int(counts.sum(axis=0).min())
+    
+    def clear(self) -> None:
+        """Mereset semua counter."""
+        self._counts[:] = 0
+        self._labels[:] = -1
+
+
+class DDSketchMapping:
+    """
+    Pemetaan nilai positif ke bucket logaritmik DDSketch.
+    
+    Bucket i (i >= 1) mencakup (min_value * gamma^(i-1), min_value * gamma^i]
+    dengan gamma = (1 + alpha) / (1 - alpha), sehingga nilai representatif
+    bucket punya error relatif <= alpha. Nilai <= min_value masuk bucket 0
+    dan nilai di atas max_value masuk bucket terakhir. Jumlah bucket tetap,
+    sehingga histogram padat (array NumPy) bisa dijumlahkan antar bucket
+    waktu / shard / proses.
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.02, min_value: float = 1.0, max_value: float = 1e6):
+        """
+        Inisialisasi mapping.
+        
+        Args:
+            relative_accuracy: Error relatif kuantil (alpha)
+            min_value: Batas bawah resolusi (misal 1 ms)
+            max_value: Batas atas resolusi
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if not 0 < min_value < max_value:
+            raise ValueError("min_value must be > 0 and < max_value")
+        
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = 1 + math.ceil(math.log(max_value / min_value) / self._log_gamma)
+        # Nilai representatif per bucket (titik tengah relatif bucket)
+        self._values = np.concatenate([
+            [min_value],
+            min_value * 2 * self.gamma ** np.arange(1, self.bins) / (self.gamma + 1)
+        ])
+    
+    def index(self, value: float) -> int:
+        """Bucket untuk satu nilai."""
+        if value <= self.min_value:
+            return 0
+        return min(self.bins - 1, math.ceil(math.log(value / self.min_value) / self._log_gamma))
+    
+    def indices(self, values: np.ndarray) -> np.ndarray:
+        """Versi vectorized dari index()."""
+        values = np.maximum(np.asarray(values, dtype=np.float64), self.min_value)
+        indices = np.ceil(np.log(values / self.min_value) / self._log_gamma).astype(np.int64)
+        return np.clip(indices, 0, self.bins - 1)
+    
+    def quantiles(self, counts: np.ndarray, qs: Sequence[float]) -> np.ndarray:
+        """
+        Kuantil dari histogram padat (panjang `bins`).
+        
+        Args:
+            counts: Jumlah nilai per bucket
+            qs: Kuantil yang diminta (0 - 1)
+        
+        Returns:
+            Array nilai kuantil (nol jika histogram kosong)
+        """
+        cumulative = np.cumsum(counts)
+        total = cumulative[-1] if len(cumulative) else 0
+        if not total:
+            return np.zeros(len(qs))
+        ranks = np.asarray(qs, dtype=np.float64) * (total - 1)
+        return self._values[np.searchsorted(cumulative, ranks, side='right')]
+
+
+# Mapping default untuk response time (ms): error relatif 2%, 1 ms - 1000 detik
+LATENCY_MAPPING = DDSketchMapping()
+
+
+class DDSketch:
+    """
+    DDSketch sparse untuk kuantil streaming (misal p95 response time).
+    
+    Hanya bucket yang terisi yang disimpan, sehingga memori mengikuti
+    sebaran nilai, bukan jumlah nilai. Berbeda dengan t-digest, bucket
+    bersifat tetap: nilai bisa dikeluarkan lagi (remove) tanpa kehilangan
+    akurasi dan dua sketch dengan mapping sama bisa digabung dengan
+    menjumlahkan bucket.
+    """
+    
+    __slots__ = ('mapping', 'count', '_counts')
+    
+    def __init__(self, mapping: Optional[DDSketchMapping] = None):
+        """
+        Inisialisasi DDSketch.
+        
+        Args:
+            mapping: Mapping bucket (default: LATENCY_MAPPING)
+        """
+        self.mapping = mapping if mapping is not None else LATENCY_MAPPING
+        self.count = 0
+        self._counts: Dict[int, int] = {}
+    
+    def add(self, value: float, count: int = 1) -> None:
+        """Menambahkan nilai."""
+        index = self.mapping.index(value)
+        self._counts[index] = self._counts.get(index, 0) + count
+        self.count += count
+    
+    def remove(self, value: float, count: int = 1) -> None:
+        """Mengeluarkan nilai yang sebelumnya ditambahkan."""
+        index = self.mapping.index(value)
+        remaining = self._counts[index] - count
+        if remaining:
+            self._counts[index] = remaining
+        else:
+            del self._counts[index]
+        self.count -= count
+    
+    def merge(self, other: 'DDSketch') -> 'DDSketch':
+        """Menggabungkan sketch lain ke sketch ini (in-place)."""
+        if other.mapping is not self.mapping:
+            raise ValueError("Cannot merge DDSketch with different mapping")
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+        self.count += other.count
+        return self
+    
+    def to_histogram(self) -> np.ndarray:
+        """Histogram padat (panjang mapping.bins)."""
+        histogram = np.zeros(self.mapping.bins, dtype=np.int64)
+        if self._counts:
+            histogram[list(self._counts)] = list(self._counts.values())
+        return histogram
+    
+    def quantile(self, q: float) -> float:
+        """
+        Estimasi kuantil q (0 - 1), error relatif <= mapping.relative_accuracy.
+        
+        Returns:
+            Nilai kuantil (0.0 jika sketch kosong)
+        """
+        return self.quantiles((q,))[0]
+    
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Beberapa kuantil sekaligus (satu kali iterasi bucket)."""
+        if not self.count:
+            return [0.0] * len(qs)
+        ranks = [q * (self.count - 1) for q in qs]
+        results = [None] * len(qs)
+        pending = sorted(range(len(qs)), key=lambda i: ranks[i])
+        cumulative = 0
+        for index in sorted(self._counts):
+            cumulative += self._counts[index]
+            while pending and cumulative > ranks[pending[0]]:
+                results[pending.pop(0)] = float(self.mapping._values[index])
+            if not pending:
+                break
+        for i in pending:
+            results[i] = float(self.mapping._values[max(self._counts)])
+        return results
+    
+    def clear(self) -> None:
+        """Mengosongkan sketch."""
+        self._counts.clear()
+        self.count = 0
@@ -27,358 +27,3444 @@ Original Contributors / Legacy Team:
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from collections import deque
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import heapq
+import ipaddress
+import math
+import os
+import re
 import threading
+import time
+import zlib
+from contextlib import ExitStack
+
+from sketches import (
+    LATENCY_MAPPING,
+    DDSketch,
+    SlidingCountMinSketch,
+    SlidingHyperLogLog,
+    hll_estimate,
+    hll_position,
+    precision_for_error,
+    stable_hash64
+)
+from url_templates import UrlTemplateNormalizer
+
+
+# Field record ringkas untuk snapshot / write-ahead log (timestamp = epoch detik)
+LOG_RECORD_FIELDS = ('timestamp', 'ip_address', 'method', 'url', 'status_code', 'response_time', 'user_agent')
+
+# Window yang selalu ada (dipakai FEATURE_ORDER, statistik dan dashboard)
+DEFAULT_WINDOWS = ('1min', '5min', '10min')
+
+_WINDOW_UNITS = {'s': 1, 'min': 60, 'h': 3600}
+
+
+def parse_window_key(window_key: str) -> timedelta:
+    """
+    Mengkonversi key window seperti '10s', '30s', '5min' atau '1h' menjadi timedelta.
+    
+    Args:
+        window_key: Angka bulat positif diikuti satuan 's', 'min' atau 'h'
+    
+    Returns:
+        Panjang window
+    """
+    match = re.fullmatch(r'(\d+)(s|min|h)', str(window_key))
+    if match is None or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid window key: {window_key!r} (expected e.g. '10s', '5min', '1h')")
+    return timedelta(seconds=int(match.group(1)) * _WINDOW_UNITS[match.group(2)])
+
+
+# Panjang prefix subnet per versi IP: (subnet, wide_subnet)
+SUBNET_PREFIXES = {4: (24, 16), 6: (64, 48)}
+
+# Nama level subnet pada fitur (subnet_req_count_1min, wide_subnet_req_count_1min)
+SUBNET_LEVELS = ('subnet', 'wide_subnet')
+
+
+@lru_cache(maxsize=65536)
+def subnet_prefixes(ip_address: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    Mengambil subnet sebuah IP untuk setiap level di SUBNET_LEVELS.
+    
+    Args:
+        ip_address: Alamat IPv4 atau IPv6
+    
+    Returns:
+        Tuple (subnet, wide_subnet), misal ('10.1.2.0/24', '10.1.0.0/16'),
+        atau None jika alamat tidak valid
+    """
+    if not ip_address:
+        return None
+    
+    # Fast path IPv4 tanpa membuat objek ipaddress
+    parts = ip_address.split('.')
+    if len(parts) == 4 and all(part.isdigit() and int(part) < 256 for part in parts):
+        return f'{parts[0]}.{parts[1]}.{parts[2]}.0/24', f'{parts[0]}.{parts[1]}.0.0/16'
+    
+    try:
+        address = ipaddress.ip_address(ip_address)
+    except ValueError:
+        return None
+    return tuple(
+        str(ipaddress.ip_network(f'{address}/{length}', strict=False))
+        for length in SUBNET_PREFIXES[address.version]
+    )
+
+
+class _LogEvent:
+    """
+    Representasi ringkas satu log yang sudah dinormalisasi.
+    
+    Nilai turunan (error, bytes, dll) dihitung sekali saat insert sehingga
+    penambahan dan pengurangan agregat selalu simetris, walaupun dictionary
+    milik caller diubah setelah masuk ke buffer. Timestamp disimpan sebagai
+    epoch float (detik). Status code yang sudah dinormalisasi (null = 200)
+    disimpan di event; backend storage membacanya dari sini, bukan dari
+    dictionary log.
+    """
+    
+    __slots__ = ('timestamp', 'ip', 'method', 'url', 'is_error',
+                 'response_time', 'nbytes', 'log', 'status_code')
+    
+    def __init__(self, timestamp: float, ip: Optional[str], method: str, url: str,
+                 is_error: bool, response_time: float, nbytes: int,
+                 log: Optional[Dict] = None, status_code: Optional[int] = None):
+        self.timestamp = timestamp
+        self.ip = ip
+        self.method = method
+        self.url = url
+        self.is_error = is_error
+        self.response_time = response_time
+        self.nbytes = nbytes
+        self.log = log
+        self.status_code = status_code if status_code is not None else (500 if is_error else 200)
+    
+    @classmethod
+    def from_log(cls, log_data: Dict, timestamp: float) -> '_LogEvent':
+        """Membuat event dari dictionary log server."""
+        url = log_data.get('url', '')
+        user_agent = log_data.get('user_agent', '')
+        status_code = int(log_data.get('status_code') or 200)
+        
+        return cls(
+            timestamp=timestamp,
+            ip=log_data.get('ip_address'),
+            method=log_data.get('method', 'GET'),
+            url=url,
+            is_error=status_code >= 400,
+            response_time=float(log_data.get('response_time') or 0),
+            # Estimasi sederhana: URL + user agent + 200 untuk HTTP headers dasar
+            nbytes=len(url) + len(user_agent) + 200,
+            log=log_data,
+            status_code=status_code
+        )
+    
+    @classmethod
+    def from_record(cls, record: Tuple) -> '_LogEvent':
+        """Membuat event dari record ringkas (LOG_RECORD_FIELDS) hasil snapshot / WAL."""
+        timestamp, ip, method, url, status_code, response_time, user_agent = record
+        method = method or 'GET'
+        url = url or ''
+        user_agent = user_agent or ''
+        status_code = int(status_code) if status_code is not None else 200
+        response_time = float(response_time or 0)
+        
+        log_data = {
+            'timestamp': datetime.fromtimestamp(timestamp),
+            'ip_address': ip,
+            'method': method,
+            'url': url,
+            'status_code': status_code,
+            'response_time': response_time,
+            'user_agent': user_agent,
+        }
+        return cls(timestamp, ip, method, url, status_code >= 400, response_time,
+                   len(url) + len(user_agent) + 200, log_data, status_code)
+
+
+class _DistinctCounter:
+    """
+    Penghitung jumlah nilai unik (misal URL) dalam satu window.
+    
+    Selama jumlah nilai unik masih kecil, counter menyimpan multiset exact
+    (nilai -> [jumlah, last_seen]). Jika melewati `exact_limit`, counter
+    beralih ke SlidingHyperLogLog sehingga memori tetap walaupun penyerang
+    melakukan enumerasi puluhan ribu path.
+    """
+    
+    __slots__ = ('span', 'exact_limit', 'precision', '_exact', '_sketch')
+    
+    def __init__(self, span: float, exact_limit: int, precision: int):
+        self.span = span
+        self.exact_limit = exact_limit
+        self.precision = precision
+        self._exact: Optional[Dict[str, List[float]]] = {}
+        self._sketch: Optional[SlidingHyperLogLog] = None
+    
+    @property
+    def is_sketch(self) -> bool:
+        """True jika counter sudah beralih ke HyperLogLog."""
+        return self._sketch is not None
+    
+    def add(self, value: str, timestamp: float) -> None:
+        """Mencatat satu kemunculan nilai."""
+        if self._sketch is not None:
+            self._sketch.add_hash(stable_hash64(value), timestamp)
+            return
+        
+        entry = self._exact.get(value)
+        if entry is None:
+            self._exact[value] = [1, timestamp]
+            if len(self._exact) > self.exact_limit:
+                self._switch_to_sketch()
+        else:
+            entry[0] += 1
+            if timestamp > entry[1]:
+                entry[1] = timestamp
+    
+    def remove(self, value: str) -> None:
+        """
+        Menghapus satu kemunculan (mode exact). Pada mode sketch, nilai
+        kedaluwarsa otomatis lewat irisan waktu.
+        """
+        if self._sketch is not None:
+            return
+        
+        entry = self._exact[value]
+        entry[0] -= 1
+        if not entry[0]:
+            del self._exact[value]
+    
+    def count(self, now: float) -> int:
+        """Jumlah nilai unik dalam window yang berakhir di `now`."""
+        if self._sketch is not None:
+            return self._sketch.count(now)
+        return len(self._exact)
+    
+    def _switch_to_sketch(self) -> None:
+        # Kemunculan terakhir menentukan kapan nilai keluar dari window
+        sketch = SlidingHyperLogLog(self.span, precision=self.precision)
+        for value, (_, last_seen) in self._exact.items():
+            sketch.add_hash(stable_hash64(value), last_seen)
+        self._sketch = sketch
+        self._exact = None
+
+
+class _WindowAggregate:
+    """
+    Agregat berjalan (running aggregate) untuk satu IP dalam satu window.
+    
+    Diperbarui secara inkremental saat log masuk ke window dan saat log
+    keluar dari window, sehingga pembacaan fitur tidak perlu scan buffer.
+    """
+    
+    __slots__ = ('count', 'error_count', 'response_time_sum', 'bytes_sum',
+                 'method_counts', 'urls', 'routes', 'latency', 'since', 'last_seen')
+    
+    def __init__(
+        self,
+        urls: Optional[_DistinctCounter] = None,
+        routes: Optional[_DistinctCounter] = None,
+        latency: Optional[DDSketch] = None
+    ):
+        self.count = 0
+        self.error_count = 0
+        self.response_time_sum = 0.0
+        self.bytes_sum = 0
+        self.method_counts: Dict[str, int] = {}
+        # None = URL unik tidak dilacak (agregat global memakai time wheel)
+        self.urls = urls
+        # Route template unik (hanya jika window memakai url_normalizer)
+        self.routes = routes
+        # Sketch kuantil response time (hanya jika window memakai latency_quantiles)
+        self.latency = latency
+        # Event sebelum `since` tidak masuk agregat (IP dipromosikan dari sketch)
+        self.since = float('-inf')
+        # Timestamp event terbaru (untuk deadline idle janitor)
+        self.last_seen = float('-inf')
+    
+    def add(self, event: _LogEvent, route: Optional[str] = None) -> None:
+        """Memasukkan satu event (dan route template-nya) ke agregat."""
+        self.count += 1
+        if event.timestamp > self.last_seen:
+            self.last_seen = event.timestamp
+        self.error_count += event.is_error
+        self.response_time_sum += event.response_time
+        self.bytes_sum += event.nbytes
+        self.method_counts[event.method] = self.method_counts.get(event.method, 0) + 1
+        if self.urls is not None:
+            self.urls.add(event.url, event.timestamp)
+        if self.routes is not None:
+            self.routes.add(route, event.timestamp)
+        if self.latency is not None:
+            self.latency.add(event.response_time)
+    
+    def remove(self, event: _LogEvent, route: Optional[str] = None) -> None:
+        """Mengeluarkan satu event dari agregat (kebalikan dari add)."""
+        self.count -= 1
+        self.error_count -= event.is_error
+        self.bytes_sum -= event.nbytes
+        if self.count == 0:
+            # Reset agar floating-point drift tidak terakumulasi
+            self.response_time_sum = 0.0
+        else:
+            self.response_time_sum -= event.response_time
+        
+        remaining = self.method_counts[event.method] - 1
+        if remaining:
+            self.method_counts[event.method] = remaining
+        else:
+            del self.method_counts[event.method]
+        
+        if self.urls is not None:
+            self.urls.remove(event.url)
+        if self.routes is not None:
+            self.routes.remove(route)
+        if self.latency is not None:
+            self.latency.remove(event.response_time)
+    
+    def method_entropy(self) -> float:
+        """
+        Entropi distribusi method dari histogram.
+        Histogram hanya berisi beberapa method sehingga biayanya konstan.
+        """
+        if not self.count:
+            return 0.0
+        
+        entropy = 0.0
+        for count in self.method_counts.values():
+            p = count / self.count
+            entropy -= p * np.log2(p)
+        return entropy
+
+
+class _SubnetAggregate:
+    """
+    Counter berjalan untuk satu subnet dalam satu window (request, error
+    dan, untuk level subnet terkecil, jumlah request per IP anggota).
+    """
+    
+    __slots__ = ('count', 'error_count', 'ips', 'since')
+    
+    def __init__(self, track_ips: bool):
+        self.count = 0
+        self.error_count = 0
+        self.ips: Optional[Dict[str, int]] = {} if track_ips else None
+        # Event sebelum `since` dihitung di sketch (tabel subnet sempat penuh)
+        self.since = float('-inf')
+    
+    def add(self, event: _LogEvent) -> None:
+        """Memasukkan satu event ke counter subnet."""
+        self.count += 1
+        self.error_count += event.is_error
+        if self.ips is not None:
+            self.ips[event.ip] = self.ips.get(event.ip, 0) + 1
+    
+    def remove(self, event: _LogEvent) -> None:
+        """Mengeluarkan satu event dari counter subnet."""
+        self.count -= 1
+        self.error_count -= event.is_error
+        if self.ips is not None:
+            remaining = self.ips[event.ip] - 1
+            if remaining:
+                self.ips[event.ip] = remaining
+            else:
+                del self.ips[event.ip]
+
+
+# (level, window) yang dibaca _subnet_feature_dict
+SUBNET_FEATURE_TOTALS = ((0, '1min'), (0, '5min'), (1, '1min'))
+
+
+def _subnet_feature_dict(totals) -> Dict:
+    """
+    Menyusun fitur subnet dari fungsi totals(level, window_key) yang
+    mengembalikan (request, error, IP unik).
+    """
+    count_1min, errors_1min, unique_ips_1min = totals(0, '1min')
+    return {
+        'subnet_req_count_1min': count_1min,
+        'subnet_req_count_5min': totals(0, '5min')[0],
+        'subnet_error_rate_1min': round(errors_1min / count_1min, 4) if count_1min else 0.0,
+        'subnet_unique_ips_1min': unique_ips_1min,
+        'wide_subnet_req_count_1min': totals(1, '1min')[0],
+    }
+
+
+class _PublishedTotals:
+    """
+    Salinan read-only agregat global sebuah shard pada waktu `time`.
+    
+    Dibuat ulang (bukan diubah) oleh shard pemiliknya dengan lock dipegang,
+    lalu dipasang dengan satu assignment atribut, sehingga shard lain bisa
+    membacanya tanpa lock.
+    """
+    
+    __slots__ = ('time', 'ip_registers', 'latency', 'subnets')
+    
+    def __init__(
+        self,
+        time: float,
+        ip_registers: Dict[str, np.ndarray],
+        latency: Optional[Dict[str, np.ndarray]],
+        subnets: Optional[Dict[Tuple[int, str], Dict[str, Tuple[int, int, int]]]]
+    ):
+        self.time = time
+        # Register HyperLogLog IP per window
+        self.ip_registers = ip_registers
+        # Histogram response time per window (jika latency_quantiles)
+        self.latency = latency
+        # {(level, window): {prefix: (request, error, IP unik)}} untuk
+        # SUBNET_FEATURE_TOTALS; subnet di sketch tidak ikut disalin
+        self.subnets = subnets
+    
+    def subnet_totals(self, level: int, prefix: str, window_key: str) -> Tuple[int, int, int]:
+        """(request, error, IP unik) subnet pada saat salinan dibuat."""
+        if self.subnets is None:
+            return 0, 0, 0
+        return self.subnets.get((level, window_key), {}).get(prefix, (0, 0, 0))
+
+
+class _LogStore:
+    """
+    Buffer log terurut berdasarkan timestamp dengan alamat sequence absolut.
+    
+    Setiap log mendapat nomor sequence yang tidak berubah selama log masih
+    berada di buffer (kecuali log out-of-order yang disisipkan di tengah),
+    sehingga tiap window cukup menyimpan pointer "head" ke log pertamanya.
+    Akses dengan index relatif mengembalikan dictionary log asli.
+    """
+    
+    # Compaction dilakukan setelah sejumlah slot depan kosong
+    COMPACT_THRESHOLD = 4096
+    
+    def __init__(self):
+        self._events: List[Optional[_LogEvent]] = []
+        self._start = 0
+        self.first_seq = 0
+    
+    @property
+    def end_seq(self) -> int:
+        """Sequence satu posisi setelah log terakhir."""
+        return self.first_seq + len(self._events) - self._start
+    
+    def __len__(self) -> int:
+        return len(self._events) - self._start
+    
+    def __getitem__(self, index: int) -> Dict:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('log store index out of range')
+        return self._log_for(self._events[self._start + index])
+    
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(self._start, len(self._events)):
+            yield self._log_for(self._events[i])
+    
+    def _log_for(self, event: _LogEvent) -> Dict:
+        return event.log
+    
+    def _record_for(self, event: _LogEvent) -> Tuple:
+        return (event.timestamp, event.ip, event.method, event.url,
+                event.status_code, event.response_time,
+                event.log.get('user_agent', ''))
+    
+    def event_at(self, seq: int) -> _LogEvent:
+        """Mengambil event berdasarkan sequence absolut."""
+        return self._events[self._start + seq - self.first_seq]
+    
+    def timestamp_at(self, seq: int) -> float:
+        """Timestamp (epoch detik) event pada sequence absolut."""
+        return self._events[self._start + seq - self.first_seq].timestamp
+    
+    def events_between(self, lo: int, hi: int) -> Iterator[_LogEvent]:
+        """Iterasi event dengan sequence dalam [lo, hi)."""
+        offset = self._start - self.first_seq
+        for i in range(lo + offset, hi + offset):
+            yield self._events[i]
+    
+    def logs_between(self, lo: int, hi: int) -> List[Dict]:
+        """Dictionary log untuk sequence dalam [lo, hi)."""
+        return [self._log_for(event) for event in self.events_between(lo, hi)]
+    
+    def records_between(self, lo: int, hi: int) -> List[Tuple]:
+        """Record ringkas (lihat LOG_RECORD_FIELDS) untuk sequence dalam [lo, hi)."""
+        return [self._record_for(event) for event in self.events_between(lo, hi)]
+    
+    def insert(self, event: _LogEvent) -> int:
+        """
+        Menyisipkan event dengan menjaga urutan timestamp.
+        Kasus umum (timestamp naik) adalah append O(1).
+        
+        Returns:
+            Sequence tempat event disimpan
+        """
+        events = self._events
+        pos = len(events)
+        while pos > self._start and events[pos - 1].timestamp > event.timestamp:
+            pos -= 1
+        events.insert(pos, event)
+        return self.first_seq + pos - self._start
+    
+    def first_seq_at_or_after(self, cutoff: float, lo: int) -> int:
+        """
+        Mencari sequence pertama (mulai dari lo) dengan timestamp >= cutoff.
+        Biaya amortized O(1) karena pointer hanya bergerak maju.
+        """
+        events = self._events
+        i = self._start + max(lo, self.first_seq) - self.first_seq
+        end = len(events)
+        while i < end and events[i].timestamp < cutoff:
+            i += 1
+        return self.first_seq + i - self._start
+    
+    def drop_before(self, seq: int) -> None:
+        """Membuang semua event dengan sequence < seq."""
+        events = self._events
+        stop = self._start + seq - self.first_seq
+        for i in range(self._start, stop):
+            events[i] = None
+        self.first_seq += stop - self._start
+        self._start = stop
+        
+        if self._start >= self.COMPACT_THRESHOLD and self._start * 2 >= len(events):
+            del events[:self._start]
+            self._start = 0
+    
+    def clear(self) -> None:
+        """Mengosongkan store tanpa mereset sequence."""
+        self.first_seq = self.end_seq
+        self._events = []
+        self._start = 0
+
+
+class _StringInterner:
+    """
+    Tabel interning string -> id integer kecil dengan reference counting.
+    
+    Id yang refcount-nya turun ke nol dikembalikan ke free list sehingga
+    ukuran tabel mengikuti jumlah string yang masih dipakai buffer.
+    """
+    
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._strings: List[Optional[str]] = []
+        self._refcounts: List[int] = []
+        self._free: List[int] = []
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def intern(self, value: str) -> int:
+        """Mengambil id untuk string (dan menambah refcount-nya)."""
+        string_id = self._ids.get(value)
+        if string_id is None:
+            if self._free:
+                string_id = self._free.pop()
+                self._strings[string_id] = value
+                self._refcounts[string_id] = 0
+            else:
+                string_id = len(self._strings)
+                self._strings.append(value)
+                self._refcounts.append(0)
+            self._ids[value] = string_id
+        self._refcounts[string_id] += 1
+        return string_id
+    
+    def lookup(self, string_id: int) -> str:
+        """Mengambil string dari id."""
+        return self._strings[string_id]
+    
+    def canonical(self, value: str) -> str:
+        """Mengambil objek string milik tabel untuk value (dan menambah refcount-nya)."""
+        return self._strings[self.intern(value)]
+    
+    def _decrement(self, string_id: int, count: int) -> None:
+        self._refcounts[string_id] -= count
+        if self._refcounts[string_id] == 0:
+            del self._ids[self._strings[string_id]]
+            self._strings[string_id] = None
+            self._free.append(string_id)
+    
+    def release(self, value: str) -> None:
+        """Mengurangi refcount string berdasarkan nilainya."""
+        self._decrement(self._ids[value], 1)
+    
+    def release_many(self, string_ids: np.ndarray) -> None:
+        """Mengurangi refcount untuk sekumpulan id (boleh berulang)."""
+        if len(string_ids) == 0:
+            return
+        unique_ids, counts = np.unique(string_ids, return_counts=True)
+        for string_id, count in zip(unique_ids.tolist(), counts.tolist()):
+            self._decrement(string_id, count)
+    
+    def clear(self) -> None:
+        """Mengosongkan tabel."""
+        self._ids.clear()
+        self._strings.clear()
+        self._refcounts.clear()
+        self._free.clear()
+
+
+class _CompactLogEvent(_LogEvent):
+    """
+    _LogEvent tanpa dictionary log asli: user agent disimpan sebagai slot
+    sehingga dictionary bisa direkonstruksi.
+    """
+    
+    __slots__ = ('user_agent',)
+    
+    def __init__(self, timestamp: float, ip: Optional[str], method: str, url: str,
+                 is_error: bool, response_time: float, nbytes: int,
+                 status_code: int, user_agent: str):
+        super().__init__(timestamp, ip, method, url, is_error, response_time, nbytes,
+                         status_code=status_code)
+        self.user_agent = user_agent
+
+
+class _CompactLogStore(_LogStore):
+    """
+    Varian _LogStore yang tidak menyimpan dictionary log asli.
+    
+    IP, method, URL, user agent dan status code diinterning dengan reference
+    counting sehingga log dengan nilai yang sama berbagi satu objek, dan
+    setiap log disimpan sebagai _CompactLogEvent (__slots__). Nilai dilepas
+    dari tabel interning saat log keluar dari buffer. Dictionary log
+    direkonstruksi saat dibaca (get_logs_in_window), sama seperti backend
+    'columnar'.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._interner = _StringInterner()
+    
+    @property
+    def interned_values(self) -> int:
+        """Jumlah nilai unik yang sedang dipakai buffer."""
+        return len(self._interner)
+    
+    def _log_for(self, event: _CompactLogEvent) -> Dict:
+        return {
+            'timestamp': datetime.fromtimestamp(event.timestamp),
+            'ip_address': event.ip,
+            'method': event.method,
+            'url': event.url,
+            'user_agent': event.user_agent,
+            'status_code': event.status_code,
+            'response_time': event.response_time,
+        }
+    
+    def _record_for(self, event: _CompactLogEvent) -> Tuple:
+        return (event.timestamp, event.ip, event.method, event.url,
+                event.status_code, event.response_time, event.user_agent)
+    
+    def insert(self, event: _LogEvent) -> int:
+        """Menyisipkan versi ringkas event (lihat _LogStore.insert)."""
+        log = event.log or {}
+        canonical = self._interner.canonical
+        compact = _CompactLogEvent(
+            timestamp=event.timestamp,
+            ip=canonical(event.ip),
+            method=canonical(event.method),
+            url=canonical(event.url),
+            is_error=event.is_error,
+            response_time=event.response_time,
+            nbytes=event.nbytes,
+            status_code=canonical(event.status_code),
+            user_agent=canonical(log.get('user_agent', ''))
+        )
+        return super().insert(compact)
+    
+    def drop_before(self, seq: int) -> None:
+        """Membuang semua event dengan sequence < seq dan melepas nilai interning."""
+        release = self._interner.release
+        for event in self.events_between(self.first_seq, seq):
+            release(event.ip)
+            release(event.method)
+            release(event.url)
+            release(event.status_code)
+            release(event.user_agent)
+        super().drop_before(seq)
+    
+    def clear(self) -> None:
+        """Mengosongkan store tanpa mereset sequence."""
+        super().clear()
+        self._interner.clear()
+
+
+class _ColumnarLogStore:
+    """
+    Backend penyimpanan kolumnar untuk buffer sliding window.
+    
+    Log disimpan sebagai kolom NumPy yang dialokasikan di awal (timestamp
+    epoch float, id IP/method/URL/user agent hasil interning, status code,
+    response time, estimasi bytes), sekitar 40 byte per log dibanding ~1 KB
+    untuk dictionary Python. Kolom timestamp selalu terurut sehingga batas
+    window dicari dengan np.searchsorted. Antarmukanya sama dengan _LogStore.
+    """
+    
+    DEFAULT_CAPACITY = 65536
+    
+    COLUMNS = (
+        ('timestamp', np.float64),
+        ('ip', np.int32),
+        ('method', np.int32),
+        ('url', np.int32),
+        ('user_agent', np.int32),
+        ('status_code', np.int32),
+        ('response_time', np.float64),
+        ('nbytes', np.int32),
+    )
+    
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._capacity = max(1, int(capacity))
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.empty(self._capacity, dtype=dtype) for name, dtype in self.COLUMNS
+        }
+        self._start = 0
+        self._end = 0
+        self.first_seq = 0
+        
+        # IP None disimpan sebagai id -1
+        self._interners: Dict[str, _StringInterner] = {
+            'ip': _StringInterner(),
+            'method': _StringInterner(),
+            'url': _StringInterner(),
+            'user_agent': _StringInterner(),
+        }
+    
+    @property
+    def end_seq(self) -> int:
+        """Sequence satu posisi setelah log terakhir."""
+        return self.first_seq + self._end - self._start
+    
+    @property
+    def nbytes(self) -> int:
+        """Memori yang dialokasikan untuk kolom (byte)."""
+        return sum(column.nbytes for column in self._columns.values())
+    
+    def __len__(self) -> int:
+        return self._end - self._start
+    
+    def __getitem__(self, index: int) -> Dict:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('log store index out of range')
+        return self.logs_between(self.first_seq + index, self.first_seq + index + 1)[0]
+    
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.logs_between(self.first_seq, self.end_seq))
+    
+    def _slice(self, name: str, lo: int, hi: int) -> np.ndarray:
+        offset = self._start - self.first_seq
+        return self._columns[name][lo + offset:hi + offset]
+    
+    def _ensure_capacity(self) -> None:
+        """Compaction ke depan atau perbesar kolom saat slot belakang habis."""
+        if self._end < self._capacity:
+            return
+        
+        size = self._end - self._start
+        if size * 2 > self._capacity:
+            self._capacity *= 2
+        
+        for name, dtype in self.COLUMNS:
+            column = np.empty(self._capacity, dtype=dtype)
+            column[:size] = self._columns[name][self._start:self._end]
+            self._columns[name] = column
+        self._start = 0
+        self._end = size
+    
+    def _decode_ip(self, ip_id: int) -> Optional[str]:
+        return None if ip_id < 0 else self._interners['ip'].lookup(ip_id)
+    
+    def event_at(self, seq: int) -> _LogEvent:
+        """Mengambil event berdasarkan sequence absolut."""
+        return next(self.events_between(seq, seq + 1))
+    
+    def timestamp_at(self, seq: int) -> float:
+        """Timestamp (epoch detik) event pada sequence absolut."""
+        return float(self._columns['timestamp'][self._start + seq - self.first_seq])
+    
+    def events_between(self, lo: int, hi: int) -> Iterator[_LogEvent]:
+        """Iterasi event dengan sequence dalam [lo, hi)."""
+        if hi <= lo:
+            return
+        columns = {name: self._slice(name, lo, hi).tolist() for name, _ in self.COLUMNS}
+        methods = self._interners['method']
+        urls = self._interners['url']
+        
+        for i in range(hi - lo):
+            yield _LogEvent(
+                timestamp=columns['timestamp'][i],
+                ip=self._decode_ip(columns['ip'][i]),
+                method=methods.lookup(columns['method'][i]),
+                url=urls.lookup(columns['url'][i]),
+                is_error=columns['status_code'][i] >= 400,
+                response_time=columns['response_time'][i],
+                nbytes=columns['nbytes'][i],
+                status_code=columns['status_code'][i]
+            )
+    
+    def logs_between(self, lo: int, hi: int) -> List[Dict]:
+        """Rekonstruksi dictionary log untuk sequence dalam [lo, hi)."""
+        if hi <= lo:
+            return []
+        columns = {name: self._slice(name, lo, hi).tolist() for name, _ in self.COLUMNS}
+        interners = self._interners
+        
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(columns['timestamp'][i]),
+                'ip_address': self._decode_ip(columns['ip'][i]),
+                'method': interners['method'].lookup(columns['method'][i]),
+                'url': interners['url'].lookup(columns['url'][i]),
+                'user_agent': interners['user_agent'].lookup(columns['user_agent'][i]),
+                'status_code': columns['status_code'][i],
+                'response_time': columns['response_time'][i],
+            }
+            for i in range(hi - lo)
+        ]
+    
+    def records_between(self, lo: int, hi: int) -> List[Tuple]:
+        """Record ringkas (lihat LOG_RECORD_FIELDS) untuk sequence dalam [lo, hi)."""
+        if hi <= lo:
+            return []
+        columns = {name: self._slice(name, lo, hi).tolist() for name, _ in self.COLUMNS}
+        interners = self._interners
+        
+        return [
+            (columns['timestamp'][i], self._decode_ip(columns['ip'][i]),
+             interners['method'].lookup(columns['method'][i]),
+             interners['url'].lookup(columns['url'][i]),
+             columns['status_code'][i], columns['response_time'][i],
+             interners['user_agent'].lookup(columns['user_agent'][i]))
+            for i in range(hi - lo)
+        ]
+    
+    def insert(self, event: _LogEvent) -> int:
+        """
+        Menyisipkan event dengan menjaga urutan kolom timestamp.
+        
+        Returns:
+            Sequence tempat event disimpan
+        """
+        self._ensure_capacity()
+        columns = self._columns
+        timestamps = columns['timestamp']
+        
+        if self._end > self._start and timestamps[self._end - 1] > event.timestamp:
+            pos = self._start + int(np.searchsorted(
+                timestamps[self._start:self._end], event.timestamp, side='right'))
+            for column in columns.values():
+                column[pos + 1:self._end + 1] = column[pos:self._end]
+        else:
+            pos = self._end
+        
+        log = event.log or {}
+        interners = self._interners
+        columns['timestamp'][pos] = event.timestamp
+        columns['ip'][pos] = -1 if event.ip is None else interners['ip'].intern(event.ip)
+        columns['method'][pos] = interners['method'].intern(event.method)
+        columns['url'][pos] = interners['url'].intern(event.url)
+        columns['user_agent'][pos] = interners['user_agent'].intern(log.get('user_agent', ''))
+        columns['status_code'][pos] = event.status_code
+        columns['response_time'][pos] = event.response_time
+        columns['nbytes'][pos] = event.nbytes
+        self._end += 1
+        
+        return self.first_seq + pos - self._start
+    
+    def first_seq_at_or_after(self, cutoff: float, lo: int) -> int:
+        """Batas window via np.searchsorted pada kolom timestamp."""
+        lo = max(lo, self.first_seq)
+        timestamps = self._slice('timestamp', lo, self.end_seq)
+        return lo + int(np.searchsorted(timestamps, cutoff, side='left'))
+    
+    def count_since(self, cutoff: float) -> int:
+        """Jumlah log dengan timestamp >= cutoff (vectorized)."""
+        return self.end_seq - self.first_seq_at_or_after(cutoff, self.first_seq)
+    
+    def drop_before(self, seq: int) -> None:
+        """Membuang semua event dengan sequence < seq dan melepas id string."""
+        if seq <= self.first_seq:
+            return
+        ip_ids = self._slice('ip', self.first_seq, seq)
+        self._interners['ip'].release_many(ip_ids[ip_ids >= 0])
+        for name in ('method', 'url', 'user_agent'):
+            self._interners[name].release_many(self._slice(name, self.first_seq, seq))
+        
+        self._start += seq - self.first_seq
+        self.first_seq = seq
+    
+    def clear(self) -> None:
+        """Mengosongkan store tanpa mereset sequence."""
+        self.first_seq = self.end_seq
+        self._start = self._end = 0
+        for interner in self._interners.values():
+            interner.clear()
+
+
+class _TimeWheel:
+    """
+    Ring bucket per detik untuk metrik global (semua IP).
+    
+    Setiap slot menyimpan jumlah request, jumlah error, total response time,
+    histogram response time (bucket DDSketch, untuk p50/p95/p99), histogram
+    method serta register HyperLogLog untuk URL dan IP unik dalam satu detik. Slot dipakai ulang secara lazy:
+    label detik yang berbeda berarti slot tersebut sudah kedaluwarsa.
+    Semua metrik global dihitung dengan fold vectorized atas maksimal
+    `horizon_seconds` slot, tidak bergantung pada ukuran buffer.
+    
+    Tidak punya lock sendiri: window_registers/latency_histogram menulis
+    cache merge, sehingga pembacaan pun harus memegang lock window pemiliknya.
+    """
+    
+    def __init__(self, horizon_seconds: int = 600, precision: int = 9):
+        self.size = max(1, int(horizon_seconds))
+        self.precision = precision
+        self._method_ids: Dict[str, int] = {}
+        self._method_names: List[str] = []
+        # Register HLL / histogram latency gabungan detik-detik yang sudah lewat, per (field, window)
+        self._merged_registers: Dict[Tuple[str, int], Tuple[int, np.ndarray]] = {}
+        self._allocate(method_slots=8)
+    
+    def _allocate(self, method_slots: int) -> None:
+        self._seconds = np.full(self.size, -1, dtype=np.int64)
+        self._counts = np.zeros(self.size, dtype=np.int64)
+        self._errors = np.zeros(self.size, dtype=np.int64)
+        self._response_time_sums = np.zeros(self.size, dtype=np.float64)
+        self._latency_counts = np.zeros((self.size, LATENCY_MAPPING.bins), dtype=np.int32)
+        self._method_counts = np.zeros((self.size, method_slots), dtype=np.int64)
+        self._url_registers = np.zeros((self.size, 1 << self.precision), dtype=np.uint8)
+        self._ip_registers = np.zeros((self.size, 1 << self.precision), dtype=np.uint8)
+    
+    def _method_slot(self, method: str) -> int:
+        slot = self._method_ids.get(method)
+        if slot is None:
+            slot = self._method_ids[method] = len(self._method_names)
+            self._method_names.append(method)
+            if slot >= self._method_counts.shape[1]:
+                extra = np.zeros_like(self._method_counts)
+                self._method_counts = np.hstack([self._method_counts, extra])
+        return slot
+    
+    def add(self, event: _LogEvent, now: float) -> None:
+        """
+        Mencatat event ke bucket detiknya.
+        Event di masa depan dicatat pada detik sekarang; event yang lebih
+        tua dari horizon diabaikan.
+        """
+        second = int(min(event.timestamp, now))
+        if second <= int(now) - self.size:
+            return
+        
+        slot = second % self.size
+        if second < int(now):
+            # Detik yang sudah lewat berubah: cache register gabungan basi
+            self._merged_registers.clear()
+        if self._seconds[slot] != second:
+            self._seconds[slot] = second
+            self._counts[slot] = 0
+            self._errors[slot] = 0
+            self._response_time_sums[slot] = 0.0
+            self._latency_counts[slot] = 0
+            self._method_counts[slot] = 0
+            self._url_registers[slot] = 0
+            self._ip_registers[slot] = 0
+        
+        self._counts[slot] += 1
+        self._errors[slot] += event.is_error
+        self._response_time_sums[slot] += event.response_time
+        self._latency_counts[slot, LATENCY_MAPPING.index(event.response_time)] += 1
+        self._method_counts[slot, self._method_slot(event.method)] += 1
+        
+        for registers, value in ((self._url_registers, event.url), (self._ip_registers, event.ip)):
+            index, rank = hll_position(stable_hash64(value), self.precision)
+            if rank > registers[slot, index]:
+                registers[slot, index] = rank
+    
+    def add_many(self, events: List[_LogEvent], now: float) -> None:
+        """
+        Versi vectorized dari add() untuk banyak event sekaligus (bulk load).
+        Hasilnya sama dengan memanggil add() untuk setiap event.
+        """
+        seconds = np.minimum(np.array([event.timestamp for event in events], dtype=np.float64), now)
+        seconds = np.floor(seconds).astype(np.int64)
+        keep = seconds > int(now) - self.size
+        if not keep.any():
+            return
+        events = [event for event, kept in zip(events, keep) if kept]
+        seconds = seconds[keep]
+        slots = seconds % self.size
+        self._merged_registers.clear()
+        
+        # Slot dengan label detik berbeda direset dulu (label terbaru menang)
+        for slot, second in zip(*np.unique(np.stack([slots, seconds]), axis=1)):
+            if self._seconds[slot] != second and self._seconds[slot] < second:
+                self._seconds[slot] = second
+                self._counts[slot] = 0
+                self._errors[slot] = 0
+                self._response_time_sums[slot] = 0.0
+                self._latency_counts[slot] = 0
+                self._method_counts[slot] = 0
+                self._url_registers[slot] = 0
+                self._ip_registers[slot] = 0
+        
+        current = self._seconds[slots] == seconds
+        events = [event for event, kept in zip(events, current) if kept]
+        slots = slots[current]
+        
+        np.add.at(self._counts, slots, 1)
+        np.add.at(self._errors, slots, np.array([event.is_error for event in events], dtype=np.int64))
+        response_times = np.array([event.response_time for event in events])
+        np.add.at(self._response_time_sums, slots, response_times)
+        np.add.at(self._latency_counts, (slots, LATENCY_MAPPING.indices(response_times)), 1)
+        method_slots = np.array([self._method_slot(event.method) for event in events], dtype=np.int64)
+        np.add.at(self._method_counts, (slots, method_slots), 1)
+        
+        for registers, field in ((self._url_registers, 'url'), (self._ip_registers, 'ip')):
+            # Hash dihitung sekali per nilai unik
+            cache: Dict[str, Tuple[int, int]] = {}
+            for event in events:
+                value = getattr(event, field)
+                if value not in cache:
+                    cache[value] = hll_position(stable_hash64(value), self.precision)
+            positions = np.array([cache[getattr(event, field)] for event in events], dtype=np.int64).reshape(-1, 2)
+            np.maximum.at(registers, (slots, positions[:, 0]), positions[:, 1].astype(np.uint8))
+    
+    def _window_mask(self, now: float, seconds: float) -> np.ndarray:
+        ages = int(now) - self._seconds
+        return (ages >= 0) & (ages < min(int(np.ceil(seconds)), self.size)) & (self._counts > 0)
+    
+    def unique_count(self, now: float, seconds: float, field: str = 'ip') -> int:
+        """
+        Estimasi jumlah IP atau URL unik dalam window (merge HyperLogLog).
+        
+        Args:
+            now: Waktu sekarang (epoch detik)
+            seconds: Panjang window dalam detik
+            field: 'ip' atau 'url'
+        """
+        merged = self.window_registers(now, seconds, field)
+        if not merged.any():
+            return 0
+        return int(round(hll_estimate(merged)))
+    
+    def window_registers(self, now: float, seconds: float, field: str = 'ip') -> np.ndarray:
+        """Register HyperLogLog gabungan untuk window (read-only)."""
+        registers = self._ip_registers if field == 'ip' else self._url_registers
+        current_second = int(now)
+        key = (field, min(int(np.ceil(seconds)), self.size))
+        cached = self._merged_registers.get(key)
+        if cached is None or cached[0] != current_second:
+            # Merge detik-detik sebelumnya sekali per detik
+            mask = self._window_mask(now, seconds) & (self._seconds != current_second)
+            merged = registers[mask].max(axis=0) if mask.any() else np.zeros(registers.shape[1], dtype=np.uint8)
+            cached = self._merged_registers[key] = (current_second, merged)
+        
+        slot = current_second % self.size
+        if self._seconds[slot] == current_second and self._counts[slot] > 0:
+            return np.maximum(cached[1], registers[slot])
+        return cached[1]
+    
+    def latency_histogram(self, now: float, seconds: float) -> np.ndarray:
+        """Histogram response time (bucket LATENCY_MAPPING) gabungan window."""
+        current_second = int(now)
+        key = ('latency', min(int(np.ceil(seconds)), self.size))
+        cached = self._merged_registers.get(key)
+        if cached is None or cached[0] != current_second:
+            # Sama seperti register HLL: detik yang sudah lewat dijumlah sekali per detik
+            mask = self._window_mask(now, seconds) & (self._seconds != current_second)
+            cached = self._merged_registers[key] = (
+                current_second, self._latency_counts[mask].sum(axis=0, dtype=np.int64))
+        
+        slot = current_second % self.size
+        if self._seconds[slot] == current_second and self._counts[slot] > 0:
+            return cached[1] + self._latency_counts[slot]
+        return cached[1]
+    
+    def window_snapshot(self, now: float, seconds: float) -> Dict:
+        """
+        Mengambil isi bucket dalam `seconds` detik terakhir dalam bentuk yang
+        bisa digabung dengan snapshot wheel lain (misal antar shard).
+        Array per slot berisi nol untuk slot di luar window.
+        
+        Args:
+            now: Waktu sekarang (epoch detik)
+            seconds: Panjang window dalam detik
+        
+        Returns:
+            Dictionary berisi counts, errors, response_time_sum, latency
+            (histogram response time), methods, url_registers dan ip_registers
+        """
+        mask = self._window_mask(now, seconds)
+        method_totals = self._method_counts[mask].sum(axis=0)
+        
+        if mask.any():
+            url_registers = self._url_registers[mask].max(axis=0)
+            ip_registers = self._ip_registers[mask].max(axis=0)
+        else:
+            url_registers = np.zeros(self._url_registers.shape[1], dtype=np.uint8)
+            ip_registers = np.zeros(self._ip_registers.shape[1], dtype=np.uint8)
+        
+        return {
+            'counts': np.where(mask, self._counts, 0),
+            'errors': np.where(mask, self._errors, 0),
+            'response_time_sum': float(self._response_time_sums[mask].sum()),
+            'latency': self._latency_counts[mask].sum(axis=0, dtype=np.int64),
+            'methods': {
+                name: int(method_totals[slot])
+                for name, slot in self._method_ids.items() if method_totals[slot]
+            },
+            'url_registers': url_registers,
+            'ip_registers': ip_registers,
+        }
+    
+    @staticmethod
+    def merge_snapshots(snapshots: List[Dict]) -> Dict:
+        """
+        Menggabungkan snapshot dari beberapa wheel dengan ukuran sama.
+        Slot yang sama mewakili detik yang sama sehingga bisa dijumlahkan.
+        """
+        merged = {
+            'counts': sum(snapshot['counts'] for snapshot in snapshots),
+            'errors': sum(snapshot['errors'] for snapshot in snapshots),
+            'response_time_sum': sum(snapshot['response_time_sum'] for snapshot in snapshots),
+            'latency': sum(snapshot['latency'] for snapshot in snapshots),
+            'methods': {},
+            'url_registers': np.maximum.reduce([s['url_registers'] for s in snapshots]),
+            'ip_registers': np.maximum.reduce([s['ip_registers'] for s in snapshots]),
+        }
+        for snapshot in snapshots:
+            for name, count in snapshot['methods'].items():
+                merged['methods'][name] = merged['methods'].get(name, 0) + count
+        return merged
+    
+    @classmethod
+    def metrics_from_snapshot(cls, snapshot: Dict, now: float) -> Dict:
+        """
+        Menghitung metrik global dari snapshot window.
+        
+        Returns:
+            Dictionary metrik global window tersebut
+        """
+        counts = snapshot['counts']
+        requests = int(counts.sum())
+        if not requests:
+            return {
+                'requests': 0,
+                'errors': 0,
+                'error_rate': 0.0,
+                'avg_response_time': 0.0,
+                'p50_response_time': 0.0,
+                'p95_response_time': 0.0,
+                'p99_response_time': 0.0,
+                'method_entropy': 0.0,
+                'max_rps': 0,
+                'error_rate_slope': 0.0,
+                'unique_urls': 0,
+                'unique_ips': 0,
+            }
+        
+        # Umur slot s dalam detik relatif terhadap now
+        size = len(counts)
+        ages = (int(now) - np.arange(size)) % size
+        active = counts > 0
+        errors = snapshot['errors']
+        
+        method_totals = np.array(list(snapshot['methods'].values()), dtype=np.float64)
+        p = method_totals[method_totals > 0] / requests
+        p50, p95, p99 = LATENCY_MAPPING.quantiles(snapshot['latency'], (0.5, 0.95, 0.99))
+        
+        return {
+            'requests': requests,
+            'errors': int(errors.sum()),
+            'error_rate': float(errors.sum() / requests),
+            'avg_response_time': float(snapshot['response_time_sum'] / requests),
+            'p50_response_time': float(p50),
+            'p95_response_time': float(p95),
+            'p99_response_time': float(p99),
+            'method_entropy': max(0.0, float(-(p * np.log2(p)).sum())),
+            'max_rps': int(counts.max()),
+            'error_rate_slope': cls._error_rate_slope(-ages[active], counts[active], errors[active]),
+            'unique_urls': int(round(hll_estimate(snapshot['url_registers']))),
+            'unique_ips': int(round(hll_estimate(snapshot['ip_registers']))),
+        }
+    
+    def fold(self, now: float, seconds: float) -> Dict:
+        """
+        Menggabungkan bucket dalam `seconds` detik terakhir.
+        
+        Args:
+            now: Waktu sekarang (epoch detik)
+            seconds: Panjang window dalam detik
+        
+        Returns:
+            Dictionary metrik global window tersebut
+        """
+        return self.metrics_from_snapshot(self.window_snapshot(now, seconds), now)
+    
+    @staticmethod
+    def _error_rate_slope(x: np.ndarray, counts: np.ndarray, errors: np.ndarray) -> float:
+        """
+        Slope least-squares (berbobot jumlah request) dari error rate per
+        detik terhadap waktu, dinyatakan per menit.
+        """
+        weights = counts.astype(np.float64)
+        total = weights.sum()
+        x = x.astype(np.float64)
+        y = errors / weights
+        
+        x_mean = (weights * x).sum() / total
+        y_mean = (weights * y).sum() / total
+        denominator = (weights * (x - x_mean) ** 2).sum()
+        if denominator == 0:
+            return 0.0
+        
+        return float((weights * (x - x_mean) * (y - y_mean)).sum() / denominator * 60)
+    
+    def clear(self) -> None:
+        """Mengosongkan semua bucket."""
+        self._merged_registers.clear()
+        self._allocate(method_slots=self._method_counts.shape[1])
+
+
+class WallClock:
+    """Jam dinding: waktu sekarang diambil dari time.time() (mode live)."""
+    
+    def now(self) -> float:
+        return time.time()
+    
+    def observe(self, timestamp: float) -> None:
+        """Jam dinding tidak dipengaruhi timestamp event."""
+
+
+class EventTimeClock:
+    """
+    Jam event-time untuk replay log arsip.
+    
+    Waktu sekarang adalah watermark = timestamp terbaru yang sudah masuk ke
+    window, sehingga eviction dan fitur mengikuti waktu di dalam log,
+    bukan waktu proses. Satu instance bisa dibagi beberapa shard.
+    """
+    
+    def __init__(self):
+        self.watermark: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def now(self) -> float:
+        # Sebelum ada event, waktu berada di epoch (window kosong)
+        return self.watermark if self.watermark is not None else 0.0
+    
+    def observe(self, timestamp: float) -> None:
+        """Memajukan watermark (tidak pernah mundur)."""
+        with self._lock:
+            if self.watermark is None or timestamp > self.watermark:
+                self.watermark = timestamp
+
+
+def create_clock(clock: Union[str, WallClock, EventTimeClock]) -> Union[WallClock, EventTimeClock]:
+    """
+    Membuat clock dari nama ('wall' atau 'event') atau mengembalikan instance
+    clock yang sudah ada.
+    """
+    if clock == 'wall':
+        return WallClock()
+    if clock == 'event':
+        return EventTimeClock()
+    if isinstance(clock, (WallClock, EventTimeClock)):
+        return clock
+    raise ValueError(f"Unknown clock: {clock}")
+
+
+def _parse_timestamp(value) -> datetime:
+    """Timestamp log (datetime, string ISO atau None = sekarang)."""
+    if value is None:
+        return datetime.now()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+class _ReorderBuffer:
+    """
+    Buffer reorder terbatas untuk replay event yang sedikit tidak berurutan.
+    
+    Event ditahan sampai timestamp terbaru yang diterima melewatinya sejauh
+    `delay_seconds`, lalu dilepas berurutan. Jika jumlah event tertahan
+    melebihi `capacity`, event tertua dilepas lebih awal.
+    """
+    
+    def __init__(self, delay_seconds: float, capacity: int):
+        if delay_seconds < 0:
+            raise ValueError("reorder delay must be >= 0")
+        if capacity < 1:
+            raise ValueError("reorder capacity must be >= 1")
+        self.delay = delay_seconds
+        self.capacity = capacity
+        self._heap: List[Tuple[float, int, Dict]] = []
+        self._arrivals = 0
+        self._newest = float('-inf')
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def push(self, log_data: Dict) -> List[Dict]:
+        """Menambahkan satu log dan mengembalikan log yang sudah aman diproses."""
+        timestamp = _parse_timestamp(log_data.get('timestamp'))
+        log_data['timestamp'] = timestamp
+        epoch = timestamp.timestamp()
+        self._newest = max(self._newest, epoch)
+        # Urutan kedatangan memecah seri timestamp yang sama (stabil)
+        heapq.heappush(self._heap, (epoch, self._arrivals, log_data))
+        self._arrivals += 1
+        
+        release_before = self._newest - self.delay
+        released = []
+        while self._heap and (self._heap[0][0] <= release_before or len(self._heap) > self.capacity):
+            released.append(heapq.heappop(self._heap)[2])
+        return released
+    
+    def flush(self) -> Iterator[Dict]:
+        """Melepas semua log yang tersisa secara berurutan."""
+        while self._heap:
+            yield heapq.heappop(self._heap)[2]
 
 
 class TemporalSlidingWindow:
     """
-    Kelas untuk mengelola sliding window dan menghitung fitur temporal.
+    Kelas untuk mengelola sliding window dan menghitung fitur temporal.
+    
+    Fitur yang dihitung:
+    1. req_count_1min: Jumlah request dalam 1 menit terakhir
+    2. req_count_5min: Jumlah request dalam 5 menit terakhir
+    3. avg_response_time_1min: Rata-rata response time 1 menit
+    4. avg_bytes_5min: Rata-rata ukuran payload dalam 5 menit
+    5. error_rate_1min: Persentase error (4xx, 5xx) dalam 1 menit
+    6. error_rate_slope: Tren kenaikan error rate (derivative)
+    7. unique_urls_1min: Jumlah URL unik (deteksi scanning)
+    8. method_entropy: Entropi distribusi HTTP method (deteksi abnormal pattern)
+    9. unique_ips_1min: Jumlah IP unik global (deteksi serangan terdistribusi)
+    
+    Setiap window menyimpan agregat per-IP yang diperbarui saat insert dan
+    eviction, sehingga biaya fitur per request bergantung pada aktivitas IP
+    tersebut, bukan pada ukuran total buffer.
+    
+    Selain 1min/5min/10min, window tambahan bisa dikonfigurasi per deployment
+    (misal '10s', '30s', '60min'). Setiap window hanya berupa head pointer ke
+    buffer terurut plus agregat berjalan (selisih dua prefix), sehingga window
+    tambahan menambah biaya O(1) per request, bukan scan buffer.
+    
+    Storage backend:
+    - 'object': buffer berisi dictionary log asli (default)
+    - 'compact': record __slots__ dengan string hasil interning (~190 byte per log)
+    - 'columnar': buffer kolom NumPy, hemat memori (~40 byte per log)
+    
+    Jumlah URL unik per IP dihitung exact selama kecil, lalu beralih ke
+    HyperLogLog dengan error bound `cardinality_error` (memori per IP tetap).
+    
+    Jumlah IP dengan state penuh per window dibatasi `max_tracked_ips`.
+    Setelah batas tercapai, IP baru hanya dihitung di Count-Min Sketch
+    (request & error) dan dipromosikan ke state penuh jika frekuensinya
+    melebihi heavy hitter terkecil yang dilacak; IP paling sepi dikeluarkan.
+    """
+    
+    STORAGE_BACKENDS = ('object', 'compact', 'columnar')
+    
+    # Urutan fitur untuk vektor ML (lihat get_feature_vector)
+    FEATURE_ORDER = [
+        'req_count_1min',
+        'req_count_5min',
+        'avg_response_time_1min',
+        'avg_bytes_5min',
+        'error_rate_1min',
+        'error_rate_slope',
+        'unique_urls_1min',
+        'method_entropy',
+        'global_req_count_1min',
+        'global_error_rate_1min'
+    ]
+    
+    def __init__(
+        self,
+        window_size_minutes: int = 10,
+        storage: str = 'object',
+        capacity: int = _ColumnarLogStore.DEFAULT_CAPACITY,
+        cardinality_error: float = 0.05,
+        unique_url_exact_limit: int = 64,
+        max_tracked_ips: Optional[int] = 10000,
+        clock: Union[str, WallClock, EventTimeClock] = 'wall',
+        windows: Optional[Iterable[str]] = None,
+        url_normalizer: Optional[UrlTemplateNormalizer] = None,
+        subnet_counters: bool = False,
+        latency_quantiles: bool = False
+    ):
+        """
+        Inisialisasi sliding window.
+        
+        Args:
+            window_size_minutes: Ukuran maksimal window dalam menit
+            storage: Backend penyimpanan buffer ('object' menyimpan dictionary
+                asli, 'compact' record __slots__ dengan string hasil interning,
+                atau 'columnar')
+            capacity: Kapasitas awal kolom untuk backend 'columnar'
+            cardinality_error: Error bound relatif HyperLogLog (URL/IP unik)
+            unique_url_exact_limit: Batas URL unik per IP sebelum beralih ke HyperLogLog
+            max_tracked_ips: Batas IP dengan state penuh per window (None = tanpa batas)
+            clock: 'wall' (waktu sekarang), 'event' (watermark dari timestamp log,
+                untuk replay) atau instance clock yang dibagi antar window
+            windows: Window tambahan (misal ['10s', '30s', '60min']); window
+                DEFAULT_WINDOWS selalu ada. Buffer diperpanjang jika window
+                tambahan lebih panjang dari window_size_minutes.
+            url_normalizer: Jika diisi, traffic juga diagregasi per route
+                template (misal /api/users/{id}) selain per URL mentah
+            subnet_counters: Jika True, request juga dihitung per subnet
+                (IPv4 /24 dan /16, IPv6 /64 dan /48) untuk mendeteksi
+                serangan yang tersebar di banyak alamat
+            latency_quantiles: Jika True, setiap IP yang dilacak menyimpan
+                DDSketch response time sehingga fitur p50/p95/p99 tersedia
+        """
+        if storage not in self.STORAGE_BACKENDS:
+            raise ValueError(f"Unknown storage backend: {storage}")
+        if max_tracked_ips is not None and max_tracked_ips < 1:
+            raise ValueError("max_tracked_ips must be >= 1")
+        
+        # Konfigurasi time windows (urut dari yang terpendek)
+        extra_windows = {key: parse_window_key(key) for key in (windows or ()) if key not in DEFAULT_WINDOWS}
+        self.windows = dict(sorted(
+            [(key, parse_window_key(key)) for key in DEFAULT_WINDOWS] + list(extra_windows.items()),
+            key=lambda item: item[1]
+        ))
+        self.extra_windows = list(key for key in self.windows if key in extra_windows)
+        
+        self.window_size = max([timedelta(minutes=window_size_minutes)] + list(extra_windows.values()))
+        self.storage = storage
+        if storage == 'object':
+            self.log_buffer = _LogStore()
+        elif storage == 'compact':
+            self.log_buffer = _CompactLogStore()
+        else:
+            self.log_buffer = _ColumnarLogStore(capacity)
+        self.lock = threading.RLock()  # Reentrant lock to avoid deadlock
+        self.clock = create_clock(clock)
+        # Write-ahead log opsional (lihat window_persistence.WindowPersistence)
+        self.wal = None
+        # Riwayat multi-resolusi opsional (lihat history_store.RoundRobinHistory)
+        self.history = None
+        # Eviction latar belakang opsional (lihat window_janitor.WindowJanitor)
+        self.janitor = None
+        # Salinan agregat global untuk dibaca tanpa lock (diaktifkan
+        # ShardedSlidingWindow); None = tidak dipublikasikan
+        self.publish_interval: Optional[float] = None
+        self.published: Optional[_PublishedTotals] = None
+        
+        # Window tidak bisa lebih panjang dari buffer (dalam detik)
+        self._window_spans = {
+            key: min(span, self.window_size).total_seconds() for key, span in self.windows.items()
+        }
+        self._window_heads: Dict[str, int] = {key: 0 for key in self.windows}
+        self._longest_window = max(self._window_spans, key=self._window_spans.get)
+        self._min_span = min(self._window_spans.values())
+        # Waktu paling awal sebuah head window / buffer perlu bergerak
+        self._next_expiry = float('inf')
+        self._ip_aggregates: Dict[str, Dict[str, _WindowAggregate]] = {
+            key: {} for key in self.windows
+        }
+        self._global_aggregates: Dict[str, _WindowAggregate] = {
+            key: _WindowAggregate() for key in self.windows
+        }
+        
+        self.cardinality_precision = precision_for_error(cardinality_error)
+        self.unique_url_exact_limit = unique_url_exact_limit
+        
+        # Jumlah request per route template untuk setiap window
+        self.url_normalizer = url_normalizer
+        self._route_counts: Dict[str, Dict[str, int]] = {key: {} for key in self.windows}
+        
+        # Counter subnet per window, satu tabel per level (lihat SUBNET_LEVELS);
+        # ukuran tabel dibatasi max_tracked_ips, sisanya masuk Count-Min Sketch
+        self.subnet_counters = subnet_counters
+        self._subnet_aggregates: Dict[str, Tuple[Dict[str, _SubnetAggregate], ...]] = {
+            key: tuple({} for _ in SUBNET_LEVELS) for key in self.windows
+        }
+        self._subnet_sketches: Dict[Tuple[str, int], Tuple[SlidingCountMinSketch, SlidingCountMinSketch]] = {}
+        
+        self.latency_quantiles = latency_quantiles
+        
+        # Heavy hitter: sketch (request, error) untuk IP yang tidak dilacak,
+        # dibuat saat tabel IP sebuah window pertama kali penuh
+        self.max_tracked_ips = max_tracked_ips
+        self._ip_sketches: Dict[str, Tuple[SlidingCountMinSketch, SlidingCountMinSketch]] = {}
+        self._promotion_threshold: Dict[str, int] = {key: 0 for key in self.windows}
+        self._sketch_horizon: Dict[str, float] = {key: float('-inf') for key in self.windows}
+        
+        # Bucket per detik untuk metrik global dashboard
+        self._time_wheel = _TimeWheel(
+            int(np.ceil(self.window_size.total_seconds())),
+            precision=self.cardinality_precision
+        )
+        
+        print(f"[INFO] TemporalSlidingWindow initialized (window: {window_size_minutes} min, storage: {storage})")
+    
+    def add_log(self, log_data: Dict) -> None:
+        """
+        Menambahkan log baru ke buffer dengan timestamp.
+        
+        Args:
+            log_data: Dictionary berisi data log server
+        """
+        with self.lock:
+            self._insert_log(log_data, _parse_timestamp(log_data.get('timestamp')))
+    
+    def _insert_log(self, log_data: Dict, timestamp: datetime) -> None:
+        """Isi add_log (dipanggil dengan lock dipegang)."""
+        if self.storage == 'object':
+            # Backend object menyimpan dictionary asli beserta timestamp-nya
+            log_data['timestamp'] = timestamp
+        
+        event = _LogEvent.from_log(log_data, timestamp.timestamp())
+        self.clock.observe(event.timestamp)
+        now = self.clock.now()
+        self._cleanup_expired_logs(now)
+        self.log_buffer.insert(event)
+        self._time_wheel.add(event, now)
+        
+        for key, span in self._window_spans.items():
+            if event.timestamp >= now - span:
+                self._account(key, event, now)
+            else:
+                # Disisipkan sebelum head window (sudah kedaluwarsa)
+                self._window_heads[key] += 1
+        
+        # Event baru bisa menjadi head window berikutnya yang kedaluwarsa
+        self._next_expiry = min(self._next_expiry, event.timestamp + self._min_span)
+        
+        # Bersihkan log yang sudah expired
+        self._cleanup_expired_logs(now)
+        self._maybe_publish(now)
+        
+        # WAL & history hanya mencatat log yang berhasil masuk buffer, agar
+        # replay tidak memutar ulang log yang gagal
+        if self.wal is not None:
+            self.wal.append(log_data, event.timestamp)
+        if self.history is not None:
+            self.history.record(event.timestamp, event.ip, event.is_error, event.response_time)
+    
+    def export_records(self) -> List[Tuple]:
+        """
+        Mengekspor isi buffer sebagai record ringkas (untuk snapshot).
+        
+        Returns:
+            List tuple sesuai LOG_RECORD_FIELDS, terurut berdasarkan timestamp
+        """
+        with self.lock:
+            self._cleanup_expired_logs()
+            store = self.log_buffer
+            return store.records_between(store.first_seq, store.end_seq)
+    
+    def bulk_load(self, records: Iterable[Tuple]) -> int:
+        """
+        Memuat banyak record sekaligus (restore dari snapshot / WAL).
+        Record diurutkan lalu di-append, dan agregat setiap window dibangun
+        sekali jalan tanpa menghitung fitur per log. Jika buffer tidak kosong,
+        record dimasukkan lewat add_log biasa.
+        
+        Args:
+            records: Iterable tuple sesuai LOG_RECORD_FIELDS
+        
+        Returns:
+            Jumlah log yang masih berada dalam window setelah dimuat
+        """
+        events = [_LogEvent.from_record(record) for record in sorted(records, key=lambda record: record[0])]
+        
+        with self.lock:
+            if len(self.log_buffer):
+                for event in events:
+                    self.add_log(event.log)
+                return len(self.log_buffer)
+            
+            if events:
+                self.clock.observe(events[-1].timestamp)
+            now = self.clock.now()
+            
+            cutoff = now - self.window_size.total_seconds()
+            store = self.log_buffer
+            events = [event for event in events if event.timestamp >= cutoff]
+            for event in events:
+                store.insert(event)
+            if events:
+                self._time_wheel.add_many(events, now)
+            
+            for key, span in self._window_spans.items():
+                head = store.first_seq_at_or_after(now - span, store.first_seq)
+                self._window_heads[key] = head
+                for event in store.events_between(head, store.end_seq):
+                    self._account(key, event, now)
+            
+            self._next_expiry = self._compute_next_expiry()
+            self._maybe_publish(now)
+            return len(store)
+    
+    def _route_for(self, event: _LogEvent) -> Optional[str]:
+        """Route template event (None jika url_normalizer tidak dipakai)."""
+        if self.url_normalizer is None:
+            return None
+        return self.url_normalizer.normalize(event.url)
+    
+    def _account(self, window_key: str, event: _LogEvent, now: float) -> None:
+        """Memasukkan event ke agregat global dan per-IP suatu window."""
+        self._global_aggregates[window_key].add(event)
+        route = self._route_for(event)
+        if route is not None:
+            route_counts = self._route_counts[window_key]
+            route_counts[route] = route_counts.get(route, 0) + 1
+        if self.subnet_counters:
+            self._account_subnets(window_key, event)
+        
+        per_ip = self._ip_aggregates[window_key]
+        aggregate = per_ip.get(event.ip)
+        if aggregate is None:
+            aggregate = self._admit_ip(window_key, event, now)
+        elif event.timestamp < aggregate.since:
+            aggregate = None
+        
+        if aggregate is None:
+            self._sketch_event(window_key, event)
+            return
+        
+        aggregate.add(event, route)
+        cap = self.max_tracked_ips
+        if cap is not None and len(per_ip) > cap + max(1, cap // 10):
+            self._shrink_ip_table(window_key, now)
+    
+    def _admit_ip(self, window_key: str, event: _LogEvent, now: float) -> Optional[_WindowAggregate]:
+        """
+        Membuat state penuh untuk IP baru jika tabel belum penuh atau IP
+        tersebut sudah menjadi heavy hitter. None = event dicatat di sketch.
+        """
+        per_ip = self._ip_aggregates[window_key]
+        cap = self.max_tracked_ips
+        has_room = cap is None or len(per_ip) < cap
+        since = float('-inf')
+        
+        if window_key in self._ip_sketches or not has_room:
+            requests, _ = self._window_sketches(window_key)
+            previous = requests.estimate(stable_hash64(event.ip), now)
+            if not has_room and previous + 1 <= self._promotion_threshold[window_key]:
+                return None
+            if previous:
+                # Sebagian event IP ini ada di sketch: agregat dimulai dari sini
+                if event.timestamp <= self._sketch_horizon[window_key]:
+                    return None
+                since = event.timestamp
+        
+        counter_args = (self._window_spans[window_key], self.unique_url_exact_limit, self.cardinality_precision)
+        aggregate = per_ip[event.ip] = _WindowAggregate(
+            _DistinctCounter(*counter_args),
+            _DistinctCounter(*counter_args) if self.url_normalizer is not None else None,
+            DDSketch() if self.latency_quantiles else None
+        )
+        aggregate.since = since
+        if self.janitor is not None and window_key == self._longest_window:
+            self.janitor.schedule_idle(self, event.ip, event.timestamp)
+        return aggregate
+    
+    def _window_sketches(self, window_key: str) -> Tuple[SlidingCountMinSketch, SlidingCountMinSketch]:
+        sketches = self._ip_sketches.get(window_key)
+        if sketches is None:
+            span = self._window_spans[window_key]
+            sketches = self._ip_sketches[window_key] = (SlidingCountMinSketch(span), SlidingCountMinSketch(span))
+        return sketches
+    
+    def _sketch_event(self, window_key: str, event: _LogEvent) -> None:
+        """Mencatat event IP yang tidak dilacak ke Count-Min Sketch."""
+        requests, errors = self._window_sketches(window_key)
+        ip_hash = stable_hash64(event.ip)
+        requests.add_hash(ip_hash, event.timestamp)
+        if event.is_error:
+            errors.add_hash(ip_hash, event.timestamp)
+        self._sketch_horizon[window_key] = max(self._sketch_horizon[window_key], event.timestamp)
+    
+    def _shrink_ip_table(self, window_key: str, now: float) -> None:
+        """
+        Mengeluarkan IP paling sepi sampai tabel kembali ke `max_tracked_ips`.
+        Jumlahnya dipindahkan ke sketch dan menjadi ambang promosi berikutnya.
+        """
+        per_ip = self._ip_aggregates[window_key]
+        excess = len(per_ip) - self.max_tracked_ips
+        victims = heapq.nsmallest(excess, per_ip.items(), key=lambda item: item[1].count)
+        self._demote_ips(window_key, [ip for ip, _ in victims], now)
+        self._promotion_threshold[window_key] = victims[-1][1].count
+    
+    def _demote_ips(self, window_key: str, ips: List[str], now: float) -> None:
+        """Memindahkan jumlah (request, error) IP ke sketch lalu membuang state penuhnya."""
+        per_ip = self._ip_aggregates[window_key]
+        requests, errors = self._window_sketches(window_key)
+        
+        for ip in ips:
+            aggregate = per_ip.pop(ip)
+            ip_hash = stable_hash64(ip)
+            requests.add_hash(ip_hash, now, aggregate.count)
+            if aggregate.error_count:
+                errors.add_hash(ip_hash, now, aggregate.error_count)
+        
+        self._sketch_horizon[window_key] = max(self._sketch_horizon[window_key], now)
+    
+    def _sketch_counts(self, ip_address: str, window_key: str) -> Tuple[int, int]:
+        """Estimasi (request, error) untuk IP yang tidak dilacak penuh."""
+        with self.lock:
+            sketches = self._ip_sketches.get(self._resolve_window(window_key))
+            if sketches is None:
+                return 0, 0
+            ip_hash = stable_hash64(ip_address)
+            now = self.clock.now()
+            return sketches[0].estimate(ip_hash, now), sketches[1].estimate(ip_hash, now)
+    
+    def _unaccount(self, window_key: str, event: _LogEvent) -> None:
+        """Mengeluarkan event dari agregat; state IP yang kosong dihapus."""
+        self._global_aggregates[window_key].remove(event)
+        route = self._route_for(event)
+        if route is not None:
+            route_counts = self._route_counts[window_key]
+            remaining = route_counts[route] - 1
+            if remaining:
+                route_counts[route] = remaining
+            else:
+                del route_counts[route]
+        if self.subnet_counters:
+            self._unaccount_subnets(window_key, event)
+        
+        per_ip = self._ip_aggregates[window_key]
+        aggregate = per_ip.get(event.ip)
+        if aggregate is None or event.timestamp < aggregate.since:
+            # Event IP yang tidak dilacak kedaluwarsa lewat irisan sketch
+            return
+        aggregate.remove(event, route)
+        if not aggregate.count:
+            del per_ip[event.ip]
+    
+    def _account_subnets(self, window_key: str, event: _LogEvent) -> None:
+        """Satu update counter per level subnet untuk event yang masuk window."""
+        prefixes = subnet_prefixes(event.ip)
+        if prefixes is None:
+            return
+        
+        tables = self._subnet_aggregates[window_key]
+        cap = self.max_tracked_ips
+        for level, prefix in enumerate(prefixes):
+            table = tables[level]
+            aggregate = table.get(prefix)
+            if aggregate is None and (cap is None or len(table) < cap):
+                aggregate = table[prefix] = _SubnetAggregate(track_ips=level == 0)
+                if (window_key, level) in self._subnet_sketches:
+                    aggregate.since = event.timestamp
+            
+            if aggregate is None or event.timestamp < aggregate.since:
+                requests, errors = self._subnet_window_sketches(window_key, level)
+                prefix_hash = stable_hash64(prefix)
+                requests.add_hash(prefix_hash, event.timestamp)
+                if event.is_error:
+                    errors.add_hash(prefix_hash, event.timestamp)
+            else:
+                aggregate.add(event)
+    
+    def _unaccount_subnets(self, window_key: str, event: _LogEvent) -> None:
+        """Kebalikan _account_subnets; event di sketch kedaluwarsa lewat irisan waktu."""
+        prefixes = subnet_prefixes(event.ip)
+        if prefixes is None:
+            return
+        
+        for table, prefix in zip(self._subnet_aggregates[window_key], prefixes):
+            aggregate = table.get(prefix)
+            if aggregate is None or event.timestamp < aggregate.since:
+                continue
+            aggregate.remove(event)
+            if not aggregate.count:
+                del table[prefix]
+    
+    def _subnet_window_sketches(self, window_key: str, level: int) -> Tuple[SlidingCountMinSketch, SlidingCountMinSketch]:
+        sketches = self._subnet_sketches.get((window_key, level))
+        if sketches is None:
+            span = self._window_spans[window_key]
+            sketches = self._subnet_sketches[(window_key, level)] = (
+                SlidingCountMinSketch(span), SlidingCountMinSketch(span)
+            )
+        return sketches
+    
+    def _subnet_totals(self, level: int, prefix: str, window_key: str) -> Tuple[int, int, int]:
+        """(request, error, IP unik) sebuah subnet di shard ini (lock dipegang caller)."""
+        window_key = self._resolve_window(window_key)
+        aggregate = self._subnet_aggregates[window_key][level].get(prefix)
+        if aggregate is None:
+            count = error_count = unique_ips = 0
+        else:
+            count, error_count = aggregate.count, aggregate.error_count
+            unique_ips = len(aggregate.ips) if aggregate.ips is not None else 0
+        
+        sketches = self._subnet_sketches.get((window_key, level))
+        if sketches is not None:
+            prefix_hash = stable_hash64(prefix)
+            now = self.clock.now()
+            count += sketches[0].estimate(prefix_hash, now)
+            error_count += sketches[1].estimate(prefix_hash, now)
+        return count, error_count, unique_ips
+    
+    def _advance_windows(self, now: float) -> None:
+        """
+        Memajukan head setiap window ke waktu sekarang dan mengurangi
+        agregat untuk log yang keluar dari window.
+        """
+        for key, span in self._window_spans.items():
+            head = self._window_heads[key]
+            new_head = self.log_buffer.first_seq_at_or_after(now - span, head)
+            for event in self.log_buffer.events_between(head, new_head):
+                self._unaccount(key, event)
+            self._window_heads[key] = new_head
+    
+    def _evict_buffer(self, now: float) -> None:
+        """Membuang log yang sudah melewati window maksimal dari buffer."""
+        store = self.log_buffer
+        cutoff = now - self.window_size.total_seconds()
+        store.drop_before(store.first_seq_at_or_after(cutoff, store.first_seq))
+    
+    def _cleanup_expired_logs(self, now: Optional[float] = None) -> None:
+        """
+        Menghapus log yang sudah melewati window maksimal.
+        Langsung kembali jika belum ada log yang kedaluwarsa sejak cleanup
+        terakhir, sehingga aman dipanggil di setiap pembacaan fitur.
+        """
+        now = self.clock.now() if now is None else now
+        if now <= self._next_expiry:
+            return
+        self._advance_windows(now)
+        self._evict_buffer(now)
+        self._next_expiry = self._compute_next_expiry()
+    
+    def _compute_next_expiry(self) -> float:
+        """Waktu paling awal head salah satu window atau buffer harus maju."""
+        store = self.log_buffer
+        if not len(store):
+            return float('inf')
+        expiry = store.timestamp_at(store.first_seq) + self.window_size.total_seconds()
+        for key, span in self._window_spans.items():
+            head = self._window_heads[key]
+            if head < store.end_seq:
+                expiry = min(expiry, store.timestamp_at(head) + span)
+        return expiry
+    
+    def _try_cleanup_expired_logs(self, timeout: float = 0.0) -> bool:
+        """
+        Cleanup tanpa menunggu lock lebih dari `timeout` detik (0 = tidak
+        menunggu sama sekali).
+        
+        Returns:
+            False jika cleanup dilewati karena lock sedang dipakai
+        """
+        acquired = self.lock.acquire(timeout=timeout) if timeout > 0 else self.lock.acquire(blocking=False)
+        if not acquired:
+            return False
+        try:
+            now = self.clock.now()
+            self._cleanup_expired_logs(now)
+            self._maybe_publish(now)
+        finally:
+            self.lock.release()
+        return True
+    
+    def _maybe_publish(self, now: float) -> None:
+        """
+        Memperbarui salinan agregat global (self.published) jika publikasi
+        aktif dan salinan terakhir sudah berumur `publish_interval` detik.
+        Dipanggil dengan lock dipegang.
+        """
+        if self.publish_interval is None:
+            return
+        published = self.published
+        if published is not None and 0 <= now - published.time < self.publish_interval:
+            return
+        
+        ip_registers = {}
+        latency = {} if self.latency_quantiles else None
+        for key, span in self._window_spans.items():
+            ip_registers[key] = self._time_wheel.window_registers(now, span, 'ip').copy()
+            if latency is not None:
+                latency[key] = self._time_wheel.latency_histogram(now, span).copy()
+        
+        subnets = None
+        if self.subnet_counters:
+            subnets = {}
+            for level, window_key in SUBNET_FEATURE_TOTALS:
+                subnets[(level, window_key)] = {
+                    prefix: (aggregate.count, aggregate.error_count,
+                             len(aggregate.ips) if aggregate.ips is not None else 0)
+                    for prefix, aggregate in self._subnet_aggregates[window_key][level].items()
+                }
+        self.published = _PublishedTotals(now, ip_registers, latency, subnets)
+    
+    def expire_idle_ips(self, ips: List[Optional[str]], idle_seconds: float) -> Dict[Optional[str], float]:
+        """
+        Membuang state penuh IP yang tidak aktif selama `idle_seconds`
+        (dipanggil janitor). State IP yang semua lognya sudah keluar window
+        terhapus oleh cleanup; IP idle yang lognya masih di window dipindahkan
+        ke sketch heavy hitter seperti saat tabel IP penuh.
+        
+        Args:
+            ips: IP yang deadline idle-nya sudah lewat
+            idle_seconds: Lama tanpa aktivitas sebelum state IP dibuang
+        
+        Returns:
+            Dictionary {ip: deadline baru} untuk IP yang ternyata masih aktif
+        """
+        with self.lock:
+            now = self.clock.now()
+            self._cleanup_expired_logs(now)
+            pending = {}
+            for ip_address in ips:
+                tracked = [
+                    key for key, per_ip in self._ip_aggregates.items() if ip_address in per_ip
+                ]
+                if not tracked:
+                    continue
+                last_seen = max(self._ip_aggregates[key][ip_address].last_seen for key in tracked)
+                deadline = last_seen + idle_seconds
+                if deadline > now:
+                    pending[ip_address] = deadline
+                    continue
+                for key in tracked:
+                    self._demote_ips(key, [ip_address], now)
+            return pending
+    
+    def _resolve_window(self, window_key: str) -> str:
+        """Window yang tidak dikenal jatuh ke '1min'."""
+        return window_key if window_key in self._window_spans else '1min'
+    
+    def _get_aggregate(self, ip_address: Optional[str], window_key: str) -> Optional[_WindowAggregate]:
+        """
+        Mengambil agregat terkini untuk IP tertentu dalam window.
+        
+        Args:
+            ip_address: IP address (None = agregat global)
+            window_key: Window waktu
+        
+        Returns:
+            _WindowAggregate atau None jika IP tidak aktif di window tersebut.
+            Agregat ini live: pembacaan field-nya harus dilakukan dengan
+            self.lock dipegang agar tidak bercampur dengan eviction.
+        """
+        with self.lock:
+            self._cleanup_expired_logs()
+            key = self._resolve_window(window_key)
+            if ip_address is None:
+                return self._global_aggregates[key]
+            return self._ip_aggregates[key].get(ip_address)
+    
+    def get_logs_in_window(self, window_key: str = '1min') -> List[Dict]:
+        """
+        Mengambil semua log dalam window tertentu.
+        
+        Args:
+            window_key: Key dari window (lihat self.windows)
+        
+        Returns:
+            List log yang masih dalam window
+        """
+        with self.lock:
+            self._cleanup_expired_logs()
+            store = self.log_buffer
+            head = self._window_heads[self._resolve_window(window_key)]
+            return store.logs_between(head, store.end_seq)
+    
+    def get_global_metrics(self, window_key: str = '1min') -> Dict:
+        """
+        Metrik global (semua IP) untuk dashboard, dihitung dari bucket per
+        detik tanpa menyalin buffer.
+        
+        Args:
+            window_key: Window waktu
+        
+        Returns:
+            Dictionary berisi requests, errors, error_rate, avg_response_time,
+            method_entropy, max_rps (burst), error_rate_slope (per menit),
+            unique_urls dan unique_ips (estimasi HyperLogLog)
+        """
+        with self.lock:
+            self._cleanup_expired_logs()
+            key = self._resolve_window(window_key)
+            return self._time_wheel.fold(self.clock.now(), self._window_spans[key])
+    
+    def get_top_ips(self, window_key: str = '1min', k: int = 10) -> Dict:
+        """
+        Top-K IP (heavy hitter) dalam window berdasarkan jumlah request,
+        jumlah error dan jumlah URL unik. Hanya IP dengan state penuh yang
+        dipertimbangkan, sehingga biayanya dibatasi `max_tracked_ips`.
+        
+        Args:
+            window_key: Window waktu
+            k: Jumlah IP teratas
+        
+        Returns:
+            Dictionary berisi list {'ip', 'count'} untuk by_requests,
+            by_errors dan by_unique_urls
+        """
+        with self.lock:
+            self._cleanup_expired_logs()
+            per_ip = self._ip_aggregates[self._resolve_window(window_key)]
+            now = self.clock.now()
+            unique_urls = [(ip, aggregate.urls.count(now)) for ip, aggregate in per_ip.items()]
+            return {
+                'by_requests': [
+                    {'ip': ip, 'count': aggregate.count}
+                    for ip, aggregate in heapq.nlargest(k, per_ip.items(), key=lambda item: item[1].count)
+                ],
+                'by_errors': [
+                    {'ip': ip, 'count': aggregate.error_count}
+                    for ip, aggregate in heapq.nlargest(k, per_ip.items(), key=lambda item: item[1].error_count)
+                    if aggregate.error_count
+                ],
+                'by_unique_urls': [
+                    {'ip': ip, 'count': count}
+                    for ip, count in heapq.nlargest(k, unique_urls, key=lambda item: item[1])
+                ],
+                'tracked_ips': len(per_ip),
+            }
+    
+    def get_top_routes(self, window_key: str = '1min', k: int = 10) -> List[Dict]:
+        """
+        Top-K route template berdasarkan jumlah request dalam window.
+        
+        Args:
+            window_key: Window waktu
+            k: Jumlah route teratas
+        
+        Returns:
+            List {'route', 'count'} (kosong jika url_normalizer tidak dipakai)
+        """
+        with self.lock:
+            self._cleanup_expired_logs()
+            route_counts = self._route_counts[self._resolve_window(window_key)]
+            return [
+                {'route': route, 'count': count}
+                for route, count in heapq.nlargest(k, route_counts.items(), key=lambda item: item[1])
+            ]
+    
+    def calculate_request_count(self, ip_address: str, window_key: str = '1min') -> int:
+        """
+        Menghitung jumlah request dari IP tertentu dalam window.
+        
+        Args:
+            ip_address: IP address yang akan dihitung
+            window_key: Window waktu
+        
+        Returns:
+            Jumlah request
+        """
+        with self.lock:
+            aggregate = self._get_aggregate(ip_address, window_key)
+            if aggregate:
+                return aggregate.count
+            return self._sketch_counts(ip_address, window_key)[0]
+    
+    def calculate_avg_response_time(self, ip_address: str = None, window_key: str = '1min') -> float:
+        """
+        Menghitung rata-rata response time dalam window.
+        
+        Args:
+            ip_address: Filter by IP (None = semua IP)
+            window_key: Window waktu
+        
+        Returns:
+            Rata-rata response time dalam ms
+        """
+        with self.lock:
+            aggregate = self._get_aggregate(ip_address or None, window_key)
+            if not aggregate or not aggregate.count:
+                return 0.0
+            return aggregate.response_time_sum / aggregate.count
+    
+    def calculate_response_time_quantile(self, ip_address: str = None, window_key: str = '1min', q: float = 0.95) -> float:
+        """
+        Menghitung kuantil response time (misal p95) dalam window.
+        Serangan slowloris / resource exhaustion terlihat di p95/p99,
+        bukan di rata-rata.
+        
+        Args:
+            ip_address: Filter by IP (None = semua IP, dari time wheel)
+            window_key: Window waktu
+            q: Kuantil (0 - 1)
+        
+        Returns:
+            Kuantil response time dalam ms (error relatif ~2%); 0.0 untuk IP
+            jika latency_quantiles tidak aktif
+        """
+        if not ip_address:
+            with self.lock:
+                self._cleanup_expired_logs()
+                key = self._resolve_window(window_key)
+                histogram = self._time_wheel.latency_histogram(self.clock.now(), self._window_spans[key])
+            return float(LATENCY_MAPPING.quantiles(histogram, (q,))[0])
+        
+        with self.lock:
+            aggregate = self._get_aggregate(ip_address, window_key)
+            if aggregate is None or aggregate.latency is None:
+                return 0.0
+            return aggregate.latency.quantile(q)
+    
+    def calculate_avg_bytes(self, ip_address: str = None, window_key: str = '5min') -> float:
+        """
+        Menghitung rata-rata ukuran request/response dalam window.
+        
+        Args:
+            ip_address: Filter by IP (None = semua IP)
+            window_key: Window waktu
+        
+        Returns:
+            Rata-rata bytes
+        """
+        with self.lock:
+            aggregate = self._get_aggregate(ip_address or None, window_key)
+            if not aggregate or not aggregate.count:
+                return 0.0
+            # Estimasi bytes dari panjang URL + user agent (lihat _LogEvent)
+            return aggregate.bytes_sum / aggregate.count
+    
+    def calculate_error_rate(self, ip_address: str = None, window_key: str = '1min') -> float:
+        """
+        Menghitung persentase error (4xx, 5xx) dalam window.
+        
+        Args:
+            ip_address: Filter by IP (None = semua IP)
+            window_key: Window waktu
+        
+        Returns:
+            Error rate (0.0 - 1.0)
+        """
+        with self.lock:
+            aggregate = self._get_aggregate(ip_address or None, window_key)
+            
+            if aggregate is None and ip_address:
+                requests, errors = self._sketch_counts(ip_address, window_key)
+                return min(1.0, errors / requests) if requests else 0.0
+            
+            if not aggregate or not aggregate.count:
+                return 0.0
+            
+            return aggregate.error_count / aggregate.count
+    
+    def calculate_error_rate_slope(self, ip_address: str = None) -> float:
+        """
+        Menghitung tren kenaikan error rate (derivative).
+        Membandingkan error rate 1 menit terakhir vs 5 menit sebelumnya.
+        
+        Args:
+            ip_address: Filter by IP (None = semua IP)
+        
+        Returns:
+            Slope (positif = trending up, negatif = trending down)
+        """
+        error_rate_1min = self.calculate_error_rate(ip_address, '1min')
+        error_rate_5min = self.calculate_error_rate(ip_address, '5min')
+        
+        # Slope: perubahan error rate
+        # Nilai positif berarti error rate naik (berbahaya)
+        return error_rate_1min - error_rate_5min
+    
+    def calculate_unique_urls(self, ip_address: str, window_key: str = '1min') -> int:
+        """
+        Menghitung jumlah URL unik yang diakses oleh IP tertentu.
+        Berguna untuk mendeteksi scanning/enumeration.
+        
+        Args:
+            ip_address: IP address yang akan dihitung
+            window_key: Window waktu
+        
+        Returns:
+            Jumlah URL unik
+        """
+        with self.lock:
+            aggregate = self._get_aggregate(ip_address, window_key)
+            return aggregate.urls.count(self.clock.now()) if aggregate else 0
+    
+    def calculate_unique_routes(self, ip_address: str, window_key: str = '1min') -> int:
+        """
+        Menghitung jumlah route template unik yang diakses oleh IP tertentu.
+        Berbeda dengan calculate_unique_urls, enumerasi id pada route yang
+        sama (/api/flood/1, /api/flood/2, ...) hanya dihitung sekali.
+        
+        Args:
+            ip_address: IP address yang akan dihitung
+            window_key: Window waktu
+        
+        Returns:
+            Jumlah route unik (0 jika url_normalizer tidak dipakai)
+        """
+        with self.lock:
+            aggregate = self._get_aggregate(ip_address, window_key)
+            if aggregate is None or aggregate.routes is None:
+                return 0
+            return aggregate.routes.count(self.clock.now())
+    
+    def calculate_subnet_request_count(self, ip_address: str, window_key: str = '1min', level: str = 'subnet') -> int:
+        """
+        Menghitung jumlah request dari subnet milik IP tertentu.
+        
+        Args:
+            ip_address: IP address anggota subnet
+            window_key: Window waktu
+            level: 'subnet' (/24 atau /64) atau 'wide_subnet' (/16 atau /48)
+        
+        Returns:
+            Jumlah request (0 jika subnet_counters tidak aktif)
+        """
+        prefixes = subnet_prefixes(ip_address)
+        if not self.subnet_counters or prefixes is None:
+            return 0
+        level_index = SUBNET_LEVELS.index(level)
+        with self.lock:
+            self._cleanup_expired_logs()
+            return self._subnet_totals(level_index, prefixes[level_index], window_key)[0]
+    
+    def get_top_subnets(self, window_key: str = '1min', k: int = 10) -> Dict:
+        """
+        Top-K subnet berdasarkan jumlah request untuk setiap level.
+        
+        Args:
+            window_key: Window waktu
+            k: Jumlah subnet teratas per level
+        
+        Returns:
+            Dictionary per level (lihat SUBNET_LEVELS) berisi list
+            {'subnet', 'count', 'unique_ips'}
+        """
+        with self.lock:
+            self._cleanup_expired_logs()
+            tables = self._subnet_aggregates[self._resolve_window(window_key)]
+            return {
+                name: [
+                    {'subnet': prefix, 'count': aggregate.count,
+                     'unique_ips': len(aggregate.ips) if aggregate.ips is not None else None}
+                    for prefix, aggregate in heapq.nlargest(k, table.items(), key=lambda item: item[1].count)
+                ]
+                for name, table in zip(SUBNET_LEVELS, tables)
+            }
+    
+    def calculate_unique_ips(self, window_key: str = '1min') -> int:
+        """
+        Estimasi jumlah IP unik (semua traffic) dalam window.
+        Berguna untuk mendeteksi serangan terdistribusi.
+        
+        Args:
+            window_key: Window waktu
+        
+        Returns:
+            Jumlah IP unik (HyperLogLog)
+        """
+        with self.lock:
+            self._cleanup_expired_logs()
+            key = self._resolve_window(window_key)
+            return self._time_wheel.unique_count(self.clock.now(), self._window_spans[key], 'ip')
+    
+    def calculate_method_entropy(self, ip_address: str = None, window_key: str = '1min') -> float:
+        """
+        Menghitung entropi distribusi HTTP method.
+        Entropi rendah = pola normal (mayoritas GET/POST)
+        Entropi tinggi = pola abnormal (berbagai method)
+        
+        Args:
+            ip_address: Filter by IP (None = semua IP)
+            window_key: Window waktu
+        
+        Returns:
+            Entropy value (0.0 - ~2.8 untuk 7 methods)
+        """
+        with self.lock:
+            aggregate = self._get_aggregate(ip_address or None, window_key)
+            return aggregate.method_entropy() if aggregate else 0.0
+    
+    def extract_temporal_features(self, log_data: Dict) -> Dict:
+        """
+        Mengekstrak semua fitur temporal untuk satu log entry.
+        
+        Args:
+            log_data: Dictionary berisi data log server
+        
+        Returns:
+            Dictionary dengan semua fitur temporal
+        """
+        ip_address = log_data.get('ip_address', '')
+        
+        with self.lock:
+            # Tambahkan log ke buffer dulu
+            self.add_log(log_data)
+            
+            # Ekstrak semua fitur temporal
+            features = self._ip_features(ip_address)
+            features.update(self._subnet_features(ip_address))
+            features.update(self._global_features())
+        
+        return features
+    
+    def _ip_features(self, ip_address: str) -> Dict:
+        """Fitur temporal per-IP (dipanggil dengan lock dipegang)."""
+        features = {
+            # Request frequency features
+            'req_count_1min': self.calculate_request_count(ip_address, '1min'),
+            'req_count_5min': self.calculate_request_count(ip_address, '5min'),
+            
+            # Response time features
+            'avg_response_time_1min': round(self.calculate_avg_response_time(ip_address, '1min'), 2),
+            'avg_response_time_5min': round(self.calculate_avg_response_time(ip_address, '5min'), 2),
+            
+            # Bandwidth features
+            'avg_bytes_5min': round(self.calculate_avg_bytes(ip_address, '5min'), 2),
+            
+            # Error rate features
+            'error_rate_1min': round(self.calculate_error_rate(ip_address, '1min'), 4),
+            'error_rate_5min': round(self.calculate_error_rate(ip_address, '5min'), 4),
+            'error_rate_slope': round(self.calculate_error_rate_slope(ip_address), 4),
+            
+            # Behavior features
+            'unique_urls_1min': self.calculate_unique_urls(ip_address, '1min'),
+            'method_entropy': round(self.calculate_method_entropy(ip_address, '1min'), 4),
+        }
+        
+        # Window tambahan (misal burst 10s atau brute force lambat 60min)
+        for key in self.extra_windows:
+            features[f'req_count_{key}'] = self.calculate_request_count(ip_address, key)
+            features[f'error_rate_{key}'] = round(self.calculate_error_rate(ip_address, key), 4)
+        
+        if self.url_normalizer is not None:
+            features['unique_routes_1min'] = self.calculate_unique_routes(ip_address, '1min')
+        
+        if self.latency_quantiles:
+            aggregate = self._get_aggregate(ip_address, '1min')
+            quantiles = aggregate.latency.quantiles((0.5, 0.95, 0.99)) if aggregate else [0.0] * 3
+            for name, value in zip(('p50', 'p95', 'p99'), quantiles):
+                features[f'{name}_response_time_1min'] = round(value, 2)
+        
+        return features
+    
+    def _subnet_features(self, ip_address: str) -> Dict:
+        """Fitur subnet (kosong jika subnet_counters tidak aktif)."""
+        prefixes = subnet_prefixes(ip_address)
+        if not self.subnet_counters or prefixes is None:
+            return {}
+        return _subnet_feature_dict(lambda level, window_key: self._subnet_totals(level, prefixes[level], window_key))
+    
+    def _global_features(self) -> Dict:
+        """Fitur temporal global (semua IP, dipanggil dengan lock dipegang)."""
+        features = {
+            'global_req_count_1min': self._get_aggregate(None, '1min').count,
+            'global_error_rate_1min': round(self.calculate_error_rate(None, '1min'), 4),
+            'unique_ips_1min': self.calculate_unique_ips('1min'),
+        }
+        if self.latency_quantiles:
+            features['global_p95_response_time_1min'] = round(
+                self.calculate_response_time_quantile(None, '1min', 0.95), 2)
+        return features
+    
+    def get_feature_vector(self, log_data: Dict) -> np.ndarray:
+        """
+        Mengkonversi fitur temporal menjadi numpy array untuk ML model.
+        
+        Args:
+            log_data: Dictionary berisi data log server
+        
+        Returns:
+            Numpy array dengan fitur temporal
+        """
+        features = self.extract_temporal_features(log_data)
+        
+        # Urutkan fitur untuk konsistensi
+        return np.array([features[key] for key in self.FEATURE_ORDER])
+    
+    def extract_temporal_features_batch(self, logs: List[Dict]) -> np.ndarray:
+        """
+        Versi batch dari get_feature_vector untuk satu chunk log.
+        
+        Log dimasukkan berurutan berdasarkan timestamp dengan satu kali
+        pengambilan lock, dan setiap baris dibaca langsung dari agregat
+        tepat setelah log-nya masuk. Hasilnya sama dengan memanggil
+        get_feature_vector untuk setiap log dalam urutan timestamp.
+        
+        Args:
+            logs: List dictionary log server
+        
+        Returns:
+            Matrix (N, len(FEATURE_ORDER)); baris ke-i milik logs[i]
+        """
+        timestamps = [_parse_timestamp(log.get('timestamp')) for log in logs]
+        order = sorted(range(len(logs)), key=lambda i: timestamps[i].timestamp())
+        matrix = np.zeros((len(logs), len(self.FEATURE_ORDER)), dtype=np.float64)
+        
+        with self.lock:
+            for i in order:
+                self._insert_log(logs[i], timestamps[i])
+                ip_address = logs[i].get('ip_address', '')
+                matrix[i] = self._ip_feature_row(ip_address, self.clock.now()) + self._global_feature_row()
+        
+        return matrix
+    
+    def _ip_feature_row(self, ip_address: Optional[str], now: float) -> List[float]:
+        """
+        Fitur per-IP dalam urutan FEATURE_ORDER, dibaca langsung dari agregat
+        (dipanggil dengan lock dipegang, setelah cleanup). Aturan pemilihan
+        agregat sama dengan calculate_*: IP kosong memakai agregat global
+        untuk rata-rata, error rate dan entropi.
+        """
+        global_aggregates = self._global_aggregates
+        if ip_address is None:
+            per_ip_1min, per_ip_5min = global_aggregates['1min'], global_aggregates['5min']
+        else:
+            per_ip_1min = self._ip_aggregates['1min'].get(ip_address)
+            per_ip_5min = self._ip_aggregates['5min'].get(ip_address)
+        scoped_1min = per_ip_1min if ip_address else global_aggregates['1min']
+        scoped_5min = per_ip_5min if ip_address else global_aggregates['5min']
+        
+        def sketch(window_key: str) -> Tuple[int, int]:
+            sketches = self._ip_sketches.get(window_key)
+            if sketches is None:
+                return 0, 0
+            ip_hash = stable_hash64(ip_address)
+            return sketches[0].estimate(ip_hash, now), sketches[1].estimate(ip_hash, now)
+        
+        def error_rate(aggregate: Optional[_WindowAggregate], window_key: str) -> float:
+            if aggregate is None and ip_address:
+                requests, errors = sketch(window_key)
+                return min(1.0, errors / requests) if requests else 0.0
+            if not aggregate or not aggregate.count:
+                return 0.0
+            return aggregate.error_count / aggregate.count
+        
+        error_rate_1min = error_rate(scoped_1min, '1min')
+        error_rate_5min = error_rate(scoped_5min, '5min')
+        has_1min = scoped_1min is not None and scoped_1min.count
+        has_5min = scoped_5min is not None and scoped_5min.count
+        
+        return [
+            per_ip_1min.count if per_ip_1min else sketch('1min')[0],
+            per_ip_5min.count if per_ip_5min else sketch('5min')[0],
+            round(scoped_1min.response_time_sum / scoped_1min.count, 2) if has_1min else 0.0,
+            round(scoped_5min.bytes_sum / scoped_5min.count, 2) if has_5min else 0.0,
+            round(error_rate_1min, 4),
+            round(error_rate_1min - error_rate_5min, 4),
+            per_ip_1min.urls.count(now) if per_ip_1min and per_ip_1min.urls is not None else 0,
+            round(scoped_1min.method_entropy(), 4) if scoped_1min else 0.0,
+        ]
+    
+    def _global_feature_row(self) -> List[float]:
+        """Fitur global dalam urutan FEATURE_ORDER (dipanggil dengan lock dipegang)."""
+        aggregate = self._global_aggregates['1min']
+        return [
+            aggregate.count,
+            round(aggregate.error_count / aggregate.count, 4) if aggregate.count else 0.0,
+        ]
+    
+    def replay(
+        self,
+        logs: Iterable[Dict],
+        reorder_delay_seconds: float = 0.0,
+        reorder_capacity: int = 10000
+    ) -> Iterator[Tuple[Dict, Dict]]:
+        """
+        Memutar ulang log arsip secepat CPU menggunakan waktu event.
+        Window harus dibuat dengan clock='event'. Log yang sedikit tidak
+        berurutan dirapikan oleh reorder buffer sebelum diproses, sehingga
+        fitur setiap log dihitung pada timestamp log itu sendiri.
+        
+        Args:
+            logs: Iterable log dengan field 'timestamp'
+            reorder_delay_seconds: Toleransi keterlambatan event (detik)
+            reorder_capacity: Jumlah maksimal event yang ditahan
+        
+        Yields:
+            Tuple (log, fitur temporal) berurutan berdasarkan timestamp
+        """
+        return _replay(self, logs, reorder_delay_seconds, reorder_capacity)
+    
+    def get_stats(self) -> Dict:
+        """
+        Mendapatkan statistik dari sliding window saat ini.
+        
+        Returns:
+            Dictionary dengan statistik
+        """
+        with self.lock:
+            self._cleanup_expired_logs()
+            return {
+                'buffer_size': len(self.log_buffer),
+                'storage': self.storage,
+                'window_size_minutes': self.window_size.total_seconds() / 60,
+                **{f'logs_{key}': aggregate.count for key, aggregate in self._global_aggregates.items()},
+                'tracked_ips': len(self._ip_aggregates[self._longest_window]),
+                'tracked_routes': len(self._route_counts[self._longest_window]),
+                'tracked_subnets': len(self._subnet_aggregates[self._longest_window][0]),
+            }
+    
+    def clear(self) -> None:
+        """
+        Membersihkan buffer sliding window.
+        """
+        with self.lock:
+            self.log_buffer.clear()
+            for key in self._window_spans:
+                self._window_heads[key] = self.log_buffer.first_seq
+                self._ip_aggregates[key] = {}
+                self._global_aggregates[key] = _WindowAggregate()
+                self._route_counts[key] = {}
+                self._subnet_aggregates[key] = tuple({} for _ in SUBNET_LEVELS)
+                self._promotion_threshold[key] = 0
+                self._sketch_horizon[key] = float('-inf')
+            self._ip_sketches = {}
+            self._subnet_sketches = {}
+            self._next_expiry = float('inf')
+            self._time_wheel.clear()
+            self.published = None
+            print("[INFO] Sliding window buffer cleared")
+
+
+class ShardedSlidingWindow:
+    """
+    Sliding window yang dipartisi berdasarkan hash IP ke beberapa shard.
+    
+    Setiap shard adalah TemporalSlidingWindow dengan lock dan state per-IP
+    sendiri, sehingga thread yang memproses IP berbeda tidak saling menunggu.
+    Counter global per shard digabung tanpa mengambil lock shard (shard yang
+    sedang sibuk dibaca apa adanya).
+    
+    Fitur global di jalur request (IP unik, p95 global, fitur subnet) dibaca
+    tanpa lock dari salinan agregat yang dipublikasikan setiap shard sekitar
+    sekali per `publish_interval_seconds` (lihat _published_views), sehingga
+    bisa tertinggal paling lama satu interval. Pembacaan dashboard
+    (get_global_metrics, calculate_subnet_request_count) tetap memegang semua
+    lock shard dalam urutan tetap (lihat _hold_all_shards).
+    API-nya sama dengan TemporalSlidingWindow.
+    """
+    
+    FEATURE_ORDER = TemporalSlidingWindow.FEATURE_ORDER
+    
+    def __init__(
+        self,
+        window_size_minutes: int = 10,
+        shards: int = 8,
+        publish_interval_seconds: float = 1.0,
+        **window_kwargs
+    ):
+        """
+        Inisialisasi sharded sliding window.
+        
+        Args:
+            window_size_minutes: Ukuran maksimal window dalam menit
+            shards: Jumlah shard
+            publish_interval_seconds: Interval shard memperbarui salinan
+                agregat global yang dibaca tanpa lock (0 = setiap log, exact)
+            **window_kwargs: Argumen tambahan untuk setiap TemporalSlidingWindow
+        """
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        if publish_interval_seconds < 0:
+            raise ValueError("publish_interval_seconds must be >= 0")
+        
+        # Batas IP dibagi rata antar shard
+        max_tracked_ips = window_kwargs.get('max_tracked_ips', 10000)
+        if max_tracked_ips is not None:
+            window_kwargs['max_tracked_ips'] = max(1, -(-max_tracked_ips // shards))
+        
+        # Semua shard memakai clock yang sama (watermark event-time bersama)
+        self.clock = window_kwargs['clock'] = create_clock(window_kwargs.get('clock', 'wall'))
+        
+        self.shards: List[TemporalSlidingWindow] = [
+            TemporalSlidingWindow(window_size_minutes, **window_kwargs) for _ in range(shards)
+        ]
+        for shard in self.shards:
+            shard.publish_interval = publish_interval_seconds
+        self.window_size = self.shards[0].window_size
+        self.windows = self.shards[0].windows
+        self.extra_windows = self.shards[0].extra_windows
+        self.storage = self.shards[0].storage
+        
+        print(f"[INFO] ShardedSlidingWindow initialized ({shards} shards)")
+    
+    def shard_for(self, ip_address: Optional[str]) -> TemporalSlidingWindow:
+        """Shard yang bertanggung jawab atas IP tertentu."""
+        return self.shards[zlib.crc32(str(ip_address).encode()) % len(self.shards)]
+    
+    def _hold_all_shards(self) -> ExitStack:
+        """
+        Mengambil lock semua shard dalam urutan indeks (urutan yang sama
+        dengan WindowPersistence.snapshot) agar tidak terjadi deadlock.
+        """
+        stack = ExitStack()
+        for shard in self.shards:
+            stack.enter_context(shard.lock)
+        return stack
+    
+    def _published_views(self) -> List[_PublishedTotals]:
+        """
+        Salinan agregat terakhir setiap shard. Salinan yang sudah berumur satu
+        interval (misal shard tanpa traffic) diperbarui lewat cleanup tanpa
+        menunggu; jika shard sedang sibuk, salinan lama yang dipakai.
+        """
+        now = self.clock.now()
+        views = []
+        for shard in self.shards:
+            view = shard.published
+            if view is None or not 0 <= now - view.time < shard.publish_interval:
+                shard._try_cleanup_expired_logs()
+                view = shard.published
+            if view is not None:
+                views.append(view)
+        return views
+    
+    def add_log(self, log_data: Dict) -> None:
+        """Menambahkan log ke shard milik IP-nya."""
+        self.shard_for(log_data.get('ip_address')).add_log(log_data)
+    
+    def export_records(self) -> List[Tuple]:
+        """Record semua shard, terurut berdasarkan timestamp."""
+        records = []
+        for shard in self.shards:
+            records.extend(shard.export_records())
+        records.sort(key=lambda record: record[0])
+        return records
+    
+    def bulk_load(self, records: Iterable[Tuple]) -> int:
+        """Membagi record ke shard masing-masing lalu memuatnya sekaligus."""
+        partitions: Dict[int, List[Tuple]] = {id(shard): [] for shard in self.shards}
+        for record in records:
+            partitions[id(self.shard_for(record[1]))].append(record)
+        return sum(shard.bulk_load(partitions[id(shard)]) for shard in self.shards)
+    
+    def extract_temporal_features(self, log_data: Dict) -> Dict:
+        """
+        Mengekstrak semua fitur temporal untuk satu log entry.
+        Hanya lock shard milik IP tersebut yang diambil.
+        """
+        ip_address = log_data.get('ip_address', '')
+        shard = self.shard_for(log_data.get('ip_address'))
+        
+        with shard.lock:
+            shard.add_log(log_data)
+            features = shard._ip_features(ip_address)
+        
+        features.update(self._subnet_features(ip_address))
+        features.update(self._global_features())
+        return features
+    
+    def _subnet_features(self, ip_address: str) -> Dict:
+        """Fitur subnet; IP satu subnet tersebar di banyak shard sehingga dijumlahkan."""
+        prefixes = subnet_prefixes(ip_address)
+        if not self.shards[0].subnet_counters or prefixes is None:
+            return {}
+        
+        views = self._published_views()
+        
+        def totals(level: int, window_key: str) -> Tuple[int, int, int]:
+            per_shard = [view.subnet_totals(level, prefixes[level], window_key) for view in views]
+            return tuple(sum(values) for values in zip(*per_shard)) if per_shard else (0, 0, 0)
+        
+        return _subnet_feature_dict(totals)
+    
+    def get_feature_vector(self, log_data: Dict) -> np.ndarray:
+        """Mengkonversi fitur temporal menjadi numpy array untuk ML model."""
+        features = self.extract_temporal_features(log_data)
+        return np.array([features[key] for key in self.FEATURE_ORDER])
+    
+    def extract_temporal_features_batch(self, logs: List[Dict]) -> np.ndarray:
+        """
+        Versi batch (lihat TemporalSlidingWindow.extract_temporal_features_batch).
+        Lock semua shard diambil sekali untuk seluruh chunk agar fitur global
+        setiap baris sama dengan pemanggilan berurutan.
+        """
+        timestamps = [_parse_timestamp(log.get('timestamp')) for log in logs]
+        order = sorted(range(len(logs)), key=lambda i: timestamps[i].timestamp())
+        matrix = np.zeros((len(logs), len(self.FEATURE_ORDER)), dtype=np.float64)
+        
+        with self._hold_all_shards():
+            for i in order:
+                ip_address = logs[i].get('ip_address', '')
+                shard = self.shard_for(logs[i].get('ip_address'))
+                shard._insert_log(logs[i], timestamps[i])
+                now = self.clock.now()
+                
+                count = error_count = 0
+                for other in self.shards:
+                    other._cleanup_expired_logs(now)
+                    aggregate = other._global_aggregates['1min']
+                    count += aggregate.count
+                    error_count += aggregate.error_count
+                matrix[i] = shard._ip_feature_row(ip_address, now) + [
+                    count,
+                    round(error_count / count, 4) if count else 0.0,
+                ]
+        
+        return matrix
+    
+    def replay(
+        self,
+        logs: Iterable[Dict],
+        reorder_delay_seconds: float = 0.0,
+        reorder_capacity: int = 10000
+    ) -> Iterator[Tuple[Dict, Dict]]:
+        """Replay log arsip (lihat TemporalSlidingWindow.replay)."""
+        return _replay(self, logs, reorder_delay_seconds, reorder_capacity)
+    
+    def _merged_global_aggregate(self, window_key: str) -> _WindowAggregate:
+        """Menggabungkan agregat global semua shard tanpa lock blocking."""
+        merged = _WindowAggregate()
+        for shard in self.shards:
+            shard._try_cleanup_expired_logs()
+            aggregate = shard._global_aggregates[shard._resolve_window(window_key)]
+            merged.count += aggregate.count
+            merged.error_count += aggregate.error_count
+            merged.response_time_sum += aggregate.response_time_sum
+            merged.bytes_sum += aggregate.bytes_sum
+            for method, count in aggregate.method_counts.copy().items():
+                merged.method_counts[method] = merged.method_counts.get(method, 0) + count
+        return merged
+    
+    def _global_features(self) -> Dict:
+        views = self._published_views()
+        count = error_count = 0
+        for shard in self.shards:
+            aggregate = shard._global_aggregates['1min']
+            count += aggregate.count
+            error_count += aggregate.error_count
+        features = {
+            'global_req_count_1min': count,
+            'global_error_rate_1min': round(error_count / count, 4) if count else 0.0,
+            'unique_ips_1min': self._unique_ips(views, '1min'),
+        }
+        if self.shards[0].latency_quantiles:
+            features['global_p95_response_time_1min'] = round(self._global_quantile(views, '1min', 0.95), 2)
+        return features
+    
+    def calculate_request_count(self, ip_address: str, window_key: str = '1min') -> int:
+        return self.shard_for(ip_address).calculate_request_count(ip_address, window_key)
+    
+    def calculate_unique_urls(self, ip_address: str, window_key: str = '1min') -> int:
+        return self.shard_for(ip_address).calculate_unique_urls(ip_address, window_key)
+    
+    def calculate_unique_routes(self, ip_address: str, window_key: str = '1min') -> int:
+        return self.shard_for(ip_address).calculate_unique_routes(ip_address, window_key)
+    
+    def calculate_subnet_request_count(self, ip_address: str, window_key: str = '1min', level: str = 'subnet') -> int:
+        with self._hold_all_shards():
+            return sum(shard.calculate_subnet_request_count(ip_address, window_key, level) for shard in self.shards)
+    
+    def calculate_avg_response_time(self, ip_address: str = None, window_key: str = '1min') -> float:
+        if ip_address:
+            return self.shard_for(ip_address).calculate_avg_response_time(ip_address, window_key)
+        aggregate = self._merged_global_aggregate(window_key)
+        return aggregate.response_time_sum / aggregate.count if aggregate.count else 0.0
+    
+    def calculate_response_time_quantile(self, ip_address: str = None, window_key: str = '1min', q: float = 0.95) -> float:
+        if ip_address:
+            return self.shard_for(ip_address).calculate_response_time_quantile(ip_address, window_key, q)
+        return self._global_quantile(self._published_views(), window_key, q)
+    
+    def _global_quantile(self, views: List[_PublishedTotals], window_key: str, q: float) -> float:
+        # Histogram bucket tetap: histogram semua shard cukup dijumlahkan
+        key = self.shards[0]._resolve_window(window_key)
+        histogram = sum(view.latency[key] for view in views if view.latency is not None)
+        return float(LATENCY_MAPPING.quantiles(histogram, (q,))[0])
+    
+    def calculate_avg_bytes(self, ip_address: str = None, window_key: str = '5min') -> float:
+        if ip_address:
+            return self.shard_for(ip_address).calculate_avg_bytes(ip_address, window_key)
+        aggregate = self._merged_global_aggregate(window_key)
+        return aggregate.bytes_sum / aggregate.count if aggregate.count else 0.0
+    
+    def calculate_error_rate(self, ip_address: str = None, window_key: str = '1min') -> float:
+        if ip_address:
+            return self.shard_for(ip_address).calculate_error_rate(ip_address, window_key)
+        aggregate = self._merged_global_aggregate(window_key)
+        return aggregate.error_count / aggregate.count if aggregate.count else 0.0
+    
+    def calculate_error_rate_slope(self, ip_address: str = None) -> float:
+        return self.calculate_error_rate(ip_address, '1min') - self.calculate_error_rate(ip_address, '5min')
+    
+    def calculate_method_entropy(self, ip_address: str = None, window_key: str = '1min') -> float:
+        if ip_address:
+            return self.shard_for(ip_address).calculate_method_entropy(ip_address, window_key)
+        return self._merged_global_aggregate(window_key).method_entropy()
+    
+    def calculate_unique_ips(self, window_key: str = '1min') -> int:
+        """Register HyperLogLog semua shard digabung lalu diestimasi sekali."""
+        return self._unique_ips(self._published_views(), window_key)
+    
+    def _unique_ips(self, views: List[_PublishedTotals], window_key: str) -> int:
+        key = self.shards[0]._resolve_window(window_key)
+        if not views:
+            return 0
+        merged = np.maximum.reduce([view.ip_registers[key] for view in views])
+        return int(round(hll_estimate(merged))) if merged.any() else 0
+    
+    def get_global_metrics(self, window_key: str = '1min') -> Dict:
+        """Metrik global dari gabungan time wheel semua shard."""
+        now = self.clock.now()
+        span = self.shards[0]._window_spans[self.shards[0]._resolve_window(window_key)]
+        with self._hold_all_shards():
+            snapshots = [shard._time_wheel.window_snapshot(now, span) for shard in self.shards]
+        return _TimeWheel.metrics_from_snapshot(_TimeWheel.merge_snapshots(snapshots), now)
+    
+    def get_top_ips(self, window_key: str = '1min', k: int = 10) -> Dict:
+        """Top-K IP gabungan; IP dipartisi per shard sehingga cukup di-merge."""
+        per_shard = [shard.get_top_ips(window_key, k) for shard in self.shards]
+        top = {
+            ranking: heapq.nlargest(
+                k, (entry for result in per_shard for entry in result[ranking]),
+                key=lambda entry: entry['count']
+            )
+            for ranking in ('by_requests', 'by_errors', 'by_unique_urls')
+        }
+        top['tracked_ips'] = sum(result['tracked_ips'] for result in per_shard)
+        return top
+    
+    def get_top_routes(self, window_key: str = '1min', k: int = 10) -> List[Dict]:
+        """Top-K route gabungan; satu route bisa muncul di banyak shard sehingga dijumlahkan."""
+        totals: Dict[str, int] = {}
+        for shard in self.shards:
+            with shard.lock:
+                shard._cleanup_expired_logs()
+                for route, count in shard._route_counts[shard._resolve_window(window_key)].items():
+                    totals[route] = totals.get(route, 0) + count
+        return [
+            {'route': route, 'count': count}
+            for route, count in heapq.nlargest(k, totals.items(), key=lambda item: item[1])
+        ]
+    
+    def get_logs_in_window(self, window_key: str = '1min') -> List[Dict]:
+        """Log semua shard dalam window, diurutkan berdasarkan timestamp."""
+        logs = []
+        for shard in self.shards:
+            logs.extend(shard.get_logs_in_window(window_key))
+        logs.sort(key=lambda log: log['timestamp'])
+        return logs
+    
+    def get_stats(self) -> Dict:
+        """Statistik gabungan semua shard."""
+        per_shard = [shard.get_stats() for shard in self.shards]
+        return {
+            'buffer_size': sum(stats['buffer_size'] for stats in per_shard),
+            'storage': self.storage,
+            'window_size_minutes': self.window_size.total_seconds() / 60,
+            **{f'logs_{key}': sum(stats[f'logs_{key}'] for stats in per_shard) for key in self.windows},
+            'tracked_ips': sum(stats['tracked_ips'] for stats in per_shard),
+            'tracked_routes': len(self._tracked_routes()),
+            'tracked_subnets': len(self._tracked_subnets()),
+            'shards': len(self.shards),
+        }
+    
+    def get_top_subnets(self, window_key: str = '1min', k: int = 10) -> Dict:
+        """Top-K subnet gabungan; counter subnet yang sama dari semua shard dijumlahkan."""
+        merged: Tuple[Dict[str, List], ...] = tuple({} for _ in SUBNET_LEVELS)
+        for shard in self.shards:
+            with shard.lock:
+                shard._cleanup_expired_logs()
+                tables = shard._subnet_aggregates[shard._resolve_window(window_key)]
+                for totals, table in zip(merged, tables):
+                    for prefix, aggregate in table.items():
+                        entry = totals.setdefault(prefix, [0, 0 if aggregate.ips is not None else None])
+                        entry[0] += aggregate.count
+                        if aggregate.ips is not None:
+                            entry[1] += len(aggregate.ips)
+        return {
+            name: [
+                {'subnet': prefix, 'count': count, 'unique_ips': unique_ips}
+                for prefix, (count, unique_ips) in heapq.nlargest(k, totals.items(), key=lambda item: item[1][0])
+            ]
+            for name, totals in zip(SUBNET_LEVELS, merged)
+        }
+    
+    def _tracked_routes(self) -> set:
+        routes = set()
+        for shard in self.shards:
+            with shard.lock:
+                routes.update(shard._route_counts[shard._longest_window])
+        return routes
+    
+    def _tracked_subnets(self) -> set:
+        # Satu subnet bisa tersebar di banyak shard: digabung, bukan dijumlah
+        subnets = set()
+        for shard in self.shards:
+            with shard.lock:
+                shard._cleanup_expired_logs()
+                subnets.update(shard._subnet_aggregates[shard._longest_window][0])
+        return subnets
+    
+    def clear(self) -> None:
+        """Membersihkan semua shard."""
+        for shard in self.shards:
+            shard.clear()
+
+
+class DecayedSlidingWindow:
+    """
+    Mode window dengan counter yang meluruh eksponensial (exponential decay).
     
-    Fitur yang dihitung:
-    1. req_count_1min: Jumlah request dalam 1 menit terakhir
-    2. req_count_5min: Jumlah request dalam 5 menit terakhir
-    3. avg_response_time_1min: Rata-rata response time 1 menit
-    4. avg_bytes_5min: Rata-rata ukuran payload dalam 5 menit
-    5. error_rate_1min: Persentase error (4xx, 5xx) dalam 1 menit
-    6. error_rate_slope: Tren kenaikan error rate (derivative)
-    7. unique_urls_1min: Jumlah URL unik (deteksi scanning)
-    8. method_entropy: Entropi distribusi HTTP method (deteksi abnormal pattern)
+    Tidak menyimpan log sama sekali: setiap IP hanya punya beberapa float per
+    window (jumlah request, error, total response time, total bytes) plus
+    histogram method dan bitmap URL, disimpan sebagai kolom NumPy. Cocok
+    untuk horizon panjang (jam) dengan jutaan IP (~300 byte per IP).
+    
+    Counter window W meluruh dengan half-life h: nilai sebuah event setelah
+    t detik = 2^(-t/h). Default h = W * ln 2, sehingga untuk traffic dengan
+    rate konstan nilai counter sama dengan jumlah request dalam W.
+    Rasio (error rate, rata-rata) tidak bergantung pada peluruhan.
+    
+    Nama fitur sama dengan TemporalSlidingWindow. Fitur global tetap dihitung
+    dari time wheel per detik (memori tetap). Karena log mentah tidak
+    disimpan, window ini tidak punya get_logs_in_window().
     """
     
-    def __init__(self, window_size_minutes: int = 10):
+    FEATURE_ORDER = TemporalSlidingWindow.FEATURE_ORDER
+    
+    # Argumen create_sliding_window yang didukung DecayedSlidingWindow
+    FACTORY_OPTIONS = ('windows', 'half_lives', 'max_tracked_ips', 'cardinality_error', 'capacity', 'clock')
+    
+    # Bitmap URL unik per IP (linear counting) untuk window 1 menit
+    URL_BITMAP_BITS = 64
+    
+    def __init__(
+        self,
+        window_size_minutes: int = 10,
+        half_lives: Optional[Dict[str, float]] = None,
+        windows: Optional[Iterable[str]] = None,
+        max_tracked_ips: Optional[int] = None,
+        cardinality_error: float = 0.05,
+        capacity: int = 1024,
+        clock: Union[str, WallClock, EventTimeClock] = 'wall'
+    ):
         """
-        Inisialisasi sliding window.
+        Inisialisasi decayed sliding window.
         
         Args:
-            window_size_minutes: Ukuran maksimal window dalam menit
+            window_size_minutes: Horizon time wheel global (menit)
+            half_lives: Half-life per key window dalam detik
+                (default: panjang window * ln 2)
+            windows: Window tambahan selain DEFAULT_WINDOWS (misal ['60min'])
+            max_tracked_ips: Batas jumlah IP (None = tanpa batas); IP dengan
+                counter terkecil dibuang saat batas terlampaui
+            cardinality_error: Error bound HyperLogLog untuk IP/URL unik global
+            capacity: Kapasitas awal tabel IP
+            clock: 'wall', 'event' atau instance clock
         """
-        self.window_size = timedelta(minutes=window_size_minutes)
-        self.log_buffer: deque = deque()
-        self.lock = threading.RLock()  # Reentrant lock to avoid deadlock
+        if max_tracked_ips is not None and max_tracked_ips < 1:
+            raise ValueError("max_tracked_ips must be >= 1")
         
-        # Konfigurasi time windows
-        self.windows = {
-            '1min': timedelta(minutes=1),
-            '5min': timedelta(minutes=5),
-            '10min': timedelta(minutes=10)
+        extra_windows = [key for key in (windows or ()) if key not in DEFAULT_WINDOWS]
+        self.windows = dict(sorted(
+            ((key, parse_window_key(key)) for key in list(DEFAULT_WINDOWS) + extra_windows),
+            key=lambda item: item[1]
+        ))
+        self.extra_windows = [key for key in self.windows if key in extra_windows]
+        self.window_size = max([timedelta(minutes=window_size_minutes)] + list(self.windows.values()))
+        self.storage = 'decayed'
+        self.lock = threading.RLock()
+        self.clock = create_clock(clock)
+        self.max_tracked_ips = max_tracked_ips
+        # Janitor opsional (lihat window_janitor.WindowJanitor) untuk IP idle
+        self.janitor = None
+        self.history = None
+        
+        half_lives = half_lives or {}
+        unknown = set(half_lives) - set(self.windows)
+        if unknown:
+            raise ValueError(f"Unknown window keys in half_lives: {sorted(unknown)}")
+        self.half_lives = {
+            key: float(half_lives.get(key, span.total_seconds() * np.log(2)))
+            for key, span in self.windows.items()
         }
+        if min(self.half_lives.values()) <= 0:
+            raise ValueError("half-lives must be > 0")
+        self._window_index = {key: i for i, key in enumerate(self.windows)}
+        # Laju peluruhan per detik (ln 2 / half-life) per window
+        self._decay_rates = np.array([np.log(2) / self.half_lives[key] for key in self.windows])
+        
+        self._time_wheel = _TimeWheel(
+            int(np.ceil(self.window_size.total_seconds())),
+            precision=precision_for_error(cardinality_error)
+        )
+        self._initial_capacity = max(1, capacity)
+        self._allocate(self._initial_capacity)
         
-        print(f"[INFO] TemporalSlidingWindow initialized (window: {window_size_minutes} min)")
+        print(f"[INFO] DecayedSlidingWindow initialized (half-lives: {self.half_lives})")
+    
+    def _allocate(self, capacity: int) -> None:
+        windows = len(self.windows)
+        self._rows: Dict[str, int] = {}
+        self._ips: List[str] = []
+        self._last_update = np.zeros(capacity, dtype=np.float64)
+        # Kolom [row, window]: request, error, total response time, total bytes
+        self._counts = np.zeros((capacity, windows), dtype=np.float64)
+        self._errors = np.zeros((capacity, windows), dtype=np.float64)
+        self._response_time_sums = np.zeros((capacity, windows), dtype=np.float64)
+        self._bytes_sums = np.zeros((capacity, windows), dtype=np.float64)
+        # Histogram method dan bitmap URL hanya untuk window 1 menit
+        self._method_counts = np.zeros((capacity, 8), dtype=np.float32)
+        self._url_bitmaps = np.zeros((capacity, 2), dtype=np.uint64)
+        self._url_epochs = np.zeros(capacity, dtype=np.int64)
+    
+    def _grow(self) -> None:
+        capacity = len(self._last_update) * 2
+        for name in self._COLUMNS:
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+    
+    def _row_for(self, ip_address: Optional[str], now: float) -> int:
+        row = self._rows.get(ip_address)
+        if row is not None:
+            return row
+        row = len(self._ips)
+        if row == len(self._last_update):
+            self._grow()
+        self._rows[ip_address] = row
+        self._ips.append(ip_address)
+        self._last_update[row] = now
+        if self.janitor is not None:
+            self.janitor.schedule_idle(self, ip_address, now)
+        return row
+    
+    def _decay_factors(self, row: int, now: float) -> np.ndarray:
+        return np.exp(-self._decay_rates * max(0.0, now - self._last_update[row]))
+    
+    def _url_epoch(self, timestamp: float) -> int:
+        return int(timestamp // self.windows['1min'].total_seconds())
     
     def add_log(self, log_data: Dict) -> None:
         """
-        Menambahkan log baru ke buffer dengan timestamp.
+        Memperbarui counter IP dengan satu log.
         
         Args:
             log_data: Dictionary berisi data log server
         """
         with self.lock:
-            # Tambahkan timestamp jika belum ada
-            if 'timestamp' not in log_data:
-                log_data['timestamp'] = datetime.now()
-            elif isinstance(log_data['timestamp'], str):
-                log_data['timestamp'] = datetime.fromisoformat(log_data['timestamp'])
-            
-            self.log_buffer.append(log_data)
-            
-            # Bersihkan log yang sudah expired
-            self._cleanup_expired_logs()
+            self._insert_log(log_data, _parse_timestamp(log_data.get('timestamp')))
     
-    def _cleanup_expired_logs(self) -> None:
-        """
-        Menghapus log yang sudah melewati window maksimal.
-        """
-        cutoff_time = datetime.now() - self.window_size
+    def _insert_log(self, log_data: Dict, timestamp: datetime) -> None:
+        event = _LogEvent.from_log(log_data, timestamp.timestamp())
+        if self.history is not None:
+            self.history.record(event.timestamp, event.ip, event.is_error, event.response_time)
+        self.clock.observe(event.timestamp)
+        now = self.clock.now()
+        self._time_wheel.add(event, now)
         
-        while self.log_buffer and self.log_buffer[0]['timestamp'] < cutoff_time:
-            self.log_buffer.popleft()
+        row = self._row_for(event.ip, now)
+        # Bawa state ke `now`, lalu tambahkan event dengan bobot sesuai umurnya
+        decay = self._decay_factors(row, now)
+        weight = np.exp(-self._decay_rates * max(0.0, now - event.timestamp))
+        self._counts[row] = self._counts[row] * decay + weight
+        self._errors[row] = self._errors[row] * decay + weight * event.is_error
+        self._response_time_sums[row] = self._response_time_sums[row] * decay + weight * event.response_time
+        self._bytes_sums[row] = self._bytes_sums[row] * decay + weight * event.nbytes
+        
+        minute = self._window_index['1min']
+        method_slot = self._time_wheel._method_slot(event.method)
+        if method_slot >= self._method_counts.shape[1]:
+            extra = np.zeros_like(self._method_counts)
+            self._method_counts = np.hstack([self._method_counts, extra])
+        self._method_counts[row] *= np.float32(decay[minute])
+        self._method_counts[row, method_slot] += weight[minute]
+        self._last_update[row] = max(self._last_update[row], now)
+        
+        # Bitmap URL: epoch 1 menit sekarang dan sebelumnya
+        epoch = self._url_epoch(now)
+        shift = epoch - self._url_epochs[row]
+        if shift:
+            # Kolom 0 = epoch sebelumnya, kolom 1 = epoch sekarang
+            self._url_bitmaps[row] = (self._url_bitmaps[row, 1], 0) if shift == 1 else (0, 0)
+            self._url_epochs[row] = epoch
+        if self._url_epoch(event.timestamp) >= epoch - 1:
+            slot = 1 if self._url_epoch(event.timestamp) == epoch else 0
+            bit = np.uint64(1) << np.uint64(stable_hash64(event.url) % self.URL_BITMAP_BITS)
+            self._url_bitmaps[row, slot] |= bit
+        
+        cap = self.max_tracked_ips
+        if cap is not None and len(self._ips) > cap + max(1, cap // 10):
+            self._prune(now, keep=cap)
     
-    def get_logs_in_window(self, window_key: str = '1min') -> List[Dict]:
+    _COLUMNS = ('_last_update', '_counts', '_errors', '_response_time_sums', '_bytes_sums',
+                '_method_counts', '_url_bitmaps', '_url_epochs')
+    
+    def _longest_counts(self, now: float) -> np.ndarray:
+        """Counter window terpanjang semua IP pada `now`."""
+        active = len(self._ips)
+        longest = len(self.windows) - 1
+        return self._counts[:active, longest] * np.exp(
+            -self._decay_rates[longest] * np.maximum(0.0, now - self._last_update[:active])
+        )
+    
+    def _compact(self, survivors: np.ndarray) -> None:
+        """Memadatkan tabel sehingga hanya baris `survivors` (terurut) tersisa."""
+        active = len(self._ips)
+        for name in self._COLUMNS:
+            array = getattr(self, name)
+            array[:len(survivors)] = array[survivors]
+            array[len(survivors):active] = 0
+        self._ips = [self._ips[row] for row in survivors]
+        self._rows = {ip: row for row, ip in enumerate(self._ips)}
+    
+    def _prune(self, now: float, keep: int) -> None:
+        """Menyisakan `keep` IP dengan counter window terpanjang terbesar."""
+        current = self._longest_counts(now)
+        self._compact(np.sort(np.argpartition(-current, keep - 1)[:keep]))
+    
+    def prune(self, min_count: float = 0.01) -> int:
         """
-        Mengambil semua log dalam window tertentu.
-        
-        Args:
-            window_key: Key dari window ('1min', '5min', '10min')
+        Membuang IP yang counter window terpanjangnya sudah meluruh di bawah
+        `min_count` (IP yang sudah lama tidak aktif).
         
         Returns:
-            List log yang masih dalam window
+            Jumlah IP yang dibuang
         """
         with self.lock:
-            cutoff_time = datetime.now() - self.windows.get(window_key, self.windows['1min'])
-            return [log for log in self.log_buffer if log['timestamp'] >= cutoff_time]
+            active = len(self._ips)
+            self._compact(np.nonzero(self._longest_counts(self.clock.now()) >= min_count)[0])
+            return active - len(self._ips)
     
-    def calculate_request_count(self, ip_address: str, window_key: str = '1min') -> int:
+    def _remove_rows(self, rows: List[int]) -> None:
+        """Menghapus baris dengan swap-remove (baris terakhir mengisi lubang)."""
+        for row in sorted(rows, reverse=True):
+            last = len(self._ips) - 1
+            if row != last:
+                for name in self._COLUMNS:
+                    array = getattr(self, name)
+                    array[row] = array[last]
+                self._ips[row] = self._ips[last]
+                self._rows[self._ips[row]] = row
+            for name in self._COLUMNS:
+                getattr(self, name)[last] = 0
+            del self._rows[self._ips.pop()]
+    
+    def expire_idle_ips(self, ips: List[Optional[str]], idle_seconds: float) -> Dict[Optional[str], float]:
         """
-        Menghitung jumlah request dari IP tertentu dalam window.
+        Membuang IP yang tidak aktif selama `idle_seconds` (dipanggil janitor).
         
         Args:
-            ip_address: IP address yang akan dihitung
-            window_key: Window waktu
+            ips: IP yang deadline idle-nya sudah lewat
+            idle_seconds: Lama tanpa aktivitas sebelum IP dibuang
         
         Returns:
-            Jumlah request
+            Dictionary {ip: deadline baru} untuk IP yang ternyata masih aktif
         """
-        logs = self.get_logs_in_window(window_key)
-        return sum(1 for log in logs if log.get('ip_address') == ip_address)
+        with self.lock:
+            now = self.clock.now()
+            idle_rows = []
+            pending = {}
+            for ip_address in ips:
+                row = self._rows.get(ip_address)
+                if row is None:
+                    continue
+                deadline = float(self._last_update[row]) + idle_seconds
+                if deadline <= now:
+                    idle_rows.append(row)
+                else:
+                    pending[ip_address] = deadline
+            self._remove_rows(idle_rows)
+            return pending
+    
+    def _ip_state(self, ip_address: Optional[str], window_key: str) -> Optional[Tuple[float, float, float, float]]:
+        """(request, error, total response time, total bytes) IP pada `now`."""
+        row = self._rows.get(ip_address)
+        if row is None:
+            return None
+        index = self._window_index[self._resolve_window(window_key)]
+        decay = float(np.exp(-self._decay_rates[index] * max(0.0, self.clock.now() - self._last_update[row])))
+        return (
+            self._counts[row, index] * decay,
+            self._errors[row, index] * decay,
+            self._response_time_sums[row, index] * decay,
+            self._bytes_sums[row, index] * decay,
+        )
+    
+    def _resolve_window(self, window_key: str) -> str:
+        return window_key if window_key in self._window_index else '1min'
+    
+    def _global_snapshot(self, window_key: str) -> Dict:
+        span = self.windows[self._resolve_window(window_key)].total_seconds()
+        return self._time_wheel.window_snapshot(self.clock.now(), span)
+    
+    def calculate_request_count(self, ip_address: str, window_key: str = '1min') -> float:
+        """Jumlah request (meluruh) dari IP dalam window."""
+        with self.lock:
+            state = self._ip_state(ip_address, window_key)
+            return state[0] if state else 0.0
     
     def calculate_avg_response_time(self, ip_address: str = None, window_key: str = '1min') -> float:
-        """
-        Menghitung rata-rata response time dalam window.
-        
-        Args:
-            ip_address: Filter by IP (None = semua IP)
-            window_key: Window waktu
-        
-        Returns:
-            Rata-rata response time dalam ms
-        """
-        logs = self.get_logs_in_window(window_key)
-        
-        if ip_address:
-            logs = [log for log in logs if log.get('ip_address') == ip_address]
-        
-        if not logs:
-            return 0.0
-        
-        response_times = [float(log.get('response_time', 0)) for log in logs]
-        return np.mean(response_times) if response_times else 0.0
+        with self.lock:
+            if not ip_address:
+                snapshot = self._global_snapshot(window_key)
+                requests = snapshot['counts'].sum()
+                return snapshot['response_time_sum'] / requests if requests else 0.0
+            state = self._ip_state(ip_address, window_key)
+            return state[2] / state[0] if state and state[0] > 0 else 0.0
     
     def calculate_avg_bytes(self, ip_address: str = None, window_key: str = '5min') -> float:
-        """
-        Menghitung rata-rata ukuran request/response dalam window.
-        
-        Args:
-            ip_address: Filter by IP (None = semua IP)
-            window_key: Window waktu
-        
-        Returns:
-            Rata-rata bytes
-        """
-        logs = self.get_logs_in_window(window_key)
-        
-        if ip_address:
-            logs = [log for log in logs if log.get('ip_address') == ip_address]
-        
-        if not logs:
-            return 0.0
-        
-        # Estimasi bytes dari panjang URL + user agent
-        bytes_list = []
-        for log in logs:
-            url_len = len(log.get('url', ''))
-            ua_len = len(log.get('user_agent', ''))
-            # Estimasi sederhana: URL + headers
-            estimated_bytes = url_len + ua_len + 200  # 200 untuk HTTP headers dasar
-            bytes_list.append(estimated_bytes)
-        
-        return np.mean(bytes_list) if bytes_list else 0.0
+        # Time wheel global tidak menyimpan bytes
+        with self.lock:
+            state = self._ip_state(ip_address, window_key) if ip_address else None
+            return state[3] / state[0] if state and state[0] > 0 else 0.0
     
     def calculate_error_rate(self, ip_address: str = None, window_key: str = '1min') -> float:
-        """
-        Menghitung persentase error (4xx, 5xx) dalam window.
-        
-        Args:
-            ip_address: Filter by IP (None = semua IP)
-            window_key: Window waktu
-        
-        Returns:
-            Error rate (0.0 - 1.0)
-        """
-        logs = self.get_logs_in_window(window_key)
-        
-        if ip_address:
-            logs = [log for log in logs if log.get('ip_address') == ip_address]
-        
-        if not logs:
-            return 0.0
-        
-        error_count = sum(1 for log in logs if int(log.get('status_code', 200)) >= 400)
-        return error_count / len(logs)
+        with self.lock:
+            if not ip_address:
+                snapshot = self._global_snapshot(window_key)
+                requests = snapshot['counts'].sum()
+                return float(snapshot['errors'].sum() / requests) if requests else 0.0
+            state = self._ip_state(ip_address, window_key)
+            return state[1] / state[0] if state and state[0] > 0 else 0.0
     
     def calculate_error_rate_slope(self, ip_address: str = None) -> float:
-        """
-        Menghitung tren kenaikan error rate (derivative).
-        Membandingkan error rate 1 menit terakhir vs 5 menit sebelumnya.
-        
-        Args:
-            ip_address: Filter by IP (None = semua IP)
-        
-        Returns:
-            Slope (positif = trending up, negatif = trending down)
-        """
-        error_rate_1min = self.calculate_error_rate(ip_address, '1min')
-        error_rate_5min = self.calculate_error_rate(ip_address, '5min')
-        
-        # Slope: perubahan error rate
-        # Nilai positif berarti error rate naik (berbahaya)
-        return error_rate_1min - error_rate_5min
+        return self.calculate_error_rate(ip_address, '1min') - self.calculate_error_rate(ip_address, '5min')
+    
+    def _unique_url_estimates(self, rows: np.ndarray, now: float) -> np.ndarray:
+        """Estimasi URL unik (linear counting) dari bitmap epoch sekarang + sebelumnya."""
+        shift = self._url_epoch(now) - self._url_epochs[rows]
+        bitmaps = self._url_bitmaps[rows]
+        current = np.where(shift == 0, bitmaps[:, 0] | bitmaps[:, 1],
+                           np.where(shift == 1, bitmaps[:, 1], np.uint64(0)))
+        bits = self.URL_BITMAP_BITS
+        ones = np.unpackbits(current.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+        zeros = np.maximum(bits - ones, 1)
+        return np.where(ones == bits, bits, np.rint(bits * np.log(bits / zeros))).astype(np.int64)
     
     def calculate_unique_urls(self, ip_address: str, window_key: str = '1min') -> int:
-        """
-        Menghitung jumlah URL unik yang diakses oleh IP tertentu.
-        Berguna untuk mendeteksi scanning/enumeration.
-        
-        Args:
-            ip_address: IP address yang akan dihitung
-            window_key: Window waktu
-        
-        Returns:
-            Jumlah URL unik
-        """
-        logs = self.get_logs_in_window(window_key)
-        logs = [log for log in logs if log.get('ip_address') == ip_address]
-        
-        unique_urls = set(log.get('url', '') for log in logs)
-        return len(unique_urls)
+        """Estimasi URL unik IP dalam 1-2 menit terakhir (epoch 1 menit sekarang + sebelumnya)."""
+        with self.lock:
+            row = self._rows.get(ip_address)
+            if row is None:
+                return 0
+            return int(self._unique_url_estimates(np.array([row]), self.clock.now())[0])
+    
+    def calculate_unique_ips(self, window_key: str = '1min') -> int:
+        with self.lock:
+            span = self.windows[self._resolve_window(window_key)].total_seconds()
+            return self._time_wheel.unique_count(self.clock.now(), span, 'ip')
     
     def calculate_method_entropy(self, ip_address: str = None, window_key: str = '1min') -> float:
-        """
-        Menghitung entropi distribusi HTTP method.
-        Entropi rendah = pola normal (mayoritas GET/POST)
-        Entropi tinggi = pola abnormal (berbagai method)
-        
-        Args:
-            ip_address: Filter by IP (None = semua IP)
-            window_key: Window waktu
-        
-        Returns:
-            Entropy value (0.0 - ~2.8 untuk 7 methods)
-        """
-        logs = self.get_logs_in_window(window_key)
-        
-        if ip_address:
-            logs = [log for log in logs if log.get('ip_address') == ip_address]
-        
-        if not logs:
-            return 0.0
-        
-        # Hitung distribusi method
-        methods = [log.get('method', 'GET') for log in logs]
-        total = len(methods)
-        
-        # Hitung probability tiap method
-        method_counts = {}
-        for method in methods:
-            method_counts[method] = method_counts.get(method, 0) + 1
-        
-        # Hitung entropy: -sum(p * log2(p))
-        entropy = 0.0
-        for count in method_counts.values():
-            p = count / total
-            if p > 0:
-                entropy -= p * np.log2(p)
-        
-        return entropy
+        """Entropi method dari histogram meluruh (window 1 menit)."""
+        with self.lock:
+            if not ip_address:
+                counts = self._global_snapshot(window_key)['methods'].values()
+                methods = np.array(list(counts), dtype=np.float64)
+            else:
+                row = self._rows.get(ip_address)
+                if row is None:
+                    return 0.0
+                methods = self._method_counts[row].astype(np.float64)
+            total = methods.sum()
+            if total <= 0:
+                return 0.0
+            p = methods[methods > 0] / total
+            return max(0.0, float(-(p * np.log2(p)).sum()))
     
     def extract_temporal_features(self, log_data: Dict) -> Dict:
         """
-        Mengekstrak semua fitur temporal untuk satu log entry.
-        
-        Args:
-            log_data: Dictionary berisi data log server
-        
-        Returns:
-            Dictionary dengan semua fitur temporal
+        Mengekstrak fitur temporal (nama sama dengan TemporalSlidingWindow).
+        Jumlah request berupa counter meluruh (float).
         """
         ip_address = log_data.get('ip_address', '')
         
-        # Tambahkan log ke buffer dulu
-        self.add_log(log_data)
-        
-        # Ekstrak semua fitur temporal
-        features = {
-            # Request frequency features
-            'req_count_1min': self.calculate_request_count(ip_address, '1min'),
-            'req_count_5min': self.calculate_request_count(ip_address, '5min'),
-            
-            # Response time features
-            'avg_response_time_1min': round(self.calculate_avg_response_time(ip_address, '1min'), 2),
-            'avg_response_time_5min': round(self.calculate_avg_response_time(ip_address, '5min'), 2),
-            
-            # Bandwidth features
-            'avg_bytes_5min': round(self.calculate_avg_bytes(ip_address, '5min'), 2),
-            
-            # Error rate features
-            'error_rate_1min': round(self.calculate_error_rate(ip_address, '1min'), 4),
-            'error_rate_5min': round(self.calculate_error_rate(ip_address, '5min'), 4),
-            'error_rate_slope': round(self.calculate_error_rate_slope(ip_address), 4),
+        with self.lock:
+            self.add_log(log_data)
             
-            # Behavior features
-            'unique_urls_1min': self.calculate_unique_urls(ip_address, '1min'),
-            'method_entropy': round(self.calculate_method_entropy(ip_address, '1min'), 4),
+            features = {
+                'req_count_1min': round(self.calculate_request_count(ip_address, '1min'), 2),
+                'req_count_5min': round(self.calculate_request_count(ip_address, '5min'), 2),
+                'avg_response_time_1min': round(self.calculate_avg_response_time(ip_address, '1min'), 2),
+                'avg_response_time_5min': round(self.calculate_avg_response_time(ip_address, '5min'), 2),
+                'avg_bytes_5min': round(self.calculate_avg_bytes(ip_address, '5min'), 2),
+                'error_rate_1min': round(self.calculate_error_rate(ip_address, '1min'), 4),
+                'error_rate_5min': round(self.calculate_error_rate(ip_address, '5min'), 4),
+                'error_rate_slope': round(self.calculate_error_rate_slope(ip_address), 4),
+                'unique_urls_1min': self.calculate_unique_urls(ip_address, '1min'),
+                'method_entropy': round(self.calculate_method_entropy(ip_address, '1min'), 4),
+            }
+            for key in self.extra_windows:
+                features[f'req_count_{key}'] = round(self.calculate_request_count(ip_address, key), 2)
+                features[f'error_rate_{key}'] = round(self.calculate_error_rate(ip_address, key), 4)
             
-            # Global metrics (semua IP)
-            'global_req_count_1min': len(self.get_logs_in_window('1min')),
-            'global_error_rate_1min': round(self.calculate_error_rate(None, '1min'), 4),
-        }
+            global_1min = self._global_snapshot('1min')
+            requests = int(global_1min['counts'].sum())
+            features.update({
+                'global_req_count_1min': requests,
+                'global_error_rate_1min': round(float(global_1min['errors'].sum() / requests), 4) if requests else 0.0,
+                'unique_ips_1min': self.calculate_unique_ips('1min'),
+            })
         
         return features
     
     def get_feature_vector(self, log_data: Dict) -> np.ndarray:
-        """
-        Mengkonversi fitur temporal menjadi numpy array untuk ML model.
-        
-        Args:
-            log_data: Dictionary berisi data log server
-        
-        Returns:
-            Numpy array dengan fitur temporal
-        """
+        """Mengkonversi fitur temporal menjadi numpy array untuk ML model."""
         features = self.extract_temporal_features(log_data)
-        
-        # Urutkan fitur untuk konsistensi
-        feature_order = [
-            'req_count_1min',
-            'req_count_5min',
-            'avg_response_time_1min',
-            'avg_bytes_5min',
-            'error_rate_1min',
-            'error_rate_slope',
-            'unique_urls_1min',
-            'method_entropy',
-            'global_req_count_1min',
-            'global_error_rate_1min'
-        ]
-        
-        return np.array([features[key] for key in feature_order])
+        return np.array([features[key] for key in self.FEATURE_ORDER])
+    
+    def extract_temporal_features_batch(self, logs: List[Dict]) -> np.ndarray:
+        """Versi batch dari get_feature_vector (urutan timestamp, baris ke-i milik logs[i])."""
+        order = sorted(range(len(logs)), key=lambda i: _parse_timestamp(logs[i].get('timestamp')).timestamp())
+        matrix = np.zeros((len(logs), len(self.FEATURE_ORDER)), dtype=np.float64)
+        with self.lock:
+            for i in order:
+                matrix[i] = self.get_feature_vector(logs[i])
+        return matrix
+    
+    def replay(
+        self,
+        logs: Iterable[Dict],
+        reorder_delay_seconds: float = 0.0,
+        reorder_capacity: int = 10000
+    ) -> Iterator[Tuple[Dict, Dict]]:
+        """Replay log arsip (lihat TemporalSlidingWindow.replay)."""
+        return _replay(self, logs, reorder_delay_seconds, reorder_capacity)
+    
+    def get_global_metrics(self, window_key: str = '1min') -> Dict:
+        """Metrik global dari time wheel."""
+        with self.lock:
+            span = self.windows[self._resolve_window(window_key)].total_seconds()
+            return self._time_wheel.fold(self.clock.now(), span)
+    
+    def get_top_ips(self, window_key: str = '1min', k: int = 10) -> Dict:
+        """Top-K IP berdasarkan counter meluruh (vectorized atas tabel)."""
+        with self.lock:
+            now = self.clock.now()
+            active = len(self._ips)
+            index = self._window_index[self._resolve_window(window_key)]
+            decay = np.exp(-self._decay_rates[index] * np.maximum(0.0, now - self._last_update[:active]))
+            
+            def ranking(values: np.ndarray) -> List[Dict]:
+                top = np.argsort(-values, kind='stable')[:k]
+                return [{'ip': self._ips[row], 'count': round(float(values[row]), 2)} for row in top if values[row] > 0]
+            
+            return {
+                'by_requests': ranking(self._counts[:active, index] * decay),
+                'by_errors': ranking(self._errors[:active, index] * decay),
+                'by_unique_urls': ranking(self._unique_url_estimates(np.arange(active), now)),
+                'tracked_ips': active,
+            }
     
     def get_stats(self) -> Dict:
-        """
-        Mendapatkan statistik dari sliding window saat ini.
-        
-        Returns:
-            Dictionary dengan statistik
-        """
+        """Statistik decayed window."""
         with self.lock:
+            logs = {
+                f'logs_{key}': int(self._global_snapshot(key)['counts'].sum()) for key in self.windows
+            }
             return {
-                'buffer_size': len(self.log_buffer),
+                'buffer_size': 0,
+                'storage': self.storage,
                 'window_size_minutes': self.window_size.total_seconds() / 60,
-                'logs_1min': len(self.get_logs_in_window('1min')),
-                'logs_5min': len(self.get_logs_in_window('5min')),
-                'logs_10min': len(self.get_logs_in_window('10min')),
+                **logs,
+                'tracked_ips': len(self._ips),
+                'table_bytes': sum(getattr(self, name).nbytes for name in self._COLUMNS),
+                'half_lives': dict(self.half_lives),
             }
     
     def clear(self) -> None:
-        """
-        Membersihkan buffer sliding window.
-        """
+        """Mengosongkan semua counter."""
         with self.lock:
-            self.log_buffer.clear()
-            print("[INFO] Sliding window buffer cleared")
+            self._time_wheel.clear()
+            self._allocate(self._initial_capacity)
+            print("[INFO] Decayed sliding window cleared")
+
+
+def _replay(window, logs: Iterable[Dict], reorder_delay_seconds: float,
+            reorder_capacity: int) -> Iterator[Tuple[Dict, Dict]]:
+    """Implementasi replay bersama untuk window biasa maupun sharded."""
+    if not isinstance(window.clock, EventTimeClock):
+        raise RuntimeError("replay requires an event-time clock (clock='event')")
+    buffer = _ReorderBuffer(reorder_delay_seconds, reorder_capacity)
+    
+    def generate():
+        for log_data in logs:
+            for released in buffer.push(log_data):
+                yield released, window.extract_temporal_features(released)
+        for released in buffer.flush():
+            yield released, window.extract_temporal_features(released)
+    
+    return generate()
+
+
+def create_sliding_window(
+    window_size_minutes: int = 10,
+    shards: int = 1,
+    shared_memory: Optional[str] = None,
+    **window_kwargs
+) -> Union[TemporalSlidingWindow, ShardedSlidingWindow]:
+    """
+    Factory function untuk membuat sliding window (sharded jika shards > 1).
+    
+    Args:
+        window_size_minutes: Ukuran maksimal window dalam menit
+        shards: Jumlah shard
+        shared_memory: Nama segmen shared memory; jika diisi, state dibagi
+            oleh semua worker lokal (SharedSlidingWindow) dan argumen lain
+            diabaikan
+        **window_kwargs: Argumen tambahan untuk TemporalSlidingWindow;
+            storage='decayed' membuat DecayedSlidingWindow (counter meluruh)
+            yang hanya menerima DecayedSlidingWindow.FACTORY_OPTIONS
+    
+    Returns:
+        TemporalSlidingWindow, ShardedSlidingWindow atau SharedSlidingWindow
+    
+    Raises:
+        ValueError: Jika storage='decayed' diberi opsi yang tidak didukung
+            (misal url_normalizer, subnet_counters, latency_quantiles, shards)
+    """
+    if shared_memory:
+        # Import lokal: shared_window mengimpor modul ini
+        from shared_window import SharedSlidingWindow
+        return SharedSlidingWindow(window_size_minutes, name=shared_memory)
+    if window_kwargs.get('storage') == 'decayed':
+        unsupported = sorted(
+            key for key, value in window_kwargs.items()
+            if key != 'storage' and key not in DecayedSlidingWindow.FACTORY_OPTIONS and value
+        )
+        if shards > 1:
+            unsupported.append('shards')
+        if unsupported:
+            raise ValueError(f"storage='decayed' does not support: {', '.join(unsupported)}")
+        return DecayedSlidingWindow(
+            window_size_minutes,
+            **{key: window_kwargs[key] for key in DecayedSlidingWindow.FACTORY_OPTIONS if key in window_kwargs}
+        )
+    if shards > 1:
+        return ShardedSlidingWindow(window_size_minutes, shards=shards, **window_kwargs)
+    return TemporalSlidingWindow(window_size_minutes, **window_kwargs)
 
 
-# Global instance untuk digunakan di Flask app
-sliding_window = TemporalSlidingWindow(window_size_minutes=10)
+# Global instance untuk digunakan di Flask app. Fitur yang tidak didukung
+# storage 'decayed' default-nya mati di mode itu; menyalakannya secara
+# eksplisit membuat create_sliding_window menolak konfigurasi (ValueError).
+_storage = os.environ.get('SLIDING_WINDOW_STORAGE', 'compact')
+_feature_default = '0' if _storage == 'decayed' else '1'
+sliding_window = create_sliding_window(
+    window_size_minutes=10,
+    shards=int(os.environ.get('SLIDING_WINDOW_SHARDS', 1)),
+    shared_memory=os.environ.get('SLIDING_WINDOW_SHARED_MEMORY'),
+    windows=[key.strip() for key in os.environ.get('SLIDING_WINDOW_EXTRA_WINDOWS', '').split(',') if key.strip()],
+    storage=_storage,
+    max_tracked_ips=int(os.environ.get('SLIDING_WINDOW_MAX_IPS', 10000)),
+    url_normalizer=(
+        UrlTemplateNormalizer() if os.environ.get('SLIDING_WINDOW_URL_TEMPLATES', _feature_default) != '0' else None
+    ),
+    subnet_counters=os.environ.get('SLIDING_WINDOW_SUBNETS', _feature_default) != '0',
+    latency_quantiles=os.environ.get('SLIDING_WINDOW_LATENCY_QUANTILES', _feature_default) != '0'
+)
 
 
-def get_sliding_window() -> TemporalSlidingWindow:
+def get_sliding_window() -> Union[TemporalSlidingWindow, ShardedSlidingWindow]:
     """
     Mendapatkan global instance dari sliding window.
     
     Returns:
-        TemporalSlidingWindow instance
+        TemporalSlidingWindow atau ShardedSlidingWindow instance
     """
     return sliding_window
 
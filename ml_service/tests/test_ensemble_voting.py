@@ -21,7 +21,9 @@ from ensemble_voting import (
     create_ensemble_classifier,
     ThreatLevel,
     ModelPrediction,
-    EnsembleResult
+    EnsembleResult,
+    EnsembleBatchResult,
+    THREAT_LEVEL_CODES
 )
 
 
@@ -196,6 +198,185 @@ class TestEnsembleVotingClassifier:
             trained_ensemble.predict_single_model('unknown_model', X_test)
 
 
+class TestPredictBatch:
+    """Test prediksi batch kolumnar."""
+    
+    @pytest.fixture
+    def trained_ensemble(self):
+        np.random.seed(42)
+        X_train = np.random.randn(50, 6) * 0.5 + 5
+        ensemble = EnsembleVotingClassifier(contamination=0.1, random_state=42)
+        ensemble.fit(X_train)
+        return ensemble
+    
+    def test_matches_single_predict(self, trained_ensemble):
+        """Setiap baris batch sama dengan predict() per baris."""
+        rng = np.random.RandomState(7)
+        X = np.vstack([rng.randn(40, 6) * 0.5 + 5, rng.randn(20, 6) * 4 + 5])
+        
+        batch = trained_ensemble.predict_batch(X)
+        assert isinstance(batch, EnsembleBatchResult)
+        assert len(batch) == 60
+        assert batch.model_names == list(trained_ensemble.models.keys())
+        
+        levels = batch.threat_levels()
+        for i, row in enumerate(X):
+            result = trained_ensemble.predict(row)
+            assert levels[i] == result.threat_level
+            assert batch.consensus_scores[i] == pytest.approx(result.consensus_score, abs=1e-4)
+            for column, model_name in enumerate(batch.model_names):
+                single = result.individual_predictions[column]
+                assert single.model_name == model_name
+                assert batch.predictions[i, column] == single.prediction
+                assert batch.scores[i, column] == pytest.approx(single.score)
+                assert batch.confidences[i, column] == pytest.approx(single.confidence, abs=1e-4)
+        assert batch.anomaly_votes.tolist() == [
+            sum(trained_ensemble.predict(row).voting_breakdown.values()) for row in X
+        ]
+    
+    def test_deduplicates_identical_rows(self, trained_ensemble):
+        """Baris identik di-score sekali dan hasilnya disebar ulang."""
+        rng = np.random.RandomState(3)
+        distinct = np.vstack([rng.randn(3, 6) * 0.5 + 5, np.full((1, 6), 50.0)])
+        X = distinct[rng.randint(0, 4, size=500)]
+        
+        batch = trained_ensemble.predict_batch(X)
+        plain = trained_ensemble.predict_batch(X, deduplicate=False)
+        np.testing.assert_array_equal(batch.predictions, plain.predictions)
+        np.testing.assert_allclose(batch.scores, plain.scores)
+        np.testing.assert_array_equal(batch.threat_codes, plain.threat_codes)
+        np.testing.assert_array_equal(batch.consensus_scores, plain.consensus_scores)
+        
+        outlier = np.where((X == 50.0).all(axis=1))[0]
+        assert all(level == ThreatLevel.CRITICAL for level in np.array(batch.threat_levels())[outlier])
+    
+    def test_shapes_and_validation(self, trained_ensemble):
+        """Input 1D, batch kosong dan model belum dilatih."""
+        single = trained_ensemble.predict_batch(np.full(6, 5.0))
+        assert single.predictions.shape == (1, 3)
+        
+        empty = trained_ensemble.predict_batch(np.zeros((0, 6)))
+        assert len(empty) == 0
+        assert empty.threat_levels() == []
+        
+        with pytest.raises(RuntimeError):
+            EnsembleVotingClassifier().predict_batch(np.zeros((2, 6)))
+
+
+class TestParallelPredict:
+    """Test evaluasi model secara bersamaan di thread pool."""
+    
+    def test_parallel_matches_sequential(self):
+        """Hasil paralel sama dengan sekuensial dan pool dipakai ulang."""
+        np.random.seed(42)
+        X_train = np.random.randn(50, 6) * 0.5 + 5
+        sequential = EnsembleVotingClassifier(random_state=42).fit(X_train)
+        parallel = EnsembleVotingClassifier(random_state=42, parallel=True).fit(X_train)
+        
+        try:
+            for row in [np.full(6, 5.0), np.full(6, 50.0), X_train[0]]:
+                expected, actual = sequential.predict(row), parallel.predict(row)
+                assert actual.threat_level == expected.threat_level
+                assert actual.consensus_score == expected.consensus_score
+                assert actual.voting_breakdown == expected.voting_breakdown
+                assert [p.model_name for p in actual.individual_predictions] == list(parallel.models.keys())
+                assert [p.score for p in actual.individual_predictions] == pytest.approx(
+                    [p.score for p in expected.individual_predictions]
+                )
+            executor = parallel._executor
+            parallel.predict(X_train[1])
+            assert parallel._executor is executor
+            assert parallel.get_model_info()['parallel'] is True
+        finally:
+            parallel.close()
+        assert parallel._executor is None
+    
+    def test_close_without_waiting(self):
+        """close(wait=False) melepas pool; prediksi berikutnya tetap jalan sekuensial."""
+        np.random.seed(42)
+        ensemble = EnsembleVotingClassifier(parallel=True).fit(np.random.randn(50, 6))
+        ensemble.predict(np.zeros(6))
+        executor = ensemble._executor
+        
+        ensemble.close(wait=False)
+        assert ensemble._executor is None
+        assert executor._shutdown
+        result = ensemble.predict(np.zeros(6))
+        assert len(result.individual_predictions) == 3
+        assert ensemble._executor is None
+    
+    def test_reports_timings(self):
+        """Latency per model dan total dilaporkan."""
+        np.random.seed(42)
+        ensemble = EnsembleVotingClassifier(parallel=True).fit(np.random.randn(50, 6))
+        result = ensemble.predict(np.zeros(6))
+        ensemble.close()
+        
+        assert result.latency_ms > 0
+        assert all(pred.latency_ms > 0 for pred in result.individual_predictions)
+
+
+class TestCascadeMode:
+    """Test mode cascade (Isolation Forest dulu, OCSVM/LOF di band)."""
+    
+    @pytest.fixture
+    def ensembles(self):
+        np.random.seed(42)
+        X_train = np.random.randn(300, 6)
+        full = EnsembleVotingClassifier(random_state=42).fit(X_train)
+        cascade = EnsembleVotingClassifier(random_state=42, cascade=True).fit(X_train)
+        return full, cascade
+    
+    def test_paths_and_mapping(self, ensembles):
+        """Baris jelas diputus IF, baris di band dievaluasi penuh."""
+        full, cascade = ensembles
+        low, high = cascade.cascade_band
+        rng = np.random.RandomState(5)
+        X = np.vstack([rng.randn(60, 6), np.full((1, 6), 40.0)])
+        if_scores = full.models['isolation_forest'].decision_function(X)
+        
+        paths = set()
+        for row, if_score in zip(X, if_scores):
+            result = cascade.predict(row)
+            paths.add(result.path)
+            if low <= if_score <= high:
+                expected = full.predict(row)
+                assert result.path == 'full'
+                assert result.threat_level == expected.threat_level
+                assert result.consensus_score == expected.consensus_score
+            else:
+                assert result.path == 'cascade'
+                assert [p.model_name for p in result.individual_predictions] == ['isolation_forest']
+                expected_level = ThreatLevel.CRITICAL if if_score < low else ThreatLevel.NORMAL
+                assert result.threat_level == expected_level
+                assert 'cascade' in result.explanation
+        assert paths == {'full', 'cascade'}
+        assert cascade.predict(np.full(6, 40.0)).threat_level == ThreatLevel.CRITICAL
+    
+    def test_batch_matches_predict(self, ensembles):
+        """predict_batch cascade konsisten dengan predict cascade."""
+        _, cascade = ensembles
+        rng = np.random.RandomState(9)
+        X = np.vstack([rng.randn(80, 6), rng.randn(20, 6) * 4])
+        batch = cascade.predict_batch(X)
+        
+        levels = batch.threat_levels()
+        for i, row in enumerate(X):
+            result = cascade.predict(row)
+            assert batch.cascaded[i] == (result.path == 'cascade')
+            assert levels[i] == result.threat_level
+            assert batch.consensus_scores[i] == pytest.approx(result.consensus_score, abs=1e-4)
+        assert np.isnan(batch.scores[batch.cascaded, 1:]).all()
+        assert not np.isnan(batch.scores[~batch.cascaded]).any()
+    
+    def test_band_validation(self):
+        """Band harus mengapit threshold 0."""
+        with pytest.raises(ValueError):
+            EnsembleVotingClassifier(cascade=True, cascade_band=(0.01, 0.1))
+        ensemble = EnsembleVotingClassifier(cascade=True, cascade_band=(-0.1, 0.2))
+        assert ensemble.get_model_info()['cascade_band'] == [-0.1, 0.2]
+
+
 class TestThreatLevelLogic:
     """Test threat level determination logic."""
     
@@ -222,6 +403,16 @@ class TestThreatLevelLogic:
         ensemble = EnsembleVotingClassifier()
         level = ensemble._determine_threat_level(3, 3)
         assert level == ThreatLevel.CRITICAL
+    
+    def test_threat_code_table_follows_model_count(self):
+        """Kode batch mengikuti _determine_threat_level untuk jumlah model berapa pun."""
+        ensemble = EnsembleVotingClassifier()
+        for n_models in (1, 3, 5):
+            table = ensemble._threat_code_table(n_models)
+            assert len(table) == n_models + 1
+            assert [THREAT_LEVEL_CODES[code] for code in table] == [
+                ensemble._determine_threat_level(votes, n_models) for votes in range(n_models + 1)
+            ]
 
 
 class TestFactoryFunction:
@@ -0,0 +1,95 @@
+"""
+========================================
+UNIT TESTS - FLAT ISOLATION FOREST
+PyTest untuk validasi inferensi Isolation Forest dari array datar
+========================================
+
+Lead Researcher & Developer:
+  MUHAMMAD AKBAR HADI PRATAMA (@el-pablos)
+"""
+
+import pytest
+import numpy as np
+import os
+import sys
+from sklearn.ensemble import IsolationForest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flat_isolation_forest import FlatIsolationForest
+from ensemble_voting import EnsembleVotingClassifier
+
+
+SCALE = np.array([1, 10, 100, 1000, 0.1, 5])
+
+
+@pytest.fixture
+def data():
+    rng = np.random.RandomState(0)
+    X_train = rng.randn(500, 6) * SCALE
+    X_test = np.vstack([rng.randn(300, 6) * SCALE * 3, X_train[:50]])
+    return X_train, X_test
+
+
+class TestFlatIsolationForest:
+    """Test suite untuk FlatIsolationForest."""
+    
+    @pytest.mark.parametrize('params', [
+        {},
+        {'max_features': 0.5},
+        {'max_samples': 40},
+        {'bootstrap': True},
+        {'max_samples': 1},
+    ])
+    def test_identical_to_sklearn(self, data, params):
+        X_train, X_test = data
+        model = IsolationForest(n_estimators=50, contamination=0.1, random_state=1, **params).fit(X_train)
+        flat = FlatIsolationForest(model)
+        
+        np.testing.assert_array_equal(flat.score_samples(X_test), model.score_samples(X_test))
+        np.testing.assert_array_equal(flat.decision_function(X_test), model.decision_function(X_test))
+        np.testing.assert_array_equal(flat.predict(X_test), model.predict(X_test))
+        
+        row = X_test[0]
+        assert flat.decision_function(row)[0] == model.decision_function(row.reshape(1, -1))[0]
+    
+    def test_large_batches_and_missing_values(self, data):
+        X_train, X_test = data
+        model = IsolationForest(n_estimators=20, random_state=1).fit(X_train)
+        flat = FlatIsolationForest(model, max_flat_rows=100)
+        
+        # Di atas max_flat_rows dan input berisi NaN di-score oleh scikit-learn
+        np.testing.assert_array_equal(flat.score_samples(X_test), model.score_samples(X_test))
+        with_nan = X_test[:5].copy()
+        with_nan[0, 2] = np.nan
+        np.testing.assert_array_equal(flat.score_samples(with_nan), model.score_samples(with_nan))
+    
+    def test_validation(self, data):
+        X_train, _ = data
+        with pytest.raises(RuntimeError):
+            FlatIsolationForest(IsolationForest())
+        
+        model = IsolationForest(n_estimators=5, random_state=1).fit(X_train)
+        with pytest.raises(ValueError):
+            FlatIsolationForest(model, max_flat_rows=0)
+        with pytest.raises(ValueError):
+            FlatIsolationForest(model).predict(np.zeros((2, 4)))
+    
+    def test_ensemble_uses_compiled_forest(self, data):
+        X_train, X_test = data
+        compiled = EnsembleVotingClassifier(random_state=42).fit(X_train)
+        plain = EnsembleVotingClassifier(random_state=42, compile_forest=False).fit(X_train)
+        
+        assert compiled.get_model_info()['compiled_models'] == ['isolation_forest']
+        assert plain.get_model_info()['compiled_models'] == []
+        for row in X_test[:20]:
+            expected = plain.predict(row).individual_predictions[0]
+            assert compiled.predict(row).individual_predictions[0].score == expected.score
+        np.testing.assert_array_equal(
+            compiled.predict_batch(X_test).scores, plain.predict_batch(X_test).scores
+        )
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
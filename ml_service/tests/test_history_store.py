@@ -0,0 +1,162 @@
+"""
+========================================
+UNIT TESTS - HISTORY STORE
+PyTest untuk validasi round-robin history multi-resolusi
+========================================
+
+Lead Researcher & Developer:
+  MUHAMMAD AKBAR HADI PRATAMA (@el-pablos)
+"""
+
+import pytest
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import RoundRobinHistory
+from temporal_features import DecayedSlidingWindow, ShardedSlidingWindow, TemporalSlidingWindow
+
+
+BASE = datetime(2026, 1, 1, 12, 0, 0)
+T0 = BASE.timestamp()
+
+
+def make_log(seconds, ip='10.0.0.1', status=200, response_time=10):
+    return {
+        'timestamp': BASE + timedelta(seconds=seconds),
+        'ip_address': ip,
+        'method': 'GET',
+        'url': '/api',
+        'status_code': status,
+        'response_time': response_time
+    }
+
+
+@pytest.fixture
+def history():
+    return RoundRobinHistory(top_k=3)
+
+
+class TestRoundRobinHistory:
+    """Test suite untuk RoundRobinHistory."""
+    
+    def test_series_per_resolution(self, history):
+        # 3 request di menit pertama, 1 error di menit kedua
+        for offset in (0, 10, 20):
+            history.record(T0 + offset, '10.0.0.1', False, 10.0)
+        history.record(T0 + 60, '10.0.0.2', True, 40.0)
+        
+        series = history.series('1min', 3, now=T0 + 60)
+        assert series['step_seconds'] == 60
+        assert series['timestamps'][-2:] == [T0 // 60 * 60, T0 // 60 * 60 + 60]
+        assert series['requests'] == [0, 3, 1]
+        assert series['errors'] == [0, 0, 1]
+        assert series['error_rate'] == [0.0, 0.0, 1.0]
+        assert series['avg_response_time'] == [0.0, 10.0, 40.0]
+        
+        hourly = history.series('1h', 2, now=T0 + 60)
+        assert hourly['requests'] == [0, 4]
+        assert len(history.series('1s', 120, now=T0 + 60)['requests']) == 120
+    
+    def test_ring_wraps_and_forgets(self):
+        history = RoundRobinHistory(resolutions={'1min': (60, 5)})
+        for minute in range(12):
+            history.record(T0 + minute * 60, '10.0.0.1', False, 1.0)
+        
+        series = history.series('1min', 100, now=T0 + 11 * 60)
+        assert series['points'] == 5
+        assert series['requests'] == [1] * 5
+        # Minggu depan: semua slot sudah kedaluwarsa
+        assert history.series('1min', 5, now=T0 + 7 * 86400)['requests'] == [0] * 5
+        # Event lebih tua dari isi ring diabaikan
+        history.record(T0, '10.0.0.1', False, 1.0)
+        assert sum(history.series('1min', 5, now=T0 + 11 * 60)['requests']) == 5
+    
+    def test_threat_levels(self, history):
+        for level in ('normal', 'normal', 'high', 'critical'):
+            history.record_threat(level, timestamp=T0)
+        
+        levels = history.series('1min', 1, now=T0)['threat_levels']
+        assert levels == {'normal': [2], 'suspicious': [0], 'high': [1], 'critical': [1]}
+        with pytest.raises(ValueError):
+            history.record_threat('unknown')
+    
+    def test_top_ips(self, history):
+        for i in range(100):
+            history.record(T0 + i % 60, '10.0.0.9', False, 1.0)
+            history.record(T0 + i % 60, f'10.1.0.{i}', False, 1.0)
+        for _ in range(30):
+            history.record(T0 + 61, '10.0.0.8', False, 1.0)
+        
+        top = history.series('1h', 1, now=T0 + 61)['top_ips']
+        assert [entry['ip'] for entry in top[:2]] == ['10.0.0.9', '10.0.0.8']
+        assert top[0]['requests'] <= 100
+        assert 'top_ips' not in history.series('1s', 10, now=T0)
+    
+    def test_validation_and_stats(self, history):
+        with pytest.raises(ValueError):
+            history.series('1w')
+        with pytest.raises(ValueError):
+            history.series('1min', 0)
+        with pytest.raises(ValueError):
+            RoundRobinHistory(resolutions={'bad': (0, 10)})
+        
+        history.record(T0, '10.0.0.1', False, 1.0)
+        stats = history.get_stats()
+        assert stats['recorded_logs'] == 1
+        assert stats['resolutions']['1d']['filled'] == 1
+        
+        history.clear()
+        assert history.get_stats()['resolutions']['1min']['filled'] == 0
+        assert history.series('1min', 1, now=T0)['requests'] == [0]
+
+
+class TestWindowIntegration:
+    """History tercatat dari add_log window."""
+    
+    @pytest.mark.parametrize('make_window', [
+        lambda: TemporalSlidingWindow(window_size_minutes=10, clock='event'),
+        lambda: ShardedSlidingWindow(window_size_minutes=10, shards=3),
+        lambda: DecayedSlidingWindow(window_size_minutes=10, clock='event'),
+    ], ids=['exact', 'sharded', 'decayed'])
+    def test_attach_records_logs(self, make_window):
+        window = make_window()
+        history = RoundRobinHistory()
+        history.attach(window)
+        for i in range(20):
+            window.add_log(make_log(i, ip=f'10.0.0.{i % 4}', status=500 if i < 5 else 200))
+        
+        series = history.series('1min', 1, now=T0)
+        assert series['requests'] == [20]
+        assert series['errors'] == [5]
+        assert {entry['ip'] for entry in series['top_ips']} == {f'10.0.0.{i}' for i in range(4)}
+    
+    def test_shards_record_into_separate_lanes(self):
+        import threading
+        
+        window = ShardedSlidingWindow(window_size_minutes=10, shards=3)
+        history = RoundRobinHistory()
+        history.attach(window)
+        assert len({id(shard.history) for shard in window.shards}) == 3
+        
+        # Lane shard lain yang sedang dipegang tidak menahan add_log
+        log = make_log(0, ip='10.0.0.1')
+        busy = next(shard for shard in window.shards if shard is not window.shard_for(log['ip_address']))
+        with busy.history.lock:
+            thread = threading.Thread(target=window.add_log, args=(log,))
+            thread.start()
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+        
+        history.record_threat('high', timestamp=T0)
+        series = history.series('1min', 1, now=T0)
+        assert series['requests'] == [1]
+        assert series['threat_levels']['high'] == [1]
+        assert history.get_stats()['lanes'] == 3
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
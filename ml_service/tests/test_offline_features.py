@@ -0,0 +1,108 @@
+"""
+========================================
+UNIT TESTS - OFFLINE FEATURES
+PyTest untuk validasi fitur rolling window vektor (offline)
+========================================
+
+Lead Researcher & Developer:
+  MUHAMMAD AKBAR HADI PRATAMA (@el-pablos)
+"""
+
+import pytest
+import numpy as np
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from offline_features import logs_to_columns, rolling_temporal_features
+from temporal_features import TemporalSlidingWindow
+
+
+BASE = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def make_log(seconds, ip='10.0.0.1', method='GET', url='/api', status=200, response_time=10):
+    return {
+        'timestamp': BASE + timedelta(seconds=seconds),
+        'ip_address': ip,
+        'method': method,
+        'url': url,
+        'status_code': status,
+        'response_time': response_time
+    }
+
+
+def online_features(logs):
+    sw = TemporalSlidingWindow(window_size_minutes=10, clock='event', max_tracked_ips=None)
+    return sw.extract_temporal_features_batch(logs)
+
+
+class TestRollingTemporalFeatures:
+    """Test suite untuk rolling_temporal_features."""
+    
+    def test_matches_online_window(self):
+        rng = random.Random(11)
+        logs = []
+        t = 0.0
+        for _ in range(3000):
+            # Banyak timestamp kembar dan jeda panjang agar batas window teruji
+            t += rng.choice([0.0, 0.0, 0.25, 1.0, 7.5, 60.0])
+            logs.append({
+                **make_log(
+                    t,
+                    ip=f'10.0.0.{rng.randint(0, 12)}',
+                    method=rng.choice(['GET', 'GET', 'POST', 'PUT', 'DELETE']),
+                    url=f'/api/items/{rng.randint(0, 20)}',
+                    status=rng.choice([200, 200, 301, 404, 500]),
+                    response_time=rng.randint(1, 900)
+                ),
+                'user_agent': 'agent/' + 'x' * rng.randint(0, 15)
+            })
+        
+        expected = online_features(logs)
+        actual = rolling_temporal_features(logs_to_columns(logs))
+        np.testing.assert_array_equal(actual, expected)
+    
+    def test_window_boundary_is_inclusive(self):
+        logs = [make_log(0), make_log(60), make_log(60.5), make_log(120.5)]
+        matrix = rolling_temporal_features(logs_to_columns(logs))
+        
+        order = TemporalSlidingWindow.FEATURE_ORDER
+        counts = matrix[:, order.index('req_count_1min')]
+        # Log tepat 60 detik sebelumnya masih di dalam window 1 menit
+        assert counts.tolist() == [1, 2, 2, 2]
+        assert matrix[:, order.index('req_count_5min')].tolist() == [1, 2, 3, 4]
+        np.testing.assert_array_equal(matrix, online_features(logs))
+    
+    def test_unique_urls_per_ip(self):
+        logs = [
+            make_log(0, url='/a'), make_log(1, url='/b'), make_log(2, ip='10.0.0.2', url='/c'),
+            make_log(3, url='/a'), make_log(61.5, url='/c'), make_log(62, url='/a'),
+        ]
+        matrix = rolling_temporal_features(logs_to_columns(logs))
+        unique_urls = matrix[:, TemporalSlidingWindow.FEATURE_ORDER.index('unique_urls_1min')]
+        assert unique_urls.tolist() == [1, 2, 1, 2, 2, 2]
+    
+    def test_validation(self):
+        columns = logs_to_columns([make_log(5), make_log(1)])
+        with pytest.raises(ValueError):
+            rolling_temporal_features(columns)
+        with pytest.raises(ValueError):
+            rolling_temporal_features({'timestamp': np.zeros(1)})
+        with pytest.raises(ValueError):
+            logs_to_columns([make_log(0, ip=None)])
+        
+        empty = rolling_temporal_features(logs_to_columns([]))
+        assert empty.shape == (0, len(TemporalSlidingWindow.FEATURE_ORDER))
+    
+    def test_null_status_code_is_not_an_error(self):
+        columns = logs_to_columns([make_log(0, status=None), make_log(1, status=500)])
+        assert columns['status_code'].tolist() == [200, 500]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,185 @@
+"""
+========================================
+UNIT TESTS - SHARED SLIDING WINDOW
+PyTest untuk validasi sliding window lintas proses
+========================================
+
+Lead Researcher & Developer:
+  MUHAMMAD AKBAR HADI PRATAMA (@el-pablos)
+"""
+
+import pytest
+import multiprocessing
+import os
+import sys
+import tempfile
+import uuid
+from datetime import datetime
+from multiprocessing import shared_memory
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_window import SharedSlidingWindow
+from temporal_features import TemporalSlidingWindow
+
+
+def make_log(ip='10.0.0.1', url='/api/data', status=200, method='GET'):
+    return {
+        'timestamp': datetime.now(),
+        'ip_address': ip,
+        'method': method,
+        'url': url,
+        'status_code': status,
+        'response_time': 20,
+        'bytes': 100,
+        'user_agent': 'Mozilla/5.0'
+    }
+
+
+def worker_add_logs(name, ip, n):
+    window = SharedSlidingWindow(window_size_minutes=10, name=name, ip_slots=64)
+    for i in range(n):
+        window.add_log(make_log(ip=ip, url=f'/api/{i % 5}', status=500 if i % 4 == 0 else 200))
+    window.close()
+
+
+@pytest.fixture
+def segment_name():
+    name = f'test_window_{uuid.uuid4().hex[:12]}'
+    yield name
+    segment = shared_memory.SharedMemory(name=name)
+    segment.close()
+    segment.unlink()
+    lock_path = os.path.join(tempfile.gettempdir(), f'{name}.lock')
+    if os.path.exists(lock_path):
+        os.remove(lock_path)
+
+
+class TestSharedSlidingWindow:
+    """Test suite untuk SharedSlidingWindow."""
+    
+    def test_instances_share_counts(self, segment_name):
+        first = SharedSlidingWindow(window_size_minutes=10, name=segment_name, ip_slots=64)
+        second = SharedSlidingWindow(window_size_minutes=10, name=segment_name, ip_slots=64)
+        
+        for _ in range(3):
+            first.add_log(make_log())
+        features = second.extract_temporal_features(make_log(status=500))
+        
+        assert features['req_count_1min'] == 4
+        assert features['error_rate_1min'] == 0.25
+        assert features['global_req_count_1min'] == 4
+        assert first.calculate_request_count('10.0.0.1', '5min') == 4
+        first.close()
+        second.close()
+    
+    def test_features_match_local_window(self, segment_name):
+        shared = SharedSlidingWindow(window_size_minutes=10, name=segment_name, ip_slots=64)
+        local = TemporalSlidingWindow(window_size_minutes=10)
+        
+        logs = [
+            make_log(ip=f'10.0.0.{i % 3}', url=f'/api/{i % 7}', status=404 if i % 5 == 0 else 200,
+                     method=['GET', 'POST', 'PUT'][i % 3])
+            for i in range(60)
+        ]
+        for log in logs:
+            expected = local.extract_temporal_features(dict(log))
+            actual = shared.extract_temporal_features(dict(log))
+        
+        assert set(actual) == set(expected)
+        for key in ('req_count_1min', 'req_count_5min', 'error_rate_1min', 'method_entropy',
+                    'global_req_count_1min', 'unique_urls_1min', 'unique_ips_1min'):
+            assert actual[key] == expected[key], key
+        assert len(shared.get_feature_vector(make_log())) == len(SharedSlidingWindow.FEATURE_ORDER)
+        shared.close()
+    
+    def test_counts_visible_across_processes(self, segment_name):
+        window = SharedSlidingWindow(window_size_minutes=10, name=segment_name, ip_slots=64)
+        context = multiprocessing.get_context('spawn')
+        workers = [
+            context.Process(target=worker_add_logs, args=(segment_name, ip, 40))
+            for ip in ('10.1.0.1', '10.1.0.2')
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+            assert worker.exitcode == 0
+        
+        assert window.calculate_request_count('10.1.0.1') == 40
+        assert window.calculate_request_count('10.1.0.2') == 40
+        assert window.calculate_error_rate('10.1.0.1') == 0.25
+        assert window.get_stats()['logs_1min'] == 80
+        
+        top = window.get_top_ips('1min', k=1)
+        assert top['by_requests'][0]['count'] == 40
+        assert top['by_unique_urls'][0]['count'] == 5
+        assert top['tracked_ips'] == 2
+        window.close()
+    
+    def test_config_mismatch_raises(self, segment_name):
+        window = SharedSlidingWindow(window_size_minutes=10, name=segment_name, ip_slots=64)
+        with pytest.raises(ValueError):
+            SharedSlidingWindow(window_size_minutes=10, name=segment_name, ip_slots=128)
+        window.close()
+    
+    def test_full_table_keeps_active_ips(self, segment_name):
+        window = SharedSlidingWindow(window_size_minutes=10, name=segment_name, ip_slots=4)
+        for i in range(6):
+            window.add_log(make_log(ip=f'10.2.0.{i}'))
+        
+        # Slot yang masih aktif tidak dikeluarkan; IP baru dihitung overflow
+        stats = window.get_stats()
+        assert stats['tracked_ips'] == 4
+        assert stats['ip_table_overflow'] == 2
+        assert stats['logs_1min'] == 6
+        assert window.calculate_request_count('10.2.0.0') == 1
+        assert window.calculate_request_count('10.2.0.5') == 0
+        
+        # Slot yang tidak aktif selama satu window boleh dipakai ulang
+        window._table.last_seen[:] -= window._table.horizon + 1
+        window.add_log(make_log(ip='10.2.0.5'))
+        assert window.calculate_request_count('10.2.0.5') == 1
+        window.close()
+    
+    def test_history_hook_and_no_raw_logs(self, segment_name):
+        from history_store import RoundRobinHistory
+        
+        window = SharedSlidingWindow(window_size_minutes=10, name=segment_name, ip_slots=64)
+        history = RoundRobinHistory()
+        history.attach(window)
+        for status in (200, 500):
+            window.add_log(make_log(status=status))
+        
+        assert history.get_stats()['recorded_logs'] == 2
+        assert not hasattr(window, 'get_logs_in_window')
+        window.close()
+    
+    def test_persistence_and_janitor_are_rejected(self, segment_name, tmp_path):
+        from window_janitor import WindowJanitor
+        from window_persistence import WindowPersistence
+        
+        window = SharedSlidingWindow(window_size_minutes=10, name=segment_name, ip_slots=64)
+        assert not WindowPersistence.supports(window)
+        assert not WindowJanitor.supports(window)
+        with pytest.raises(ValueError):
+            WindowPersistence(str(tmp_path)).attach(window)
+        with pytest.raises(ValueError):
+            WindowJanitor().attach(window)
+        window.close()
+    
+    def test_clear_resets_shared_state(self, segment_name):
+        first = SharedSlidingWindow(window_size_minutes=10, name=segment_name, ip_slots=64)
+        second = SharedSlidingWindow(window_size_minutes=10, name=segment_name, ip_slots=64)
+        first.add_log(make_log())
+        second.clear()
+        
+        assert first.calculate_request_count('10.0.0.1') == 0
+        assert first.get_stats()['tracked_ips'] == 0
+        first.close()
+        second.close()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,195 @@
+"""
+========================================
+UNIT TESTS - PROBABILISTIC SKETCHES
+PyTest untuk validasi modul Sketches
+========================================
+
+Lead Researcher & Developer:
+  MUHAMMAD AKBAR HADI PRATAMA (@el-pablos)
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sketches import (
+    LATENCY_MAPPING,
+    DDSketch,
+    DDSketchMapping,
+    HyperLogLog,
+    SlidingCountMinSketch,
+    SlidingHyperLogLog,
+    precision_for_error,
+    stable_hash64
+)
+
+
+class TestHyperLogLog:
+    """Test suite untuk HyperLogLog."""
+    
+    def test_precision_for_error(self):
+        assert precision_for_error(0.05) == 9
+        assert precision_for_error(0.01) == 14
+        with pytest.raises(ValueError):
+            precision_for_error(0)
+    
+    def test_stable_hash(self):
+        assert stable_hash64('/api/users') == stable_hash64('/api/users')
+        assert stable_hash64('/api/users') != stable_hash64('/api/posts')
+        assert 0 <= stable_hash64('x') < 2 ** 64
+    
+    def test_small_cardinality_is_near_exact(self):
+        hll = HyperLogLog(relative_error=0.05)
+        for url in ['/a', '/b', '/c', '/a', '/b']:
+            hll.add(url)
+        assert hll.count() == 3
+    
+    @pytest.mark.parametrize('n', [1000, 50000])
+    def test_large_cardinality_within_error_bound(self, n):
+        hll = HyperLogLog(relative_error=0.02)
+        for i in range(n):
+            hll.add(f'/scan/{i}')
+        
+        # 3 sigma dari standard error teoritis
+        assert abs(hll.count() - n) / n < 3 * hll.relative_error
+    
+    def test_memory_is_fixed(self):
+        hll = HyperLogLog(precision=10)
+        for i in range(20000):
+            hll.add(i)
+        assert hll.registers.nbytes == 1024
+    
+    def test_merge(self):
+        a = HyperLogLog(precision=12)
+        b = HyperLogLog(precision=12)
+        for i in range(3000):
+            a.add(i)
+        for i in range(2000, 5000):
+            b.add(i)
+        
+        merged = a.merge(b).count()
+        assert abs(merged - 5000) / 5000 < 0.05
+    
+    def test_merge_different_precision_raises_error(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=8).merge(HyperLogLog(precision=9))
+
+
+class TestSlidingHyperLogLog:
+    """Test suite untuk SlidingHyperLogLog."""
+    
+    def test_old_slices_expire(self):
+        sketch = SlidingHyperLogLog(span_seconds=60, slices=6, precision=10)
+        for i in range(100):
+            sketch.add_hash(stable_hash64(f'/old/{i}'), 1000.0)
+        for i in range(40):
+            sketch.add_hash(stable_hash64(f'/new/{i}'), 1100.0)
+        
+        assert abs(sketch.count(now=1050.0) - 100) <= 5
+        assert abs(sketch.count(now=1100.0) - 40) <= 3
+        assert sketch.count(now=2000.0) == 0
+    
+    def test_values_older_than_ring_are_ignored(self):
+        sketch = SlidingHyperLogLog(span_seconds=60, slices=6, precision=8)
+        sketch.add_hash(stable_hash64('/new'), 1000.0)
+        sketch.add_hash(stable_hash64('/ancient'), 100.0)
+        
+        assert sketch.count(now=1000.0) == 1
+
+
+
+class TestSlidingCountMinSketch:
+    """Test suite untuk SlidingCountMinSketch."""
+    
+    def test_never_underestimates(self):
+        sketch = SlidingCountMinSketch(span_seconds=60, width=64, depth=4)
+        truth = {}
+        for i in range(2000):
+            key = f'10.0.{i % 13}.{i % 97}'
+            truth[key] = truth.get(key, 0) + 1
+            sketch.add_hash(stable_hash64(key), 1000.0)
+        
+        for key, count in truth.items():
+            assert sketch.estimate(stable_hash64(key), 1000.0) >= count
+    
+    def test_heavy_key_is_accurate(self):
+        sketch = SlidingCountMinSketch(span_seconds=60)
+        for i in range(500):
+            sketch.add_hash(stable_hash64(f'10.0.0.{i % 250}'), 1000.0)
+        sketch.add_hash(stable_hash64('6.6.6.6'), 1000.0, weight=5000)
+        
+        assert 5000 <= sketch.estimate(stable_hash64('6.6.6.6'), 1000.0) <= 5010
+    
+    def test_old_slices_expire(self):
+        sketch = SlidingCountMinSketch(span_seconds=60, slices=6)
+        sketch.add_hash(stable_hash64('a'), 1000.0, weight=3)
+        sketch.add_hash(stable_hash64('a'), 1100.0)
+        
+        assert sketch.estimate(stable_hash64('a'), 1050.0) == 3
+        assert sketch.estimate(stable_hash64('a'), 1100.0) == 1
+        assert sketch.estimate(stable_hash64('a'), 2000.0) == 0
+
+
+
+class TestDDSketch:
+    """Test suite untuk DDSketch."""
+    
+    def test_quantiles_within_relative_accuracy(self):
+        rng = np.random.default_rng(3)
+        values = rng.lognormal(4, 1.2, 20000)
+        sketch = DDSketch()
+        for value in values:
+            sketch.add(value)
+        
+        for q in (0.5, 0.95, 0.99):
+            exact = np.quantile(values, q)
+            assert abs(sketch.quantile(q) - exact) / exact <= 0.05
+    
+    def test_remove_restores_quantiles(self):
+        sketch = DDSketch()
+        for value in (10, 20, 30, 40):
+            sketch.add(value)
+        sketch.add(5000)
+        assert sketch.quantile(1.0) == pytest.approx(5000, rel=0.02)
+        
+        sketch.remove(5000)
+        assert sketch.count == 4
+        assert sketch.quantile(1.0) == pytest.approx(40, rel=0.02)
+    
+    def test_merge_equals_union(self):
+        first, second, union = DDSketch(), DDSketch(), DDSketch()
+        for i in range(1, 500):
+            (first if i % 2 else second).add(i)
+            union.add(i)
+        
+        first.merge(second)
+        assert first.count == union.count
+        assert np.array_equal(first.to_histogram(), union.to_histogram())
+        assert first.quantile(0.95) == union.quantile(0.95)
+    
+    def test_dense_histogram_quantiles_match_sparse(self):
+        sketch = DDSketch()
+        for value in range(1, 1000):
+            sketch.add(value)
+        
+        dense = LATENCY_MAPPING.quantiles(sketch.to_histogram(), (0.5, 0.95))
+        assert dense[0] == sketch.quantile(0.5)
+        assert dense[1] == sketch.quantile(0.95)
+        assert LATENCY_MAPPING.quantiles(np.zeros(LATENCY_MAPPING.bins), (0.5,))[0] == 0.0
+    
+    def test_vectorized_indices_match_scalar(self):
+        values = np.array([0, 0.5, 1, 1.01, 37.2, 999, 1e7])
+        assert LATENCY_MAPPING.indices(values).tolist() == [LATENCY_MAPPING.index(v) for v in values]
+    
+    def test_invalid_mapping(self):
+        with pytest.raises(ValueError):
+            DDSketchMapping(relative_accuracy=0)
+        with pytest.raises(ValueError):
+            DDSketch(DDSketchMapping()).merge(DDSketch())
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
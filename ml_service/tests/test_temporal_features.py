@@ -13,11 +13,21 @@ import numpy as np
 from datetime import datetime, timedelta
 import sys
 import os
+import time
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from temporal_features import TemporalSlidingWindow
+from temporal_features import (
+    DecayedSlidingWindow,
+    EventTimeClock,
+    ShardedSlidingWindow,
+    TemporalSlidingWindow,
+    create_sliding_window,
+    parse_window_key,
+    subnet_prefixes
+)
+from url_templates import UrlTemplateNormalizer
 
 
 class TestTemporalSlidingWindow:
@@ -324,5 +334,1117 @@ class TestDDoSDetection:
         assert attacker_error_rate == 1.0  # 100% error (401)
 
 
+
+class TestIncrementalAggregates:
+    """Test agregat per-IP yang diperbarui secara inkremental."""
+    
+    @pytest.fixture
+    def sliding_window(self):
+        return TemporalSlidingWindow(window_size_minutes=10)
+    
+    def test_old_timestamp_only_in_longer_window(self, sliding_window):
+        """Log berumur 2 menit masuk window 5 menit tapi tidak 1 menit."""
+        ip = '192.168.1.100'
+        sliding_window.add_log({
+            'ip_address': ip, 'method': 'GET', 'url': '/old',
+            'status_code': 500, 'response_time': 100,
+            'timestamp': datetime.now() - timedelta(minutes=2)
+        })
+        sliding_window.add_log({
+            'ip_address': ip, 'method': 'GET', 'url': '/new',
+            'status_code': 200, 'response_time': 300
+        })
+        
+        assert sliding_window.calculate_request_count(ip, '1min') == 1
+        assert sliding_window.calculate_request_count(ip, '5min') == 2
+        assert sliding_window.calculate_error_rate(ip, '1min') == 0.0
+        assert sliding_window.calculate_error_rate(ip, '5min') == 0.5
+        assert sliding_window.calculate_avg_response_time(ip, '5min') == 200.0
+        assert len(sliding_window.get_logs_in_window('1min')) == 1
+    
+    def test_tolerates_null_fields(self, sliding_window):
+        """Log dengan status_code / response_time None tetap diterima."""
+        features = sliding_window.extract_temporal_features({
+            'ip_address': '10.0.0.9', 'method': 'GET', 'url': '/x',
+            'status_code': None, 'response_time': None
+        })
+        assert features['req_count_1min'] == 1
+        assert features['error_rate_1min'] == 0.0
+        assert features['avg_response_time_1min'] == 0.0
+    
+    def test_concurrent_reads_during_eviction(self):
+        """Pembacaan rasio tidak bentrok dengan eviction di thread lain."""
+        import threading
+        
+        sw = TemporalSlidingWindow(window_size_minutes=10, clock='event')
+        base = datetime(2026, 1, 1)
+        errors = []
+        done = threading.Event()
+        
+        def writer():
+            for i in range(3000):
+                # Setiap log 61 detik setelah sebelumnya: agregat 1 menit terus dikosongkan
+                sw.add_log({'ip_address': '10.0.0.1', 'method': 'GET', 'url': '/', 'status_code': 500,
+                            'response_time': 5, 'timestamp': base + timedelta(seconds=61 * i)})
+            done.set()
+        
+        def reader():
+            try:
+                while not done.is_set():
+                    sw.calculate_avg_response_time('10.0.0.1')
+                    sw.calculate_avg_bytes('10.0.0.1', '1min')
+                    sw.calculate_error_rate('10.0.0.1')
+                    sw.calculate_error_rate(None)
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+    
+    def test_expired_log_is_evicted(self, sliding_window):
+        """Log di luar window maksimal tidak disimpan di buffer."""
+        sliding_window.add_log({
+            'ip_address': '10.0.0.1', 'method': 'GET', 'url': '/',
+            'status_code': 200, 'response_time': 10,
+            'timestamp': datetime.now() - timedelta(minutes=11)
+        })
+        
+        assert len(sliding_window.log_buffer) == 0
+        assert sliding_window.calculate_request_count('10.0.0.1', '10min') == 0
+    
+    def test_idle_ip_state_is_released(self, sliding_window):
+        """State per-IP dihapus ketika IP tidak punya log di window."""
+        sliding_window.add_log({
+            'ip_address': '10.0.0.1', 'method': 'GET', 'url': '/',
+            'status_code': 200, 'response_time': 10,
+            'timestamp': datetime.now() - timedelta(seconds=90)
+        })
+        sliding_window.add_log({
+            'ip_address': '10.0.0.2', 'method': 'GET', 'url': '/',
+            'status_code': 200, 'response_time': 10
+        })
+        
+        assert sliding_window.calculate_request_count('10.0.0.1', '1min') == 0
+        assert '10.0.0.1' not in sliding_window._ip_aggregates['1min']
+        assert '10.0.0.1' in sliding_window._ip_aggregates['5min']
+    
+    def test_matches_brute_force_scan(self, sliding_window):
+        """Agregat inkremental harus sama dengan scan buffer secara penuh."""
+        rng = np.random.default_rng(7)
+        now = datetime.now()
+        ips = ['10.0.0.1', '10.0.0.2', '10.0.0.3']
+        logs = []
+        
+        # Timestamp acak (termasuk out-of-order) dalam 12 menit terakhir
+        for _ in range(300):
+            log = {
+                'ip_address': str(rng.choice(ips)),
+                'method': str(rng.choice(['GET', 'POST', 'PUT'])),
+                'url': f'/page/{rng.integers(0, 20)}',
+                'status_code': int(rng.choice([200, 404, 500])),
+                'response_time': float(rng.integers(10, 500)),
+                'timestamp': now - timedelta(seconds=float(rng.uniform(0, 720)))
+            }
+            logs.append(log)
+            sliding_window.add_log(log)
+        
+        for window_key, minutes in [('1min', 1), ('5min', 5), ('10min', 10)]:
+            cutoff = datetime.now() - timedelta(minutes=minutes)
+            for ip in ips:
+                expected = [l for l in logs if l['ip_address'] == ip and l['timestamp'] >= cutoff]
+                
+                assert sliding_window.calculate_request_count(ip, window_key) == len(expected)
+                assert sliding_window.calculate_unique_urls(ip, window_key) == len(
+                    set(l['url'] for l in expected))
+                if expected:
+                    errors = sum(1 for l in expected if l['status_code'] >= 400)
+                    assert abs(sliding_window.calculate_error_rate(ip, window_key)
+                               - errors / len(expected)) < 1e-9
+                    assert abs(sliding_window.calculate_avg_response_time(ip, window_key)
+                               - np.mean([l['response_time'] for l in expected])) < 1e-6
+        
+        assert list(sliding_window.log_buffer) == sorted(
+            sliding_window.log_buffer, key=lambda l: l['timestamp'])
+
+
+
+class TestColumnarStorage:
+    """Test backend penyimpanan kolumnar (NumPy)."""
+    
+    @staticmethod
+    def _make_logs(n, seed=11):
+        rng = np.random.default_rng(seed)
+        now = datetime.now()
+        return [
+            {
+                'ip_address': f'10.0.0.{rng.integers(1, 6)}',
+                'method': str(rng.choice(['GET', 'POST', 'DELETE'])),
+                'url': f'/api/item/{rng.integers(0, 30)}',
+                'user_agent': str(rng.choice(['curl/8.0', 'Mozilla/5.0'])),
+                'status_code': int(rng.choice([200, 401, 503])),
+                'response_time': float(rng.integers(5, 900)),
+                'timestamp': now - timedelta(seconds=float(rng.uniform(0, 400)))
+            }
+            for _ in range(n)
+        ]
+    
+    def test_invalid_storage_raises_error(self):
+        with pytest.raises(ValueError):
+            TemporalSlidingWindow(storage='unknown')
+    
+    def test_features_match_object_storage(self):
+        """Fitur dari backend kolumnar harus sama dengan backend object."""
+        object_window = TemporalSlidingWindow(window_size_minutes=10)
+        columnar_window = TemporalSlidingWindow(window_size_minutes=10, storage='columnar', capacity=16)
+        
+        for log in self._make_logs(200):
+            expected = object_window.extract_temporal_features(dict(log))
+            actual = columnar_window.extract_temporal_features(dict(log))
+            assert actual == expected
+        
+        assert len(columnar_window.log_buffer) == len(object_window.log_buffer)
+        assert columnar_window.get_stats()['logs_5min'] == object_window.get_stats()['logs_5min']
+    
+    def test_get_logs_in_window_returns_dicts(self):
+        sw = TemporalSlidingWindow(window_size_minutes=5, storage='columnar')
+        log = {'ip_address': '10.0.0.1', 'method': 'POST', 'url': '/login',
+               'user_agent': 'curl/8.0', 'status_code': 401, 'response_time': 12.5}
+        sw.add_log(log)
+        
+        # Dictionary caller tidak diubah oleh backend kolumnar
+        assert 'timestamp' not in log
+        
+        logs = sw.get_logs_in_window('1min')
+        assert len(logs) == 1
+        assert logs[0]['ip_address'] == '10.0.0.1'
+        assert logs[0]['status_code'] == 401
+        assert isinstance(logs[0]['timestamp'], datetime)
+        assert sw.log_buffer[0]['url'] == '/login'
+    
+    def test_memory_per_log(self):
+        """Kolom kolumnar memakai jauh lebih sedikit dari ~1 KB per log."""
+        sw = TemporalSlidingWindow(window_size_minutes=10, storage='columnar', capacity=1000)
+        store = sw.log_buffer
+        assert store.nbytes / 1000 <= 48
+    
+    def test_interned_strings_released_after_eviction(self):
+        sw = TemporalSlidingWindow(window_size_minutes=1, storage='columnar')
+        sw.add_log({'ip_address': '10.0.0.9', 'method': 'GET', 'url': '/old',
+                    'status_code': 200, 'response_time': 1,
+                    'timestamp': datetime.now() - timedelta(seconds=30)})
+        assert len(sw.log_buffer._interners['url']) == 1
+        
+        sw.add_log({'ip_address': '10.0.0.9', 'method': 'GET', 'url': '/new',
+                    'status_code': 200, 'response_time': 1,
+                    'timestamp': datetime.now() + timedelta(seconds=5)})
+        sw.log_buffer.drop_before(sw.log_buffer.first_seq + 1)
+        
+        assert len(sw.log_buffer._interners['url']) == 1
+        assert sw.log_buffer[0]['url'] == '/new'
+    
+    def test_count_since_uses_sorted_timestamps(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10, storage='columnar')
+        for log in self._make_logs(50, seed=3):
+            sw.add_log(log)
+        
+        cutoff = (datetime.now() - timedelta(minutes=2)).timestamp()
+        expected = sum(1 for log in sw.log_buffer if log['timestamp'].timestamp() >= cutoff)
+        assert sw.log_buffer.count_since(cutoff) == expected
+    
+    def test_null_status_code(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10, storage='columnar')
+        features = sw.extract_temporal_features({
+            'ip_address': '10.0.0.9', 'method': 'GET', 'url': '/x', 'status_code': None
+        })
+        assert features['error_rate_1min'] == 0.0
+        assert sw.export_records()[0][4] == 200
+
+
+class TestCompactStorage:
+    """Test backend record ringkas dengan string hasil interning."""
+    
+    def test_features_match_object_storage(self):
+        object_window = TemporalSlidingWindow(window_size_minutes=10)
+        compact_window = TemporalSlidingWindow(window_size_minutes=10, storage='compact')
+        
+        for log in TestColumnarStorage._make_logs(200, seed=5):
+            expected = object_window.extract_temporal_features(dict(log))
+            actual = compact_window.extract_temporal_features(dict(log))
+            assert actual == expected
+        
+        assert len(compact_window.log_buffer) == len(object_window.log_buffer)
+        assert compact_window.export_records() == object_window.export_records()
+    
+    def test_null_status_code(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10, storage='compact')
+        features = sw.extract_temporal_features({
+            'ip_address': '10.0.0.9', 'method': 'GET', 'url': '/x', 'status_code': None
+        })
+        assert features['error_rate_1min'] == 0.0
+        assert sw.get_logs_in_window('1min')[0]['status_code'] == 200
+    
+    def test_equal_strings_share_one_object(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10, storage='compact')
+        for _ in range(3):
+            # String baru per log, seperti hasil parsing JSON
+            sw.add_log({'ip_address': ''.join(['10.0.0.', '1']), 'method': 'GET',
+                        'url': ''.join(['/api/', 'items']), 'user_agent': 'curl/8.0',
+                        'status_code': 404, 'response_time': 3})
+        
+        events = list(sw.log_buffer.events_between(sw.log_buffer.first_seq, sw.log_buffer.end_seq))
+        assert events[0].url is events[2].url
+        assert events[0].ip is events[1].ip
+        assert not hasattr(events[0], '__dict__')
+        assert sw.log_buffer.interned_values == 5
+        
+        logs = sw.get_logs_in_window('1min')
+        assert logs[0]['url'] == '/api/items'
+        assert logs[0]['status_code'] == 404
+        assert isinstance(logs[0]['timestamp'], datetime)
+    
+    def test_interned_values_released_after_eviction(self):
+        sw = TemporalSlidingWindow(window_size_minutes=1, storage='compact')
+        sw.add_log({'ip_address': '10.0.0.9', 'method': 'GET', 'url': '/old',
+                    'status_code': 200, 'response_time': 1,
+                    'timestamp': datetime.now() - timedelta(seconds=30)})
+        sw.add_log({'ip_address': '10.0.0.9', 'method': 'GET', 'url': '/new',
+                    'status_code': 200, 'response_time': 1,
+                    'timestamp': datetime.now() + timedelta(seconds=5)})
+        sw.log_buffer.drop_before(sw.log_buffer.first_seq + 1)
+        
+        # ip, method, url, status code dan user agent milik log yang tersisa
+        assert sw.log_buffer.interned_values == 5
+        assert sw.log_buffer[0]['url'] == '/new'
+        
+        sw.clear()
+        assert sw.log_buffer.interned_values == 0
+
+
+
+class TestGlobalMetrics:
+    """Test metrik global dari bucket per detik."""
+    
+    @pytest.fixture
+    def sliding_window(self):
+        return TemporalSlidingWindow(window_size_minutes=10)
+    
+    def test_empty_window(self, sliding_window):
+        metrics = sliding_window.get_global_metrics('1min')
+        assert metrics['requests'] == 0
+        assert metrics['max_rps'] == 0
+        assert metrics['error_rate_slope'] == 0.0
+    
+    def test_metrics_match_logs(self, sliding_window):
+        base = datetime.now().replace(microsecond=0) - timedelta(seconds=20)
+        methods = ['GET', 'GET', 'POST', 'PUT']
+        
+        # Burst 8 request dalam satu detik, lalu 4 request di detik lain
+        for i in range(8):
+            sliding_window.add_log({
+                'ip_address': '10.0.0.1', 'method': methods[i % 4], 'url': f'/a/{i % 3}',
+                'status_code': 404 if i < 2 else 200, 'response_time': 100,
+                'timestamp': base + timedelta(milliseconds=i)
+            })
+        for i in range(4):
+            sliding_window.add_log({
+                'ip_address': '10.0.0.2', 'method': 'GET', 'url': '/b',
+                'status_code': 200, 'response_time': 400,
+                'timestamp': base + timedelta(seconds=5)
+            })
+        
+        metrics = sliding_window.get_global_metrics('1min')
+        
+        assert metrics['requests'] == 12
+        assert metrics['errors'] == 2
+        assert metrics['max_rps'] == 8
+        assert metrics['unique_urls'] == 4
+        assert abs(metrics['avg_response_time'] - 200.0) < 1e-9
+        assert abs(metrics['method_entropy']
+                   - sliding_window.calculate_method_entropy(None, '1min')) < 1e-9
+    
+    def test_error_rate_slope_sign(self, sliding_window):
+        """Error rate yang naik dari waktu ke waktu menghasilkan slope positif."""
+        base = datetime.now() - timedelta(seconds=50)
+        for second in range(10):
+            for i in range(10):
+                sliding_window.add_log({
+                    'ip_address': '10.0.0.1', 'method': 'GET', 'url': '/',
+                    'status_code': 500 if i < second else 200, 'response_time': 10,
+                    'timestamp': base + timedelta(seconds=second * 4)
+                })
+        
+        assert sliding_window.get_global_metrics('1min')['error_rate_slope'] > 0
+        
+        sliding_window.clear()
+        assert sliding_window.get_global_metrics('1min')['requests'] == 0
+
+
+
+class TestCardinalitySketches:
+    """Test URL/IP unik berbasis HyperLogLog."""
+    
+    def test_scanner_switches_to_fixed_memory_sketch(self):
+        sw = TemporalSlidingWindow(window_size_minutes=5, unique_url_exact_limit=32)
+        scanner = '45.33.32.156'
+        for i in range(3000):
+            sw.add_log({'ip_address': scanner, 'method': 'GET', 'url': f'/dir/{i}',
+                        'status_code': 404, 'response_time': 5})
+        
+        counter = sw._ip_aggregates['1min'][scanner].urls
+        assert counter.is_sketch
+        
+        estimate = sw.calculate_unique_urls(scanner, '1min')
+        assert abs(estimate - 3000) / 3000 < 0.15
+    
+    def test_small_ip_stays_exact(self):
+        sw = TemporalSlidingWindow(window_size_minutes=5, unique_url_exact_limit=32)
+        for url in ['/a', '/b', '/a']:
+            sw.add_log({'ip_address': '10.0.0.1', 'method': 'GET', 'url': url,
+                        'status_code': 200, 'response_time': 5})
+        
+        assert not sw._ip_aggregates['1min']['10.0.0.1'].urls.is_sketch
+        assert sw.calculate_unique_urls('10.0.0.1', '1min') == 2
+    
+    def test_unique_ips_feature(self):
+        sw = TemporalSlidingWindow(window_size_minutes=5)
+        for i in range(250):
+            sw.add_log({'ip_address': f'10.1.2.{i}', 'method': 'GET', 'url': '/',
+                        'status_code': 200, 'response_time': 5})
+        
+        features = sw.extract_temporal_features({
+            'ip_address': '10.1.2.0', 'method': 'GET', 'url': '/',
+            'status_code': 200, 'response_time': 5
+        })
+        assert abs(features['unique_ips_1min'] - 250) <= 10
+        assert sw.get_global_metrics('1min')['unique_ips'] == features['unique_ips_1min']
+
+
+class TestShardedSlidingWindow:
+    """Test sliding window yang dipartisi per IP."""
+    
+    @pytest.fixture
+    def logs(self):
+        base = datetime.now() - timedelta(seconds=30)
+        return [
+            {
+                'timestamp': base + timedelta(milliseconds=50 * i),
+                'ip_address': f'10.0.{i % 3}.{i % 7}',
+                'method': ['GET', 'POST', 'DELETE'][i % 3],
+                'url': f'/api/{i % 11}',
+                'status_code': 500 if i % 5 == 0 else 200,
+                'response_time': 10 + i
+            }
+            for i in range(200)
+        ]
+    
+    def test_per_ip_features_match_single_window(self, logs):
+        single = TemporalSlidingWindow(window_size_minutes=10)
+        # Interval 0: salinan shard diperbarui setiap log sehingga fitur global exact
+        sharded = ShardedSlidingWindow(window_size_minutes=10, shards=4, publish_interval_seconds=0)
+        
+        for log in logs:
+            expected = single.extract_temporal_features(dict(log))
+            actual = sharded.extract_temporal_features(dict(log))
+            assert actual == expected
+    
+    def test_global_stats_are_merged(self, logs):
+        sharded = ShardedSlidingWindow(window_size_minutes=10, shards=4)
+        for log in logs:
+            sharded.add_log(dict(log))
+        
+        stats = sharded.get_stats()
+        assert stats['shards'] == 4
+        assert stats['buffer_size'] == 200
+        assert stats['logs_1min'] == 200
+        assert sharded.calculate_error_rate(None, '1min') == pytest.approx(0.2)
+        assert sharded.get_global_metrics('1min')['requests'] == 200
+        assert len(sharded.get_logs_in_window('1min')) == 200
+    
+    def test_stats_keys_match_single_window(self, logs):
+        single = TemporalSlidingWindow(window_size_minutes=10, subnet_counters=True)
+        sharded = ShardedSlidingWindow(window_size_minutes=10, shards=4, subnet_counters=True)
+        for log in logs:
+            single.add_log(dict(log))
+            sharded.add_log(dict(log))
+        
+        single_stats, sharded_stats = single.get_stats(), sharded.get_stats()
+        assert set(sharded_stats) - {'shards'} == set(single_stats)
+        # Subnet yang sama di beberapa shard dihitung sekali
+        assert sharded_stats['tracked_subnets'] == single_stats['tracked_subnets'] == 3
+        assert sharded_stats['tracked_routes'] == single_stats['tracked_routes']
+    
+    def test_concurrent_extraction(self, logs):
+        import threading
+        
+        sharded = ShardedSlidingWindow(window_size_minutes=10, shards=4)
+        
+        def worker(chunk):
+            for log in chunk:
+                sharded.extract_temporal_features(dict(log))
+        
+        threads = [threading.Thread(target=worker, args=(logs[i::4],)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert sharded.get_stats()['logs_1min'] == 200
+    
+    def test_global_reads_wait_for_shard_locks(self, logs):
+        """Pembacaan dashboard membaca time wheel dan tabel subnet dengan lock shard dipegang."""
+        import threading
+        
+        sharded = ShardedSlidingWindow(window_size_minutes=10, shards=4, subnet_counters=True,
+                                       latency_quantiles=True, publish_interval_seconds=0)
+        for log in logs:
+            sharded.add_log(dict(log))
+        
+        readers = [
+            lambda: sharded.get_global_metrics('1min'),
+            lambda: sharded.calculate_subnet_request_count('10.0.1.1'),
+        ]
+        for read in readers:
+            finished = threading.Event()
+            thread = threading.Thread(target=lambda: (read(), finished.set()))
+            with sharded.shards[-1].lock:
+                thread.start()
+                assert not finished.wait(0.05)
+            thread.join()
+            assert finished.is_set()
+        
+        assert sharded.calculate_unique_ips('1min') == 21
+        assert sharded.calculate_subnet_request_count('10.0.1.1') == sum(
+            1 for log in logs if log['ip_address'].startswith('10.0.1.'))
+    
+    def test_request_path_reads_use_published_totals(self, logs):
+        """Fitur global jalur request membaca salinan shard yang sibuk, tanpa menunggu lock."""
+        import threading
+        
+        sharded = ShardedSlidingWindow(window_size_minutes=10, shards=4, subnet_counters=True,
+                                       latency_quantiles=True, publish_interval_seconds=0)
+        for log in logs:
+            sharded.add_log(dict(log))
+        busy = sharded.shards[-1]
+        
+        def read():
+            return (
+                sharded.calculate_unique_ips('1min'),
+                sharded.calculate_response_time_quantile(None, '1min', 0.95),
+                sharded._subnet_features('10.0.1.1'),
+            )
+        
+        expected = read()
+        held, release = threading.Event(), threading.Event()
+        
+        def hold_lock():
+            with busy.lock:
+                held.set()
+                release.wait(5)
+        
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        held.wait(5)
+        try:
+            started = time.time()
+            actual = read()
+            elapsed = time.time() - started
+        finally:
+            release.set()
+            holder.join()
+        
+        assert elapsed < 1
+        assert actual == expected
+        assert expected[0] == 21
+        assert expected[2]['subnet_req_count_1min'] == sum(
+            1 for log in logs if log['ip_address'].startswith('10.0.1.'))
+        with pytest.raises(ValueError):
+            ShardedSlidingWindow(shards=2, publish_interval_seconds=-1)
+    
+    def test_published_totals_lag_at_most_one_interval(self):
+        """Fitur global dari salinan shard tertinggal paling lama satu interval publikasi."""
+        base = datetime(2026, 1, 1, 12, 0, 0)
+        sharded = ShardedSlidingWindow(window_size_minutes=10, shards=4, clock='event',
+                                       publish_interval_seconds=1.0)
+        
+        def log(seconds, ip):
+            return {'timestamp': base + timedelta(seconds=seconds), 'ip_address': ip,
+                    'method': 'GET', 'url': '/', 'status_code': 200}
+        
+        for i in range(20):
+            sharded.add_log(log(0, f'10.9.0.{i}'))
+        assert sharded.calculate_unique_ips('1min') < 20
+        
+        sharded.clock.observe((base + timedelta(seconds=1)).timestamp())
+        assert sharded.calculate_unique_ips('1min') == 20
+        assert sharded.extract_temporal_features(log(1, '10.9.0.1'))['unique_ips_1min'] == 20
+    
+    def test_factory(self):
+        assert isinstance(create_sliding_window(shards=1), TemporalSlidingWindow)
+        assert isinstance(create_sliding_window(shards=3), ShardedSlidingWindow)
+        with pytest.raises(ValueError):
+            ShardedSlidingWindow(shards=0)
+
+
+class TestHeavyHitters:
+    """Test pembatasan state per-IP dan top-K heavy hitter."""
+    
+    def _flood(self, sw, n_light=1000, heavy=('6.6.6.6', '7.7.7.7'), timestamp=None):
+        for i in range(n_light):
+            log = {'ip_address': f'10.{i // 250}.{i % 250}.1', 'method': 'GET', 'url': '/',
+                   'status_code': 200, 'response_time': 5}
+            if timestamp is not None:
+                log['timestamp'] = timestamp
+            sw.add_log(log)
+            for rank, ip in enumerate(heavy):
+                if i % (rank + 2) == 0:
+                    log = {'ip_address': ip, 'method': 'POST', 'url': f'/login/{i}',
+                           'status_code': 401, 'response_time': 5}
+                    if timestamp is not None:
+                        log['timestamp'] = timestamp
+                    sw.add_log(log)
+    
+    def test_ip_state_is_bounded(self):
+        sw = TemporalSlidingWindow(window_size_minutes=5, max_tracked_ips=50)
+        self._flood(sw)
+        
+        for key in sw.windows:
+            assert len(sw._ip_aggregates[key]) <= 55
+        assert sw.get_stats()['logs_1min'] == 1000 + 500 + 334
+    
+    def test_top_ips_reports_heavy_hitters(self):
+        sw = TemporalSlidingWindow(window_size_minutes=5, max_tracked_ips=50)
+        self._flood(sw)
+        
+        top = sw.get_top_ips('1min', k=2)
+        assert [entry['ip'] for entry in top['by_requests']] == ['6.6.6.6', '7.7.7.7']
+        assert top['by_requests'][0]['count'] == 500
+        assert top['by_errors'][1] == {'ip': '7.7.7.7', 'count': 334}
+        assert top['by_unique_urls'][0]['ip'] == '6.6.6.6'
+        assert top['tracked_ips'] <= 55
+    
+    def test_untracked_ip_uses_sketch_estimate(self):
+        sw = TemporalSlidingWindow(window_size_minutes=5, max_tracked_ips=50)
+        self._flood(sw)
+        
+        untracked = [f'10.3.{i}.1' for i in range(200, 250)
+                     if f'10.3.{i}.1' not in sw._ip_aggregates['1min']]
+        assert untracked
+        assert all(sw.calculate_request_count(ip, '1min') >= 1 for ip in untracked)
+    
+    def test_expiry_with_mixed_state(self, monkeypatch):
+        import temporal_features
+        
+        sw = TemporalSlidingWindow(window_size_minutes=5, max_tracked_ips=50)
+        self._flood(sw, timestamp=datetime.now() - timedelta(seconds=50))
+        
+        later = time.time() + 30
+        monkeypatch.setattr(temporal_features.time, 'time', lambda: later)
+        sw.add_log({'ip_address': '6.6.6.6', 'method': 'GET', 'url': '/',
+                    'status_code': 200, 'response_time': 5})
+        
+        assert sw.get_stats()['logs_1min'] == 1
+        assert sw.calculate_request_count('6.6.6.6', '1min') == 1
+        assert sw.calculate_request_count('6.6.6.6', '5min') == 501
+    
+    def test_invalid_cap(self):
+        with pytest.raises(ValueError):
+            TemporalSlidingWindow(max_tracked_ips=0)
+    
+    def test_sharded_top_ips(self):
+        sharded = ShardedSlidingWindow(window_size_minutes=5, shards=4, max_tracked_ips=200)
+        self._flood(sharded)
+        
+        top = sharded.get_top_ips('1min', k=2)
+        assert [entry['ip'] for entry in top['by_requests']] == ['6.6.6.6', '7.7.7.7']
+        assert sharded.get_stats()['tracked_ips'] <= 4 * 55
+
+
+class TestEventTimeReplay:
+    """Test replay log arsip dengan clock event-time."""
+    
+    @pytest.fixture
+    def archive(self):
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        return [
+            {
+                'timestamp': start + timedelta(seconds=i),
+                'ip_address': '192.168.1.100' if i % 2 else '10.0.0.1',
+                'method': 'GET',
+                'url': f'/page/{i % 7}',
+                'status_code': 500 if i % 10 == 0 else 200,
+                'response_time': 100
+            }
+            for i in range(300)
+        ]
+    
+    def test_wall_clock_evicts_archived_logs(self, archive):
+        sw = TemporalSlidingWindow(window_size_minutes=10)
+        for log in archive:
+            sw.add_log(dict(log))
+        
+        assert sw.get_stats()['buffer_size'] == 0
+    
+    def test_replay_uses_event_time(self, archive):
+        sw = TemporalSlidingWindow(window_size_minutes=10, clock='event')
+        results = list(sw.replay(dict(log) for log in archive))
+        
+        assert len(results) == 300
+        last_log, last_features = results[-1]
+        assert last_log['timestamp'] == archive[-1]['timestamp']
+        # Event pada detik 239..299 masuk window 1 menit; separuhnya IP ini
+        assert last_features['global_req_count_1min'] == 61
+        assert last_features['req_count_1min'] == 31
+        assert sw.get_stats()['logs_5min'] == 300
+    
+    def test_reorder_buffer_matches_sorted_replay(self, archive):
+        shuffled = list(archive)
+        for i in range(0, len(shuffled) - 3, 4):
+            shuffled[i], shuffled[i + 3] = shuffled[i + 3], shuffled[i]
+        
+        expected = TemporalSlidingWindow(window_size_minutes=10, clock='event')
+        actual = TemporalSlidingWindow(window_size_minutes=10, clock='event')
+        sorted_results = list(expected.replay(dict(log) for log in archive))
+        reordered_results = list(actual.replay((dict(log) for log in shuffled), reorder_delay_seconds=5))
+        
+        assert [features for _, features in reordered_results] == [features for _, features in sorted_results]
+    
+    def test_reorder_buffer_is_bounded(self, archive):
+        sw = TemporalSlidingWindow(window_size_minutes=10, clock='event')
+        released = 0
+        for _ in sw.replay((dict(log) for log in archive), reorder_delay_seconds=3600, reorder_capacity=10):
+            released += 1
+            if released == 50:
+                break
+        
+        assert released == 50
+    
+    def test_replay_requires_event_clock(self, archive):
+        sw = TemporalSlidingWindow(window_size_minutes=10)
+        with pytest.raises(RuntimeError):
+            sw.replay(archive)
+        with pytest.raises(ValueError):
+            TemporalSlidingWindow(clock='sundial')
+    
+    def test_sharded_replay_shares_clock(self, archive):
+        clock = EventTimeClock()
+        sharded = ShardedSlidingWindow(window_size_minutes=10, shards=4, clock=clock)
+        results = list(sharded.replay(dict(log) for log in archive))
+        
+        assert all(shard.clock is clock for shard in sharded.shards)
+        assert clock.watermark == archive[-1]['timestamp'].timestamp()
+        assert results[-1][1]['global_req_count_1min'] == 61
+
+
+class TestBatchExtraction:
+    """Test extract_temporal_features_batch."""
+    
+    @pytest.fixture
+    def logs(self):
+        base = datetime.now() - timedelta(seconds=400)
+        logs = [
+            {
+                'timestamp': base + timedelta(seconds=2 * i),
+                'ip_address': f'10.0.{i % 4}.{i % 9}',
+                'method': ['GET', 'POST', 'PUT', 'DELETE'][i % 4],
+                'url': f'/api/{i % 13}',
+                'status_code': 500 if i % 6 == 0 else 200,
+                'response_time': 10 + i % 40,
+                'user_agent': 'Mozilla/5.0'
+            }
+            for i in range(200)
+        ]
+        logs.append({'timestamp': base, 'ip_address': '', 'method': 'GET', 'url': '/'})
+        return logs
+    
+    @pytest.mark.parametrize('kwargs', [
+        {'storage': 'object'},
+        {'storage': 'compact'},
+        {'storage': 'columnar'},
+        {'max_tracked_ips': 5},
+    ])
+    def test_matches_sequential_feature_vectors(self, logs, kwargs):
+        ordered = sorted(logs, key=lambda log: log['timestamp'])
+        sequential = TemporalSlidingWindow(window_size_minutes=10, **kwargs)
+        expected = np.array([sequential.get_feature_vector(dict(log)) for log in ordered])
+        
+        batch = TemporalSlidingWindow(window_size_minutes=10, **kwargs)
+        matrix = batch.extract_temporal_features_batch([dict(log) for log in ordered])
+        
+        assert matrix.shape == (len(logs), len(TemporalSlidingWindow.FEATURE_ORDER))
+        np.testing.assert_array_equal(matrix, expected)
+        assert batch.get_stats() == sequential.get_stats()
+    
+    def test_rows_follow_input_order(self, logs):
+        shuffled = logs[::-1]
+        ordered = TemporalSlidingWindow(window_size_minutes=10).extract_temporal_features_batch(
+            [dict(log) for log in logs]
+        )
+        reversed_rows = TemporalSlidingWindow(window_size_minutes=10).extract_temporal_features_batch(
+            [dict(log) for log in shuffled]
+        )
+        
+        np.testing.assert_array_equal(reversed_rows[::-1], ordered)
+    
+    def test_sharded_matches_sequential(self, logs):
+        ordered = sorted(logs, key=lambda log: log['timestamp'])
+        sequential = ShardedSlidingWindow(window_size_minutes=10, shards=4)
+        expected = np.array([sequential.get_feature_vector(dict(log)) for log in ordered])
+        
+        batch = ShardedSlidingWindow(window_size_minutes=10, shards=4)
+        np.testing.assert_array_equal(batch.extract_temporal_features_batch([dict(log) for log in ordered]), expected)
+    
+    def test_empty_batch(self):
+        matrix = TemporalSlidingWindow().extract_temporal_features_batch([])
+        assert matrix.shape == (0, len(TemporalSlidingWindow.FEATURE_ORDER))
+
+
+class TestConfigurableWindows:
+    """Test window tambahan yang dikonfigurasi per deployment."""
+    
+    @pytest.fixture
+    def sw(self):
+        return TemporalSlidingWindow(window_size_minutes=10, windows=['10s', '30s', '60min'])
+    
+    def _log(self, seconds_ago, status=200, ip='192.168.1.1'):
+        return {
+            'timestamp': datetime.now() - timedelta(seconds=seconds_ago),
+            'ip_address': ip,
+            'method': 'POST',
+            'url': '/login',
+            'status_code': status
+        }
+    
+    def test_windows_are_sorted_and_buffer_extended(self, sw):
+        assert list(sw.windows) == ['10s', '30s', '1min', '5min', '10min', '60min']
+        assert sw.extra_windows == ['10s', '30s', '60min']
+        assert sw.window_size == timedelta(minutes=60)
+    
+    def test_extra_window_features(self, sw):
+        for seconds_ago, status in ((50 * 60, 401), (20 * 60, 401), (45, 200), (20, 401), (5, 401)):
+            sw.add_log(self._log(seconds_ago, status))
+        features = sw.extract_temporal_features(self._log(0, 401))
+        
+        assert features['req_count_10s'] == 2
+        assert features['req_count_30s'] == 3
+        assert features['req_count_1min'] == 4
+        assert features['req_count_60min'] == 6
+        assert features['error_rate_10s'] == 1.0
+        assert features['error_rate_60min'] == pytest.approx(5 / 6, abs=1e-4)
+        assert sw.get_stats()['logs_60min'] == 6
+        assert sw.get_stats()['logs_10s'] == 2
+    
+    def test_default_windows_unchanged(self):
+        sw = TemporalSlidingWindow(window_size_minutes=5)
+        assert list(sw.windows) == ['1min', '5min', '10min']
+        assert 'req_count_10s' not in sw.extract_temporal_features(self._log(0))
+    
+    def test_invalid_window_key(self):
+        for key in ('10', '0s', '5 days', 'min'):
+            with pytest.raises(ValueError):
+                TemporalSlidingWindow(windows=[key])
+        assert parse_window_key('2h') == timedelta(hours=2)
+    
+    def test_sharded_window_passes_windows(self):
+        sharded = ShardedSlidingWindow(window_size_minutes=10, shards=2, windows=['10s'])
+        sharded.add_log(self._log(5))
+        features = sharded.extract_temporal_features(self._log(0))
+        
+        assert features['req_count_10s'] == 2
+        assert sharded.get_stats()['logs_10s'] == 2
+
+
+class TestRouteTemplates:
+    """Test agregasi per route template (url_normalizer)."""
+    
+    @staticmethod
+    def _flood(window, ip, n):
+        for i in range(n):
+            window.add_log({'ip_address': ip, 'method': 'GET', 'url': f'/api/flood/{i}',
+                            'status_code': 200, 'response_time': 5})
+    
+    def test_unique_routes_vs_unique_urls(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10, url_normalizer=UrlTemplateNormalizer())
+        self._flood(sw, '10.0.0.1', 30)
+        sw.add_log({'ip_address': '10.0.0.1', 'method': 'POST', 'url': '/login',
+                    'status_code': 401, 'response_time': 5})
+        
+        assert sw.calculate_unique_urls('10.0.0.1') == 31
+        assert sw.calculate_unique_routes('10.0.0.1') == 2
+        assert sw.get_top_routes('1min') == [
+            {'route': '/api/flood/{id}', 'count': 30},
+            {'route': '/login', 'count': 1},
+        ]
+        features = sw.extract_temporal_features({'ip_address': '10.0.0.1', 'url': '/api/flood/99'})
+        assert features['unique_routes_1min'] == 2
+        assert sw.get_stats()['tracked_routes'] == 2
+    
+    def test_routes_expire_with_window(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10, clock='event',
+                                   url_normalizer=UrlTemplateNormalizer())
+        base = datetime(2026, 1, 1, 12, 0, 0)
+        sw.add_log({'ip_address': '10.0.0.1', 'url': '/api/users/1', 'timestamp': base})
+        sw.add_log({'ip_address': '10.0.0.2', 'url': '/health', 'timestamp': base + timedelta(seconds=90)})
+        
+        assert sw.get_top_routes('1min') == [{'route': '/health', 'count': 1}]
+        assert len(sw.get_top_routes('5min')) == 2
+        assert sw.calculate_unique_routes('10.0.0.1', '1min') == 0
+    
+    def test_disabled_by_default(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10)
+        features = sw.extract_temporal_features({'ip_address': '10.0.0.1', 'url': '/api/1'})
+        
+        assert 'unique_routes_1min' not in features
+        assert sw.get_top_routes() == []
+        assert sw.calculate_unique_routes('10.0.0.1') == 0
+    
+    def test_sharded_routes_merged(self):
+        sharded = ShardedSlidingWindow(window_size_minutes=10, shards=4,
+                                       url_normalizer=UrlTemplateNormalizer())
+        for i in range(8):
+            self._flood(sharded, f'10.0.0.{i}', 5)
+        
+        assert sharded.get_top_routes('1min', k=1) == [{'route': '/api/flood/{id}', 'count': 40}]
+        assert sharded.calculate_unique_routes('10.0.0.3') == 1
+        assert sharded.get_stats()['tracked_routes'] == 1
+
+
+class TestSubnetCounters:
+    """Test counter hierarkis per subnet (subnet_counters)."""
+    
+    @staticmethod
+    def _botnet_log(i, status=200):
+        return {'ip_address': f'203.0.113.{i}', 'method': 'POST', 'url': '/login',
+                'status_code': status, 'response_time': 5}
+    
+    def test_subnet_prefixes(self):
+        assert subnet_prefixes('10.1.2.3') == ('10.1.2.0/24', '10.1.0.0/16')
+        assert subnet_prefixes('2001:db8:1:2:3::4') == ('2001:db8:1:2::/64', '2001:db8:1::/48')
+        assert subnet_prefixes('not-an-ip') is None
+        assert subnet_prefixes('') is None
+    
+    def test_distributed_botnet_visible_per_subnet(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10, subnet_counters=True)
+        for i in range(1, 251):
+            sw.add_log(self._botnet_log(i, status=401 if i % 2 else 200))
+        features = sw.extract_temporal_features(self._botnet_log(1))
+        
+        assert features['req_count_1min'] == 2
+        assert features['subnet_req_count_1min'] == 251
+        assert features['subnet_req_count_5min'] == 251
+        assert features['subnet_unique_ips_1min'] == 250
+        assert features['subnet_error_rate_1min'] == round(125 / 251, 4)
+        assert features['wide_subnet_req_count_1min'] == 251
+        assert sw.calculate_subnet_request_count('203.0.113.77', level='wide_subnet') == 251
+        
+        top = sw.get_top_subnets('1min', k=1)
+        assert top['subnet'] == [{'subnet': '203.0.113.0/24', 'count': 251, 'unique_ips': 250}]
+        assert top['wide_subnet'][0]['subnet'] == '203.0.0.0/16'
+    
+    def test_counters_expire_with_window(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10, clock='event', subnet_counters=True)
+        base = datetime(2026, 1, 1, 12, 0, 0)
+        for i in range(10):
+            sw.add_log({**self._botnet_log(i), 'timestamp': base})
+        sw.add_log({**self._botnet_log(99), 'timestamp': base + timedelta(seconds=90)})
+        
+        assert sw.calculate_subnet_request_count('203.0.113.1', '1min') == 1
+        assert sw.calculate_subnet_request_count('203.0.113.1', '5min') == 11
+        
+        sw.add_log({**self._botnet_log(99), 'timestamp': base + timedelta(minutes=20)})
+        assert sw.get_stats()['tracked_subnets'] == 1
+        assert sw.calculate_subnet_request_count('203.0.113.1', '10min') == 1
+    
+    def test_full_table_falls_back_to_sketch(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10, subnet_counters=True, max_tracked_ips=2)
+        for subnet in range(5):
+            for i in range(subnet + 1):
+                sw.add_log({'ip_address': f'10.{subnet}.0.{i}', 'url': '/', 'status_code': 200})
+        
+        assert sw.get_stats()['tracked_subnets'] == 2
+        # Subnet di luar tabel tetap terhitung lewat Count-Min Sketch (bisa overestimate)
+        assert sw.calculate_subnet_request_count('10.4.0.1') >= 5
+    
+    def test_disabled_by_default(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10)
+        features = sw.extract_temporal_features(self._botnet_log(1))
+        
+        assert 'subnet_req_count_1min' not in features
+        assert sw.calculate_subnet_request_count('203.0.113.1') == 0
+    
+    def test_sharded_counts_merged_across_shards(self):
+        sharded = ShardedSlidingWindow(window_size_minutes=10, shards=4, subnet_counters=True,
+                                       publish_interval_seconds=0)
+        single = TemporalSlidingWindow(window_size_minutes=10, subnet_counters=True)
+        for i in range(1, 60):
+            expected = single.extract_temporal_features(self._botnet_log(i, status=500 if i % 3 == 0 else 200))
+            actual = sharded.extract_temporal_features(self._botnet_log(i, status=500 if i % 3 == 0 else 200))
+        
+        for key in ('subnet_req_count_1min', 'subnet_error_rate_1min', 'subnet_unique_ips_1min',
+                    'wide_subnet_req_count_1min'):
+            assert actual[key] == expected[key], key
+        assert sharded.calculate_subnet_request_count('203.0.113.1') == 59
+        assert sharded.get_top_subnets('1min')['subnet'][0] == {
+            'subnet': '203.0.113.0/24', 'count': 59, 'unique_ips': 59}
+
+
+class TestLatencyQuantiles:
+    """Test kuantil response time (DDSketch per IP dan per detik)."""
+    
+    @staticmethod
+    def _log(ip, response_time):
+        return {'ip_address': ip, 'method': 'GET', 'url': '/', 'status_code': 200,
+                'response_time': response_time}
+    
+    def test_slow_tail_visible_in_p99(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10, latency_quantiles=True)
+        for i in range(90):
+            sw.add_log(self._log('10.0.0.1', 20))
+        for i in range(10):
+            sw.add_log(self._log('10.0.0.1', 30000))
+        features = sw.extract_temporal_features(self._log('10.0.0.1', 20))
+        
+        assert features['avg_response_time_1min'] < 3500
+        assert features['p50_response_time_1min'] == pytest.approx(20, rel=0.03)
+        assert features['p95_response_time_1min'] == pytest.approx(30000, rel=0.03)
+        assert features['p99_response_time_1min'] == pytest.approx(30000, rel=0.03)
+        assert features['global_p95_response_time_1min'] == pytest.approx(30000, rel=0.03)
+    
+    def test_quantiles_follow_window(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10, clock='event', latency_quantiles=True)
+        base = datetime(2026, 1, 1, 12, 0, 0)
+        sw.add_log({**self._log('10.0.0.1', 5000), 'timestamp': base})
+        sw.add_log({**self._log('10.0.0.1', 10), 'timestamp': base + timedelta(seconds=90)})
+        
+        assert sw.calculate_response_time_quantile('10.0.0.1', '1min', 0.99) == pytest.approx(10, rel=0.03)
+        assert sw.calculate_response_time_quantile('10.0.0.1', '5min', 1.0) == pytest.approx(5000, rel=0.03)
+        assert sw.calculate_response_time_quantile(None, '1min', 0.99) == pytest.approx(10, rel=0.03)
+    
+    def test_global_metrics_include_percentiles(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10)
+        for response_time in range(1, 101):
+            sw.add_log(self._log(f'10.0.0.{response_time % 5}', response_time))
+        
+        metrics = sw.get_global_metrics('1min')
+        assert metrics['p50_response_time'] == pytest.approx(50, rel=0.03)
+        assert metrics['p95_response_time'] == pytest.approx(95, rel=0.03)
+        assert metrics['p99_response_time'] == pytest.approx(99, rel=0.03)
+        assert 'p95_response_time_1min' not in sw.extract_temporal_features(self._log('10.0.0.1', 1))
+    
+    def test_sharded_global_quantile_merges_shards(self):
+        sharded = ShardedSlidingWindow(window_size_minutes=10, shards=4, latency_quantiles=True,
+                                       publish_interval_seconds=0)
+        single = TemporalSlidingWindow(window_size_minutes=10, latency_quantiles=True)
+        for i in range(200):
+            log = self._log(f'10.0.{i % 9}.1', 10 + (i * 37) % 900)
+            single.add_log(dict(log))
+            sharded.add_log(dict(log))
+        
+        for q in (0.5, 0.95, 0.99):
+            assert sharded.calculate_response_time_quantile(None, '1min', q) == \
+                single.calculate_response_time_quantile(None, '1min', q)
+        assert sharded.get_global_metrics('1min')['p95_response_time'] == \
+            single.get_global_metrics('1min')['p95_response_time']
+        assert sharded.calculate_response_time_quantile('10.0.3.1', '1min', 0.5) == \
+            single.calculate_response_time_quantile('10.0.3.1', '1min', 0.5)
+
+
+class TestDecayedSlidingWindow:
+    """Test mode counter meluruh eksponensial."""
+    
+    def _log(self, timestamp, ip='10.0.0.1', status=200, url='/api', method='GET'):
+        return {
+            'timestamp': timestamp,
+            'ip_address': ip,
+            'method': method,
+            'url': url,
+            'status_code': status,
+            'response_time': 40
+        }
+    
+    def test_same_feature_names(self):
+        decayed = DecayedSlidingWindow(windows=['60min'])
+        exact = TemporalSlidingWindow(windows=['60min'])
+        log = self._log(datetime.now())
+        
+        assert set(decayed.extract_temporal_features(dict(log))) == set(exact.extract_temporal_features(dict(log)))
+        assert len(decayed.get_feature_vector(dict(log))) == len(DecayedSlidingWindow.FEATURE_ORDER)
+    
+    def test_steady_rate_matches_window_count(self):
+        sw = DecayedSlidingWindow(clock='event')
+        base = datetime(2026, 1, 1, 12, 0, 0)
+        for i in range(1800):
+            features = sw.extract_temporal_features(
+                self._log(base + timedelta(seconds=i), status=500 if i % 4 == 0 else 200, url=f'/p/{i % 5}')
+            )
+        
+        assert features['req_count_1min'] == pytest.approx(60, rel=0.02)
+        assert features['req_count_5min'] == pytest.approx(300, rel=0.02)
+        assert features['error_rate_5min'] == pytest.approx(0.25, abs=0.01)
+        assert features['avg_response_time_1min'] == pytest.approx(40)
+        assert features['unique_urls_1min'] == 5
+        assert features['method_entropy'] == 0.0
+        assert features['global_req_count_1min'] == 60
+    
+    def test_counter_halves_after_half_life(self):
+        sw = DecayedSlidingWindow(half_lives={'1min': 30}, clock='event')
+        base = datetime(2026, 1, 1, 12, 0, 0)
+        for _ in range(8):
+            sw.add_log(self._log(base))
+        sw.add_log(self._log(base + timedelta(seconds=30), ip='10.9.9.9'))
+        
+        assert sw.calculate_request_count('10.0.0.1', '1min') == pytest.approx(4)
+        with pytest.raises(ValueError):
+            DecayedSlidingWindow(half_lives={'7min': 30})
+    
+    def test_ip_table_is_bounded(self):
+        sw = DecayedSlidingWindow(max_tracked_ips=10, capacity=4)
+        now = datetime.now()
+        for _ in range(20):
+            sw.add_log(self._log(now, ip='6.6.6.6'))
+        for i in range(100):
+            sw.add_log(self._log(now, ip=f'10.0.0.{i}'))
+        
+        assert sw.get_stats()['tracked_ips'] <= 11
+        assert sw.get_top_ips('5min', k=1)['by_requests'][0]['ip'] == '6.6.6.6'
+    
+    def test_prune_drops_idle_ips(self):
+        sw = DecayedSlidingWindow(clock='event')
+        base = datetime(2026, 1, 1, 12, 0, 0)
+        sw.add_log(self._log(base, ip='10.0.0.1'))
+        sw.add_log(self._log(base + timedelta(hours=3), ip='10.0.0.2'))
+        
+        assert sw.prune() == 1
+        assert sw.calculate_request_count('10.0.0.1', '10min') == 0.0
+        assert sw.calculate_request_count('10.0.0.2', '10min') == pytest.approx(1)
+    
+    def test_memory_per_ip(self):
+        sw = DecayedSlidingWindow(capacity=1024)
+        now = datetime.now()
+        for i in range(1024):
+            sw.add_log(self._log(now, ip=f'10.{i // 256}.{i % 256}.1'))
+        
+        stats = sw.get_stats()
+        assert stats['storage'] == 'decayed'
+        assert stats['table_bytes'] / stats['tracked_ips'] <= 200
+    
+    def test_factory(self):
+        sw = create_sliding_window(storage='decayed', windows=['60min'], max_tracked_ips=5,
+                                   cardinality_error=0.02, clock='event', subnet_counters=False)
+        assert isinstance(sw, DecayedSlidingWindow)
+        assert '60min' in sw.windows
+        assert sw.max_tracked_ips == 5
+        assert not hasattr(sw, 'get_logs_in_window')
+        
+        # Opsi yang tidak didukung mode decayed ditolak, tidak diabaikan diam-diam
+        for options in ({'url_normalizer': UrlTemplateNormalizer()}, {'subnet_counters': True},
+                        {'latency_quantiles': True}, {'shards': 4}):
+            with pytest.raises(ValueError):
+                create_sliding_window(storage='decayed', **options)
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,79 @@
+"""
+========================================
+UNIT TESTS - URL TEMPLATES
+PyTest untuk validasi normalisasi route template
+========================================
+
+Lead Researcher & Developer:
+  MUHAMMAD AKBAR HADI PRATAMA (@el-pablos)
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from url_templates import UrlTemplateNormalizer, url_to_template
+
+
+class TestUrlToTemplate:
+    """Test suite untuk url_to_template."""
+    
+    @pytest.mark.parametrize('url, expected', [
+        ('/api/flood/17', '/api/flood/{id}'),
+        ('/api/users/12345/orders/9', '/api/users/{id}/orders/{id}'),
+        ('/api/items/550e8400-e29b-41d4-a716-446655440000', '/api/items/{uuid}'),
+        ('/files/9f86d081884c7d659a2feaa0c55ad015', '/files/{hash}'),
+        ('/reset/aB3dE5gH7jK9mN1pQ3sT5v', '/reset/{token}'),
+        ('/search?q=admin&page=2', '/search?q={}&page={}'),
+        ('/docs/getting-started#install', '/docs/getting-started'),
+        ('/', '/'),
+        ('', ''),
+    ])
+    def test_templates(self, url, expected):
+        assert url_to_template(url) == expected
+    
+    def test_keeps_static_segments(self):
+        assert url_to_template('/api/v1/login') == '/api/v1/login'
+        assert url_to_template('/static/app.js') == '/static/app.js'
+
+
+class TestUrlTemplateNormalizer:
+    """Test suite untuk UrlTemplateNormalizer."""
+    
+    def test_cache_hits(self):
+        normalizer = UrlTemplateNormalizer(cache_size=8)
+        for _ in range(3):
+            assert normalizer.normalize('/api/users/1') == '/api/users/{id}'
+        
+        stats = normalizer.get_stats()
+        assert stats['cached_urls'] == 1
+        assert stats['hit_rate'] == round(2 / 3, 4)
+    
+    def test_cache_bounded_under_enumeration(self):
+        normalizer = UrlTemplateNormalizer(cache_size=100)
+        templates = {normalizer.normalize(f'/api/flood/{i}') for i in range(5000)}
+        
+        assert templates == {'/api/flood/{id}'}
+        assert normalizer.get_stats()['cached_urls'] == 100
+        # Template berbagi satu objek string
+        assert normalizer.normalize('/api/flood/1') is normalizer.normalize('/api/flood/2')
+    
+    def test_least_recently_used_evicted(self):
+        normalizer = UrlTemplateNormalizer(cache_size=2)
+        normalizer.normalize('/a/1')
+        normalizer.normalize('/b/1')
+        normalizer.normalize('/a/1')
+        normalizer.normalize('/c/1')
+        
+        assert list(normalizer._cache) == ['/a/1', '/c/1']
+    
+    def test_invalid_cache_size(self):
+        with pytest.raises(ValueError):
+            UrlTemplateNormalizer(cache_size=0)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,125 @@
+"""
+========================================
+UNIT TESTS - VERDICT CACHE
+PyTest untuk validasi cache verdict TTL per IP
+========================================
+
+Lead Researcher & Developer:
+  MUHAMMAD AKBAR HADI PRATAMA (@el-pablos)
+"""
+
+import pytest
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from url_templates import UrlTemplateNormalizer
+from verdict_cache import VerdictCache
+
+
+IP = '203.0.113.7'
+
+
+def verdict(level='critical'):
+    return {'threat_level': level, 'consensus_score': 1.0}
+
+
+@pytest.fixture
+def cache():
+    return VerdictCache(ttl_seconds=30, threshold=3)
+
+
+class TestVerdictCache:
+    """Test suite untuk VerdictCache."""
+    
+    def test_caches_after_threshold(self, cache):
+        assert cache.record(IP, '/a', 'critical', verdict(), now=0) is False
+        assert cache.record(IP, '/a', 'high', verdict('high'), now=1) is False
+        assert cache.lookup(IP, '/a', now=2) is None
+        assert cache.record(IP, '/a', 'critical', verdict(), now=2) is True
+        
+        assert cache.lookup(IP, '/b', now=3) == verdict()
+        assert cache.lookup('198.51.100.1', '/a', now=3) is None
+        stats = cache.get_stats(now=3)
+        assert stats['cached_verdicts'] == 1
+        assert (stats['hits'], stats['misses']) == (1, 2)
+    
+    def test_ttl_and_reconfirmation(self, cache):
+        for t in range(3):
+            cache.record(IP, '/a', 'critical', verdict(), now=t)
+        assert cache.lookup(IP, now=20) is not None
+        
+        # TTL habis: evaluasi penuh lagi, satu verdict berat langsung meng-cache ulang
+        assert cache.lookup(IP, now=33) is None
+        assert cache.record(IP, '/a', 'critical', verdict(), now=33) is True
+        assert cache.lookup(IP, now=34) is not None
+    
+    def test_strikes_reset(self, cache):
+        cache.record(IP, '/a', 'critical', verdict(), now=0)
+        cache.record(IP, '/a', 'critical', verdict(), now=1)
+        # Verdict ringan menghapus strike
+        cache.record(IP, '/a', 'normal', verdict('normal'), now=2)
+        assert cache.record(IP, '/a', 'critical', verdict(), now=3) is False
+        
+        # Strike yang terlalu berjauhan tidak berurutan
+        cache.record(IP, '/a', 'critical', verdict(), now=100)
+        cache.record(IP, '/a', 'critical', verdict(), now=140)
+        assert cache.record(IP, '/a', 'critical', verdict(), now=180) is False
+    
+    def test_keyed_by_route(self):
+        cache = VerdictCache(threshold=1, url_normalizer=UrlTemplateNormalizer())
+        cache.record(IP, '/api/flood/1', 'critical', verdict(), now=0)
+        
+        assert cache.lookup(IP, '/api/flood/999', now=1) is not None
+        assert cache.lookup(IP, '/login', now=1) is None
+        assert cache.invalidate(IP) == 1
+        assert cache.lookup(IP, '/api/flood/1', now=1) is None
+    
+    def test_bounded_and_validation(self):
+        cache = VerdictCache(threshold=1, max_entries=2)
+        for i in range(3):
+            cache.record(f'10.0.0.{i}', None, 'high', verdict('high'), now=0)
+        assert cache.get_stats(now=0)['entries'] == 2
+        assert cache.lookup('10.0.0.0', now=0) is None
+        
+        cache.clear()
+        assert cache.get_stats()['entries'] == 0
+        with pytest.raises(ValueError):
+            VerdictCache(threshold=0)
+
+
+class TestEnsembleEndpointCache:
+    """Cache hit di /predict/ensemble hanya memakai ulang verdict."""
+    
+    def test_hit_rebuilds_temporal_context(self, monkeypatch):
+        import app as app_module
+        from temporal_features import TemporalSlidingWindow
+        
+        cache = VerdictCache(threshold=1)
+        cache.record(IP, '/login', 'critical', verdict())
+        monkeypatch.setattr(app_module, 'verdict_cache', cache)
+        monkeypatch.setattr(app_module, 'sliding_window', TemporalSlidingWindow(window_size_minutes=10))
+        monkeypatch.setattr(app_module, 'history_store', None)
+        client = app_module.app.test_client()
+        
+        contexts = []
+        for status_code in (500, 200):
+            response = client.post('/predict/ensemble', json={
+                'ip_address': IP, 'method': 'POST', 'url': '/login', 'status_code': status_code
+            })
+            data = response.get_json()['data']
+            assert data['cached'] is True
+            assert data['threat_level'] == 'critical'
+            assert data['ensemble_latency_ms'] >= 0
+            contexts.append(data['temporal_context'])
+        
+        assert contexts[0]['req_count_1min'] == 1
+        assert contexts[0]['error_rate_1min'] == 1.0
+        assert contexts[1]['req_count_1min'] == 2
+        assert contexts[1]['error_rate_1min'] == 0.5
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
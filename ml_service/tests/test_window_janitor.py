@@ -0,0 +1,221 @@
+"""
+========================================
+UNIT TESTS - WINDOW JANITOR
+PyTest untuk validasi eviction latar belakang & timing wheel
+========================================
+
+Lead Researcher & Developer:
+  MUHAMMAD AKBAR HADI PRATAMA (@el-pablos)
+"""
+
+import pytest
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from temporal_features import DecayedSlidingWindow, ShardedSlidingWindow, TemporalSlidingWindow
+from window_janitor import HierarchicalTimingWheel, WindowJanitor
+
+
+BASE = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def make_log(seconds, ip='10.0.0.1'):
+    return {
+        'timestamp': BASE + timedelta(seconds=seconds),
+        'ip_address': ip,
+        'method': 'GET',
+        'url': '/api',
+        'status_code': 200,
+        'response_time': 10
+    }
+
+
+class TestHierarchicalTimingWheel:
+    """Test suite untuk HierarchicalTimingWheel."""
+    
+    def test_keys_fire_on_their_tick(self):
+        wheel = HierarchicalTimingWheel(tick_seconds=1.0, slots=8, levels=3)
+        rng = random.Random(7)
+        deadlines = {key: rng.randint(1, 2000) for key in range(500)}
+        for key, deadline in deadlines.items():
+            wheel.schedule(key, deadline)
+        
+        fired = {}
+        now = 0
+        while now < 2100:
+            now += rng.randint(1, 5)
+            for key in wheel.advance(now):
+                fired[key] = now
+        
+        assert set(fired) == set(deadlines)
+        for key, deadline in deadlines.items():
+            assert deadline <= fired[key] < deadline + 6
+        assert len(wheel) == 0
+    
+    def test_deadline_beyond_horizon(self):
+        wheel = HierarchicalTimingWheel(tick_seconds=1.0, slots=4, levels=2)
+        wheel.schedule('far', 100)
+        
+        assert wheel.advance(99) == []
+        assert wheel.advance(100) == ['far']
+    
+    def test_empty_wheel_jumps_forward(self):
+        wheel = HierarchicalTimingWheel()
+        assert wheel.advance(1.7e9) == []
+        wheel.schedule('a', 1.7e9 + 5, now=1.7e9)
+        assert wheel.advance(1.7e9 + 5) == ['a']
+
+
+class TestWindowJanitor:
+    """Test suite untuk WindowJanitor."""
+    
+    def test_evicts_exact_window_off_request_path(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10, clock='event')
+        for i in range(50):
+            sw.add_log(make_log(i, ip=f'10.0.0.{i}'))
+        janitor = WindowJanitor()
+        janitor.attach(sw)
+        
+        # Waktu berjalan tanpa request masuk
+        sw.clock.observe((BASE + timedelta(seconds=200)).timestamp())
+        janitor.run_once()
+        
+        assert len(sw._ip_aggregates['1min']) == 0
+        assert len(sw._ip_aggregates['10min']) == 50
+        assert sw._next_expiry > sw.clock.now()
+    
+    def test_expires_idle_decayed_ips(self):
+        sw = DecayedSlidingWindow(window_size_minutes=10, clock='event')
+        janitor = WindowJanitor(idle_seconds=300)
+        janitor.attach(sw)
+        for i in range(20):
+            sw.add_log(make_log(0, ip=f'10.1.0.{i}'))
+        sw.add_log(make_log(250, ip='10.1.0.0'))
+        
+        sw.clock.observe((BASE + timedelta(seconds=301)).timestamp())
+        assert janitor.run_once() == 19
+        assert sw.get_stats()['tracked_ips'] == 1
+        assert sw.calculate_request_count('10.1.0.0', '10min') > 0
+        
+        # IP yang masih aktif dijadwalkan ulang dari aktivitas terakhirnya
+        sw.clock.observe((BASE + timedelta(seconds=551)).timestamp())
+        assert janitor.run_once() == 1
+        assert sw.get_stats()['tracked_ips'] == 0
+        assert janitor.get_stats()['scheduled_ips'] == 0
+        assert janitor.get_stats()['evicted_ips'] == 20
+    
+    def test_expires_idle_exact_ips(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10, clock='event')
+        janitor = WindowJanitor(idle_seconds=120)
+        janitor.attach(sw)
+        for i in range(20):
+            sw.add_log(make_log(0, ip=f'10.2.0.{i}'))
+        sw.add_log(make_log(100, ip='10.2.0.0'))
+        assert janitor.get_stats()['scheduled_ips'] == 20
+        
+        sw.clock.observe((BASE + timedelta(seconds=121)).timestamp())
+        assert janitor.run_once() == 19
+        assert sw.get_stats()['tracked_ips'] == 1
+        # Log IP idle masih di window: jumlahnya pindah ke sketch
+        assert sw.calculate_request_count('10.2.0.5', '10min') >= 1
+        assert sw.get_stats()['logs_10min'] == 21
+        
+        sw.clock.observe((BASE + timedelta(seconds=221)).timestamp())
+        assert janitor.run_once() == 1
+        assert sw.get_stats()['tracked_ips'] == 0
+        assert janitor.get_stats()['scheduled_ips'] == 0
+    
+    def test_expires_idle_sharded_ips(self):
+        sharded = ShardedSlidingWindow(window_size_minutes=10, shards=3, clock='event')
+        janitor = WindowJanitor()
+        janitor.attach(sharded)
+        for i in range(30):
+            sharded.add_log(make_log(0, ip=f'10.3.0.{i}'))
+        
+        sharded.clock.observe((BASE + timedelta(seconds=601)).timestamp())
+        assert janitor.run_once() == 30
+        assert sum(shard.get_stats()['tracked_ips'] for shard in sharded.shards) == 0
+    
+    def test_cleanup_waits_for_busy_lock(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10, clock='event')
+        sw.add_log(make_log(0))
+        sw.clock.observe((BASE + timedelta(seconds=90)).timestamp())
+        
+        held, release = threading.Event(), threading.Event()
+        
+        def hold_lock():
+            with sw.lock:
+                held.set()
+                release.wait(5)
+        
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        held.wait(5)
+        threading.Timer(0.05, release.set).start()
+        janitor = WindowJanitor(cleanup_timeout_seconds=2.0)
+        janitor.attach(sw)
+        janitor.run_once()
+        holder.join()
+        
+        assert len(sw._ip_aggregates['1min']) == 0
+        assert janitor.get_stats()['skipped_cleanups'] == 0
+    
+    def test_cleanup_timeout_is_bounded(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10, clock='event')
+        sw.add_log(make_log(0))
+        held, release = threading.Event(), threading.Event()
+        
+        def hold_lock():
+            with sw.lock:
+                held.set()
+                release.wait(5)
+        
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        held.wait(5)
+        janitor = WindowJanitor(cleanup_timeout_seconds=0.01)
+        janitor.attach(sw)
+        started = time.time()
+        janitor.run_once()
+        elapsed = time.time() - started
+        release.set()
+        holder.join()
+        
+        assert elapsed < 1
+        assert janitor.get_stats()['skipped_cleanups'] == 1
+    
+    def test_attach_sharded_window(self):
+        sharded = ShardedSlidingWindow(window_size_minutes=10, shards=3)
+        janitor = WindowJanitor()
+        janitor.attach(sharded)
+        assert all(shard.janitor is janitor for shard in sharded.shards)
+        
+        janitor.close()
+        assert all(shard.janitor is None for shard in sharded.shards)
+    
+    def test_background_thread(self):
+        sw = TemporalSlidingWindow(window_size_minutes=10)
+        janitor = WindowJanitor(interval_seconds=0.01)
+        janitor.attach(sw)
+        janitor.start()
+        sw.add_log({**make_log(0), 'timestamp': datetime.now()})
+        
+        deadline = time.time() + 2
+        while janitor.last_run is None and time.time() < deadline:
+            time.sleep(0.01)
+        janitor.close()
+        
+        assert janitor.last_run is not None
+        with pytest.raises(ValueError):
+            WindowJanitor(interval_seconds=0)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,262 @@
+"""
+========================================
+UNIT TESTS - WINDOW PERSISTENCE
+PyTest untuk validasi snapshot & WAL Sliding Window
+========================================
+
+Lead Researcher & Developer:
+  MUHAMMAD AKBAR HADI PRATAMA (@el-pablos)
+"""
+
+import pytest
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from temporal_features import ShardedSlidingWindow, TemporalSlidingWindow
+from window_persistence import WindowPersistence
+
+
+def make_logs(n=500, seconds=400):
+    now = datetime.now()
+    return [
+        {
+            'timestamp': now - timedelta(seconds=seconds * (n - i) / n),
+            'ip_address': f'10.0.{i % 3}.{i % 17}',
+            'method': ['GET', 'POST', 'PUT'][i % 3],
+            'url': f'/api/{i % 23}',
+            'status_code': 404 if i % 6 == 0 else 200,
+            'response_time': 10 + i % 50,
+            'user_agent': 'Mozilla/5.0'
+        }
+        for i in range(n)
+    ]
+
+
+def window_state(window, ips):
+    """Ringkasan state window yang harus sama setelah restore."""
+    return {
+        'stats': window.get_stats(),
+        'metrics': window.get_global_metrics('5min'),
+        'per_ip': {
+            ip: (
+                window.calculate_request_count(ip, '1min'),
+                window.calculate_request_count(ip, '5min'),
+                round(window.calculate_avg_response_time(ip, '5min'), 6),
+                round(window.calculate_error_rate(ip, '5min'), 6),
+                window.calculate_unique_urls(ip, '1min'),
+            )
+            for ip in ips
+        },
+    }
+
+
+class TestWindowPersistence:
+    """Test suite untuk WindowPersistence."""
+    
+    @pytest.mark.parametrize('storage', ['object', 'columnar'])
+    def test_restore_from_snapshot_and_wal(self, tmp_path, storage):
+        logs = make_logs()
+        window = TemporalSlidingWindow(window_size_minutes=10, storage=storage)
+        persistence = WindowPersistence(str(tmp_path))
+        persistence.attach(window)
+        
+        for log in logs[:300]:
+            window.add_log(dict(log))
+        assert persistence.snapshot() == 300
+        for log in logs[300:]:
+            window.add_log(dict(log))
+        persistence.close()
+        
+        restored = TemporalSlidingWindow(window_size_minutes=10, storage=storage)
+        assert WindowPersistence(str(tmp_path)).restore(restored) == 500
+        
+        ips = {log['ip_address'] for log in logs}
+        assert window_state(restored, ips) == window_state(window, ips)
+    
+    def test_segments_covered_by_snapshot_are_removed(self, tmp_path):
+        window = TemporalSlidingWindow(window_size_minutes=10)
+        persistence = WindowPersistence(str(tmp_path))
+        persistence.attach(window)
+        for log in make_logs(50):
+            window.add_log(dict(log))
+        persistence.snapshot()
+        persistence.snapshot()
+        persistence.close()
+        
+        assert persistence._existing_segments() == [2]
+    
+    def test_stale_segment_is_not_replayed_twice(self, tmp_path):
+        """Crash setelah snapshot ditulis tapi sebelum segmen lama dihapus."""
+        window = TemporalSlidingWindow(window_size_minutes=10)
+        persistence = WindowPersistence(str(tmp_path))
+        persistence.attach(window)
+        for log in make_logs(50):
+            window.add_log(dict(log))
+        
+        persistence.flush()
+        stale = open(persistence._segment_path(0)).read()
+        assert stale.count('\n') == 50
+        persistence.snapshot()
+        persistence.close()
+        with open(persistence._segment_path(0), 'w') as f:
+            f.write(stale)
+        
+        restored = TemporalSlidingWindow(window_size_minutes=10)
+        assert WindowPersistence(str(tmp_path)).restore(restored) == 50
+    
+    def test_wal_is_written_outside_add_log(self, tmp_path):
+        """Mode buffer: add_log hanya mengisi buffer; write ke file terjadi saat flush."""
+        window = TemporalSlidingWindow(window_size_minutes=10)
+        persistence = WindowPersistence(str(tmp_path), flush_interval_seconds=1.0)
+        persistence.attach(window)
+        for log in make_logs(30):
+            window.add_log(dict(log))
+        
+        segment = persistence._segment_path(0)
+        assert os.path.getsize(segment) == 0
+        assert persistence.flush() == 30
+        assert open(segment).read().count('\n') == 30
+        assert persistence.flush() == 0
+        persistence.close()
+    
+    def test_background_thread_flushes_wal(self, tmp_path):
+        import time
+        
+        window = TemporalSlidingWindow(window_size_minutes=10)
+        persistence = WindowPersistence(str(tmp_path), flush_interval_seconds=0.01)
+        persistence.attach(window)
+        persistence.start()
+        for log in make_logs(20):
+            window.add_log(dict(log))
+        
+        deadline = time.time() + 5
+        while os.path.getsize(persistence._segment_path(0)) == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        persistence.close()
+        assert open(persistence._segment_path(0)).read().count('\n') == 20
+    
+    def test_default_writes_every_log(self, tmp_path):
+        """Default: setiap log sudah ada di WAL saat add_log kembali."""
+        window = TemporalSlidingWindow(window_size_minutes=10)
+        persistence = WindowPersistence(str(tmp_path))
+        persistence.attach(window)
+        for log in make_logs(5):
+            window.add_log(dict(log))
+        assert open(persistence._segment_path(0)).read().count('\n') == 5
+        persistence.close()
+    
+    def test_torn_wal_line_is_ignored(self, tmp_path):
+        window = TemporalSlidingWindow(window_size_minutes=10)
+        persistence = WindowPersistence(str(tmp_path))
+        persistence.attach(window)
+        for log in make_logs(20):
+            window.add_log(dict(log))
+        persistence.close()
+        
+        with open(persistence._segment_path(0), 'a') as f:
+            f.write('[1700000000.0,"10.0.0.1","GE')
+        
+        restored = TemporalSlidingWindow(window_size_minutes=10)
+        assert WindowPersistence(str(tmp_path)).restore(restored) == 20
+    
+    def test_restore_sharded_window(self, tmp_path):
+        logs = make_logs()
+        window = ShardedSlidingWindow(window_size_minutes=10, shards=4)
+        persistence = WindowPersistence(str(tmp_path))
+        persistence.attach(window)
+        for log in logs:
+            window.add_log(dict(log))
+        persistence.snapshot()
+        persistence.close()
+        
+        restored = ShardedSlidingWindow(window_size_minutes=10, shards=4)
+        WindowPersistence(str(tmp_path)).restore(restored)
+        
+        ips = {log['ip_address'] for log in logs}
+        assert window_state(restored, ips) == window_state(window, ips)
+    
+    @pytest.mark.parametrize('storage', ['object', 'compact', 'columnar'])
+    def test_null_status_code_is_persisted(self, tmp_path, storage):
+        window = TemporalSlidingWindow(window_size_minutes=10, storage=storage)
+        persistence = WindowPersistence(str(tmp_path))
+        persistence.attach(window)
+        window.add_log({'ip_address': '10.0.0.1', 'method': 'GET', 'url': '/', 'status_code': None})
+        assert persistence.snapshot() == 1
+        persistence.close()
+        
+        restored = TemporalSlidingWindow(window_size_minutes=10)
+        WindowPersistence(str(tmp_path)).restore(restored)
+        assert restored.export_records()[0][4] == 200
+    
+    def test_failed_insert_is_not_logged(self, tmp_path, monkeypatch):
+        """Log yang gagal masuk buffer tidak ditulis ke WAL maupun history."""
+        window = TemporalSlidingWindow(window_size_minutes=10)
+        persistence = WindowPersistence(str(tmp_path))
+        persistence.attach(window)
+        recorded = []
+        
+        class History:
+            def record(self, *args):
+                recorded.append(args)
+        
+        window.history = History()
+        
+        def broken_insert(event):
+            raise RuntimeError('insert failed')
+        
+        monkeypatch.setattr(window.log_buffer, 'insert', broken_insert)
+        with pytest.raises(RuntimeError):
+            window.add_log(dict(make_logs(1)[0]))
+        persistence.close()
+        
+        assert os.path.getsize(persistence._segment_path(0)) == 0
+        assert recorded == []
+    
+    def test_repeated_snapshot_failures_are_reported(self, tmp_path, monkeypatch):
+        import time
+        
+        window = TemporalSlidingWindow(window_size_minutes=10)
+        persistence = WindowPersistence(str(tmp_path), snapshot_interval_seconds=0.01)
+        persistence.attach(window)
+        
+        def broken_snapshot():
+            raise OSError('disk full')
+        
+        monkeypatch.setattr(persistence, 'snapshot', broken_snapshot)
+        persistence.start()
+        deadline = time.time() + 5
+        while persistence.consecutive_failures < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        persistence.close()
+        
+        stats = persistence.get_stats()
+        assert stats['consecutive_failures'] >= 2
+        assert stats['last_error'] == 'OSError: disk full'
+        assert stats['wal_segments'] == 1
+    
+    def test_decayed_window_is_rejected(self, tmp_path):
+        from temporal_features import DecayedSlidingWindow
+        
+        window = DecayedSlidingWindow(window_size_minutes=10)
+        assert not WindowPersistence.supports(window)
+        assert WindowPersistence.supports(ShardedSlidingWindow(shards=2))
+        with pytest.raises(ValueError):
+            WindowPersistence(str(tmp_path)).restore(window)
+        with pytest.raises(ValueError):
+            WindowPersistence(str(tmp_path)).attach(window)
+    
+    def test_snapshot_requires_attached_window(self, tmp_path):
+        with pytest.raises(RuntimeError):
+            WindowPersistence(str(tmp_path)).snapshot()
+        with pytest.raises(ValueError):
+            WindowPersistence(str(tmp_path), snapshot_interval_seconds=0)
+        with pytest.raises(ValueError):
+            WindowPersistence(str(tmp_path), flush_interval_seconds=-1)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
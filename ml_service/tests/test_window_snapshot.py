@@ -0,0 +1,120 @@
+"""
+========================================
+UNIT TESTS - WINDOW SNAPSHOT
+PyTest untuk validasi snapshot read-only (RCU) sliding window
+========================================
+
+Lead Researcher & Developer:
+  MUHAMMAD AKBAR HADI PRATAMA (@el-pablos)
+"""
+
+import pytest
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from temporal_features import ShardedSlidingWindow, TemporalSlidingWindow
+from window_snapshot import SnapshotPublisher
+
+
+def make_log(ip='10.0.0.1', status=200):
+    return {
+        'timestamp': datetime.now(),
+        'ip_address': ip,
+        'method': 'GET',
+        'url': '/api',
+        'status_code': status,
+        'response_time': 10
+    }
+
+
+@pytest.fixture
+def window():
+    sw = TemporalSlidingWindow(window_size_minutes=10)
+    for i in range(10):
+        sw.add_log(make_log(ip=f'10.0.0.{i % 3}', status=500 if i < 2 else 200))
+    return sw
+
+
+class TestSnapshotPublisher:
+    """Test suite untuk SnapshotPublisher."""
+    
+    def test_publish_and_read(self, window):
+        publisher = SnapshotPublisher(window)
+        snapshot = publisher.read()
+        
+        assert snapshot.version == 1
+        assert snapshot.stats['logs_1min'] == 10
+        assert snapshot.metrics['1min']['requests'] == 10
+        assert snapshot.metrics['5min']['errors'] == 2
+        assert 0 <= snapshot.age < 1
+        
+        # Pembaca tetap melihat snapshot lama sampai snapshot baru terbit
+        window.add_log(make_log())
+        assert publisher.read() is snapshot
+        assert publisher.publish().stats['logs_1min'] == 11
+        assert publisher.read().version == 2
+    
+    def test_snapshot_is_immutable(self, window):
+        snapshot = SnapshotPublisher(window).publish()
+        with pytest.raises(AttributeError):
+            snapshot.stats = {}
+        with pytest.raises(TypeError):
+            snapshot.stats['logs_1min'] = 0
+        with pytest.raises(TypeError):
+            snapshot.metrics['1min']['requests'] = 0
+        
+        as_dict = snapshot.to_dict()
+        as_dict['stats']['logs_1min'] = 0
+        assert snapshot.stats['logs_1min'] == 10
+        assert as_dict['metrics']['1min']['requests'] == 10
+    
+    def test_read_does_not_wait_for_window_lock(self, window):
+        publisher = SnapshotPublisher(window)
+        publisher.publish()
+        
+        # Writer memegang lock window; pembaca tidak ikut menunggu
+        acquired, release = threading.Event(), threading.Event()
+        
+        def writer():
+            with window.lock:
+                acquired.set()
+                release.wait(2)
+        
+        thread = threading.Thread(target=writer)
+        thread.start()
+        acquired.wait(2)
+        started = time.perf_counter()
+        snapshot = publisher.read()
+        elapsed = time.perf_counter() - started
+        release.set()
+        thread.join()
+        
+        assert snapshot.stats['logs_1min'] == 10
+        assert elapsed < 0.1
+    
+    def test_background_thread_and_sharded_window(self):
+        sharded = ShardedSlidingWindow(window_size_minutes=10, shards=3)
+        for i in range(12):
+            sharded.add_log(make_log(ip=f'10.0.1.{i}'))
+        publisher = SnapshotPublisher(sharded, interval_seconds=0.01)
+        publisher.start()
+        
+        deadline = time.time() + 2
+        while (publisher._snapshot is None or publisher._snapshot.version < 3) and time.time() < deadline:
+            time.sleep(0.01)
+        publisher.close()
+        
+        assert publisher.read().version >= 3
+        assert publisher.read().stats['logs_1min'] == 12
+        with pytest.raises(ValueError):
+            SnapshotPublisher(sharded, interval_seconds=0)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,152 @@
+"""
+========================================
+URL TEMPLATES MODULE
+Normalisasi Path URL menjadi Route Template
+========================================
+
+Path seperti /api/users/12345 atau /api/flood/{i} (burst attack) membuat
+jumlah URL unik meledak. Modul ini menyatukan segmen yang berupa id
+numerik, UUID, hash heksadesimal dan token panjang menjadi placeholder,
+serta menghapus nilai query string:
+
+    /api/users/12345?page=2&sort=asc  ->  /api/users/{id}?page={}&sort={}
+    /files/9f86d081884c7d659a2feaa0c55ad015  ->  /files/{hash}
+
+Hasil normalisasi disimpan di cache LRU berdasarkan path mentah, sehingga
+path yang sering muncul tidak perlu diproses ulang dan memori cache tetap
+terbatas walaupun penyerang melakukan enumerasi path.
+
+========================================
+Lead Researcher & Developer (Journal-Grade Overhaul):
+  MUHAMMAD AKBAR HADI PRATAMA
+  GitHub: @el-pablos
+  Email: yeteprem.end23juni@gmail.com
+
+Original Contributors / Legacy Team:
+  - Jeremy Christo Emmanuelle Panjaitan (237006516084)
+  - Farrel Alfaridzi (237006516028)
+  - Chosmas Laurens Rumngewur (217006516074)
+========================================
+"""
+
+import re
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+
+# Urutan pengecekan penting: UUID dan hash juga bisa berupa token
+_SEGMENT_PATTERNS = (
+    (re.compile(r'\d+'), '{id}'),
+    (re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'), '{uuid}'),
+    (re.compile(r'[0-9a-fA-F]{16,}'), '{hash}'),
+    (re.compile(r'(?=[A-Za-z_-]*\d)[A-Za-z0-9_-]{20,}'), '{token}'),
+)
+
+
+def normalize_segment(segment: str) -> str:
+    """
+    Mengganti satu segmen path dengan placeholder jika berupa id.
+    
+    Args:
+        segment: Segmen path (tanpa '/')
+    
+    Returns:
+        Placeholder ('{id}', '{uuid}', '{hash}', '{token}') atau segmen asli
+    """
+    for pattern, placeholder in _SEGMENT_PATTERNS:
+        if pattern.fullmatch(segment):
+            return placeholder
+    return segment
+
+
+def url_to_template(url: str) -> str:
+    """
+    Mengkonversi URL mentah menjadi route template (tanpa cache).
+    
+    Args:
+        url: Path URL, boleh dengan query string dan fragment
+    
+    Returns:
+        Route template
+    """
+    path, _, query = url.partition('#')[0].partition('?')
+    template = '/'.join(normalize_segment(segment) for segment in path.split('/'))
+    if query:
+        keys = (parameter.partition('=')[0] for parameter in query.split('&') if parameter)
+        template += '?' + '&'.join(f'{key}={{}}' for key in keys)
+    return template
+
+
+class UrlTemplateNormalizer:
+    """
+    Normalizer URL -> route template dengan cache LRU berdasarkan path mentah.
+    
+    Aman dipakai bersama oleh beberapa shard / thread. Template di-intern
+    sehingga ribuan path mentah dengan route yang sama berbagi satu string.
+    """
+    
+    DEFAULT_CACHE_SIZE = 4096
+    
+    # URL lebih panjang dari ini dinormalisasi tanpa masuk cache
+    MAX_CACHED_URL_LENGTH = 512
+    
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Inisialisasi normalizer.
+        
+        Args:
+            cache_size: Jumlah path mentah maksimal di cache LRU
+        """
+        if cache_size < 1:
+            raise ValueError("cache_size must be >= 1")
+        
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def normalize(self, url: str) -> str:
+        """
+        Route template untuk URL (dari cache jika ada).
+        
+        Args:
+            url: Path URL mentah
+        
+        Returns:
+            Route template
+        """
+        with self._lock:
+            template = self._cache.get(url)
+            if template is not None:
+                self._cache.move_to_end(url)
+                self.hits += 1
+                return template
+            self.misses += 1
+        
+        template = sys.intern(url_to_template(url))
+        if len(url) <= self.MAX_CACHED_URL_LENGTH:
+            with self._lock:
+                self._cache[url] = template
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return template
+    
+    def clear(self) -> None:
+        """Mengosongkan cache."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def get_stats(self) -> Dict:
+        """Statistik cache untuk monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'cached_urls': len(self._cache),
+                'cache_size': self.cache_size,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,206 @@
+"""
+========================================
+VERDICT CACHE MODULE
+Cache Verdict TTL untuk IP Penyerang Berulang
+========================================
+
+Saat banjir request (DDoS) dari IP yang sama, /predict/ensemble menjalankan
+preprocessing, ekstraksi fitur temporal dan tiga model untuk setiap
+request, padahal IP tersebut sudah berkali-kali dinilai CRITICAL. Cache
+ini mencatat "strike" verdict berat (HIGH/CRITICAL) per IP (opsional per
+IP + route template). Setelah jumlah strike mencapai threshold dalam TTL,
+verdict terakhir disimpan dan request berikutnya dari IP tersebut langsung
+mendapat verdict cache sampai TTL habis. Setelah itu IP dievaluasi penuh
+lagi, sehingga IP yang berhenti menyerang tidak terkunci selamanya.
+
+Ukuran cache dibatasi (LRU) agar banjir IP palsu tidak menghabiskan memori.
+
+========================================
+Lead Researcher & Developer (Journal-Grade Overhaul):
+  MUHAMMAD AKBAR HADI PRATAMA
+  GitHub: @el-pablos
+  Email: yeteprem.end23juni@gmail.com
+
+Original Contributors / Legacy Team:
+  - Jeremy Christo Emmanuelle Panjaitan (237006516084)
+  - Farrel Alfaridzi (237006516028)
+  - Chosmas Laurens Rumngewur (217006516074)
+========================================
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Sequence
+
+
+class _VerdictEntry:
+    """Strike dan verdict cache untuk satu key."""
+    
+    __slots__ = ('strikes', 'last_strike', 'verdict', 'expires_at', 'hits')
+    
+    def __init__(self):
+        self.strikes = 0
+        self.last_strike = float('-inf')
+        self.verdict: Optional[Dict] = None
+        self.expires_at = float('-inf')
+        self.hits = 0
+
+
+class VerdictCache:
+    """
+    Cache verdict ensemble per IP dengan TTL dan threshold strike.
+    
+    Pemakaian:
+        cached = cache.lookup(ip, url)
+        if cached is None:
+            verdict = ...evaluasi penuh...
+            cache.record(ip, url, verdict['threat_level'], verdict)
+    """
+    
+    DEFAULT_LEVELS = ('high', 'critical')
+    
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        threshold: int = 5,
+        levels: Sequence[str] = DEFAULT_LEVELS,
+        max_entries: int = 100000,
+        url_normalizer=None
+    ):
+        """
+        Inisialisasi verdict cache.
+        
+        Args:
+            ttl_seconds: Lama verdict disajikan dari cache, sekaligus jarak
+                maksimal antar strike agar tetap dihitung berurutan
+            threshold: Jumlah verdict berat sebelum verdict di-cache
+            levels: Threat level yang dihitung sebagai strike
+            max_entries: Jumlah key maksimal (LRU)
+            url_normalizer: UrlTemplateNormalizer; jika diisi, key cache
+                adalah (IP, route template) bukan IP saja
+        """
+        if ttl_seconds <= 0 or threshold < 1 or max_entries < 1:
+            raise ValueError("ttl_seconds must be > 0, threshold >= 1 and max_entries >= 1")
+        
+        self.ttl = ttl_seconds
+        self.threshold = threshold
+        self.levels = frozenset(levels)
+        self.max_entries = max_entries
+        self.url_normalizer = url_normalizer
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def _key(self, ip_address: str, url: Optional[str]) -> Hashable:
+        if self.url_normalizer is None:
+            return ip_address
+        return ip_address, self.url_normalizer.normalize(url or '')
+    
+    def lookup(self, ip_address: str, url: Optional[str] = None, now: Optional[float] = None) -> Optional[Dict]:
+        """
+        Verdict cache untuk IP (dan URL) jika masih berlaku.
+        
+        Args:
+            ip_address: IP address sumber
+            url: URL request (dipakai jika cache per route)
+            now: Waktu sekarang (default: time.time())
+        
+        Returns:
+            Dictionary verdict (jangan diubah) atau None jika harus
+            dievaluasi penuh
+        """
+        key = self._key(ip_address, url)
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.verdict is None or now >= entry.expires_at:
+                self.misses += 1
+                return None
+            entry.hits += 1
+            # IP masih menyerang: strike tetap hidup sehingga setelah TTL habis
+            # satu evaluasi penuh yang berat langsung meng-cache ulang verdict
+            entry.last_strike = now
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry.verdict
+    
+    def record(self, ip_address: str, url: Optional[str], threat_level: str, verdict: Dict,
+               now: Optional[float] = None) -> bool:
+        """
+        Mencatat hasil evaluasi penuh.
+        
+        Args:
+            ip_address: IP address sumber
+            url: URL request
+            threat_level: Threat level hasil ensemble
+            verdict: Data verdict yang akan disajikan saat cache hit
+            now: Waktu sekarang (default: time.time())
+        
+        Returns:
+            True jika verdict sekarang disajikan dari cache
+        """
+        key = self._key(ip_address, url)
+        now = time.time() if now is None else now
+        with self._lock:
+            if threat_level not in self.levels:
+                # Verdict ringan menghapus strike: IP harus mengumpulkan ulang
+                self._entries.pop(key, None)
+                return False
+            
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _VerdictEntry()
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            
+            if now - entry.last_strike > self.ttl:
+                entry.strikes = 0
+            entry.strikes += 1
+            entry.last_strike = now
+            if entry.strikes < self.threshold:
+                return False
+            entry.verdict = verdict
+            entry.expires_at = now + self.ttl
+            return True
+    
+    def invalidate(self, ip_address: str) -> int:
+        """
+        Menghapus semua entry milik IP (misal setelah IP di-whitelist).
+        
+        Returns:
+            Jumlah entry yang dihapus
+        """
+        with self._lock:
+            if self.url_normalizer is None:
+                return 1 if self._entries.pop(ip_address, None) is not None else 0
+            keys = [key for key in self._entries if key[0] == ip_address]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+    
+    def clear(self) -> None:
+        """Mengosongkan cache (misal setelah model dilatih ulang)."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def get_stats(self, now: Optional[float] = None) -> Dict:
+        """Statistik cache untuk monitoring."""
+        now = time.time() if now is None else now
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'cached_verdicts': sum(
+                    1 for entry in self._entries.values()
+                    if entry.verdict is not None and now < entry.expires_at
+                ),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,326 @@
+"""
+========================================
+WINDOW JANITOR MODULE
+Eviction Latar Belakang untuk Sliding Window
+========================================
+
+Tanpa janitor, log kedaluwarsa dibuang di dalam add_log sehingga request
+pertama setelah periode sepi menanggung seluruh biaya eviction. Janitor
+menjalankan eviction di thread latar belakang setiap detik, sehingga jalur
+request hampir selalu mengambil fast path (tidak ada yang kedaluwarsa).
+
+State per-IP yang idle dijadwalkan di hierarchical timing wheel: setiap IP
+baru didaftarkan sekali dengan deadline idle, dan saat deadline lewat
+window memeriksa aktivitas terakhir IP tersebut. IP yang masih aktif
+dijadwalkan ulang (lazy), IP yang idle dibuang sehingga memori dari IP
+botnet berumur pendek kembali.
+
+Pada TemporalSlidingWindow/ShardedSlidingWindow, agregat per-IP sudah
+dihapus ketika head window melewati log terakhir IP tersebut; janitor
+memastikan hal itu terjadi tepat waktu, dan IP yang idle lebih lama dari
+`idle_seconds` tetapi lognya masih di window dipindahkan ke sketch heavy
+hitter. Pada DecayedSlidingWindow (tanpa buffer log), timing wheel
+menentukan kapan baris IP dibuang.
+
+Jika lock shard sedang dipakai request, cleanup menunggu paling lama
+`cleanup_timeout_seconds` alih-alih dilewati begitu saja.
+
+========================================
+Lead Researcher & Developer (Journal-Grade Overhaul):
+  MUHAMMAD AKBAR HADI PRATAMA
+  GitHub: @el-pablos
+  Email: yeteprem.end23juni@gmail.com
+
+Original Contributors / Legacy Team:
+  - Jeremy Christo Emmanuelle Panjaitan (237006516084)
+  - Farrel Alfaridzi (237006516028)
+  - Chosmas Laurens Rumngewur (217006516074)
+========================================
+"""
+
+import threading
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class HierarchicalTimingWheel:
+    """
+    Hierarchical timing wheel untuk deadline dalam jumlah besar.
+    
+    Level 0 punya `slots` bucket selebar satu tick; level berikutnya setiap
+    bucket-nya selebar satu putaran level di bawahnya. Schedule dan expire
+    O(1) per entry (ditambah cascade sekali per level), tidak bergantung pada
+    jumlah deadline yang terdaftar.
+    """
+    
+    def __init__(self, tick_seconds: float = 1.0, slots: int = 64, levels: int = 4, start: float = 0.0):
+        """
+        Inisialisasi timing wheel.
+        
+        Args:
+            tick_seconds: Resolusi tick (detik)
+            slots: Jumlah bucket per level
+            levels: Jumlah level (horizon = tick * slots^levels)
+            start: Waktu awal (epoch detik)
+        """
+        if tick_seconds <= 0 or slots < 2 or levels < 1:
+            raise ValueError("tick_seconds must be > 0, slots >= 2 and levels >= 1")
+        
+        self.tick = tick_seconds
+        self.slots = slots
+        self.levels = levels
+        self._current = int(start // tick_seconds)
+        self._buckets: List[List[List[Tuple[int, Hashable]]]] = [
+            [[] for _ in range(slots)] for _ in range(levels)
+        ]
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def _place(self, deadline_tick: int, key: Hashable) -> None:
+        delta = max(deadline_tick - self._current, 1)
+        level = 0
+        while level < self.levels - 1 and delta >= self.slots ** (level + 1):
+            level += 1
+        # Deadline di luar horizon ditaruh di bucket terjauh lalu di-cascade ulang
+        span = self.slots ** level
+        target = min(deadline_tick, self._current + span * (self.slots - 1))
+        self._buckets[level][(target // span) % self.slots].append((deadline_tick, key))
+    
+    def schedule(self, key: Hashable, deadline: float, now: Optional[float] = None) -> None:
+        """
+        Mendaftarkan key dengan deadline (epoch detik).
+        
+        Args:
+            key: Key yang akan dikembalikan advance() setelah deadline
+            deadline: Waktu kedaluwarsa
+            now: Waktu sekarang; jika wheel kosong, wheel langsung maju ke sini
+        """
+        if not self._size and now is not None:
+            self._current = max(self._current, int(now // self.tick))
+        self._place(int(deadline // self.tick), key)
+        self._size += 1
+    
+    def advance(self, now: float) -> List[Hashable]:
+        """
+        Memajukan wheel sampai `now`.
+        
+        Returns:
+            Key yang deadline-nya sudah lewat
+        """
+        due = []
+        target = int(now // self.tick)
+        while self._current < target:
+            if not self._size:
+                # Tidak ada deadline: lompat langsung tanpa memutar bucket kosong
+                self._current = target
+                break
+            self._current += 1
+            # Cascade dari level atas saat level di bawahnya menyelesaikan satu putaran
+            for level in range(self.levels - 1, 0, -1):
+                span = self.slots ** level
+                if self._current % span == 0:
+                    bucket = self._buckets[level][(self._current // span) % self.slots]
+                    entries, bucket[:] = list(bucket), []
+                    for deadline_tick, key in entries:
+                        if deadline_tick <= self._current:
+                            due.append(key)
+                            self._size -= 1
+                        else:
+                            self._place(deadline_tick, key)
+            
+            bucket = self._buckets[0][self._current % self.slots]
+            if bucket:
+                entries, bucket[:] = list(bucket), []
+                for deadline_tick, key in entries:
+                    if deadline_tick <= self._current:
+                        due.append(key)
+                        self._size -= 1
+                    else:
+                        self._place(deadline_tick, key)
+        return due
+    
+    def clear(self) -> None:
+        """Menghapus semua deadline."""
+        for level in self._buckets:
+            for bucket in level:
+                bucket.clear()
+        self._size = 0
+
+
+class WindowJanitor:
+    """
+    Thread latar belakang yang menjalankan eviction sliding window dan
+    membuang state IP yang idle.
+    
+    Pemakaian:
+        janitor = WindowJanitor()
+        janitor.attach(sliding_window)
+        janitor.start()
+    """
+    
+    def __init__(
+        self,
+        interval_seconds: float = 1.0,
+        idle_seconds: Optional[float] = None,
+        cleanup_timeout_seconds: Optional[float] = None
+    ):
+        """
+        Inisialisasi janitor.
+        
+        Args:
+            interval_seconds: Interval antar putaran janitor
+            idle_seconds: Lama tanpa aktivitas sebelum state IP dibuang
+                (default: window terpanjang milik window yang dipasang)
+            cleanup_timeout_seconds: Batas waktu menunggu lock shard untuk
+                cleanup (default: seperempat interval)
+        """
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be > 0")
+        if idle_seconds is not None and idle_seconds <= 0:
+            raise ValueError("idle_seconds must be > 0")
+        if cleanup_timeout_seconds is not None and cleanup_timeout_seconds < 0:
+            raise ValueError("cleanup_timeout_seconds must be >= 0")
+        
+        self.interval = interval_seconds
+        self.idle_seconds = idle_seconds
+        self.cleanup_timeout = interval_seconds / 4 if cleanup_timeout_seconds is None else cleanup_timeout_seconds
+        self.window = None
+        self._shards: List = []
+        self._lock = threading.Lock()
+        self._wheel = HierarchicalTimingWheel(tick_seconds=interval_seconds)
+        # (id shard, ip) yang sedang terjadwal, agar satu IP hanya punya satu entry
+        self._scheduled: Dict[Tuple[int, Optional[str]], object] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.evicted_ips = 0
+        # Cleanup yang tetap dilewati karena lock shard sibuk melewati batas waktu
+        self.skipped_cleanups = 0
+        self.last_run: Optional[float] = None
+    
+    @staticmethod
+    def supports(window) -> bool:
+        """
+        True jika window punya clock dan state yang bisa dibersihkan janitor.
+        SharedSlidingWindow tidak: bucket-nya kedaluwarsa secara lazy.
+        """
+        return hasattr(window, 'clock') and all(
+            hasattr(shard, 'lock') for shard in getattr(window, 'shards', [window])
+        )
+    
+    def attach(self, window) -> None:
+        """
+        Menghubungkan janitor ke window (semua shard jika sharded).
+        
+        Raises:
+            ValueError: Jika window tidak didukung (lihat supports())
+        """
+        if not self.supports(window):
+            raise ValueError(
+                f"WindowJanitor does not support storage={getattr(window, 'storage', type(window).__name__)!r}"
+            )
+        self.window = window
+        self._shards = list(getattr(window, 'shards', [window]))
+        for shard in self._shards:
+            shard.janitor = self
+    
+    def _idle_seconds_for(self, shard) -> float:
+        if self.idle_seconds is not None:
+            return self.idle_seconds
+        return shard.window_size.total_seconds()
+    
+    def schedule_idle(self, shard, ip_address: Optional[str], last_seen: float) -> None:
+        """
+        Mendaftarkan IP baru milik shard ke timing wheel (dipanggil window
+        saat IP pertama kali mendapat state). Tidak melakukan apa-apa jika
+        IP tersebut sudah terjadwal.
+        """
+        key = (id(shard), ip_address)
+        with self._lock:
+            if key in self._scheduled:
+                return
+            self._scheduled[key] = shard
+            self._wheel.schedule(key, last_seen + self._idle_seconds_for(shard), now=last_seen)
+    
+    def run_once(self, now: Optional[float] = None) -> int:
+        """
+        Satu putaran janitor: eviction log kedaluwarsa di setiap shard lalu
+        membuang IP yang deadline idle-nya lewat.
+        
+        Args:
+            now: Waktu sekarang untuk timing wheel (default: clock window)
+        
+        Returns:
+            Jumlah IP idle yang dibuang
+        """
+        for shard in self._shards:
+            cleanup = getattr(shard, '_try_cleanup_expired_logs', None)
+            if cleanup is None:
+                continue
+            # Coba tanpa menunggu dulu; jika lock sibuk, tunggu dengan batas waktu
+            if not cleanup() and not cleanup(timeout=self.cleanup_timeout):
+                self.skipped_cleanups += 1
+        
+        if now is None:
+            now = self.window.clock.now() if self.window is not None else time.time()
+        with self._lock:
+            due = self._wheel.advance(now)
+            per_shard: Dict[int, List[Optional[str]]] = {}
+            for key in due:
+                per_shard.setdefault(key[0], []).append(key[1])
+            shards = {key[0]: self._scheduled[key] for key in due}
+        
+        evicted = 0
+        for shard_id, ips in per_shard.items():
+            shard = shards[shard_id]
+            pending = shard.expire_idle_ips(ips, self._idle_seconds_for(shard))
+            with self._lock:
+                for ip_address in ips:
+                    key = (shard_id, ip_address)
+                    if ip_address in pending:
+                        self._wheel.schedule(key, pending[ip_address])
+                    else:
+                        self._scheduled.pop(key, None)
+                        evicted += 1
+        
+        self.evicted_ips += evicted
+        self.last_run = now
+        return evicted
+    
+    def start(self) -> None:
+        """Menjalankan thread janitor (daemon)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='window-janitor', daemon=True)
+        self._thread.start()
+    
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"[WARNING] Sliding window janitor failed: {e}")
+    
+    def close(self) -> None:
+        """Menghentikan thread janitor dan melepas window."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for shard in self._shards:
+            shard.janitor = None
+        with self._lock:
+            self._wheel.clear()
+            self._scheduled.clear()
+    
+    def get_stats(self) -> Dict:
+        """Statistik janitor untuk monitoring."""
+        with self._lock:
+            return {
+                'scheduled_ips': len(self._scheduled),
+                'evicted_ips': self.evicted_ips,
+                'skipped_cleanups': self.skipped_cleanups,
+                'last_run': self.last_run,
+            }
@@ -0,0 +1,378 @@
+"""
+========================================
+WINDOW PERSISTENCE MODULE
+Snapshot & Write-Ahead Log untuk Sliding Window
+========================================
+
+Modul ini menjaga state Temporal Sliding Window tetap ada ketika service
+di-restart (misal oleh pm2), sehingga fitur rate per-IP tidak kosong
+selama 10 menit pertama setelah boot.
+
+- Snapshot: isi buffer ditulis berkala sebagai record ringkas (JSON),
+  ditulis ke file sementara lalu di-rename secara atomik.
+- Write-ahead log (WAL): setiap log yang masuk di-append ke segmen WAL
+  aktif. Saat snapshot diambil, WAL berpindah ke segmen baru dan segmen
+  lama dihapus setelah snapshot tersimpan.
+- Secara default setiap log ditulis (dan di-flush) ke WAL di dalam
+  add_log, sehingga log yang sudah diterima tidak hilang saat proses crash.
+- Mode buffer (opt-in, flush_interval_seconds > 0): add_log hanya menaruh
+  record di buffer memori; serialisasi JSON dan write ke file dilakukan
+  thread latar belakang setiap flush_interval_seconds, di luar lock window.
+
+Saat boot, snapshot dimuat lalu segmen WAL setelahnya diputar ulang lewat
+bulk_load, tanpa menghitung fitur per log.
+
+Durabilitas: tanpa fsync, log yang sudah di-flush tetap aman saat proses
+crash tetapi bisa hilang saat mati listrik. Pada mode buffer, log yang
+belum di-flush (maksimal flush_interval_seconds terakhir) juga hilang jika
+proses crash; sebagai gantinya I/O tidak lagi dibayar di dalam lock window.
+
+Catatan: satu direktori state untuk satu proses. Jika memakai beberapa
+worker gunicorn, berikan direktori berbeda untuk setiap worker.
+
+========================================
+Lead Researcher & Developer (Journal-Grade Overhaul):
+  MUHAMMAD AKBAR HADI PRATAMA
+  GitHub: @el-pablos
+  Email: yeteprem.end23juni@gmail.com
+
+Original Contributors / Legacy Team:
+  - Jeremy Christo Emmanuelle Panjaitan (237006516084)
+  - Farrel Alfaridzi (237006516028)
+  - Chosmas Laurens Rumngewur (217006516074)
+========================================
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import ExitStack
+from typing import Dict, List, Optional, Tuple
+
+from temporal_features import LOG_RECORD_FIELDS
+
+
+class WindowPersistence:
+    """
+    Snapshot berkala + write-ahead log untuk TemporalSlidingWindow atau
+    ShardedSlidingWindow.
+    
+    Urutan pemakaian saat boot:
+        persistence = WindowPersistence('/var/lib/log-sentinel')
+        persistence.restore(window)
+        persistence.attach(window)
+        persistence.start()
+    """
+    
+    SNAPSHOT_FILE = 'sliding_window.snapshot.json'
+    WAL_PREFIX = 'sliding_window.wal.'
+    FORMAT_VERSION = 1
+    
+    def __init__(
+        self,
+        directory: str,
+        snapshot_interval_seconds: float = 60.0,
+        fsync: bool = False,
+        flush_interval_seconds: float = 0.0
+    ):
+        """
+        Inisialisasi persistence.
+        
+        Args:
+            directory: Direktori untuk snapshot dan segmen WAL
+            snapshot_interval_seconds: Interval snapshot otomatis (start())
+            fsync: fsync setiap flush WAL (tahan mati listrik, lebih lambat).
+                Tanpa fsync, data yang sudah di-flush tetap aman jika hanya
+                proses yang crash.
+            flush_interval_seconds: 0 (default) = setiap log langsung ditulis
+                di add_log. > 0 = mode buffer: WAL di-flush oleh thread latar
+                belakang dengan interval ini; log dalam interval terakhir
+                hilang jika proses crash.
+        """
+        if snapshot_interval_seconds <= 0:
+            raise ValueError("snapshot_interval_seconds must be > 0")
+        if flush_interval_seconds < 0:
+            raise ValueError("flush_interval_seconds must be >= 0")
+        
+        self.directory = directory
+        self.snapshot_interval = snapshot_interval_seconds
+        self.flush_interval = flush_interval_seconds
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        
+        self.window = None
+        # _lock: buffer dan segmen aktif (singkat, dipegang di dalam lock window)
+        # _io_lock: urutan write ke file (di luar lock window pada mode buffer)
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._pending: List[List] = []
+        self._segment = 0
+        self._wal_file = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_snapshot: Optional[float] = None
+        # Kegagalan flush/snapshot berturut-turut (0 setelah snapshot berhasil)
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+    
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, self.SNAPSHOT_FILE)
+    
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f'{self.WAL_PREFIX}{segment:08d}')
+    
+    def _existing_segments(self) -> List[int]:
+        segments = []
+        for name in os.listdir(self.directory):
+            if name.startswith(self.WAL_PREFIX) and name[len(self.WAL_PREFIX):].isdigit():
+                segments.append(int(name[len(self.WAL_PREFIX):]))
+        return sorted(segments)
+    
+    @staticmethod
+    def _shards(window) -> List:
+        return getattr(window, 'shards', [window])
+    
+    @classmethod
+    def supports(cls, window) -> bool:
+        """
+        True jika window bisa di-snapshot (TemporalSlidingWindow atau
+        ShardedSlidingWindow). Mode 'decayed' dan 'shared' tidak menyimpan
+        record log sehingga tidak bisa di-persist.
+        """
+        return (hasattr(window, 'export_records') and hasattr(window, 'bulk_load')
+                and all(hasattr(shard, 'lock') for shard in cls._shards(window)))
+    
+    def _check_window(self, window) -> None:
+        if not self.supports(window):
+            raise ValueError(
+                f"WindowPersistence does not support storage={getattr(window, 'storage', type(window).__name__)!r}"
+            )
+    
+    # ========================================
+    # WRITE-AHEAD LOG
+    # ========================================
+    
+    def append(self, log_data: Dict, timestamp: float) -> None:
+        """
+        Menaruh satu log di buffer WAL (dipanggil oleh add_log dengan lock
+        window dipegang). Buffer ditulis ke segmen aktif oleh flush().
+        
+        Args:
+            log_data: Dictionary log
+            timestamp: Timestamp log (epoch detik)
+        """
+        record = [timestamp] + [log_data.get(field) for field in LOG_RECORD_FIELDS[1:]]
+        with self._lock:
+            if self._wal_file is None:
+                return
+            self._pending.append(record)
+        if self.flush_interval == 0:
+            self.flush()
+    
+    def flush(self) -> int:
+        """
+        Menulis buffer WAL ke segmen aktif (dipanggil thread latar belakang).
+        
+        Returns:
+            Jumlah log yang ditulis
+        """
+        with self._io_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                wal_file = self._wal_file
+            if wal_file is None:
+                return 0
+            self._write_records(wal_file, pending)
+            return len(pending)
+    
+    def _write_records(self, wal_file, records: List[List]) -> None:
+        """Serialisasi dan write ke file (_io_lock dipegang caller)."""
+        if not records:
+            return
+        wal_file.write(''.join(
+            json.dumps(record, separators=(',', ':'), default=str) + '\n' for record in records
+        ))
+        wal_file.flush()
+        if self.fsync:
+            os.fsync(wal_file.fileno())
+    
+    def _open_segment(self, segment: int):
+        """Membuka segmen baru (_lock dipegang); file lama dikembalikan untuk ditutup caller."""
+        previous = self._wal_file
+        self._segment = segment
+        self._wal_file = open(self._segment_path(segment), 'a', encoding='utf-8')
+        return previous
+    
+    def _read_segment(self, segment: int) -> List[Tuple]:
+        records = []
+        with open(self._segment_path(segment), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(tuple(json.loads(line)))
+                except ValueError:
+                    # Baris terakhir bisa terpotong saat proses crash
+                    break
+        return records
+    
+    # ========================================
+    # SNAPSHOT & RESTORE
+    # ========================================
+    
+    def restore(self, window) -> int:
+        """
+        Memuat snapshot terakhir dan segmen WAL setelahnya ke window.
+        
+        Args:
+            window: Sliding window (sebaiknya masih kosong)
+        
+        Returns:
+            Jumlah log dalam window setelah restore
+        
+        Raises:
+            ValueError: Jika window tidak didukung (lihat supports())
+        """
+        self._check_window(window)
+        start = time.time()
+        records: List[Tuple] = []
+        first_segment = 0
+        
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            if snapshot.get('version') != self.FORMAT_VERSION:
+                raise ValueError(f"Unsupported snapshot version: {snapshot.get('version')}")
+            records.extend(tuple(record) for record in snapshot['records'])
+            first_segment = snapshot['wal_segment']
+        
+        for segment in self._existing_segments():
+            if segment >= first_segment:
+                records.extend(self._read_segment(segment))
+        
+        restored = window.bulk_load(records)
+        print(f"[INFO] Sliding window restored: {restored} logs in {time.time() - start:.2f}s")
+        return restored
+    
+    def attach(self, window) -> None:
+        """
+        Menghubungkan WAL ke window: setiap add_log berikutnya ditulis ke
+        segmen WAL baru.
+        """
+        self._check_window(window)
+        segments = self._existing_segments()
+        with self._lock:
+            previous = self._open_segment((segments[-1] + 1) if segments else 0)
+        if previous is not None:
+            self._close_segment(previous, [])
+        self.window = window
+        for shard in self._shards(window):
+            shard.wal = self
+    
+    def snapshot(self) -> int:
+        """
+        Menulis snapshot isi window lalu membuang segmen WAL yang sudah
+        tercakup snapshot.
+        
+        Returns:
+            Jumlah log dalam snapshot
+        """
+        if self.window is None:
+            raise RuntimeError("WindowPersistence is not attached to a window")
+        
+        # Cut yang konsisten: semua lock shard dipegang (urutan tetap) saat
+        # buffer diekspor dan WAL berpindah segmen
+        with ExitStack() as stack:
+            for shard in self._shards(self.window):
+                stack.enter_context(shard.lock)
+            records = self.window.export_records()
+            with self._lock:
+                pending, self._pending = self._pending, []
+                previous = self._open_segment(self._segment + 1)
+                covered_until = self._segment
+        
+        # Sisa buffer milik segmen lama ditulis di luar lock window, agar
+        # segmen lama tetap lengkap jika snapshot gagal ditulis
+        self._close_segment(previous, pending)
+        
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': self.FORMAT_VERSION,
+                'created': time.time(),
+                'wal_segment': covered_until,
+                'fields': list(LOG_RECORD_FIELDS),
+                'records': records,
+            }, f, separators=(',', ':'), default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        
+        for segment in self._existing_segments():
+            if segment < covered_until:
+                os.remove(self._segment_path(segment))
+        
+        self.last_snapshot = time.time()
+        self.consecutive_failures = 0
+        self.last_error = None
+        return len(records)
+    
+    def _close_segment(self, wal_file, pending: List[List]) -> None:
+        # _io_lock menunggu flush() yang sedang menulis batch lebih awal ke file ini
+        with self._io_lock:
+            self._write_records(wal_file, pending)
+            wal_file.close()
+    
+    # ========================================
+    # FLUSH & SNAPSHOT BERKALA
+    # ========================================
+    
+    def start(self) -> None:
+        """Menjalankan thread flush WAL dan snapshot berkala (daemon)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='window-snapshot', daemon=True)
+        self._thread.start()
+    
+    def _run(self) -> None:
+        interval = min(self.flush_interval or self.snapshot_interval, self.snapshot_interval)
+        next_snapshot = time.time() + self.snapshot_interval
+        while not self._stop_event.wait(interval):
+            try:
+                if time.time() >= next_snapshot:
+                    next_snapshot = time.time() + self.snapshot_interval
+                    self.snapshot()
+                else:
+                    self.flush()
+            except Exception as e:
+                # Snapshot yang terus gagal membuat segmen WAL tidak pernah dihapus
+                self.consecutive_failures += 1
+                self.last_error = f'{type(e).__name__}: {e}'
+                print(f"[ERROR] Sliding window WAL flush/snapshot failed "
+                      f"(consecutive failures: {self.consecutive_failures}): {self.last_error}")
+    
+    def get_stats(self) -> Dict:
+        """Status persistence untuk monitoring."""
+        return {
+            'last_snapshot': self.last_snapshot,
+            'wal_segments': len(self._existing_segments()),
+            'consecutive_failures': self.consecutive_failures,
+            'last_error': self.last_error,
+        }
+    
+    def close(self) -> None:
+        """Menghentikan thread snapshot dan menutup WAL."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        
+        if self.window is not None:
+            for shard in self._shards(self.window):
+                shard.wal = None
+        with self._lock:
+            pending, self._pending = self._pending, []
+            wal_file, self._wal_file = self._wal_file, None
+        if wal_file is not None:
+            self._close_segment(wal_file, pending)
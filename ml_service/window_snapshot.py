@@ -0,0 +1,162 @@
+"""
+========================================
+WINDOW SNAPSHOT MODULE
+Snapshot Read-Only (RCU) untuk Pembaca Sliding Window
+========================================
+
+Endpoint dashboard (/health, /temporal/stats) yang membaca window secara
+langsung harus mengambil lock window dan menjalankan cleanup, sehingga
+polling dashboard ikut memperlambat ingestion log. Dengan modul ini satu
+thread latar belakang menerbitkan snapshot agregat secara berkala:
+
+  - snapshot dibangun di luar jalur request (sekali per interval, berapa
+    pun jumlah pembaca), lalu dipasang dengan satu assignment referensi
+    yang atomik di CPython (gaya RCU: read-copy-update)
+  - pembaca hanya membaca referensi snapshot terakhir tanpa lock, jadi
+    writer tidak pernah menunggu pembaca dan pembacaan selesai dalam
+    hitungan mikrodetik
+  - snapshot tidak bisa diubah (NamedTuple berisi mappingproxy) dan
+    membawa umurnya sendiri agar dashboard tahu seberapa segar datanya
+
+========================================
+Lead Researcher & Developer (Journal-Grade Overhaul):
+  MUHAMMAD AKBAR HADI PRATAMA
+  GitHub: @el-pablos
+  Email: yeteprem.end23juni@gmail.com
+
+Original Contributors / Legacy Team:
+  - Jeremy Christo Emmanuelle Panjaitan (237006516084)
+  - Farrel Alfaridzi (237006516028)
+  - Chosmas Laurens Rumngewur (217006516074)
+========================================
+"""
+
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional, Sequence
+
+
+class WindowSnapshot(NamedTuple):
+    """Snapshot read-only dari statistik dan metrik global sebuah window."""
+    
+    version: int
+    published_at: float          # epoch detik (untuk ditampilkan)
+    published_monotonic: float   # time.monotonic() (untuk menghitung umur)
+    stats: Mapping
+    metrics: Mapping[str, Mapping]
+    
+    @property
+    def age(self) -> float:
+        """Umur snapshot dalam detik."""
+        return time.monotonic() - self.published_monotonic
+    
+    def to_dict(self) -> Dict:
+        """Salinan dictionary biasa (misal untuk jsonify)."""
+        return {
+            'version': self.version,
+            'published_at': self.published_at,
+            'age_seconds': round(self.age, 3),
+            'stats': dict(self.stats),
+            'metrics': {key: dict(metrics) for key, metrics in self.metrics.items()},
+        }
+
+
+class SnapshotPublisher:
+    """
+    Menerbitkan WindowSnapshot secara berkala di thread latar belakang.
+    
+    Pemakaian:
+        publisher = SnapshotPublisher(sliding_window)
+        publisher.start()
+        snapshot = publisher.read()     # tanpa lock
+        snapshot.stats['logs_1min'], snapshot.metrics['1min']['requests']
+    """
+    
+    DEFAULT_METRIC_WINDOWS = ('1min', '5min')
+    
+    def __init__(
+        self,
+        window,
+        interval_seconds: float = 1.0,
+        metric_windows: Sequence[str] = DEFAULT_METRIC_WINDOWS
+    ):
+        """
+        Inisialisasi publisher.
+        
+        Args:
+            window: Sliding window (jenis apa pun yang punya get_stats dan
+                get_global_metrics)
+            interval_seconds: Interval penerbitan snapshot
+            metric_windows: Window yang metrik globalnya ikut disnapshot
+        """
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be > 0")
+        
+        self.window = window
+        self.interval = interval_seconds
+        self.metric_windows = tuple(metric_windows)
+        self._snapshot: Optional[WindowSnapshot] = None
+        # Hanya serialisasi antar penerbit; pembaca tidak pernah memakainya
+        self._publish_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def publish(self) -> WindowSnapshot:
+        """
+        Membangun snapshot baru dari window lalu memasangnya.
+        
+        Returns:
+            Snapshot yang baru diterbitkan
+        """
+        with self._publish_lock:
+            stats = self.window.get_stats()
+            metrics = {
+                key: MappingProxyType(dict(self.window.get_global_metrics(key)))
+                for key in self.metric_windows
+            }
+            previous = self._snapshot
+            snapshot = WindowSnapshot(
+                version=previous.version + 1 if previous is not None else 1,
+                published_at=time.time(),
+                published_monotonic=time.monotonic(),
+                stats=MappingProxyType(dict(stats)),
+                metrics=MappingProxyType(metrics),
+            )
+            # Assignment referensi atomik: pembaca melihat snapshot lama atau baru
+            self._snapshot = snapshot
+        return snapshot
+    
+    def read(self) -> WindowSnapshot:
+        """
+        Snapshot terakhir tanpa mengambil lock window. Hanya pembacaan
+        pertama sebelum snapshot pertama terbit yang membangunnya langsung.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.publish()
+        return snapshot
+    
+    def start(self) -> None:
+        """Menjalankan thread penerbit (daemon)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='window-snapshot', daemon=True)
+        self._thread.start()
+    
+    def _run(self) -> None:
+        while True:
+            try:
+                self.publish()
+            except Exception as e:
+                print(f"[WARNING] Sliding window snapshot failed: {e}")
+            if self._stop_event.wait(self.interval):
+                break
+    
+    def close(self) -> None:
+        """Menghentikan thread penerbit."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None